@@ -0,0 +1,113 @@
+"""Compare per-frame render time of the markup and raw-text output paths.
+
+Usage:
+    python -m benchmarks.output_render [--lines N] [--height H]
+
+Appends N output lines one at a time and renders the visible rows after
+each, as the output pane does on every frame while a command is printing.
+"markup" is the previous approach (all lines joined into one string and
+shown with ``Static.update``, so the whole output is parsed as console
+markup on every update); "raw" is ``OutputLog``, which builds styled text
+per line and only renders the visible rows.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from textual.app import App, ComposeResult
+from textual.containers import ScrollableContainer
+from textual.geometry import Region
+from textual.widgets import Static
+
+from src.models import OutputLine, StreamType
+from src.services.highlight import Highlighter
+from src.widgets.output_log import OutputLog
+
+SAMPLE_LINES = [
+    '{"level": "info", "msg": "request served", "tags": ["api", "v2"], "ms": 12}',
+    "[INFO] 2024-01-01 12:00:00 worker-3 connected to 10.0.0.12:5432",
+    "[WARN] retrying [attempt 2/5] after 250ms",
+    "plain progress line without any markup-looking characters",
+    "Traceback (most recent call last): ValueError: bad value [x]",
+]
+
+
+def make_line(index: int) -> OutputLine:
+    """Build the index-th synthetic output line."""
+    return OutputLine(
+        id=f"line_{index}",
+        execution_id="bench",
+        timestamp=datetime.now(),
+        stream=StreamType.STDERR if index % 7 == 0 else StreamType.STDOUT,
+        content=SAMPLE_LINES[index % len(SAMPLE_LINES)],
+    )
+
+
+class BenchApp(App):
+    """Minimal app hosting the widget under test."""
+
+    def __init__(self, raw: bool):
+        super().__init__()
+        self.raw = raw
+
+    def compose(self) -> ComposeResult:
+        if self.raw:
+            yield OutputLog(highlighter=Highlighter(), id="log")
+        else:
+            with ScrollableContainer():
+                yield Static("", id="log")
+
+
+async def measure(raw: bool, lines: int, height: int) -> list[float]:
+    """Append lines one by one and time rendering the visible rows (ms)."""
+    app = BenchApp(raw)
+    frame_times = []
+    async with app.run_test(size=(120, height)):
+        widget = app.query_one("#log")
+        shown: list[str] = []
+        for index in range(lines):
+            line = make_line(index)
+            start = time.perf_counter()
+            if raw:
+                widget.add_line(line)
+                visible = Region(0, 0, widget.size.width, height)
+            else:
+                prefix = "[OUT] " if line.stream == StreamType.STDOUT else "[ERR] "
+                shown.append(prefix + line.content)
+                widget.update("\n".join(shown))
+                rows = len(shown)
+                visible = Region(0, max(0, rows - height), 120, min(rows, height))
+            widget.render_lines(visible)
+            frame_times.append((time.perf_counter() - start) * 1000)
+    return frame_times
+
+
+def summarize(label: str, frame_times: list[float]) -> str:
+    """Format p50/p99/max for a set of frame times."""
+    percentiles = statistics.quantiles(frame_times, n=100)
+    return (
+        f"{label:<7} p50 {percentiles[49]:8.3f} ms   p99 {percentiles[98]:8.3f} ms"
+        f"   max {max(frame_times):8.3f} ms"
+    )
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=40)
+    args = parser.parse_args()
+
+    markup = await measure(False, args.lines, args.height)
+    raw = await measure(True, args.lines, args.height)
+
+    print(f"{args.lines} lines appended, {args.height} visible rows")
+    print(summarize("markup", markup))
+    print(summarize("raw", raw))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
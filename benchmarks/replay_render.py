@@ -0,0 +1,88 @@
+"""Replay a recorded session into the output pane and time its frames.
+
+Usage:
+    python -m benchmarks.replay_render RECORDING [--fps F] [--height H]
+
+Record a session with ``ops-deck --record DIR`` and run the command whose
+output is slow to render. The recording is replayed as fast as possible
+through the same decoding path as a live command, into an ``OutputPane``;
+the visible rows are rendered once per frame of *recorded* time (1/F s),
+so every run renders the same frames with the same content, whatever the
+speed of the machine.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from textual.app import App, ComposeResult
+from textual.geometry import Region
+
+from src.services.recording import ReplayRunner
+from src.widgets.output_log import OutputLog
+from src.widgets.output_pane import OutputPane
+
+
+class BenchApp(App):
+    """Minimal app hosting the output pane."""
+
+    def compose(self) -> ComposeResult:
+        yield OutputPane(id="output-pane")
+
+
+async def replay(path: str, fps: float, height: int) -> tuple[int, list[float], float]:
+    """Replay a recording, rendering once per recorded frame.
+
+    Returns:
+        Lines shown, render time of each frame (ms) and total wall time (s)
+    """
+    runner = ReplayRunner(path, speed=0)
+    app = BenchApp()
+    frame_times: list[float] = []
+    lines = 0
+    async with app.run_test(size=(120, height)):
+        pane = app.query_one(OutputPane)
+        log = pane.query_one(OutputLog)
+        frame = 1 / fps
+        next_frame = frame
+
+        def on_output(line) -> None:
+            nonlocal lines, next_frame
+            pane.add_output_line(line)
+            lines += 1
+            if runner.position >= next_frame:
+                next_frame = runner.position + frame
+                start = time.perf_counter()
+                log.render_lines(Region(0, 0, log.size.width, log.size.height))
+                frame_times.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await runner.run(
+            runner.recording.command(), output_callback=on_output, start_callback=pane.start_command
+        )
+        wall = time.perf_counter() - started
+    return lines, frame_times, wall
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--fps", type=float, default=60.0)
+    parser.add_argument("--height", type=int, default=40)
+    args = parser.parse_args()
+
+    lines, frame_times, wall = await replay(args.recording, args.fps, args.height)
+
+    print(f"{lines} lines in {wall:.2f}s ({lines / wall:,.0f} lines/s), {len(frame_times)} frames")
+    if len(frame_times) >= 2:
+        percentiles = statistics.quantiles(frame_times, n=100)
+        print(
+            f"frame   p50 {percentiles[49]:8.3f} ms   p99 {percentiles[98]:8.3f} ms"
+            f"   max {max(frame_times):8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
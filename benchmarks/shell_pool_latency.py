@@ -0,0 +1,60 @@
+"""Compare per-execution latency of spawn-per-run and pooled shells.
+
+Usage:
+    python -m benchmarks.shell_pool_latency [--runs N] [--command CMD]
+
+Reports p50/p99 wall-clock latency of ``AsyncCommandRunner.run`` for a short
+command, with and without a ``ShellWorkerPool``.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.models import Command
+from src.services.command_runner import AsyncCommandRunner
+from src.services.shell_pool import ShellWorkerPool
+
+
+async def measure(runner: AsyncCommandRunner, command: Command, runs: int) -> list[float]:
+    """Run a command repeatedly and collect latencies in milliseconds."""
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await runner.run(command, output_callback=lambda line: None)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies: list[float]) -> str:
+    """Format p50/p99 for a set of latencies."""
+    percentiles = statistics.quantiles(latencies, n=100)
+    return f"{label:<8} p50 {percentiles[49]:7.2f} ms   p99 {percentiles[98]:7.2f} ms"
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--command", default="echo status ok")
+    args = parser.parse_args()
+
+    command = Command(name="bench", command=args.command, timeout=10)
+
+    spawn = await measure(AsyncCommandRunner(), command, args.runs)
+
+    pool = ShellWorkerPool(size=2, max_runs=1000)
+    pool.start()
+    try:
+        pooled = await measure(AsyncCommandRunner(shell_pool=pool), command, args.runs)
+    finally:
+        pool.close()
+
+    print(f"{args.runs} runs of {args.command!r}")
+    print(summarize("spawn", spawn))
+    print(summarize("pooled", pooled))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
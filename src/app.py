@@ -1,51 +1,377 @@
-"""Entry point for Ops Deck TUI application."""
+"""Entry point for Ops Deck TUI application.
 
+Heavy imports (Textual, pydantic models, widgets) are deferred until they are
+needed so that ``--help`` and ``--check-config`` start quickly.
+"""
+
+import argparse
 import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .exceptions import ConfigError
-from .models import AppConfig, Command
-from .services import ConfigLoader
-from .widgets.app import OpsApp
 
+if TYPE_CHECKING:
+    from .models import AppConfig, Command, Pipeline
+
+# Reference point for startup profiling (interpreter start is not observable)
+_PROCESS_START = time.perf_counter()
+
+DEFAULT_CONFIG_PATH = "commands.yaml"
+
+
+@dataclass
+class StartupProfile:
+    """Wall-clock timings of the startup phases, in seconds."""
+
+    phases: dict[str, float] = field(default_factory=dict)
+    _mark: float = field(default_factory=time.perf_counter)
+
+    def mark(self, phase: str) -> None:
+        """Record the time elapsed since the previous mark under ``phase``."""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._mark
+        self._mark = now
+
+    def report(self) -> str:
+        """Format the recorded timings as a small table."""
+        lines = ["Startup profile:"]
+        for phase, seconds in self.phases.items():
+            lines.append(f"  {phase:<12} {seconds * 1000:8.1f} ms")
+        total = time.perf_counter() - _PROCESS_START
+        lines.append(f"  {'total':<12} {total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="ops-deck",
+        description="TUI dashboard for running curated CLI commands.",
+    )
+    parser.add_argument(
+        "-c",
+        "--config",
+        default=DEFAULT_CONFIG_PATH,
+        help=f"Path to the command configuration file (default: {DEFAULT_CONFIG_PATH})",
+    )
+    parser.add_argument(
+        "--check-config",
+        action="store_true",
+        help="Validate the configuration and exit without starting the TUI",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="COMMAND",
+        help="Run a command without the TUI and stream its output to a file, then exit",
+    )
+    parser.add_argument(
+        "--export-file",
+        metavar="PATH",
+        help="File written by --export (default: <command>-<time>.log in the current "
+        "directory); a .gz suffix gzips it",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=["text", "jsonl"],
+        default="text",
+        help="Format written by --export: text, or JSON Lines with stream and timestamp "
+        "(default: text)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Record every execution's output and timing to DIR (overrides record_dir)",
+    )
+    parser.add_argument(
+        "--history",
+        metavar="FILE",
+        help="List the runs stored in a command's output history file, then exit",
+    )
+    parser.add_argument(
+        "--history-run",
+        metavar="N",
+        type=int,
+        help="With --history, print the output of run N instead (negative counts from the latest)",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="Open the deck with a single command that plays back a recording",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        metavar="N",
+        help="Playback speed for --replay: 1 for recorded timing, N times faster, "
+        "or 0 for as fast as possible (default: 1)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import, config and first-paint timings, then exit",
+    )
+    return parser
+
+
+def check_config(config_path: str) -> int:
+    """Validate a configuration file without importing Textual.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Process exit code (0 if the configuration is valid)
+    """
+    from .services.config import ConfigLoader
+
+    loader = ConfigLoader()
+    try:
+        config_data = loader.load(config_path)
+        commands, _ = loader.validate(config_data)
+        pipelines = loader.validate_pipelines(config_data, commands)
+    except ConfigError as e:
+        print(f"Configuration Error: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"OK: {len(commands)} command(s), {len(pipelines)} pipeline(s) loaded from {config_path}"
+    )
+    return 0
+
+
+def export_command(config_path: str, name: str, path: str | None, fmt: str = "text") -> int:
+    """Run one configured command headlessly, streaming its output to a file.
 
-def main() -> None:
+    Lines are written as they arrive, so the output is never held in memory.
+    A command with targets runs once per target, as in the deck, with each
+    line prefixed by its target. The file ends with the outcome and resource
+    usage of each execution.
+
+    Args:
+        config_path: Path to the YAML configuration file
+        name: Name of the command to run
+        path: File to write (None for a name derived from the command)
+        fmt: Export format (``"text"`` or ``"jsonl"``)
+
+    Returns:
+        Process exit code (the command's exit code, or 1 if it could not run
+        or failed on any target)
+    """
+    import asyncio
+    from datetime import datetime
+
+    from .exceptions import OpsError
+    from .models import ExecutionStatus
+    from .services.config import ConfigLoader
+    from .services.export import OutputExporter, export_filename
+    from .services.fanout import FanOutRunner
+    from .services.python_runner import PythonTaskRunner
+
+    loader = ConfigLoader()
+    try:
+        commands, config = loader.validate(loader.load(config_path))
+    except ConfigError as e:
+        print(f"Configuration Error: {e}", file=sys.stderr)
+        return 1
+    command = next((command for command in commands if command.name == name), None)
+    if command is None:
+        print(f"Unknown command: {name}", file=sys.stderr)
+        return 1
+
+    path = path or export_filename(name, datetime.now(), fmt, compress=False)
+    # Callables need the Python worker pool; a worker starts only for them
+    runner = PythonTaskRunner(workers=1, termination_grace=config.termination_grace)
+    try:
+        with OutputExporter(path, fmt) as exporter:
+            if command.is_parameterized():
+                fanout = FanOutRunner(runner, max_parallel=config.max_parallel)
+                result = asyncio.run(
+                    fanout.run(
+                        command,
+                        output_callback=lambda target, line: exporter.write(
+                            line.with_prefix(f"{target} | ")
+                        ),
+                    )
+                )
+                for target_result in result.results:
+                    exporter.write_execution(target_result.execution)
+            else:
+                execution = asyncio.run(runner.run(command, output_callback=exporter.write))
+                exporter.write_execution(execution)
+    except (OSError, OpsError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        runner.close()
+
+    print(f"{exporter.lines_written} line(s) written to {path}", file=sys.stderr)
+    if command.is_parameterized():
+        failed = result.failure_count()
+        if failed:
+            print(f"Failed on {failed} of {len(result.results)} target(s)", file=sys.stderr)
+        return 1 if failed else 0
+    if execution.status == ExecutionStatus.SUCCESS:
+        return 0
+    return execution.exit_code or 1
+
+
+def show_history(path: str, run: int | None = None) -> int:
+    """Print the runs stored in an output history, or the output of one run.
+
+    Args:
+        path: History file
+        run: Run whose output to print (None to list the runs)
+
+    Returns:
+        Process exit code (0 if the history could be read)
+    """
+    from .exceptions import OpsError
+    from .services.history import OutputHistory
+
+    if not Path(path).is_file():
+        print(f"No such history: {path}", file=sys.stderr)
+        return 1
+    try:
+        history = OutputHistory(path)
+    except (OSError, OpsError) as e:
+        print(f"History Error: {e}", file=sys.stderr)
+        return 1
+    try:
+        if run is not None:
+            try:
+                lines = history.lines(run)
+            except IndexError:
+                print(f"No run {run} in {path} ({len(history)} run(s))", file=sys.stderr)
+                return 1
+            for line in lines:
+                print(line)
+            return 0
+        for entry in history.runs():
+            exit_code = "-" if entry.exit_code is None else entry.exit_code
+            when = f"{entry.time:%Y-%m-%d %H:%M:%S}"
+            usage = entry.resource_usage
+            resources = f"  {usage.summary()}" if usage is not None else ""
+            print(
+                f"{entry.index:>7}  {when}  exit {exit_code:<4}  output {entry.object}{resources}"
+            )
+        print(
+            f"{len(history)} run(s), {history.object_count} distinct output(s), "
+            f"{history.size:,} bytes",
+            file=sys.stderr,
+        )
+        return 0
+    finally:
+        history.close()
+
+
+def main(argv: list[str] | None = None) -> None:
     """Load configuration and run the Ops Deck TUI application.
 
-    Loads configuration from commands.yaml and initializes the app.
-    If configuration fails, displays an error screen instead of crashing.
+    Some flags take a fast path that exits without starting the TUI (or
+    importing Textual): ``--check-config`` validates the configuration,
+    ``--export`` runs one command and streams its output to a file, and
+    ``--history`` lists or prints the runs stored in an output history.
+
+    Otherwise the configuration is loaded from ``--config`` (commands.yaml
+    by default), or with ``--replay`` a recording is played back in place
+    of running its command; ``--record`` saves every execution for later
+    replay. If loading fails, the app shows an error screen instead of
+    crashing. ``--profile-startup`` prints the time spent loading the
+    configuration, importing the app and painting the first frame, then
+    exits.
+
+    Args:
+        argv: Command-line arguments (defaults to ``sys.argv[1:]``)
     """
+    args = build_parser().parse_args(argv)
+
+    if args.check_config:
+        sys.exit(check_config(args.config))
+
+    if args.export:
+        sys.exit(export_command(args.config, args.export, args.export_file, args.export_format))
+
+    if args.history:
+        sys.exit(show_history(args.history, args.history_run))
+
+    profile = StartupProfile() if args.profile_startup else None
+
     # Determine config file path
-    config_path = Path("commands.yaml")
+    config_path = Path(args.config)
     config: AppConfig | None = None
     commands: list[Command] = []
+    pipelines: list[Pipeline] = []
+    runner = None
     error_title: str | None = None
     error_message: str | None = None
     error_details: str | None = None
 
     try:
-        # Load configuration
-        config_loader = ConfigLoader()
-        commands, config = config_loader.load_and_validate(str(config_path))
+        if args.replay:
+            # A replay needs no configuration: the recording names its command
+            from . import models
+            from .services.recording import ReplayRunner
+
+            config = models.AppConfig()
+            runner = ReplayRunner(args.replay, speed=args.replay_speed)
+            commands = [runner.recording.command()]
+        else:
+            # Load configuration
+            from .services.config import ConfigLoader
+
+            config_loader = ConfigLoader()
+            config_data = config_loader.load(str(config_path))
+            commands, config = config_loader.validate(config_data)
+            pipelines = config_loader.validate_pipelines(config_data, commands)
+        if args.record and config is not None:
+            config.record_dir = args.record
 
     except ConfigError as e:
         # Handle configuration errors
         error_title = "Configuration Error"
         error_message = str(e)
-        error_details = "Check your commands.yaml file for errors."
+        error_details = f"Check your {config_path} file for errors."
     except FileNotFoundError:
         # Handle missing config file
         error_title = "Configuration File Not Found"
-        error_message = f"Could not find {config_path}"
-        error_details = "Create a commands.yaml file in the current directory."
+        error_message = f"Could not find {args.replay or config_path}"
+        error_details = (
+            f"Check the path of {args.replay}."
+            if args.replay
+            else "Create a commands.yaml file in the current directory."
+        )
     except Exception as e:
         # Handle unexpected errors
         error_title = "Unexpected Error"
         error_message = str(e)
         error_details = "An unexpected error occurred during startup."
 
+    if profile:
+        profile.mark("config")
+
+    from .widgets.app import OpsApp
+
+    if profile:
+        profile.mark("import")
+
+    def on_first_paint() -> None:
+        """Record first-paint time and stop the profiling run."""
+        if profile:
+            profile.mark("first_paint")
+            app.exit()
+
     # Create and configure app
-    app = OpsApp(commands, config=config)
+    app = OpsApp(
+        commands,
+        config=config,
+        pipelines=pipelines,
+        on_first_paint=on_first_paint if profile else None,
+        runner=runner,
+    )
 
     # If there was an error, show it
     if error_title and error_message:
@@ -57,6 +383,9 @@ def main() -> None:
     except KeyboardInterrupt:
         sys.exit(0)
 
+    if profile:
+        print(profile.report(), file=sys.stderr)
+
 
 if __name__ == "__main__":
     main()
@@ -6,7 +6,7 @@ Messages are used to communicate between widgets in the TUI.
 
 from textual.message import Message
 
-from .models import Execution, ExecutionStatus, OutputLine
+from .models import Execution, ExecutionStatus, FanOutResult, OutputLine, PipelineResult
 
 
 class CommandOutput(Message):
@@ -84,3 +84,56 @@ class CommandStarted(Message):
         """Initialize the message."""
         super().__init__(**kwargs)
         self.execution = execution
+
+
+class FanOutComplete(Message):
+    """Message sent when a parameterized command finishes on all targets.
+
+    Attributes:
+        result: Aggregated per-target result
+        run_id: ID of the fan-out run (its output buffer)
+    """
+
+    def __init__(self, result: FanOutResult, run_id: str | None = None, **kwargs) -> None:
+        """Initialize the message."""
+        super().__init__(**kwargs)
+        self.result = result
+        self.run_id = run_id
+
+
+class PipelineProgress(Message):
+    """Message sent when a pipeline node finishes or the pipeline completes.
+
+    Attributes:
+        result: Pipeline result so far
+        finished: True once every node has finished or been skipped
+        run_id: ID of the pipeline run (its output buffer)
+    """
+
+    def __init__(
+        self,
+        result: PipelineResult,
+        finished: bool = False,
+        run_id: str | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialize the message."""
+        super().__init__(**kwargs)
+        self.result = result
+        self.finished = finished
+        self.run_id = run_id
+
+
+class OutputAlert(Message):
+    """Message sent when command output matches an ``alert_on`` pattern.
+
+    Attributes:
+        execution: The execution that produced the output
+        alert: Description of the match
+    """
+
+    def __init__(self, execution: Execution, alert: str, **kwargs) -> None:
+        """Initialize the message."""
+        super().__init__(**kwargs)
+        self.execution = execution
+        self.alert = alert
@@ -1,19 +1,78 @@
 """Models package initialization.
 
-Exports all models for public use.
+Exports all models for public use. Exports are resolved lazily (PEP 562) so
+that pydantic is only imported once a model is actually needed.
 """
 
-from .command import Command
-from .config import AppConfig, LogLevel
-from .execution import Execution, ExecutionStatus
-from .output import OutputLine, StreamType
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .command import Command, LoadProfile, MetricExtractor, OutputStage, ResourceLimits
+    from .config import AppConfig, ExportFormat, HighlightRule, LogLevel
+    from .execution import Execution, ExecutionStatus, ResourceUsage
+    from .fanout import FanOutResult, TargetResult
+    from .output import OutputLine, StreamType
+    from .pipeline import NodeResult, Pipeline, PipelineResult, PipelineStep
+
+# Maps each exported name to the submodule that defines it
+_EXPORTS = {
+    "AppConfig": ".config",
+    "Command": ".command",
+    "Execution": ".execution",
+    "ExecutionStatus": ".execution",
+    "ExportFormat": ".config",
+    "FanOutResult": ".fanout",
+    "HighlightRule": ".config",
+    "LoadProfile": ".command",
+    "LogLevel": ".config",
+    "MetricExtractor": ".command",
+    "NodeResult": ".pipeline",
+    "OutputLine": ".output",
+    "OutputStage": ".command",
+    "Pipeline": ".pipeline",
+    "PipelineResult": ".pipeline",
+    "PipelineStep": ".pipeline",
+    "ResourceLimits": ".command",
+    "ResourceUsage": ".execution",
+    "StreamType": ".output",
+    "TargetResult": ".fanout",
+}
 
 __all__ = [
     "AppConfig",
     "Command",
     "Execution",
     "ExecutionStatus",
+    "ExportFormat",
+    "FanOutResult",
+    "HighlightRule",
+    "LoadProfile",
     "LogLevel",
+    "MetricExtractor",
+    "NodeResult",
     "OutputLine",
+    "OutputStage",
+    "Pipeline",
+    "PipelineResult",
+    "PipelineStep",
+    "ResourceLimits",
+    "ResourceUsage",
     "StreamType",
+    "TargetResult",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported model on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazy exports."""
+    return sorted({*globals(), *__all__})
@@ -3,20 +3,214 @@
 Represents a CLI command that can be executed.
 """
 
-from pydantic import BaseModel, Field
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class ResourceLimits(BaseModel):
+    """Resource limits and scheduling applied to a command's process.
+
+    Limits are set in the child before exec and are inherited by everything
+    it starts.
+    """
+
+    memory_mb: int | None = Field(
+        default=None, ge=1, description="Address-space limit in MiB (RLIMIT_AS)"
+    )
+    cpu_seconds: int | None = Field(
+        default=None, ge=1, description="CPU-time limit in seconds (RLIMIT_CPU)"
+    )
+    nice: int | None = Field(
+        default=None, ge=-20, le=19, description="Scheduling niceness (-20 to 19)"
+    )
+    io_class: Literal["realtime", "best-effort", "idle"] | None = Field(
+        default=None, description="I/O scheduling class (as in ionice)"
+    )
+    io_priority: int | None = Field(
+        default=None, ge=0, le=7, description="Priority within the I/O class (0 is highest)"
+    )
+    cpu_affinity: list[int] = Field(
+        default_factory=list, description="CPUs the process may run on (empty for all)"
+    )
+    cgroup: str | None = Field(
+        default=None,
+        description="cgroup v2 to place the process in, relative to /sys/fs/cgroup",
+    )
+
+
+class LoadProfile(BaseModel):
+    """Synthetic output generated in-process instead of running a program.
+
+    Used to stress-test output handling; the same profile and seed always
+    produce the same lines.
+    """
+
+    lines_per_second: float = Field(
+        default=1000.0, gt=0, le=10_000_000, description="Average output rate"
+    )
+    lines: int | None = Field(
+        default=10000, ge=1, description="Lines to output before exiting (None for no limit)"
+    )
+    duration: float | None = Field(
+        default=None, gt=0, description="Seconds to run before exiting (None for no limit)"
+    )
+    line_length: int = Field(default=80, ge=0, le=1_000_000, description="Mean line length")
+    length_distribution: Literal["fixed", "uniform", "exponential"] = Field(
+        default="uniform",
+        description="Line lengths: all equal, uniform up to twice the mean, or exponential",
+    )
+    stderr_ratio: float = Field(
+        default=0.0, ge=0.0, le=1.0, description="Fraction of lines written to stderr"
+    )
+    burst_size: int = Field(
+        default=1, ge=1, description="Lines written back to back, then a pause (burstiness)"
+    )
+    invalid_utf8_ratio: float = Field(
+        default=0.0, ge=0.0, le=1.0, description="Fraction of lines with invalid UTF-8 bytes"
+    )
+    ansi_ratio: float = Field(
+        default=0.0, ge=0.0, le=1.0, description="Fraction of lines with ANSI color codes"
+    )
+    exit_code: int = Field(default=0, description="Exit code reported when done")
+    seed: int = Field(default=0, description="Random seed")
+
+
+class OutputStage(BaseModel):
+    """One step of a command's output pipeline, applied to each decoded line.
+
+    ``include`` and ``exclude`` keep or drop lines matching ``pattern``;
+    ``replace`` substitutes ``replacement`` for every match (e.g. to redact
+    secrets); ``json`` pretty-prints lines that are JSON objects or arrays.
+    """
+
+    type: Literal["include", "exclude", "replace", "json"] = Field(
+        ..., description="What the stage does"
+    )
+    pattern: str | None = Field(
+        default=None, description="Regular expression (include, exclude and replace)"
+    )
+    replacement: str = Field(
+        default="***", description="Text substituted for matches (replace; may use \\1)"
+    )
+    indent: int = Field(default=2, ge=0, le=8, description="Indentation (json)")
+
+    @model_validator(mode="after")
+    def _check_pattern(self) -> "OutputStage":
+        """Require a pattern for the stages that match one."""
+        if self.type != "json" and not self.pattern:
+            raise ValueError(f"{self.type} stage requires a pattern")
+        return self
+
+
+class MetricExtractor(BaseModel):
+    """A number pulled out of a command's output as it streams.
+
+    Each match adds a point to the command's time series of the metric,
+    which keeps the last ``points`` values.
+    """
+
+    name: str = Field(..., min_length=1, description="Metric name shown with its sparkline")
+    pattern: str | None = Field(
+        default=None,
+        description="Regex finding the value: group 'value', else group 1, else the whole match",
+    )
+    json_path: str | None = Field(
+        default=None, description="Dotted path to the value in JSON lines (e.g. disks[0].free)"
+    )
+    points: int = Field(default=60, ge=2, le=10000, description="Values kept in the series")
+
+    @model_validator(mode="after")
+    def _check_source(self) -> "MetricExtractor":
+        """Require exactly one way of finding the value."""
+        if (self.pattern is None) == (self.json_path is None):
+            raise ValueError(f"metric {self.name!r} needs either pattern or json_path")
+        return self
 
 
 class Command(BaseModel):
     """Represents a CLI command configuration."""
 
     name: str = Field(..., description="Command name (must be unique)")
-    command: str = Field(..., description="Shell command to execute")
+    command: str = Field(default="", description="Shell command to execute")
     description: str = Field(default="", description="User-friendly description")
     tags: list[str] = Field(default_factory=list, description="Tags for categorization")
     timeout: int = Field(default=300, ge=1, description="Execution timeout in seconds")
     env: dict[str, str] = Field(
         default_factory=dict, description="Environment variables for execution"
     )
+    shell: bool | Literal["auto"] = Field(
+        default="auto",
+        description="Run through /bin/sh (true), exec directly (false) or detect (auto)",
+    )
+    targets: list[str | dict[str, str]] = Field(
+        default_factory=list,
+        description="Targets to fan out over; each renders the command's {placeholders}",
+    )
+    target_groups: list[str] = Field(
+        default_factory=list, description="Names of configured target groups to fan out over"
+    )
+    max_parallel: int | None = Field(
+        default=None, ge=1, description="Concurrency cap for fan-out (defaults to app setting)"
+    )
+    keep_head: int | None = Field(
+        default=None, ge=0, description="Lines to keep from the start of long output"
+    )
+    keep_tail: int | None = Field(
+        default=None, ge=0, description="Lines to keep from the end of long output"
+    )
+    max_output_bytes: int | None = Field(
+        default=None, ge=1, description="Output bytes after which further output is dropped"
+    )
+    kill_on_max_output: bool = Field(
+        default=False, description="Stop the command when max_output_bytes is reached"
+    )
+    strip_ansi: bool = Field(
+        default=False, description="Drop ANSI color codes instead of rendering them"
+    )
+    until: list[str] = Field(
+        default_factory=list,
+        description="Regexes that finish the execution successfully when output matches",
+    )
+    fail_on: list[str] = Field(
+        default_factory=list,
+        description="Regexes that stop the execution as failed when output matches",
+    )
+    alert_on: list[str] = Field(
+        default_factory=list, description="Regexes that raise an alert when output matches"
+    )
+    limits: ResourceLimits | None = Field(
+        default=None, description="Resource limits and scheduling priority for the process"
+    )
+    load: LoadProfile | None = Field(
+        default=None, description="Generate synthetic output in-process instead of running"
+    )
+    callable: str | None = Field(
+        default=None,
+        pattern=r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*[:.][A-Za-z_]\w*$",
+        description="Python function to run on the worker pool (package.module:function)",
+    )
+    arguments: dict[str, Any] = Field(
+        default_factory=dict, description="Keyword arguments for the callable"
+    )
+    stages: list[OutputStage] = Field(
+        default_factory=list,
+        description="Output pipeline: filters and transforms applied to decoded lines in order",
+    )
+    format: Literal["text", "jsonl", "csv", "table"] = Field(
+        default="text",
+        description="Parse stdout into a sortable table (JSON Lines, CSV or aligned columns)",
+    )
+    metrics: list[MetricExtractor] = Field(
+        default_factory=list, description="Numbers to extract from output into time series"
+    )
+
+    @model_validator(mode="after")
+    def _check_command(self) -> "Command":
+        """Require a command line unless output is generated or a callable runs."""
+        if not self.command and self.load is None and self.callable is None:
+            raise ValueError("command is required (unless load or callable is set)")
+        return self
 
     class Config:
         """Pydantic config."""
@@ -29,6 +223,9 @@ class Command(BaseModel):
                 "tags": ["filesystem", "listing"],
                 "timeout": 10,
                 "env": {},
+                "shell": "auto",
+                "targets": [],
+                "target_groups": [],
             }
         }
 
@@ -36,6 +233,10 @@ class Command(BaseModel):
         """String representation."""
         return f"{self.name}: {self.command}"
 
+    def is_parameterized(self) -> bool:
+        """Check if the command fans out over a list of targets."""
+        return bool(self.targets)
+
     def __repr__(self) -> str:
         """Debug representation."""
         return f"Command(name={self.name!r}, command={self.command!r})"
@@ -17,6 +17,21 @@ class LogLevel(str, Enum):
     ERROR = "ERROR"
 
 
+class ExportFormat(str, Enum):
+    """Output export file formats."""
+
+    TEXT = "text"
+    JSONL = "jsonl"
+
+
+class HighlightRule(BaseModel):
+    """A pattern to highlight in command output."""
+
+    name: str = Field(..., description="Rule name (for error messages)")
+    pattern: str = Field(..., min_length=1, description="Regular expression to match")
+    style: str = Field(..., description="Rich style for matches, e.g. 'bold red'")
+
+
 class AppConfig(BaseModel):
     """Global application configuration."""
 
@@ -34,6 +49,48 @@ class AppConfig(BaseModel):
     auto_scroll: bool = Field(
         default=True, description="Auto-scroll output pane to bottom"
     )
+    max_parallel: int = Field(
+        default=8, ge=1, le=256, description="Default concurrency cap for fan-out executions"
+    )
+    termination_grace: float = Field(
+        default=2.0, ge=0.0, le=60.0, description="Seconds between SIGTERM and SIGKILL on stop"
+    )
+    shell_pool_size: int = Field(
+        default=0, ge=0, le=64, description="Pre-forked shell workers to keep (0 = disabled)"
+    )
+    shell_pool_max_runs: int = Field(
+        default=100, ge=1, description="Executions after which a shell worker is replaced"
+    )
+    python_workers: int = Field(
+        default=2, ge=1, le=64, description="Worker processes kept for callable commands"
+    )
+    stage_workers: int = Field(
+        default=2,
+        ge=0,
+        le=64,
+        description="Worker processes for CPU-heavy output stages (0 = run them inline)",
+    )
+    output_memory_mb: int = Field(
+        default=256,
+        ge=1,
+        le=65536,
+        description="Output kept in memory across executions before finished ones go to disk",
+    )
+    highlight_rules: list[HighlightRule] | None = Field(
+        default=None, description="Output highlighting rules (None = built-in rules)"
+    )
+    export_dir: str = Field(default=".", description="Directory output exports are written to")
+    export_format: ExportFormat = Field(
+        default=ExportFormat.TEXT, description="Format of output exports"
+    )
+    export_gzip: bool = Field(default=False, description="Gzip output exports")
+    record_dir: str | None = Field(
+        default=None, description="Directory to record executions to for replay (None = off)"
+    )
+    history_dir: str | None = Field(
+        default=None,
+        description="Directory to keep every command's output history in (None = off)",
+    )
 
     class Config:
         """Pydantic config."""
@@ -47,6 +104,16 @@ class AppConfig(BaseModel):
                 "command_timeout": 300,
                 "max_output_lines": 10000,
                 "auto_scroll": True,
+                "max_parallel": 8,
+                "termination_grace": 2.0,
+                "shell_pool_size": 0,
+                "shell_pool_max_runs": 100,
+                "python_workers": 2,
+                "stage_workers": 2,
+                "output_memory_mb": 256,
+                "export_dir": ".",
+                "export_format": "text",
+                "export_gzip": False,
             }
         }
 
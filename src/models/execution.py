@@ -5,6 +5,7 @@ Represents a single execution of a command.
 
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -19,6 +20,50 @@ class ExecutionStatus(str, Enum):
     SUCCESS = "success"
     ERROR = "error"
     TIMEOUT = "timeout"
+    CANCELLED = "cancelled"
+
+
+class ResourceUsage(BaseModel):
+    """Resources consumed by an execution's process tree (from ``wait4``).
+
+    Covers the spawned process and every descendant it waited for.
+    """
+
+    user_cpu_seconds: float = Field(0.0, description="CPU time spent in user mode")
+    system_cpu_seconds: float = Field(0.0, description="CPU time spent in the kernel")
+    max_rss_kb: int = Field(0, description="Peak resident set size in KiB")
+    block_input_ops: int = Field(0, description="Block input operations")
+    block_output_ops: int = Field(0, description="Block output operations")
+    voluntary_context_switches: int = Field(0, description="Voluntary context switches")
+    involuntary_context_switches: int = Field(0, description="Involuntary context switches")
+
+    @classmethod
+    def from_rusage(cls, rusage: Any) -> "ResourceUsage":
+        """Build from a ``resource.struct_rusage``."""
+        return cls(
+            user_cpu_seconds=rusage.ru_utime,
+            system_cpu_seconds=rusage.ru_stime,
+            max_rss_kb=rusage.ru_maxrss,
+            block_input_ops=rusage.ru_inblock,
+            block_output_ops=rusage.ru_oublock,
+            voluntary_context_switches=rusage.ru_nvcsw,
+            involuntary_context_switches=rusage.ru_nivcsw,
+        )
+
+    @property
+    def cpu_seconds(self) -> float:
+        """Total CPU time (user + system)."""
+        return self.user_cpu_seconds + self.system_cpu_seconds
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (
+            f"CPU {self.user_cpu_seconds:.2f}s user + {self.system_cpu_seconds:.2f}s sys"
+            f" · max RSS {self.max_rss_kb / 1024:.1f} MiB"
+            f" · blocks in/out {self.block_input_ops}/{self.block_output_ops}"
+            f" · ctx switches {self.voluntary_context_switches}"
+            f"/{self.involuntary_context_switches}"
+        )
 
 
 class Execution(BaseModel):
@@ -33,6 +78,15 @@ class Execution(BaseModel):
         default=ExecutionStatus.PENDING, description="Current execution status"
     )
     error_message: str | None = Field(None, description="Error message if failed")
+    stop_reason: str | None = Field(
+        None, description="Why the execution was stopped before it exited on its own"
+    )
+    alerts: list[str] = Field(
+        default_factory=list, description="Alerts raised by output patterns"
+    )
+    resource_usage: ResourceUsage | None = Field(
+        None, description="Resources used by the process tree, if it was spawned"
+    )
 
     class Config:
         """Pydantic config."""
@@ -47,6 +101,11 @@ class Execution(BaseModel):
                 "exit_code": 0,
                 "status": "success",
                 "error_message": None,
+                "resource_usage": {
+                    "user_cpu_seconds": 0.01,
+                    "system_cpu_seconds": 0.0,
+                    "max_rss_kb": 3456,
+                },
             }
         }
 
@@ -70,4 +129,5 @@ class Execution(BaseModel):
             ExecutionStatus.SUCCESS,
             ExecutionStatus.ERROR,
             ExecutionStatus.TIMEOUT,
+            ExecutionStatus.CANCELLED,
         )
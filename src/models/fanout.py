@@ -0,0 +1,50 @@
+"""Fan-out result models for Ops Deck.
+
+Represents the aggregated outcome of running one parameterized command
+against a list of targets.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from .command import Command
+from .execution import Execution, ExecutionStatus
+
+
+class TargetResult(BaseModel):
+    """Outcome of a parameterized command for a single target."""
+
+    target: str = Field(..., description="Display label of the target")
+    execution: Execution = Field(..., description="Execution for this target")
+
+    def succeeded(self) -> bool:
+        """Check if the execution for this target succeeded."""
+        return self.execution.status == ExecutionStatus.SUCCESS
+
+
+class FanOutResult(BaseModel):
+    """Aggregated outcome of a fan-out over all targets."""
+
+    command: Command = Field(..., description="The parameterized command")
+    results: list[TargetResult] = Field(default_factory=list, description="Per-target results")
+    start_time: datetime | None = Field(None, description="Fan-out start time")
+    end_time: datetime | None = Field(None, description="Fan-out end time")
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"FanOutResult({self.command.name}): {self.success_count()}/{len(self.results)} ok"
+
+    def duration_seconds(self) -> float | None:
+        """Calculate total fan-out duration in seconds."""
+        if self.start_time and self.end_time:
+            return (self.end_time - self.start_time).total_seconds()
+        return None
+
+    def success_count(self) -> int:
+        """Count targets whose execution succeeded."""
+        return sum(1 for result in self.results if result.succeeded())
+
+    def failure_count(self) -> int:
+        """Count targets whose execution did not succeed."""
+        return len(self.results) - self.success_count()
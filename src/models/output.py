@@ -24,6 +24,9 @@ class OutputLine(BaseModel):
     timestamp: datetime = Field(..., description="When this output was captured")
     stream: StreamType = Field(..., description="Stream type (stdout or stderr)")
     content: str = Field(..., description="The actual output content", min_length=1)
+    spans: list[tuple[int, int, str]] | None = Field(
+        default=None, description="Styled (start, end, style) spans from ANSI color codes"
+    )
 
     class Config:
         """Pydantic config."""
@@ -43,6 +46,16 @@ class OutputLine(BaseModel):
         """String representation."""
         return f"[{self.stream.value}] {self.content[:50]}..."
 
+    def with_prefix(self, prefix: str) -> "OutputLine":
+        """Copy of the line with text prepended, keeping color spans aligned."""
+        shift = len(prefix)
+        spans = (
+            [(start + shift, end + shift, style) for start, end, style in self.spans]
+            if self.spans
+            else None
+        )
+        return self.model_copy(update={"content": prefix + self.content, "spans": spans})
+
     def is_error(self) -> bool:
         """Check if this is an error output."""
         return self.stream == StreamType.STDERR
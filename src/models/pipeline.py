@@ -0,0 +1,149 @@
+"""Pipeline models for Ops Deck.
+
+Represents a DAG of commands with dependencies and the outcome of running it.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from .execution import Execution, ExecutionStatus
+
+
+class PipelineStep(BaseModel):
+    """A single node in a pipeline, referring to a configured command."""
+
+    command: str = Field(..., description="Name of the command to run")
+    name: str | None = Field(
+        default=None, description="Node name (defaults to the command name)"
+    )
+    depends_on: list[str] = Field(
+        default_factory=list, description="Names of nodes that must succeed first"
+    )
+
+    @property
+    def node_name(self) -> str:
+        """Get the unique node name within the pipeline."""
+        return self.name or self.command
+
+
+class Pipeline(BaseModel):
+    """A DAG of commands executed with maximal parallelism."""
+
+    name: str = Field(..., description="Pipeline name (must be unique)")
+    description: str = Field(default="", description="User-friendly description")
+    steps: list[PipelineStep] = Field(..., min_length=1, description="Pipeline nodes")
+    max_parallel: int | None = Field(
+        default=None, ge=1, description="Concurrency cap (defaults to app setting)"
+    )
+
+    class Config:
+        """Pydantic config."""
+
+        json_schema_extra = {  # noqa: RUF012
+            "example": {
+                "name": "release",
+                "description": "Build, test and package",
+                "steps": [
+                    {"command": "build"},
+                    {"command": "lint"},
+                    {"command": "test", "depends_on": ["build"]},
+                    {"command": "package", "depends_on": ["test", "lint"]},
+                ],
+            }
+        }
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"Pipeline({self.name}): {len(self.steps)} steps"
+
+    def dependencies(self) -> dict[str, list[str]]:
+        """Map each node name to the node names it depends on."""
+        return {step.node_name: list(step.depends_on) for step in self.steps}
+
+
+class NodeResult(BaseModel):
+    """Outcome of one pipeline node."""
+
+    name: str = Field(..., description="Node name")
+    depends_on: list[str] = Field(default_factory=list, description="Upstream node names")
+    execution: Execution | None = Field(None, description="Execution, if the node ran")
+    skipped: bool = Field(default=False, description="Whether an upstream failure skipped it")
+
+    def status(self) -> str:
+        """Get the node status as a display string."""
+        if self.skipped:
+            return "skipped"
+        if self.execution is None:
+            return ExecutionStatus.PENDING.value
+        return self.execution.status.value
+
+    def succeeded(self) -> bool:
+        """Check if the node ran successfully."""
+        return self.execution is not None and self.execution.status == ExecutionStatus.SUCCESS
+
+    def duration_seconds(self) -> float:
+        """Get the node duration in seconds (0 if it did not run)."""
+        if self.execution is None:
+            return 0.0
+        return self.execution.duration_seconds() or 0.0
+
+
+class PipelineResult(BaseModel):
+    """Aggregated outcome of a pipeline run."""
+
+    pipeline: Pipeline = Field(..., description="The pipeline that ran")
+    nodes: dict[str, NodeResult] = Field(default_factory=dict, description="Results by node")
+    start_time: datetime | None = Field(None, description="Pipeline start time")
+    end_time: datetime | None = Field(None, description="Pipeline end time")
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"PipelineResult({self.pipeline.name}): {self.status()}"
+
+    def status(self) -> str:
+        """Get the overall status: success only if every node succeeded."""
+        if all(node.succeeded() for node in self.nodes.values()):
+            return ExecutionStatus.SUCCESS.value
+        return ExecutionStatus.ERROR.value
+
+    def duration_seconds(self) -> float | None:
+        """Calculate wall-clock pipeline duration in seconds."""
+        if self.start_time and self.end_time:
+            return (self.end_time - self.start_time).total_seconds()
+        return None
+
+    def serial_seconds(self) -> float:
+        """Sum of node durations, i.e. the time a serial run would take."""
+        return sum(node.duration_seconds() for node in self.nodes.values())
+
+    def critical_path(self) -> list[str]:
+        """Find the dependency chain with the largest total duration.
+
+        Returns:
+            Node names along the critical path, upstream first
+        """
+        longest: dict[str, float] = {}
+        previous: dict[str, str | None] = {}
+
+        def visit(name: str) -> float:
+            if name not in longest:
+                node = self.nodes[name]
+                best, best_dep = 0.0, None
+                for dep in node.depends_on:
+                    length = visit(dep)
+                    if best_dep is None or length > best:
+                        best, best_dep = length, dep
+                longest[name] = best + node.duration_seconds()
+                previous[name] = best_dep
+            return longest[name]
+
+        if not self.nodes:
+            return []
+        end = max(self.nodes, key=visit)
+        path: list[str] = []
+        current: str | None = end
+        while current is not None:
+            path.append(current)
+            current = previous[current]
+        return path[::-1]
@@ -1,12 +1,47 @@
 """Services package initialization.
 
-Exports all service components.
+Exports all service components. Exports are resolved lazily (PEP 562) so that
+importing one service does not pay for the others.
 """
 
-from .command_runner import AsyncCommandRunner
-from .config import ConfigLoader
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .command_runner import AsyncCommandRunner
+    from .config import ConfigLoader
+    from .fanout import FanOutRunner
+    from .pipeline import PipelineExecutor
+    from .shell_pool import ShellWorkerPool
+
+# Maps each exported name to the submodule that defines it
+_EXPORTS = {
+    "AsyncCommandRunner": ".command_runner",
+    "ConfigLoader": ".config",
+    "FanOutRunner": ".fanout",
+    "PipelineExecutor": ".pipeline",
+    "ShellWorkerPool": ".shell_pool",
+}
 
 __all__ = [
     "AsyncCommandRunner",
     "ConfigLoader",
+    "FanOutRunner",
+    "PipelineExecutor",
+    "ShellWorkerPool",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported service on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazy exports."""
+    return sorted({*globals(), *__all__})
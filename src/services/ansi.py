@@ -0,0 +1,219 @@
+"""ANSI escape sequence handling for Ops Deck.
+
+Command output is decoded into plain text plus styled spans. SGR (color
+and attribute) sequences update a style state that carries over from one
+line to the next, as it does in a terminal; every other escape sequence
+(cursor movement, erase, OSC titles and hyperlinks) is dropped. Style
+transitions and style strings are cached, so a chatty colored command
+costs one dictionary lookup per sequence once its styles have been seen.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+# CSI (parameters, final byte), OSC (terminated by BEL or ST) or a two-byte escape
+_ESCAPE = re.compile(
+    r"\x1b(?:\[([0-?]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)|[ -/]*[0-Z\\-~])"
+)
+# An escape sequence cut off at the end of the input
+_PARTIAL_ESCAPE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*\x1b?)?\Z")
+
+Span = tuple[int, int, str]
+
+
+class SgrState(NamedTuple):
+    """Text attributes set by SGR sequences."""
+
+    fg: str = ""
+    bg: str = ""
+    bold: bool = False
+    dim: bool = False
+    italic: bool = False
+    underline: bool = False
+    blink: bool = False
+    reverse: bool = False
+    conceal: bool = False
+    strike: bool = False
+
+
+DEFAULT_STATE = SgrState()
+
+# SGR codes that only switch attributes on or off
+_ATTRIBUTES = {
+    1: {"bold": True},
+    2: {"dim": True},
+    3: {"italic": True},
+    4: {"underline": True},
+    5: {"blink": True},
+    6: {"blink": True},
+    7: {"reverse": True},
+    8: {"conceal": True},
+    9: {"strike": True},
+    21: {"underline": True},
+    22: {"bold": False, "dim": False},
+    23: {"italic": False},
+    24: {"underline": False},
+    25: {"blink": False},
+    27: {"reverse": False},
+    28: {"conceal": False},
+    29: {"strike": False},
+}
+
+
+def _extended_color(codes: list[str], index: int) -> tuple[str, int]:
+    """Parse a 256-color or truecolor argument list after 38/48.
+
+    Args:
+        codes: SGR parameters
+        index: Position of the 5/2 selector
+
+    Returns:
+        Tuple of (color string or "" if malformed, index after the color)
+    """
+    try:
+        mode = int(codes[index])
+        if mode == 5:
+            return f"color({min(int(codes[index + 1]), 255)})", index + 2
+        if mode == 2:
+            red, green, blue = (min(int(code), 255) for code in codes[index + 1 : index + 4])
+            return f"#{red:02x}{green:02x}{blue:02x}", index + 4
+    except (IndexError, ValueError):
+        pass
+    return "", len(codes)
+
+
+@lru_cache(maxsize=4096)
+def apply_sgr(state: SgrState, params: str) -> SgrState:
+    """Apply one SGR sequence to a style state.
+
+    Args:
+        state: Current state
+        params: Parameters of the sequence (the part between ``ESC[`` and ``m``)
+
+    Returns:
+        New state
+    """
+    if not params:
+        return DEFAULT_STATE
+    codes: list[str] = []
+    for param in params.split(";"):
+        if ":" in param:
+            # ITU sub-parameters: 38:2::r:g:b / 38:5:n / 4:3
+            head, *rest = param.split(":")
+            if head in ("38", "48") and rest and rest[0] == "2" and len(rest) == 5:
+                rest = ["2", *rest[2:]]
+            codes.extend([head, *rest] if head in ("38", "48") else [head])
+        else:
+            codes.append(param)
+
+    changes: dict[str, Any] = {}
+    index = 0
+    while index < len(codes):
+        try:
+            code = int(codes[index] or 0)
+        except ValueError:
+            break
+        index += 1
+        if code == 0:
+            state = DEFAULT_STATE
+            changes.clear()
+        elif code in _ATTRIBUTES:
+            changes.update(_ATTRIBUTES[code])
+        elif 30 <= code <= 37:
+            changes["fg"] = f"color({code - 30})"
+        elif 90 <= code <= 97:
+            changes["fg"] = f"color({code - 90 + 8})"
+        elif 40 <= code <= 47:
+            changes["bg"] = f"color({code - 40})"
+        elif 100 <= code <= 107:
+            changes["bg"] = f"color({code - 100 + 8})"
+        elif code == 39:
+            changes["fg"] = ""
+        elif code == 49:
+            changes["bg"] = ""
+        elif code in (38, 48):
+            color, index = _extended_color(codes, index)
+            if color:
+                changes["fg" if code == 38 else "bg"] = color
+    return state._replace(**changes) if changes else state
+
+
+@lru_cache(maxsize=1024)
+def style_string(state: SgrState) -> str:
+    """Get the Rich style string for a state ("" for the default style)."""
+    parts = [
+        name
+        for name in ("bold", "dim", "italic", "underline", "blink", "reverse", "conceal", "strike")
+        if getattr(state, name)
+    ]
+    if state.fg:
+        parts.append(state.fg)
+    if state.bg:
+        parts.append(f"on {state.bg}")
+    return " ".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _transition(state: SgrState, params: str) -> tuple[SgrState, str]:
+    """Get the state after an SGR sequence together with its style string."""
+    new_state = apply_sgr(state, params)
+    return new_state, style_string(new_state)
+
+
+def strip_ansi(text: str) -> str:
+    """Remove all escape sequences from text."""
+    return _ESCAPE.sub("", text) if "\x1b" in text else text
+
+
+class AnsiDecoder:
+    """Incremental decoder for one output stream, fed one line at a time.
+
+    Style state persists from line to line. A sequence never continues
+    past the end of its line: one left unterminated there (e.g. output cut
+    short by a killed process) is dropped rather than swallowing the start
+    of the next line.
+    """
+
+    def __init__(self):
+        """Initialize the decoder in the default style."""
+        self.state = DEFAULT_STATE
+
+    def decode(self, text: str) -> tuple[str, list[Span]]:
+        """Decode a line of output.
+
+        Args:
+            text: Output line, possibly containing escape sequences
+
+        Returns:
+            Tuple of (text without escape sequences, styled spans over it)
+        """
+        if "\x1b" not in text:
+            if self.state == DEFAULT_STATE:
+                return text, []
+            return text, [(0, len(text), style_string(self.state))] if text else []
+
+        partial = _PARTIAL_ESCAPE.match(text, text.rfind("\x1b"))
+        if partial is not None:
+            text = text[: partial.start()]
+
+        # split() yields text, then (parameters, final byte) per sequence, then text...
+        parts = _ESCAPE.split(text)
+        pieces: list[str] = []
+        spans: list[Span] = []
+        length = 0
+        state = self.state
+        style = style_string(state)
+        for index in range(0, len(parts), 3):
+            piece = parts[index]
+            if piece:
+                if style:
+                    spans.append((length, length + len(piece), style))
+                pieces.append(piece)
+                length += len(piece)
+            if index + 2 < len(parts):
+                params, final = parts[index + 1], parts[index + 2]
+                if final == "m" and "?" not in params:
+                    state, style = _transition(state, params)
+        self.state = state
+        return "".join(pieces), spans
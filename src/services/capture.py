@@ -0,0 +1,158 @@
+"""Bounded output capture for Ops Deck.
+
+Keeps the first and last lines of a command's output and replaces the
+middle with an elision marker, counting the discarded lines and bytes
+without decoding or storing them. An optional hard byte cap stops capture
+(and can stop the command) once a command has printed too much.
+"""
+
+from collections import deque
+from collections.abc import Callable
+
+from ..models import Command, StreamType
+
+LineCallback = Callable[[StreamType, bytes], None]
+
+
+def elision_marker(lines: int, size: int, reason: str = "") -> bytes:
+    """Build the marker line that stands in for discarded output.
+
+    Args:
+        lines: Number of lines discarded
+        size: Number of bytes discarded
+        reason: Optional explanation appended to the marker
+
+    Returns:
+        Marker line bytes
+    """
+    suffix = f" ({reason})" if reason else ""
+    return f"… {lines} lines / {size} bytes elided{suffix} …".encode()
+
+
+class OutputCapture:
+    """Head+tail capture of one execution's output lines.
+
+    Head lines are passed through as they arrive; later lines go into a ring
+    of the last ``keep_tail`` lines and are passed on, after the marker, when
+    the execution finishes.
+    """
+
+    def __init__(
+        self,
+        emit: LineCallback,
+        keep_head: int | None = None,
+        keep_tail: int | None = None,
+        max_bytes: int | None = None,
+        on_cap: Callable[[int], None] | None = None,
+    ):
+        """Initialize the capture.
+
+        Args:
+            emit: Callback receiving the lines that are kept
+            keep_head: Lines to keep from the start (None with keep_tail None
+                keeps everything)
+            keep_tail: Lines to keep from the end
+            max_bytes: Total output bytes after which further output is dropped
+            on_cap: Optional callback receiving ``max_bytes`` when the cap is hit
+        """
+        self.emit = emit
+        self.elide = keep_head is not None or keep_tail is not None
+        self.keep_head = keep_head or 0
+        self.max_bytes = max_bytes
+        self.on_cap = on_cap
+        self.total_bytes = 0
+        self.head_lines = 0
+        self.tail: deque[tuple[StreamType, bytes]] = deque(maxlen=keep_tail or 0)
+        self.elided_lines = 0
+        self.elided_bytes = 0
+        self.dropped_lines = 0
+        self.dropped_bytes = 0
+        self.capped = False
+
+    @classmethod
+    def for_command(
+        cls,
+        command: Command,
+        emit: LineCallback,
+        on_cap: Callable[[int], None] | None = None,
+    ) -> "OutputCapture | None":
+        """Create a capture for a command's settings.
+
+        Args:
+            command: Command whose keep_head/keep_tail/max_output_bytes apply
+            emit: Callback receiving the lines that are kept
+            on_cap: Optional callback when max_output_bytes is reached
+
+        Returns:
+            OutputCapture, or None if the command keeps all of its output
+        """
+        if command.keep_head is None and command.keep_tail is None:
+            if command.max_output_bytes is None:
+                return None
+        return cls(
+            emit,
+            keep_head=command.keep_head,
+            keep_tail=command.keep_tail,
+            max_bytes=command.max_output_bytes,
+            on_cap=on_cap,
+        )
+
+    def feed(self, stream: StreamType, data: bytes) -> None:
+        """Accept one raw output line.
+
+        Args:
+            stream: Stream the line came from
+            data: Raw line bytes
+        """
+        if self.capped:
+            self.drop(1, len(data))
+            return
+
+        self.total_bytes += len(data)
+        if self.max_bytes is not None and self.total_bytes > self.max_bytes:
+            self.capped = True
+            self.drop(1, len(data))
+            if self.on_cap:
+                self.on_cap(self.max_bytes)
+            return
+
+        if not self.elide:
+            self.emit(stream, data)
+        elif self.head_lines < self.keep_head:
+            self.head_lines += 1
+            self.emit(stream, data)
+        elif self.tail.maxlen:
+            if len(self.tail) == self.tail.maxlen:
+                _, evicted = self.tail[0]
+                self.elided_lines += 1
+                self.elided_bytes += len(evicted)
+            self.tail.append((stream, data))
+        else:
+            self.elided_lines += 1
+            self.elided_bytes += len(data)
+
+    def drop(self, lines: int, size: int) -> None:
+        """Count output discarded after the byte cap without looking at it.
+
+        Args:
+            lines: Number of lines discarded
+            size: Number of bytes discarded
+        """
+        self.dropped_lines += lines
+        self.dropped_bytes += size
+
+    def finish(self) -> None:
+        """Emit the elision marker and the kept tail, then the cap marker."""
+        if self.elided_lines:
+            self.emit(StreamType.STDOUT, elision_marker(self.elided_lines, self.elided_bytes))
+        while self.tail:
+            self.emit(*self.tail.popleft())
+        if self.dropped_lines:
+            self.emit(
+                StreamType.STDOUT,
+                elision_marker(
+                    self.dropped_lines, self.dropped_bytes, "max_output_bytes reached"
+                ),
+            )
+            self.dropped_lines = self.dropped_bytes = 0
+        self.elided_lines = self.elided_bytes = 0
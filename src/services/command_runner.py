@@ -4,14 +4,41 @@ Provides async command execution with output streaming.
 """
 
 import asyncio
+import contextlib
+import re
+import shlex
+import signal
+import subprocess
 import uuid
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import TYPE_CHECKING, Any
 
 from ..exceptions import ExecutionError
 from ..exceptions import TimeoutError as OpsTimeoutError
-from ..models import Command, Execution, ExecutionStatus, OutputLine, StreamType
+from ..models import (
+    Command,
+    Execution,
+    ExecutionStatus,
+    OutputLine,
+    ResourceUsage,
+    StreamType,
+)
+from .ansi import AnsiDecoder, strip_ansi
+from .capture import OutputCapture
+from .limits import build_preexec
+from .loadgen import LoadGenerator
+from .metrics import OutputMetrics
+from .process import SpawnedProcess
+from .shell_syntax import split_command
+from .stages import OutputPipeline
+from .triggers import OutputTriggers, TriggerMatch
+
+if TYPE_CHECKING:
+    from .shell_pool import ShellWorkerPool
+    from .stages import StagePool
 
 
 class CommandRunner(ABC):
@@ -23,6 +50,7 @@ class CommandRunner(ABC):
         command: Command,
         output_callback: Callable[[OutputLine], None] | None = None,
         completion_callback: Callable[[Execution], None] | None = None,
+        start_callback: Callable[[Execution], None] | None = None,
     ) -> Execution:
         """Execute a command and stream its output.
 
@@ -30,6 +58,8 @@ class CommandRunner(ABC):
             command: Command to execute
             output_callback: Optional callback for each output line
             completion_callback: Optional callback when execution completes
+            start_callback: Optional callback when execution starts, before
+                any output
 
         Returns:
             Completed Execution object
@@ -40,21 +70,164 @@ class CommandRunner(ABC):
         """
 
 
+LineCallback = Callable[[StreamType, bytes], None]
+
+# Read size used to skip output past the byte cap
+_DISCARD_CHUNK = 1 << 20
+
+
+@dataclass
+class ActiveExecution:
+    """Bookkeeping for an execution that is still running."""
+
+    execution: Execution
+    loop: asyncio.AbstractEventLoop
+    stop_event: asyncio.Event
+    process_group: int | None = None
+    stop_status: ExecutionStatus | None = None
+    stop_message: str | None = None
+    alerted: set[str] = field(default_factory=set)
+
+    def stop(self, status: ExecutionStatus, message: str | None = None) -> None:
+        """Request that the execution be stopped and finish with ``status``.
+
+        Must be called on the execution's event loop; the first request wins.
+
+        Args:
+            status: Status the execution finishes with
+            message: Optional error message to record
+        """
+        if self.stop_status is None:
+            self.stop_status = status
+            self.stop_message = message
+            self.stop_event.set()
+
+
 class AsyncCommandRunner(CommandRunner):
-    """Async command runner using asyncio subprocess."""
+    """Async command runner using asyncio subprocess.
+
+    Every spawned execution runs in its own session (and so its own process
+    group). Timeouts and cancellation signal the whole group with SIGTERM,
+    escalating to SIGKILL after a grace period, so grandchildren started by
+    ``sh -c`` cannot keep running or hold the output pipes open.
+
+    Spawned executions record the rusage of their process tree; pooled runs
+    share a long-lived shell and leave ``resource_usage`` unset.
+    """
+
+    def __init__(
+        self,
+        shell_pool: "ShellWorkerPool | None" = None,
+        termination_grace: float = 2.0,
+        alert_callback: Callable[[Execution, str], None] | None = None,
+        record_dir: str | None = None,
+        stage_pool: "StagePool | None" = None,
+        metric_callback: Callable[[Execution, str, float], None] | None = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            shell_pool: Optional pool of pre-forked shells; when set, commands
+                run in a persistent worker instead of spawning a new shell
+            termination_grace: Seconds between SIGTERM and SIGKILL when a
+                process group is stopped
+            alert_callback: Optional callback receiving (execution, message)
+                when output matches an ``alert_on`` pattern
+            record_dir: Directory to record every execution's raw output and
+                timing to, for replay (None to not record)
+            stage_pool: Optional worker processes for CPU-heavy output
+                stages; without one, stages run on the runner's event loop
+            metric_callback: Optional callback receiving (execution, metric
+                name, value) for each value a command's ``metrics`` find in
+                its output
+        """
+        self.shell_pool = shell_pool
+        self.termination_grace = termination_grace
+        self.alert_callback = alert_callback
+        self.record_dir = record_dir
+        self.stage_pool = stage_pool
+        self.metric_callback = metric_callback
+        self._active: dict[str, ActiveExecution] = {}
+
+    def active_executions(self) -> list[Execution]:
+        """Get the executions that are currently running.
+
+        Returns:
+            Running Execution objects
+        """
+        return [active.execution for active in list(self._active.values())]
+
+    def process_groups(self) -> dict[int, Execution]:
+        """Get the process groups of the running spawned executions.
+
+        Pooled executions run inside a shared worker shell and are not
+        included.
+
+        Returns:
+            Running Execution objects keyed by process group ID
+        """
+        return {
+            active.process_group: active.execution
+            for active in list(self._active.values())
+            if active.process_group is not None
+        }
+
+    def cancel(self, execution_id: str) -> bool:
+        """Request cancellation of a running execution.
+
+        Safe to call from any thread; the execution's process group is
+        stopped on the event loop that runs it.
+
+        Args:
+            execution_id: ID of the execution to cancel
+
+        Returns:
+            True if the execution was running
+        """
+        active = self._active.get(execution_id)
+        if active is None:
+            return False
+        try:
+            active.loop.call_soon_threadsafe(
+                active.stop, ExecutionStatus.CANCELLED, "Command was cancelled"
+            )
+        except RuntimeError:
+            # The loop closed, so the execution has already ended
+            return False
+        return True
+
+    def cancel_all(self) -> int:
+        """Request cancellation of every running execution.
+
+        Returns:
+            Number of executions that were signalled
+        """
+        return sum(self.cancel(execution_id) for execution_id in list(self._active))
 
     async def run(
         self,
         command: Command,
         output_callback: Callable[[OutputLine], None] | None = None,
         completion_callback: Callable[[Execution], None] | None = None,
+        start_callback: Callable[[Execution], None] | None = None,
     ) -> Execution:
         """Execute command asynchronously with output streaming.
 
+        A cancelled execution is returned with status CANCELLED rather than
+        raising. Long output is reduced to its head and tail (and capped)
+        according to the command's ``keep_head``, ``keep_tail`` and
+        ``max_output_bytes``. Output lines matching the command's ``until``
+        or ``fail_on`` patterns stop the execution early with status SUCCESS
+        or ERROR. Values of the command's ``metrics`` are reported to the
+        metric callback as lines arrive. Decoded lines go through the command's output ``stages``
+        before they reach ``output_callback``.
+
         Args:
             command: Command to execute
             output_callback: Optional callback for each output line
             completion_callback: Optional callback when execution completes
+            start_callback: Optional callback when execution starts, before
+                any output
 
         Returns:
             Completed Execution object
@@ -71,55 +244,106 @@ class AsyncCommandRunner(CommandRunner):
             end_time=None,
             exit_code=None,
             error_message=None,
+            stop_reason=None,
+            resource_usage=None,
+        )
+        active = ActiveExecution(
+            execution=execution, loop=asyncio.get_running_loop(), stop_event=asyncio.Event()
         )
+        self._active[execution_id] = active
 
-        try:
-            execution.status = ExecutionStatus.RUNNING
-            execution.start_time = datetime.now()
+        # One decoder per stream: color state carries over between lines
+        decoders = (
+            None
+            if command.strip_ansi
+            else {StreamType.STDOUT: AnsiDecoder(), StreamType.STDERR: AnsiDecoder()}
+        )
 
-            # Create subprocess
-            process = await asyncio.create_subprocess_shell(
-                command.command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=command.env or None,
-            )
+        pipeline: OutputPipeline | None = None
+        line_callback = output_callback
 
-            # Stream output from both stdout and stderr
-            stdout_task = self._stream_output(
-                process.stdout, execution_id, StreamType.STDOUT, output_callback
+        def emit(stream_type: StreamType, data: bytes) -> None:
+            self._emit_line(
+                data,
+                execution_id,
+                stream_type,
+                line_callback,
+                decoders[stream_type] if decoders else None,
             )
-            stderr_task = self._stream_output(
-                process.stderr, execution_id, StreamType.STDERR, output_callback
+
+        def on_output_cap(max_bytes: int) -> None:
+            active.stop(
+                ExecutionStatus.ERROR, f"Output exceeded max_output_bytes ({max_bytes} bytes)"
             )
 
-            try:
-                # Wait for all output and process completion
-                await asyncio.wait_for(
-                    asyncio.gather(stdout_task, stderr_task, process.wait()),
-                    timeout=command.timeout,
-                )
-
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                execution.status = ExecutionStatus.TIMEOUT
-                execution.error_message = f"Command exceeded timeout of {command.timeout}s"
-                execution.end_time = datetime.now()
-                raise OpsTimeoutError(execution.error_message)
-
-            execution.exit_code = process.returncode
+        capture: OutputCapture | None = None
+        recorder = None
+        try:
+            execution.status = ExecutionStatus.RUNNING
+            execution.start_time = datetime.now()
+            if start_callback:
+                start_callback(execution)
+
+            if command.stages and output_callback is not None:
+                pipeline = OutputPipeline(command.stages, output_callback, self.stage_pool)
+                line_callback = pipeline.feed
+            capture = OutputCapture.for_command(
+                command, emit, on_cap=on_output_cap if command.kill_on_max_output else None
+            )
+            sink = capture.feed if capture else emit
+            triggers = OutputTriggers.for_command(command)
+            metric_callback = self.metric_callback
+            metrics = OutputMetrics.for_command(command) if metric_callback else None
+            on_line: LineCallback = sink
+            if triggers is not None or metrics is not None:
+
+                def match_line(stream_type: StreamType, data: bytes) -> None:
+                    # Match before capture so elided lines still fire triggers
+                    # and yield metric values
+                    if triggers is not None:
+                        match = triggers.match(data)
+                        if match is not None:
+                            self._fire_trigger(match, data, active)
+                    if metrics is not None and metric_callback is not None:
+                        for name, value in metrics.extract(data):
+                            metric_callback(execution, name, value)
+                    sink(stream_type, data)
+
+                on_line = match_line
+
+            if self.record_dir is not None:
+                from .recording import SessionRecorder
+
+                recorder = SessionRecorder.for_execution(self.record_dir, execution)
+                on_line = recorder.tap(on_line)
+
+            returncode = await self._execute(command, active, on_line, capture)
+
+            execution.exit_code = returncode
             execution.end_time = datetime.now()
 
-            if process.returncode == 0:
+            if active.stop_status is not None:
+                execution.status = active.stop_status
+                execution.stop_reason = active.stop_message
+                if active.stop_status != ExecutionStatus.SUCCESS:
+                    execution.error_message = active.stop_message
+            elif returncode == 0:
                 execution.status = ExecutionStatus.SUCCESS
             else:
                 execution.status = ExecutionStatus.ERROR
-                execution.error_message = f"Command failed with exit code {process.returncode}"
+                execution.error_message = f"Command failed with exit code {returncode}"
 
         except OpsTimeoutError:
             raise
-        except ExecutionError:
+        except re.error as e:
+            execution.status = ExecutionStatus.ERROR
+            execution.error_message = str(e)
+            execution.end_time = datetime.now()
+            raise ExecutionError(f"Invalid output pattern: {e}")
+        except ExecutionError as e:
+            execution.status = ExecutionStatus.ERROR
+            execution.error_message = str(e)
+            execution.end_time = datetime.now()
             raise
         except Exception as e:
             execution.status = ExecutionStatus.ERROR
@@ -128,71 +352,353 @@ class AsyncCommandRunner(CommandRunner):
             raise ExecutionError(f"Command execution failed: {e}")
 
         finally:
+            self._active.pop(execution_id, None)
+            if capture:
+                capture.finish()
+            if pipeline:
+                await pipeline.close()
+            if recorder:
+                recorder.close(execution.exit_code)
             # Call completion callback if provided
             if completion_callback:
                 completion_callback(execution)
 
         return execution
 
+    async def _execute(
+        self,
+        command: Command,
+        active: ActiveExecution,
+        on_line: LineCallback,
+        capture: OutputCapture | None,
+    ) -> int | None:
+        """Run a command the way it asks to be run and wait for it to finish.
+
+        Subclasses override this to run some commands on another backend.
+
+        Args:
+            command: Command to run
+            active: Bookkeeping of the execution
+            on_line: Callback receiving (stream, raw line bytes)
+            capture: Optional capture fed by ``on_line``
+
+        Returns:
+            Exit code, or None if the execution was stopped without one
+
+        Raises:
+            TimeoutError: If execution exceeds timeout
+        """
+        if command.load is not None:
+            return await self._run_generated(command, active, on_line)
+        argv = self._direct_argv(command)
+        # Limits are applied between fork and exec, so they need a fresh process
+        if argv is None and self.shell_pool is not None and command.limits is None:
+            return await self._run_pooled(command, active, on_line)
+        return await self._run_spawned(command, argv, active, on_line, capture)
+
+    def _fire_trigger(self, match: TriggerMatch, data: bytes, active: ActiveExecution) -> None:
+        """Act on an output line that matched one of the command's patterns.
+
+        ``until`` stops the execution as successful and ``fail_on`` as
+        failed; ``alert_on`` records an alert (once per pattern) and reports
+        it to the alert callback while the command keeps running.
+
+        Args:
+            match: Trigger that matched
+            data: Raw line bytes that matched
+            active: Bookkeeping of the execution
+        """
+        line = data.decode("utf-8", errors="replace").strip()[:200]
+        message = f"Output matched {match.kind} pattern {match.pattern!r}: {line}"
+        if match.kind == "until":
+            active.stop(ExecutionStatus.SUCCESS, message)
+        elif match.kind == "fail_on":
+            active.stop(ExecutionStatus.ERROR, message)
+        elif match.pattern not in active.alerted:
+            active.alerted.add(match.pattern)
+            active.execution.alerts.append(message)
+            if self.alert_callback:
+                self.alert_callback(active.execution, message)
+
+    def _direct_argv(self, command: Command) -> tuple[str, ...] | None:
+        """Get the argv to exec directly, or None if the command needs a shell.
+
+        With ``shell: auto`` the decision is cached per command string; with
+        the shell pool enabled, auto-detected commands without ``limits`` use
+        the pool instead.
+
+        Args:
+            command: Command to inspect
+
+        Returns:
+            Argument tuple for direct exec, or None to use a shell
+        """
+        if command.shell is True:
+            return None
+        if command.shell == "auto" and self.shell_pool is not None and command.limits is None:
+            return None
+        argv = split_command(command.command)
+        if argv is None and command.shell is False:
+            try:
+                argv = tuple(shlex.split(command.command))
+            except ValueError as e:
+                raise ExecutionError(f"Cannot split command for direct exec: {e}")
+        return argv
+
+    async def _supervise(
+        self, work: "asyncio.Future[Any]", active: ActiveExecution, timeout: float
+    ) -> bool:
+        """Wait for work to finish, a timeout, or a stop request.
+
+        Args:
+            work: Task producing the execution's result
+            active: Bookkeeping of the execution
+            timeout: Seconds before the execution times out
+
+        Returns:
+            True if the work finished on its own, False if it must be stopped
+        """
+        cancel_wait = asyncio.ensure_future(active.stop_event.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {work, cancel_wait}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            cancel_wait.cancel()
+        return work in done
+
+    async def _run_spawned(
+        self,
+        command: Command,
+        argv: tuple[str, ...] | None,
+        active: ActiveExecution,
+        on_line: LineCallback,
+        capture: OutputCapture | None = None,
+    ) -> int:
+        """Run a command in a new process, directly or via a fresh shell.
+
+        Args:
+            command: Command to run
+            argv: Arguments for direct exec, or None to run through /bin/sh
+            active: Bookkeeping of the execution
+            on_line: Callback receiving (stream, raw line bytes)
+            capture: Optional capture fed by ``on_line``
+
+        Returns:
+            Process exit code (negative signal number if it was stopped)
+
+        Raises:
+            TimeoutError: If execution exceeds timeout
+        """
+        execution = active.execution
+
+        # Create subprocess in its own session so the whole tree can be signalled
+        try:
+            process = await SpawnedProcess.start(
+                command.command if argv is None else argv,
+                shell=argv is None,
+                env=command.env or None,
+                preexec_fn=build_preexec(command.limits),
+            )
+        except subprocess.SubprocessError as e:
+            raise ExecutionError(f"Failed to apply resource limits: {e}")
+        except (FileNotFoundError, PermissionError) as e:
+            if argv is None:
+                raise
+            # Report like sh would: 127 for not found, 126 for not executable
+            on_line(StreamType.STDERR, f"{argv[0]}: {e.strerror}".encode())
+            return 127 if isinstance(e, FileNotFoundError) else 126
+        active.process_group = process.pid
+
+        # Stream output from both stdout and stderr
+        stdout_task = self._stream_output(process.stdout, StreamType.STDOUT, on_line, capture)
+        stderr_task = self._stream_output(process.stderr, StreamType.STDERR, on_line, capture)
+
+        # Wait for all output and process completion
+        work = asyncio.ensure_future(asyncio.gather(stdout_task, stderr_task, process.wait()))
+        try:
+            if not await self._supervise(work, active, command.timeout):
+                await self._terminate_group(process)
+                # Descendants that left the group could still hold the pipes open
+                _, pending = await asyncio.wait({work}, timeout=self.termination_grace)
+                for task in pending:
+                    task.cancel()
+                if not active.stop_event.is_set():
+                    raise self._timeout_error(execution)
+        finally:
+            process.close()
+            if process.rusage is not None:
+                execution.resource_usage = ResourceUsage.from_rusage(process.rusage)
+
+        return process.returncode  # type: ignore
+
+    async def _terminate_group(self, process: SpawnedProcess) -> None:
+        """Stop a process group: SIGTERM, then SIGKILL after the grace period.
+
+        The group leader is reaped before returning.
+
+        Args:
+            process: Group leader started in its own session
+        """
+        process.signal_group(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=self.termination_grace)
+        except asyncio.TimeoutError:
+            pass
+        # Kill any members that ignored SIGTERM or outlived the leader
+        process.signal_group(signal.SIGKILL)
+        await process.wait()
+
+    async def _run_pooled(
+        self,
+        command: Command,
+        active: ActiveExecution,
+        on_line: LineCallback,
+    ) -> int | None:
+        """Run a command in a pre-forked shell worker.
+
+        A worker whose run is stopped is killed with its process group.
+
+        Returns:
+            Command exit code, or None if the execution was stopped
+
+        Raises:
+            TimeoutError: If execution exceeds timeout
+        """
+        assert self.shell_pool is not None
+        execution = active.execution
+
+        work = asyncio.ensure_future(self.shell_pool.run(command, on_line))
+        if await self._supervise(work, active, command.timeout):
+            return work.result()
+
+        work.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await work
+        if not active.stop_event.is_set():
+            raise self._timeout_error(execution)
+        return None
+
+    async def _run_generated(
+        self,
+        command: Command,
+        active: ActiveExecution,
+        on_line: LineCallback,
+    ) -> int | None:
+        """Produce a command's synthetic output in-process (see ``Command.load``).
+
+        Returns:
+            The load profile's exit code, or None if the execution was stopped
+
+        Raises:
+            TimeoutError: If execution exceeds timeout
+        """
+        assert command.load is not None
+        work = asyncio.ensure_future(LoadGenerator(command.load).run(on_line))
+        if await self._supervise(work, active, command.timeout):
+            return work.result()
+
+        work.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await work
+        if not active.stop_event.is_set():
+            raise self._timeout_error(active.execution)
+        return None
+
+    def _timeout_error(self, execution: Execution) -> OpsTimeoutError:
+        """Record a timeout on the execution.
+
+        Returns:
+            TimeoutError to raise
+        """
+        execution.status = ExecutionStatus.TIMEOUT
+        execution.error_message = f"Command exceeded timeout of {execution.command.timeout}s"
+        execution.end_time = datetime.now()
+        return OpsTimeoutError(execution.error_message)
+
+    def _emit_line(
+        self,
+        data: bytes,
+        execution_id: str,
+        stream_type: StreamType,
+        callback: Callable[[OutputLine], None] | None,
+        decoder: AnsiDecoder | None = None,
+    ) -> None:
+        """Decode one raw output line and pass it to the callback.
+
+        Args:
+            data: Raw line bytes (with or without trailing newline)
+            execution_id: ID of the execution
+            stream_type: Type of stream (stdout/stderr)
+            callback: Optional callback for the line
+            decoder: ANSI decoder of the stream, or None to strip escape codes
+        """
+        # Decode output
+        try:
+            content = data.decode("utf-8").rstrip("\n")
+        except UnicodeDecodeError:
+            content = data.decode("utf-8", errors="replace").rstrip("\n")
+
+        spans = None
+        if decoder is None:
+            content = strip_ansi(content)
+        else:
+            content, spans = decoder.decode(content)
+
+        # Skip empty lines
+        if not content:
+            return
+
+        # Create output line object
+        output_line = OutputLine(
+            id=f"out_{uuid.uuid4().hex[:8]}",
+            execution_id=execution_id,
+            timestamp=datetime.now(),
+            stream=stream_type,
+            content=content,
+            spans=spans or None,
+        )
+
+        # Call callback if provided
+        if callback:
+            callback(output_line)
+
     async def _stream_output(
         self,
         reader: asyncio.StreamReader | None,
-        execution_id: str,
         stream_type: StreamType,
-        callback: Callable[[OutputLine], None] | None = None,
+        on_line: LineCallback,
+        capture: OutputCapture | None = None,
     ) -> None:
         """Stream output from a subprocess stream.
 
+        Once the capture's byte cap is reached the rest of the stream is
+        read in large chunks and only counted.
+
         Args:
             reader: Subprocess stream reader
-            execution_id: ID of the execution
             stream_type: Type of stream (stdout/stderr)
-            callback: Optional callback for each line
+            on_line: Callback receiving (stream, raw line bytes)
+            capture: Optional capture fed by ``on_line``
         """
         if not reader:
             return
 
-        line_num = 0
         while True:
             try:
+                if capture is not None and capture.capped:
+                    data = await reader.read(_DISCARD_CHUNK)
+                    if not data:
+                        break
+                    capture.drop(data.count(b"\n"), len(data))
+                    continue
+
                 data = await reader.readline()
                 if not data:
                     break
 
-                # Decode output
-                try:
-                    content = data.decode("utf-8").rstrip("\n")
-                except UnicodeDecodeError:
-                    content = data.decode("utf-8", errors="replace").rstrip("\n")
-
-                # Skip empty lines
-                if not content:
-                    continue
-
-                # Create output line object
-                output_line = OutputLine(
-                    id=f"out_{uuid.uuid4().hex[:8]}",
-                    execution_id=execution_id,
-                    timestamp=datetime.now(),
-                    stream=stream_type,
-                    content=content,
-                )
-
-                # Call callback if provided
-                if callback:
-                    callback(output_line)
-
-                line_num += 1
+                on_line(stream_type, data)
 
             except Exception as e:
                 # Log error but continue streaming
-                if callback:
-                    error_line = OutputLine(
-                        id=f"out_{uuid.uuid4().hex[:8]}",
-                        execution_id=execution_id,
-                        timestamp=datetime.now(),
-                        stream=StreamType.STDERR,
-                        content=f"[ERROR] Failed to read output: {e}",
-                    )
-                    callback(error_line)
-
+                on_line(StreamType.STDERR, f"[ERROR] Failed to read output: {e}".encode())
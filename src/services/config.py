@@ -3,14 +3,21 @@
 Loads and validates YAML configuration files.
 """
 
+import re
 from pathlib import Path
 from typing import Any
 
 import yaml
 from pydantic import ValidationError as PydanticValidationError
 
-from ..exceptions import ConfigError
-from ..models import AppConfig, Command
+from ..exceptions import ConfigError, ExecutionError
+from ..models import AppConfig, Command, Pipeline
+from .fanout import expand_targets
+from .highlight import compile_rules
+from .metrics import OutputMetrics
+from .pipeline import topological_order
+from .stages import compile_stages, stage_specs
+from .triggers import OutputTriggers
 
 
 class ConfigLoader:
@@ -72,11 +79,12 @@ class ConfigLoader:
             if not isinstance(commands_data, list):
                 raise ConfigError("Invalid config: 'commands' must be a list")
 
+            target_groups = self._load_target_groups(config)
+
             commands = []
             for i, cmd_data in enumerate(commands_data):
                 try:
                     command = Command(**cmd_data)
-                    commands.append(command)
                 except PydanticValidationError as e:
                     # Extract field information from validation error
                     error_details = []
@@ -87,9 +95,17 @@ class ConfigLoader:
                     error_msg = "; ".join(error_details)
                     raise ConfigError(
                         f"Invalid command at index {i}: {error_msg}\n"
-                        f"Required fields: name, command\n"
-                        f"Optional fields: description, tags, timeout, env"
+                        f"Required fields: name, command (or load or callable)\n"
+                        f"Optional fields: description, tags, timeout, env, shell, "
+                        f"targets, target_groups, max_parallel, keep_head, keep_tail, "
+                        f"max_output_bytes, kill_on_max_output, strip_ansi, until, fail_on, alert_on, "
+                        f"limits, load, callable, arguments, stages, format, metrics"
                     )
+                command = self._resolve_targets(command, target_groups, i)
+                self._check_triggers(command, i)
+                self._check_stages(command, i)
+                self._check_metrics(command, i)
+                commands.append(command)
 
             # Load app config
             app_config_data = config.get("app", {})
@@ -107,8 +123,9 @@ class ConfigLoader:
                 error_msg = "; ".join(error_details)
                 raise ConfigError(
                     f"Invalid app configuration: {error_msg}\n"
-                    f"Optional fields: theme, refresh_rate, log_level, command_timeout, max_output_lines, auto_scroll"
+                    f"Optional fields: theme, refresh_rate, log_level, command_timeout, max_output_lines, auto_scroll, max_parallel, termination_grace, shell_pool_size, shell_pool_max_runs, python_workers, stage_workers, output_memory_mb, highlight_rules, export_dir, export_format, export_gzip, record_dir, history_dir"
                 )
+            self._check_highlight_rules(app_config)
 
             return commands, app_config
 
@@ -117,6 +134,195 @@ class ConfigLoader:
         except Exception as e:
             raise ConfigError(f"Configuration validation failed: {e}")
 
+    def validate_pipelines(self, config: dict, commands: list[Command]) -> list[Pipeline]:
+        """Validate the pipelines section against the loaded commands.
+
+        Args:
+            config: Dictionary containing the configuration
+            commands: Validated commands that pipeline steps refer to
+
+        Returns:
+            List of validated pipelines
+
+        Raises:
+            ConfigError: If a pipeline is malformed, refers to an unknown
+                command or node, or contains a dependency cycle
+        """
+        pipelines_data = config.get("pipelines", [])
+        if not isinstance(pipelines_data, list):
+            raise ConfigError("Invalid config: 'pipelines' must be a list")
+
+        commands_by_name = {command.name: command for command in commands}
+        pipelines = []
+        for i, pipeline_data in enumerate(pipelines_data):
+            try:
+                pipeline = Pipeline(**pipeline_data)
+            except (PydanticValidationError, TypeError) as e:
+                raise ConfigError(
+                    f"Invalid pipeline at index {i}: {e}\n"
+                    f"Required fields: name, steps\n"
+                    f"Optional fields: description, max_parallel"
+                )
+
+            node_names = [step.node_name for step in pipeline.steps]
+            duplicates = sorted({name for name in node_names if node_names.count(name) > 1})
+            if duplicates:
+                raise ConfigError(
+                    f"Pipeline '{pipeline.name}': duplicate node names {', '.join(duplicates)}; "
+                    f"set 'name' on steps that reuse a command"
+                )
+            for step in pipeline.steps:
+                command = commands_by_name.get(step.command)
+                if command is None:
+                    raise ConfigError(
+                        f"Pipeline '{pipeline.name}': unknown command '{step.command}'"
+                    )
+                if command.is_parameterized():
+                    raise ConfigError(
+                        f"Pipeline '{pipeline.name}': command '{step.command}' has targets "
+                        f"and cannot be used as a pipeline step"
+                    )
+            topological_order(pipeline)
+            pipelines.append(pipeline)
+
+        return pipelines
+
+    def _load_target_groups(self, config: dict) -> dict[str, list[str | dict[str, str]]]:
+        """Load the named target groups section.
+
+        Args:
+            config: Dictionary containing the configuration
+
+        Returns:
+            Mapping of group name to its targets
+
+        Raises:
+            ConfigError: If the section is malformed
+        """
+        groups = config.get("target_groups", {})
+        if not isinstance(groups, dict):
+            raise ConfigError("Invalid config: 'target_groups' must be a dictionary")
+        for name, targets in groups.items():
+            if not isinstance(targets, list) or not all(
+                isinstance(target, str | dict) for target in targets
+            ):
+                raise ConfigError(
+                    f"Invalid target group '{name}': must be a list of strings or mappings"
+                )
+        return groups
+
+    def _resolve_targets(
+        self,
+        command: Command,
+        target_groups: dict[str, list[str | dict[str, str]]],
+        index: int,
+    ) -> Command:
+        """Expand a command's target groups and check its template renders.
+
+        Args:
+            command: Command to resolve
+            target_groups: Configured target groups
+            index: Position of the command in the config (for errors)
+
+        Returns:
+            The command, or a copy with its groups' targets appended
+
+        Raises:
+            ConfigError: If a group is unknown or a target cannot be rendered
+        """
+        targets = list(command.targets)
+        for group in command.target_groups:
+            if group not in target_groups:
+                raise ConfigError(
+                    f"Invalid command at index {index}: unknown target group '{group}'"
+                )
+            targets.extend(target_groups[group])
+        if command.target_groups:
+            command = command.model_copy(update={"targets": targets})
+
+        try:
+            expand_targets(command)
+        except ExecutionError as e:
+            raise ConfigError(f"Invalid command at index {index}: {e}")
+        return command
+
+    def _check_triggers(self, command: Command, index: int) -> None:
+        """Check that a command's output patterns are valid regexes.
+
+        Args:
+            command: Command to check
+            index: Position of the command in the config (for errors)
+
+        Raises:
+            ConfigError: If a pattern does not compile
+        """
+        try:
+            OutputTriggers.for_command(command)
+        except re.error as e:
+            raise ConfigError(f"Invalid command at index {index}: {e}")
+
+    def _check_stages(self, command: Command, index: int) -> None:
+        """Check that a command's output stages have valid patterns.
+
+        Args:
+            command: Command to check
+            index: Position of the command in the config (for errors)
+
+        Raises:
+            ConfigError: If a pattern does not compile
+        """
+        try:
+            compile_stages(stage_specs(command.stages))
+        except re.error as e:
+            raise ConfigError(f"Invalid command at index {index}: {e}")
+
+    def _check_metrics(self, command: Command, index: int) -> None:
+        """Check that a command's metric patterns are valid regexes.
+
+        Args:
+            command: Command to check
+            index: Position of the command in the config (for errors)
+
+        Raises:
+            ConfigError: If a pattern does not compile or a metric name repeats
+        """
+        names = [metric.name for metric in command.metrics]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ConfigError(
+                f"Invalid command at index {index}: duplicate metric names {duplicates}"
+            )
+        try:
+            OutputMetrics.for_command(command)
+        except re.error as e:
+            raise ConfigError(f"Invalid command at index {index}: {e}")
+
+    def _check_highlight_rules(self, app_config: AppConfig) -> None:
+        """Check that highlight rules have valid patterns and styles.
+
+        Args:
+            app_config: Validated application configuration
+
+        Raises:
+            ConfigError: If a rule does not compile or names an unknown style
+        """
+        if not app_config.highlight_rules:
+            return
+        from rich.errors import StyleSyntaxError
+        from rich.style import Style
+
+        try:
+            compile_rules(app_config.highlight_rules)
+        except re.error as e:
+            raise ConfigError(f"Invalid app configuration: {e}")
+        for rule in app_config.highlight_rules:
+            try:
+                Style.parse(rule.style)
+            except StyleSyntaxError as e:
+                raise ConfigError(
+                    f"Invalid app configuration: highlight rule '{rule.name}': {e}"
+                )
+
     def load_and_validate(self, path: str) -> tuple[list[Command], AppConfig]:
         """Load and validate configuration in one step.
 
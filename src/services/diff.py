@@ -0,0 +1,338 @@
+"""Line diffs between two executions' output for Ops Deck.
+
+Matching follows patience diff: the common prefix and suffix are trimmed,
+lines that occur exactly once on both sides anchor the match (their longest
+increasing subsequence), and the regions between anchors are diffed the same
+way. Lines are counted (and so hashed) once for the whole output; a region
+is only counted on its own when no line of the whole output anchors it.
+Regions without unique lines fall back to :mod:`difflib` when small and are
+reported as replaced when large, which keeps the diff near-linear on long
+outputs.
+
+A :class:`DiffDocument` lays the result out as display rows, folding long
+unchanged regions into one row each, and finds the row at any position by
+bisection, so a view only builds the rows on screen.
+"""
+
+import bisect
+import difflib
+import itertools
+import operator
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from operator import itemgetter
+
+# Regions up to this many lines (both sides) without unique lines are
+# matched with difflib; larger ones are reported as replaced
+FALLBACK_LINES = 2000
+# Unchanged lines shown around each change
+CONTEXT_LINES = 3
+
+# (tag, old start, old end, new start, new end), as in difflib
+Opcode = tuple[str, int, int, int, int]
+
+
+def diff_lines(old: Sequence[str], new: Sequence[str]) -> list[Opcode]:
+    """Diff two lists of lines.
+
+    Args:
+        old: Lines before
+        new: Lines after
+
+    Returns:
+        Opcodes (``equal``, ``replace``, ``delete``, ``insert``) covering both
+        sides in order
+    """
+    return _opcodes(_matching_blocks(list(old), list(new)), len(old), len(new))
+
+
+@dataclass
+class _LineCounts:
+    """How often each line occurs on either side, and where it last occurs in the old lines."""
+
+    old: Counter[str]
+    new: Counter[str]
+    positions: dict[str, int]
+
+    @classmethod
+    def count(cls, a: list[str], b: list[str], alo: int, ahi: int, blo: int, bhi: int):
+        """Count the lines of a region (C loops only)."""
+        old = a[alo:ahi]
+        return cls(Counter(old), Counter(b[blo:bhi]), dict(zip(old, range(alo, ahi))))
+
+
+def _matching_blocks(a: list[str], b: list[str]) -> list[tuple[int, int, int]]:
+    """Find runs of equal lines as (old start, new start, length), in order."""
+    counts = _LineCounts.count(a, b, 0, len(a), 0, len(b))
+    blocks: list[tuple[int, int, int]] = []
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        alo, ahi, blo, bhi = regions.pop()
+        # Common prefix and suffix
+        start = alo
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            alo += 1
+            blo += 1
+        if alo > start:
+            blocks.append((start, blo - (alo - start), alo - start))
+        end = ahi
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+        if ahi < end:
+            blocks.append((ahi, bhi, end - ahi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _anchor_runs(b, alo, ahi, blo, bhi, counts)
+        if not anchors:
+            # Lines repeated elsewhere in the output may be unique in this region
+            region_counts = _LineCounts.count(a, b, alo, ahi, blo, bhi)
+            anchors = _anchor_runs(b, alo, ahi, blo, bhi, region_counts)
+        if anchors:
+            # Each anchor run is a block; the gaps between blocks are
+            # diffed as regions of their own
+            i, j = alo, blo
+            for run in anchors:
+                run_i, run_j, size = run
+                if run_i > i and run_j > j:
+                    regions.append((i, run_i, j, run_j))
+                blocks.append(run)
+                i, j = run_i + size, run_j + size
+            if ahi > i and bhi > j:
+                regions.append((i, ahi, j, bhi))
+        elif (ahi - alo) + (bhi - blo) <= FALLBACK_LINES:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                if size:
+                    blocks.append((alo + i, blo + j, size))
+    blocks.sort()
+    # Merge runs that continue each other
+    merged: list[tuple[int, int, int]] = []
+    for i, j, size in blocks:
+        if merged:
+            pi, pj, psize = merged[-1]
+            if pi + psize == i and pj + psize == j:
+                merged[-1] = (pi, pj, psize + size)
+                continue
+        merged.append((i, j, size))
+    return merged
+
+
+def _anchor_runs(
+    b: list[str], alo: int, ahi: int, blo: int, bhi: int, counts: _LineCounts
+) -> list[tuple[int, int, int]]:
+    """Pair the lines unique to both sides, keeping the longest sequence in the same order.
+
+    Pairs that follow each other on both sides are grouped into runs. The
+    old lines of a run are consecutive, so two runs are either wholly in
+    order or not, and the runs that cover the most lines give the longest
+    increasing subsequence of the pairs.
+
+    Args:
+        b: New lines
+        alo: Start of the region in the old lines
+        ahi: End of the region in the old lines
+        blo: Start of the region in the new lines
+        bhi: End of the region in the new lines
+        counts: Counts of the region, or of a larger range around it
+
+    Returns:
+        (old start, new start, length) of the anchor runs in the region, in order
+    """
+    # The pairs are selected with map/compress so the loops over the lines
+    # run in C: a new line pairs up if it occurs once on each side and its
+    # old position is in the region (positions of duplicated lines are
+    # never used)
+    lines = b[blo:bhi]
+    olds = list(map(counts.positions.get, lines, itertools.repeat(-1)))
+    once = map(
+        (1).__eq__,
+        map(operator.mul, map(counts.old.__getitem__, lines), map(counts.new.__getitem__, lines)),
+    )
+    inside = map(operator.and_, map(alo.__le__, olds), map(ahi.__gt__, olds))
+    pairs = list(itertools.compress(zip(olds, range(blo, bhi)), map(operator.and_, once, inside)))
+    if not pairs:
+        return []
+    runs = _runs(pairs)
+    starts = list(map(itemgetter(0), runs))
+    if starts == sorted(starts):
+        # Nothing moved: every run is in order
+        return runs
+    # Heaviest increasing subsequence of the runs by old start. Chains are
+    # kept by their last old start with both starts and sizes increasing,
+    # dropping any chain that a later start matches or beats in size.
+    keys: list[int] = []
+    totals: list[int] = []
+    last: list[int] = []
+    previous = [-1] * len(runs)
+    for index, (i, _, size) in enumerate(runs):
+        pile = bisect.bisect_left(keys, i)
+        total = size
+        if pile:
+            previous[index] = last[pile - 1]
+            total += totals[pile - 1]
+        stop = pile
+        while stop < len(keys) and totals[stop] <= total:
+            stop += 1
+        keys[pile:stop] = [i]
+        totals[pile:stop] = [total]
+        last[pile:stop] = [index]
+    anchors = []
+    index = last[-1]
+    while index >= 0:
+        anchors.append(runs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _runs(pairs: list[tuple[int, int]]) -> list[tuple[int, int, int]]:
+    """Group pairs that follow each other on both sides into (old, new, length) runs."""
+    olds = list(map(itemgetter(0), pairs))
+    news = list(map(itemgetter(1), pairs))
+    follows = map(
+        operator.and_,
+        map((1).__eq__, map(operator.sub, olds[1:], olds)),
+        map((1).__eq__, map(operator.sub, news[1:], news)),
+    )
+    starts = [0, *itertools.compress(range(1, len(pairs)), map(operator.not_, follows))]
+    ends = [*starts[1:], len(pairs)]
+    return [(olds[start], news[start], end - start) for start, end in zip(starts, ends)]
+
+
+def _opcodes(blocks: list[tuple[int, int, int]], old_count: int, new_count: int) -> list[Opcode]:
+    """Turn matching blocks into opcodes covering both sides."""
+    opcodes: list[Opcode] = []
+    i = j = 0
+    for block_i, block_j, size in [*blocks, (old_count, new_count, 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, j))
+        elif j < block_j:
+            opcodes.append(("insert", i, i, j, block_j))
+        if size:
+            opcodes.append(("equal", block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+    return opcodes
+
+
+@dataclass(frozen=True)
+class DiffRow:
+    """One display row of a diff.
+
+    ``kind`` is ``equal``, ``delete``, ``insert`` or ``fold`` (a folded
+    region of ``folded`` unchanged lines starting at ``old``/``new``).
+    """
+
+    kind: str
+    old: int
+    new: int
+    text: str
+    folded: int = 0
+
+
+@dataclass
+class DiffDocument:
+    """A diff laid out as rows, with long unchanged regions folded."""
+
+    old: Sequence[str]
+    new: Sequence[str]
+    opcodes: list[Opcode]
+    context: int | None = CONTEXT_LINES
+    # (kind, old start, new start, lines) of each run of rows
+    segments: list[tuple[str, int, int, int]] = field(default_factory=list, init=False)
+    # Row of the first line of each segment
+    starts: list[int] = field(default_factory=list, init=False)
+    row_count: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.layout(self.context)
+
+    @classmethod
+    def build(
+        cls, old: Sequence[str], new: Sequence[str], context: int | None = CONTEXT_LINES
+    ) -> "DiffDocument":
+        """Diff two outputs and lay out the result.
+
+        Args:
+            old: Lines before
+            new: Lines after
+            context: Unchanged lines kept around changes (None to fold nothing)
+        """
+        return cls(old, new, diff_lines(old, new), context)
+
+    @property
+    def added(self) -> int:
+        """Lines only in the new output."""
+        return sum(j2 - j1 for tag, _, _, j1, j2 in self.opcodes if tag in ("insert", "replace"))
+
+    @property
+    def removed(self) -> int:
+        """Lines only in the old output."""
+        return sum(i2 - i1 for tag, i1, i2, _, _ in self.opcodes if tag in ("delete", "replace"))
+
+    def layout(self, context: int | None) -> None:
+        """Lay out the rows, folding unchanged regions longer than twice ``context``.
+
+        Args:
+            context: Unchanged lines kept around changes (None to fold nothing)
+        """
+        self.context = context
+        segments: list[tuple[str, int, int, int]] = []
+        last = len(self.opcodes) - 1
+        for index, (tag, i1, i2, j1, j2) in enumerate(self.opcodes):
+            if tag == "equal":
+                size = i2 - i1
+                before = 0 if index == 0 or context is None else context
+                after = 0 if index == last or context is None else context
+                if context is None or size <= before + after + 1:
+                    segments.append(("equal", i1, j1, size))
+                    continue
+                if before:
+                    segments.append(("equal", i1, j1, before))
+                hidden = size - before - after
+                segments.append(("fold", i1 + before, j1 + before, hidden))
+                if after:
+                    segments.append(("equal", i2 - after, j2 - after, after))
+                continue
+            if i2 > i1:
+                segments.append(("delete", i1, j1, i2 - i1))
+            if j2 > j1:
+                segments.append(("insert", i2, j1, j2 - j1))
+        self.segments = segments
+        self.starts = []
+        rows = 0
+        for kind, _, _, size in segments:
+            self.starts.append(rows)
+            rows += 1 if kind == "fold" else size
+        self.row_count = rows
+
+    def row(self, index: int) -> DiffRow:
+        """Get a display row.
+
+        Args:
+            index: Row number (0 to ``row_count - 1``)
+        """
+        segment = bisect.bisect_right(self.starts, index) - 1
+        kind, old, new, size = self.segments[segment]
+        offset = index - self.starts[segment]
+        if kind == "fold":
+            return DiffRow(kind, old, new, "", folded=size)
+        if kind == "delete":
+            return DiffRow(kind, old + offset, new, self.old[old + offset])
+        if kind == "insert":
+            return DiffRow(kind, old, new + offset, self.new[new + offset])
+        return DiffRow(kind, old + offset, new + offset, self.new[new + offset])
+
+    def hunk_rows(self) -> list[int]:
+        """Get the first row of every run of changed rows."""
+        rows = []
+        previous = "equal"
+        for (kind, _, _, _), start in zip(self.segments, self.starts):
+            if kind in ("delete", "insert") and previous not in ("delete", "insert"):
+                rows.append(start)
+            previous = kind
+        return rows
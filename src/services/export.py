@@ -0,0 +1,210 @@
+"""Output export for Ops Deck.
+
+Writes output lines to a file as they are read, so exporting never holds
+the whole log in memory: lines are formatted into chunks that are written
+through a large buffer, and gzip compression is applied while writing.
+Each finished execution ends with a record of its outcome and the
+resources it used.
+"""
+
+import gzip
+import io
+import json
+import re
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import TextIO
+
+from ..models import Execution, ExportFormat, OutputLine, StreamType
+
+EXPORT_FORMATS = tuple(fmt.value for fmt in ExportFormat)
+# Lines formatted before each write
+CHUNK_LINES = 4096
+# Bytes buffered between the writer and the file (or compressor)
+BUFFER_SIZE = 1024 * 1024
+
+_PREFIXES = {StreamType.STDOUT: "[OUT] ", StreamType.STDERR: "[ERR] "}
+_EXTENSIONS = {"text": "log", "jsonl": "jsonl"}
+_sub_unsafe = re.compile(r"[^\w.-]+").sub
+
+
+def export_filename(name: str, started: datetime, fmt: str = "text", compress: bool = False) -> str:
+    """Build a file name for the export of one run.
+
+    Args:
+        name: Command or pipeline name
+        started: When the run started
+        fmt: Export format
+        compress: True if the file is gzipped
+
+    Returns:
+        File name such as ``deploy-20240501-101500.log.gz``
+    """
+    stem = _sub_unsafe("_", name).strip("_") or "output"
+    suffix = ".gz" if compress else ""
+    return f"{stem}-{started:%Y%m%d-%H%M%S}.{_EXTENSIONS[fmt]}{suffix}"
+
+
+def format_line(line: OutputLine, fmt: str = "text") -> str:
+    """Format an output line for export, including the trailing newline.
+
+    Args:
+        line: Output line
+        fmt: ``"text"`` for the line with its stream prefix, or ``"jsonl"``
+            for a JSON object with timestamp, stream and content
+
+    Returns:
+        Formatted line
+    """
+    if fmt == "jsonl":
+        record = {
+            "timestamp": line.timestamp.isoformat(),
+            "stream": line.stream.value,
+            "content": line.content,
+        }
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    return f"{_PREFIXES[line.stream]}{line.content}\n"
+
+
+def format_execution(execution: Execution, fmt: str = "text") -> str:
+    """Format a finished execution's outcome for export, including the trailing newline.
+
+    Args:
+        execution: Finished execution
+        fmt: ``"text"`` for an ``[END]`` line, or ``"jsonl"`` for a JSON
+            object with an ``execution`` key holding the status, exit code,
+            times and resource usage
+
+    Returns:
+        Formatted record
+    """
+    usage = execution.resource_usage
+    if fmt == "jsonl":
+        record = {
+            "execution": {
+                "id": execution.id,
+                "command": execution.command.name,
+                "status": execution.status.value,
+                "exit_code": execution.exit_code,
+                "start_time": execution.start_time and execution.start_time.isoformat(),
+                "end_time": execution.end_time and execution.end_time.isoformat(),
+                "resource_usage": usage and usage.model_dump(),
+            }
+        }
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    exit_code = "-" if execution.exit_code is None else execution.exit_code
+    outcome = f"{execution.status.value} (exit {exit_code})"
+    resources = f" · {usage.summary()}" if usage is not None else ""
+    return f"[END] {execution.command.name}: {outcome}{resources}\n"
+
+
+class OutputExporter:
+    """Writer that appends output lines to an export file in chunks."""
+
+    def __init__(self, path: str, fmt: str = "text", compress: bool | None = None):
+        """Open the export file.
+
+        Args:
+            path: File to write (replaced if it exists)
+            fmt: One of :data:`EXPORT_FORMATS`
+            compress: Gzip the file (by default, when the path ends in ``.gz``)
+
+        Raises:
+            ValueError: If the format is unknown
+            OSError: If the file cannot be created
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r} (expected one of {EXPORT_FORMATS})")
+        if compress is None:
+            compress = path.endswith(".gz")
+        self.path = path
+        self.fmt = fmt
+        self.lines_written = 0
+        self._chunk: list[str] = []
+        raw = open(path, "wb")
+        stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else raw
+        self._raw = raw
+        self._file: TextIO = io.TextIOWrapper(
+            io.BufferedWriter(stream, BUFFER_SIZE), encoding="utf-8", newline="\n"
+        )
+
+    def write(self, line: OutputLine) -> None:
+        """Add a line to the export."""
+        self._chunk.append(format_line(line, self.fmt))
+        if len(self._chunk) >= CHUNK_LINES:
+            self._flush_chunk()
+
+    def write_execution(self, execution: Execution) -> None:
+        """Add the outcome record of a finished execution."""
+        self._flush_chunk()
+        self._file.write(format_execution(execution, self.fmt))
+
+    def write_lines(
+        self, lines: Iterable[OutputLine], cancelled: Callable[[], bool] = lambda: False
+    ) -> bool:
+        """Add lines to the export, checking for cancellation between chunks.
+
+        Args:
+            lines: Output lines in order
+            cancelled: Returns True when the export should stop
+
+        Returns:
+            False if the export was cancelled
+        """
+        for line in lines:
+            self.write(line)
+            # Checked after each chunk is written
+            if not self._chunk and cancelled():
+                return False
+        return True
+
+    def close(self) -> None:
+        """Write the remaining lines and close the file."""
+        if self._file.closed:
+            return
+        self._flush_chunk()
+        # Closes the compressor (writing the gzip trailer) and then the file
+        self._file.close()
+        self._raw.close()
+
+    def __enter__(self) -> "OutputExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _flush_chunk(self) -> None:
+        """Write the formatted lines in one call."""
+        if self._chunk:
+            self._file.write("".join(self._chunk))
+            self.lines_written += len(self._chunk)
+            self._chunk = []
+
+
+def export_lines(
+    lines: Iterable[OutputLine],
+    path: str,
+    fmt: str = "text",
+    compress: bool | None = None,
+    cancelled: Callable[[], bool] = lambda: False,
+    executions: Iterable[Execution] = (),
+) -> int:
+    """Stream output lines to a file.
+
+    Args:
+        lines: Output lines in order (read lazily)
+        path: File to write
+        fmt: One of :data:`EXPORT_FORMATS`
+        compress: Gzip the file (by default, when the path ends in ``.gz``)
+        cancelled: Returns True when the export should stop
+        executions: Finished executions the lines came from, recorded after
+            them unless the export was cancelled
+
+    Returns:
+        Number of lines written
+    """
+    with OutputExporter(path, fmt, compress) as exporter:
+        if exporter.write_lines(lines, cancelled):
+            for execution in executions:
+                exporter.write_execution(execution)
+    return exporter.lines_written
@@ -0,0 +1,211 @@
+"""Parameterized command fan-out service for Ops Deck.
+
+Renders templated commands for each target and runs them concurrently
+through a CommandRunner with a concurrency cap.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from functools import lru_cache
+from string import Formatter
+
+from ..exceptions import ExecutionError, OpsError
+from ..models import Command, Execution, ExecutionStatus, FanOutResult, OutputLine, TargetResult
+from .command_runner import CommandRunner
+
+Target = str | dict[str, str]
+
+
+@lru_cache(maxsize=1024)
+def template_fields(template: str) -> tuple[str, ...]:
+    """Get the distinct placeholder names used in a command template.
+
+    Args:
+        template: Command string with ``{name}`` placeholders
+
+    Returns:
+        Placeholder names in order of first appearance
+    """
+    fields: list[str] = []
+    for _, field_name, _, _ in Formatter().parse(template):
+        if field_name and field_name not in fields:
+            fields.append(field_name)
+    return tuple(fields)
+
+
+@lru_cache(maxsize=4096)
+def _render(template: str, params: tuple[tuple[str, str], ...]) -> str:
+    """Render a template with hashable parameters (cached)."""
+    return template.format_map(dict(params))
+
+
+def target_params(template: str, target: Target) -> dict[str, str]:
+    """Build the placeholder values for a target.
+
+    A plain string target binds ``{target}`` and, when the template uses a
+    single other placeholder (e.g. ``{host}``), that placeholder as well.
+
+    Args:
+        template: Command string with placeholders
+        target: Target string or mapping of placeholder values
+
+    Returns:
+        Mapping of placeholder name to value
+
+    Raises:
+        ExecutionError: If a string target is ambiguous for the template
+    """
+    if isinstance(target, dict):
+        return dict(target)
+
+    fields = [name for name in template_fields(template) if name != "target"]
+    if len(fields) > 1:
+        raise ExecutionError(
+            f"Target {target!r} is ambiguous for placeholders {', '.join(fields)}; "
+            "use a mapping target instead"
+        )
+    params = {"target": target}
+    if fields:
+        params[fields[0]] = target
+    return params
+
+
+def render_command(template: str, target: Target) -> str:
+    """Render a command template for a single target.
+
+    Args:
+        template: Command string with placeholders
+        target: Target string or mapping of placeholder values
+
+    Returns:
+        Rendered command string
+
+    Raises:
+        ExecutionError: If the template cannot be rendered for the target
+    """
+    params = target_params(template, target)
+    try:
+        return _render(template, tuple(sorted(params.items())))
+    except (KeyError, IndexError, ValueError) as e:
+        raise ExecutionError(f"Cannot render {template!r} for target {target!r}: {e}")
+
+
+def target_label(target: Target) -> str:
+    """Get the display label for a target."""
+    if isinstance(target, dict):
+        return ",".join(target.values())
+    return target
+
+
+def expand_targets(command: Command) -> list[tuple[str, Command]]:
+    """Render a parameterized command into one command per target.
+
+    Args:
+        command: Command with targets
+
+    Returns:
+        List of (target label, rendered command) pairs
+
+    Raises:
+        ExecutionError: If a target cannot be rendered
+    """
+    expanded = []
+    for target in command.targets:
+        label = target_label(target)
+        rendered = command.model_copy(
+            update={
+                "name": f"{command.name}[{label}]",
+                "command": render_command(command.command, target),
+                "targets": [],
+                "target_groups": [],
+            }
+        )
+        expanded.append((label, rendered))
+    return expanded
+
+
+class FanOutRunner:
+    """Runs a parameterized command against all of its targets in parallel."""
+
+    def __init__(self, runner: CommandRunner, max_parallel: int = 8):
+        """Initialize the fan-out runner.
+
+        Args:
+            runner: Runner used for each per-target execution
+            max_parallel: Default concurrency cap
+        """
+        self.runner = runner
+        self.max_parallel = max_parallel
+
+    async def run(
+        self,
+        command: Command,
+        output_callback: Callable[[str, OutputLine], None] | None = None,
+        completion_callback: Callable[[str, Execution], None] | None = None,
+    ) -> FanOutResult:
+        """Execute a command for every target, at most N at a time.
+
+        Per-target failures and timeouts are recorded in the result rather
+        than raised, so one bad target does not abort the others.
+
+        Args:
+            command: Parameterized command to execute
+            output_callback: Optional callback receiving (target label, line)
+            completion_callback: Optional callback receiving (target label, execution)
+
+        Returns:
+            FanOutResult with one TargetResult per target, in target order
+
+        Raises:
+            ExecutionError: If a target cannot be rendered
+        """
+        expanded = expand_targets(command)
+        semaphore = asyncio.Semaphore(command.max_parallel or self.max_parallel)
+        result = FanOutResult(command=command, start_time=datetime.now(), end_time=None)
+
+        async def run_target(label: str, target_command: Command) -> TargetResult:
+            """Run one rendered command under the concurrency cap."""
+            finished: list[Execution] = []
+
+            def on_output(line: OutputLine) -> None:
+                if output_callback:
+                    output_callback(label, line)
+
+            def on_complete(execution: Execution) -> None:
+                finished.append(execution)
+                if completion_callback:
+                    completion_callback(label, execution)
+
+            async with semaphore:
+                try:
+                    await self.runner.run(
+                        target_command,
+                        output_callback=on_output,
+                        completion_callback=on_complete,
+                    )
+                except OpsError as e:
+                    if not finished:
+                        finished.append(
+                            Execution(
+                                id=f"exec_error_{label}_{uuid.uuid4().hex[:8]}",
+                                command=target_command,
+                                start_time=None,
+                                end_time=None,
+                                exit_code=None,
+                                status=ExecutionStatus.ERROR,
+                                error_message=str(e),
+                                stop_reason=None,
+                                resource_usage=None,
+                            )
+                        )
+            return TargetResult(target=label, execution=finished[-1])
+
+        result.results = list(
+            await asyncio.gather(
+                *(run_target(label, target_command) for label, target_command in expanded)
+            )
+        )
+        result.end_time = datetime.now()
+        return result
@@ -0,0 +1,137 @@
+"""Output highlighting rules for Ops Deck.
+
+All rules are compiled into one combined regular expression with a named
+group per rule, so a line is scanned once however many rules are
+configured. Results are cached per line content; the output view asks for
+spans only when a line is actually drawn.
+"""
+
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+
+from ..models import HighlightRule
+from .patterns import combine_patterns
+
+# Used when the configuration does not define its own rules
+DEFAULT_RULES = (
+    HighlightRule(
+        name="error",
+        pattern=r"\b(?:[Ee]rrors?|ERRORS?|[Ff]atal|FATAL|[Ff]ail(?:ed|ure)|FAIL(?:ED|URE)"
+        r"|[Ee]xception|[Pp]anic|PANIC|[Cc]ritical|CRITICAL)\b",
+        style="bold red",
+    ),
+    HighlightRule(
+        name="warning", pattern=r"\b(?:[Ww]arn(?:ings?)?|WARN(?:INGS?)?)\b", style="bold yellow"
+    ),
+    HighlightRule(name="log_level", pattern=r"\b(?:DEBUG|INFO|NOTICE|TRACE)\b", style="cyan"),
+    HighlightRule(
+        name="ip_address",
+        pattern=r"\b(?:\d{1,3}\.){3}\d{1,3}(?::\d{1,5})?\b",
+        style="magenta",
+    ),
+    HighlightRule(
+        name="duration",
+        pattern=r"\b\d+(?:\.\d+)?(?:ns|us|µs|ms|s|m|h)\b",
+        style="green",
+    ),
+)
+
+Span = tuple[int, int, str]
+
+
+def _leading_boundary(pattern: str) -> str | None:
+    """Get the rest of a pattern that starts with ``\\b`` applying to all of it.
+
+    Returns None if the pattern does not start with ``\\b`` or has a
+    top-level alternation (where the ``\\b`` only applies to one branch).
+    """
+    if not pattern.startswith(r"\b"):
+        return None
+    depth = 0
+    in_class = False
+    chars = iter(pattern)
+    for char in chars:
+        if char == "\\":
+            next(chars, None)
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return None
+    return pattern[2:]
+
+
+def compile_rules(rules: Sequence[HighlightRule]) -> re.Pattern[str] | None:
+    """Combine highlight rules into one regex.
+
+    Earlier rules win when two rules match at the same position. When every
+    rule starts at a word boundary the ``\\b`` is hoisted out of the
+    alternation, which lets the regex engine reject most positions without
+    trying each rule.
+
+    Args:
+        rules: Rules to combine
+
+    Returns:
+        Combined regex with one group ``_rule<N>`` per rule, or None if
+        there are no rules
+
+    Raises:
+        re.error: If a rule's pattern is not a valid regular expression
+    """
+    for rule in rules:
+        # Compile individually so errors name the offending rule
+        try:
+            re.compile(rule.pattern)
+        except re.error as e:
+            raise re.error(f"invalid pattern for highlight rule '{rule.name}': {e}") from e
+    if not rules:
+        return None
+    patterns = [rule.pattern for rule in rules]
+    rests = [_leading_boundary(pattern) for pattern in patterns]
+    if all(rest is not None for rest in rests):
+        return re.compile(rf"\b(?:{combine_patterns(rests, '_rule')})")  # type: ignore[arg-type]
+    return re.compile(combine_patterns(patterns, "_rule"))
+
+
+class Highlighter:
+    """Computes styled spans for output lines."""
+
+    def __init__(self, rules: Sequence[HighlightRule] = DEFAULT_RULES, cache_size: int = 4096):
+        """Compile the rules.
+
+        Args:
+            rules: Highlight rules, in priority order
+            cache_size: Number of distinct lines whose spans are cached
+
+        Raises:
+            re.error: If a rule's pattern is not a valid regular expression
+        """
+        self.rules = tuple(rules)
+        self.regex = compile_rules(self.rules)
+        self._styles = {f"_rule{i}": rule.style for i, rule in enumerate(self.rules)}
+        self.spans = lru_cache(maxsize=cache_size)(self._spans)
+
+    def _spans(self, content: str) -> tuple[Span, ...]:
+        """Find the styled spans of one line.
+
+        Args:
+            content: Line text
+
+        Returns:
+            Non-overlapping (start, end, style) spans in line order
+        """
+        if self.regex is None:
+            return ()
+        styles = self._styles
+        return tuple(
+            (match.start(), match.end(), styles[match.lastgroup])  # type: ignore[index]
+            for match in self.regex.finditer(content)
+            if match.end() > match.start()
+        )
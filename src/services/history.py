@@ -0,0 +1,552 @@
+"""Delta-encoded output history of repeatedly run commands for Ops Deck.
+
+A command run every few seconds prints nearly the same output each time.
+Its history keeps every run in one append-only file per command, storing
+each distinct output once:
+
+- the magic bytes ``OPSHIST1\\n`` and a varint-prefixed JSON header;
+- one record per distinct output (an *object*), addressed by a hash of its
+  lines: a zlib-compressed full snapshot every ``snapshot_every`` objects,
+  and in between a line-level delta against the previous object (copied
+  line ranges, lines edited in place and inserted lines);
+- one small record per run: time since the previous run, exit code, the
+  object holding its output and, when it was measured, the resources the
+  run used, so a run whose output did not change costs a few bytes.
+
+Reconstructing a run reads its nearest snapshot and applies at most
+``snapshot_every - 1`` deltas; the file is indexed once when opened.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+import zlib
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..exceptions import ExecutionError
+from ..models import Command, Execution, ResourceUsage
+from .diff import diff_lines
+
+MAGIC = b"OPSHIST1\n"
+FILE_SUFFIX = ".opshist"
+# Objects between full snapshots (the longest delta chain to replay)
+SNAPSHOT_EVERY = 64
+
+_SNAPSHOT = 0
+_DELTA = 1
+_DELTA_ZLIB = 2
+_RUN = 3
+_RUN_USAGE = 4
+_DIGEST_SIZE = 16
+# Deltas at least this long are stored compressed if that is smaller
+_COMPRESS_OVER = 128
+# Delta operations
+_COPY = 0
+_INSERT = 1
+_EDIT = 2
+# Characters an edited line must share with the line it replaces
+_MIN_SHARED = 4
+
+
+def _varint(value: int) -> bytes:
+    """Encode a non-negative integer as a LEB128 varint."""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Decode a varint at a position, returning it and the position after it."""
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    """Map a signed integer to a non-negative one (0, -1, 1, -2, ...)."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+def _encode_lines(lines: Sequence[str], out: bytearray) -> None:
+    """Append a count and length-prefixed UTF-8 lines to a buffer."""
+    out += _varint(len(lines))
+    for line in lines:
+        data = line.encode("utf-8", "surrogateescape")
+        out += _varint(len(data))
+        out += data
+
+
+def _encode_usage(usage: ResourceUsage) -> bytes:
+    """Encode resource usage as varints (CPU times in microseconds)."""
+    return b"".join(
+        _varint(max(0, value))
+        for value in (
+            round(usage.user_cpu_seconds * 1_000_000),
+            round(usage.system_cpu_seconds * 1_000_000),
+            usage.max_rss_kb,
+            usage.block_input_ops,
+            usage.block_output_ops,
+            usage.voluntary_context_switches,
+            usage.involuntary_context_switches,
+        )
+    )
+
+
+def _decode_usage(data: bytes, pos: int) -> tuple[ResourceUsage, int]:
+    """Decode resource usage written by :func:`_encode_usage`."""
+    values = []
+    for _ in range(7):
+        value, pos = _read_varint(data, pos)
+        values.append(value)
+    user, system, rss, block_in, block_out, voluntary, involuntary = values
+    usage = ResourceUsage(
+        user_cpu_seconds=user / 1_000_000,
+        system_cpu_seconds=system / 1_000_000,
+        max_rss_kb=rss,
+        block_input_ops=block_in,
+        block_output_ops=block_out,
+        voluntary_context_switches=voluntary,
+        involuntary_context_switches=involuntary,
+    )
+    return usage, pos
+
+
+def _decode_lines(data: bytes, pos: int) -> tuple[list[str], int]:
+    """Decode lines written by :func:`_encode_lines`."""
+    count, pos = _read_varint(data, pos)
+    lines = []
+    for _ in range(count):
+        size, pos = _read_varint(data, pos)
+        lines.append(data[pos : pos + size].decode("utf-8", "surrogateescape"))
+        pos += size
+    return lines, pos
+
+
+def _shared_ends(old: str, new: str) -> tuple[int, int]:
+    """Count the characters two lines share at their start and, after that, their end."""
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+def encode_delta(old: Sequence[str], new: Sequence[str]) -> bytes:
+    """Encode the lines of an output as changes to the previous output.
+
+    Unchanged runs become one copy, a changed line that keeps enough of the
+    line it replaces stores only the differing middle, and other lines are
+    stored whole.
+
+    Args:
+        old: Previous output
+        new: Output to encode
+
+    Returns:
+        Delta, applied with :func:`apply_delta`
+    """
+    out = bytearray()
+    inserted: list[str] = []
+    cursor = 0
+
+    def flush() -> None:
+        if inserted:
+            out.append(_INSERT)
+            _encode_lines(inserted, out)
+            inserted.clear()
+
+    for tag, i1, i2, j1, j2 in diff_lines(old, new):
+        if tag == "equal":
+            flush()
+            out.append(_COPY)
+            out += _varint(i1 - cursor) + _varint(i2 - i1)
+            cursor = i2
+        elif tag == "insert":
+            inserted.extend(new[j1:j2])
+        elif tag == "replace":
+            for k in range(j2 - j1):
+                line = new[j1 + k]
+                if k >= i2 - i1:
+                    inserted.append(line)
+                    continue
+                base = old[i1 + k]
+                prefix, suffix = _shared_ends(base, line)
+                if prefix + suffix < _MIN_SHARED:
+                    inserted.append(line)
+                    continue
+                flush()
+                middle = line[prefix : len(line) - suffix].encode("utf-8", "surrogateescape")
+                out.append(_EDIT)
+                out += _varint(i1 + k - cursor) + _varint(prefix) + _varint(suffix)
+                out += _varint(len(middle)) + middle
+                cursor = i1 + k + 1
+    flush()
+    return bytes(out)
+
+
+def apply_delta(old: Sequence[str], delta: bytes) -> list[str]:
+    """Rebuild an output from the previous output and a delta.
+
+    Args:
+        old: Previous output
+        delta: Delta from :func:`encode_delta`
+
+    Returns:
+        The encoded output's lines
+    """
+    lines: list[str] = []
+    cursor = pos = 0
+    end = len(delta)
+    while pos < end:
+        op = delta[pos]
+        pos += 1
+        if op == _COPY:
+            skip, pos = _read_varint(delta, pos)
+            count, pos = _read_varint(delta, pos)
+            cursor += skip
+            lines.extend(old[cursor : cursor + count])
+            cursor += count
+        elif op == _INSERT:
+            inserted, pos = _decode_lines(delta, pos)
+            lines.extend(inserted)
+        elif op == _EDIT:
+            skip, pos = _read_varint(delta, pos)
+            prefix, pos = _read_varint(delta, pos)
+            suffix, pos = _read_varint(delta, pos)
+            size, pos = _read_varint(delta, pos)
+            middle = delta[pos : pos + size].decode("utf-8", "surrogateescape")
+            pos += size
+            cursor += skip
+            base = old[cursor]
+            lines.append(base[:prefix] + middle + base[len(base) - suffix :])
+            cursor += 1
+        else:
+            raise ExecutionError(f"History delta has an unknown operation {op}")
+    return lines
+
+
+@dataclass(frozen=True)
+class HistoryRun:
+    """One stored run of a command."""
+
+    index: int
+    time: datetime
+    exit_code: int | None
+    # Object holding the output; runs with the same output share it
+    object: int
+    resource_usage: ResourceUsage | None = None
+
+
+class OutputHistory:
+    """The stored outputs of one command, in an append-only file.
+
+    Safe to use from several threads.
+    """
+
+    def __init__(self, path: str, name: str = "", snapshot_every: int = SNAPSHOT_EVERY):
+        """Open a history file, creating it if needed, and index it.
+
+        A record cut short by a crash while writing is dropped.
+
+        Args:
+            path: History file
+            name: Command name written to a new file's header
+            snapshot_every: Objects between full snapshots
+
+        Raises:
+            ExecutionError: If the file is not a history
+        """
+        self.path = path
+        self.snapshot_every = max(1, snapshot_every)
+        self._lock = threading.Lock()
+        # Run times (ms since the epoch), exit codes (None as -1 << 31) and objects
+        self._times = array("q")
+        self._exit_codes = array("l")
+        self._run_objects = array("l")
+        # Resource usage of the runs it was measured for, by run index
+        self._usages: dict[int, ResourceUsage] = {}
+        # Payload offset and size of each object, which objects are snapshots
+        self._offsets = array("q")
+        self._sizes = array("l")
+        self._kinds = bytearray()
+        self._snapshots = array("l")
+        self._digests: dict[bytes, int] = {}
+        self._last_lines: list[str] | None = None
+        self._cache: tuple[int, list[str]] | None = None
+        if not os.path.exists(path) or not os.path.getsize(path):
+            header = json.dumps({"name": name, "created": datetime.now().isoformat()}).encode()
+            with open(path, "wb") as file:
+                file.write(MAGIC + _varint(len(header)) + header)
+        self._file = open(path, "r+b")
+        try:
+            self._index()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._run_objects)
+
+    @property
+    def object_count(self) -> int:
+        """Distinct outputs stored."""
+        return len(self._kinds)
+
+    @property
+    def size(self) -> int:
+        """Bytes the history takes on disk."""
+        with self._lock:
+            return self._file.seek(0, os.SEEK_END)
+
+    def _index(self) -> None:
+        """Read the whole file once to index its runs and objects."""
+        data = self._file.read()
+        if not data.startswith(MAGIC):
+            raise ExecutionError(f"{self.path} is not an output history")
+        length, pos = _read_varint(data, len(MAGIC))
+        self.header = json.loads(data[pos : pos + length])
+        pos += length
+        good = pos
+        time = 0
+        try:
+            while pos < len(data):
+                kind = data[pos]
+                pos += 1
+                if kind in (_RUN, _RUN_USAGE):
+                    delta, pos = _read_varint(data, pos)
+                    code, pos = _read_varint(data, pos)
+                    back, pos = _read_varint(data, pos)
+                    usage = None
+                    if kind == _RUN_USAGE:
+                        usage, pos = _decode_usage(data, pos)
+                    time += _unzigzag(delta)
+                    self._add_run(time, _unzigzag(code - 1) if code else None, back, usage)
+                elif kind in (_SNAPSHOT, _DELTA, _DELTA_ZLIB):
+                    digest = data[pos : pos + _DIGEST_SIZE]
+                    size, pos = _read_varint(data, pos + _DIGEST_SIZE)
+                    if len(digest) < _DIGEST_SIZE or pos + size > len(data):
+                        break
+                    self._add_object(kind, digest, pos, size)
+                    pos += size
+                else:
+                    raise ExecutionError(f"{self.path} has an unknown record type {kind}")
+                good = pos
+        except IndexError:
+            pass
+        if good < len(data):
+            # Partly written record: drop it so appends start cleanly
+            self._file.truncate(good)
+        self._file.seek(good)
+
+    def _add_run(
+        self, time: int, exit_code: int | None, back: int, usage: ResourceUsage | None
+    ) -> None:
+        if usage is not None:
+            self._usages[len(self._run_objects)] = usage
+        self._times.append(time)
+        self._exit_codes.append(-(1 << 31) if exit_code is None else exit_code)
+        self._run_objects.append(len(self._kinds) - 1 - back)
+
+    def _add_object(self, kind: int, digest: bytes, offset: int, size: int) -> None:
+        number = len(self._kinds)
+        if kind == _SNAPSHOT:
+            self._snapshots.append(number)
+        self._kinds.append(kind)
+        self._offsets.append(offset)
+        self._sizes.append(size)
+        self._digests[digest] = number
+
+    def add(
+        self,
+        lines: Sequence[str],
+        exit_code: int | None = None,
+        time: datetime | None = None,
+        resource_usage: ResourceUsage | None = None,
+    ) -> HistoryRun:
+        """Store a run's output.
+
+        Args:
+            lines: Output lines
+            exit_code: The run's exit code
+            time: When the run started (default now)
+            resource_usage: Resources the run used, if measured
+
+        Returns:
+            The stored run
+        """
+        time = time or datetime.now()
+        encoded = bytearray()
+        _encode_lines(lines, encoded)
+        digest = hashlib.blake2b(encoded, digest_size=_DIGEST_SIZE).digest()
+        with self._lock:
+            record = bytearray()
+            number = self._digests.get(digest)
+            if number is None:
+                number = len(self._kinds)
+                kind, payload = self._encode_object(lines, encoded)
+                record.append(kind)
+                record += digest + _varint(len(payload))
+                offset = self._file.tell() + len(record)
+                record += payload
+                self._add_object(kind, digest, offset, len(payload))
+                self._last_lines = list(lines)
+            milliseconds = int(time.timestamp() * 1000)
+            previous = self._times[-1] if self._times else 0
+            code = 0 if exit_code is None else _zigzag(exit_code) + 1
+            back = len(self._kinds) - 1 - number
+            record.append(_RUN if resource_usage is None else _RUN_USAGE)
+            record += _varint(_zigzag(milliseconds - previous)) + _varint(code) + _varint(back)
+            if resource_usage is not None:
+                record += _encode_usage(resource_usage)
+            self._file.write(record)
+            self._file.flush()
+            self._add_run(milliseconds, exit_code, back, resource_usage)
+            return self._run(len(self._run_objects) - 1)
+
+    def _encode_object(self, lines: Sequence[str], encoded: bytearray) -> tuple[int, bytes]:
+        """Choose how to store a new output: as a delta or a full snapshot."""
+        chain = len(self._kinds) - (self._snapshots[-1] if self._snapshots else len(self._kinds))
+        if self._kinds and chain < self.snapshot_every:
+            if self._last_lines is None:
+                self._last_lines = self._reconstruct(len(self._kinds) - 1)
+            delta = encode_delta(self._last_lines, lines)
+            kind = _DELTA
+            if len(delta) >= _COMPRESS_OVER:
+                compressed = zlib.compress(delta)
+                if len(compressed) < len(delta):
+                    kind, delta = _DELTA_ZLIB, compressed
+            # A delta as large as the output saves nothing on replay
+            if len(delta) < len(encoded) // 2:
+                return kind, delta
+        return _SNAPSHOT, zlib.compress(encoded)
+
+    def runs(self) -> list[HistoryRun]:
+        """Get every stored run, oldest first."""
+        with self._lock:
+            return [self._run(index) for index in range(len(self._run_objects))]
+
+    def _run(self, index: int) -> HistoryRun:
+        code = self._exit_codes[index]
+        return HistoryRun(
+            index,
+            datetime.fromtimestamp(self._times[index] / 1000),
+            None if code == -(1 << 31) else code,
+            self._run_objects[index],
+            self._usages.get(index),
+        )
+
+    def lines(self, index: int) -> list[str]:
+        """Reconstruct a run's output.
+
+        Args:
+            index: Run number (negative counts from the latest run)
+
+        Returns:
+            Output lines
+
+        Raises:
+            IndexError: If there is no such run
+        """
+        with self._lock:
+            return list(self._reconstruct(self._run_objects[index]))
+
+    def _reconstruct(self, number: int) -> list[str]:
+        """Rebuild an object from its snapshot, or from the last one rebuilt."""
+        start = self._snapshots[bisect.bisect_right(self._snapshots, number) - 1]
+        cache = self._cache
+        if cache is not None and start <= cache[0] <= number:
+            current, lines = cache
+        else:
+            current, lines = start, _decode_lines(zlib.decompress(self._payload(start)), 0)[0]
+        while current < number:
+            current += 1
+            delta = self._payload(current)
+            if self._kinds[current] == _DELTA_ZLIB:
+                delta = zlib.decompress(delta)
+            lines = apply_delta(lines, delta)
+        self._cache = (number, lines)
+        return lines
+
+    def _payload(self, number: int) -> bytes:
+        return os.pread(self._file.fileno(), self._sizes[number], self._offsets[number])
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            self._file.close()
+
+
+class HistoryStore:
+    """Output histories of every command, one file each in a directory."""
+
+    def __init__(self, directory: str, snapshot_every: int = SNAPSHOT_EVERY):
+        """Initialize the store; histories are opened when first used.
+
+        Args:
+            directory: Directory of the history files
+            snapshot_every: Objects between full snapshots
+        """
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._histories: dict[str, OutputHistory] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> str:
+        """Get the history file of a command."""
+        return os.path.join(self.directory, name.replace(os.sep, "_") + FILE_SUFFIX)
+
+    def history(self, command: Command) -> OutputHistory:
+        """Open (once) the history of a command.
+
+        Raises:
+            OSError: If the file cannot be created or read
+            ExecutionError: If the file is not a history
+        """
+        with self._lock:
+            history = self._histories.get(command.name)
+            if history is None:
+                os.makedirs(self.directory, exist_ok=True)
+                history = OutputHistory(self.path(command.name), command.name, self.snapshot_every)
+                self._histories[command.name] = history
+            return history
+
+    def record(self, execution: Execution, lines: Sequence[str]) -> HistoryRun:
+        """Store a finished execution's output in its command's history.
+
+        Args:
+            execution: Finished execution
+            lines: Its output lines
+
+        Returns:
+            The stored run
+        """
+        return self.history(execution.command).add(
+            lines, execution.exit_code, execution.start_time, execution.resource_usage
+        )
+
+    def close(self) -> None:
+        """Close every open history."""
+        with self._lock:
+            for history in self._histories.values():
+                history.close()
+            self._histories.clear()
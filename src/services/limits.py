@@ -0,0 +1,132 @@
+"""Resource limits and scheduling for spawned commands.
+
+Everything that can fail for configuration reasons is checked in the parent,
+so the ``preexec_fn`` run in the forked child only makes the syscalls.
+"""
+
+import ctypes
+import os
+import platform
+import resource
+from collections.abc import Callable
+
+from ..exceptions import ExecutionError
+from ..models import ResourceLimits
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# ioprio_set(2) is not wrapped by the os module
+_IOPRIO_SET_SYSCALLS = {"x86_64": 251, "aarch64": 30, "riscv64": 30, "i386": 289, "i686": 289}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+
+
+def ioprio_value(io_class: str, priority: int | None) -> int:
+    """Encode an I/O class and priority as an ioprio value.
+
+    Args:
+        io_class: One of "realtime", "best-effort" or "idle"
+        priority: Level within the class (0-7), ignored for "idle"
+
+    Returns:
+        Value for ioprio_set(2)
+    """
+    level = 0 if io_class == "idle" else (4 if priority is None else priority)
+    return (_IOPRIO_CLASSES[io_class] << _IOPRIO_CLASS_SHIFT) | level
+
+
+def cgroup_v2_available(root: str = CGROUP_ROOT) -> bool:
+    """Check whether a unified (v2) cgroup hierarchy is mounted."""
+    return os.path.exists(os.path.join(root, "cgroup.controllers"))
+
+
+def _capped_rlimit(limit: int, soft: int, hard: int) -> tuple[int, int]:
+    """Build a (soft, hard) rlimit that never raises the current hard limit."""
+    _, current = resource.getrlimit(limit)
+    if current == resource.RLIM_INFINITY:
+        return soft, hard
+    return min(soft, current), min(hard, current)
+
+
+def build_preexec(
+    limits: ResourceLimits | None, cgroup_root: str = CGROUP_ROOT
+) -> Callable[[], None] | None:
+    """Prepare a ``preexec_fn`` that applies a command's limits in the child.
+
+    cgroup placement is skipped when no cgroup v2 hierarchy is mounted.
+
+    Args:
+        limits: Limits to apply (None for none)
+        cgroup_root: Mount point of the cgroup v2 hierarchy
+
+    Returns:
+        Callable to run in the child before exec, or None if nothing to apply
+
+    Raises:
+        ExecutionError: If a limit cannot be applied on this host
+    """
+    if limits is None:
+        return None
+
+    rlimits: list[tuple[int, tuple[int, int]]] = []
+    if limits.memory_mb is not None:
+        size = limits.memory_mb * 1024 * 1024
+        rlimits.append((resource.RLIMIT_AS, _capped_rlimit(resource.RLIMIT_AS, size, size)))
+    if limits.cpu_seconds is not None:
+        # The soft limit sends SIGXCPU; the hard limit a second later kills
+        seconds = limits.cpu_seconds
+        rlimits.append(
+            (resource.RLIMIT_CPU, _capped_rlimit(resource.RLIMIT_CPU, seconds, seconds + 1))
+        )
+
+    affinity = set(limits.cpu_affinity)
+    if affinity:
+        unknown = affinity - os.sched_getaffinity(0)
+        if unknown:
+            raise ExecutionError(
+                f"CPU affinity names unavailable CPUs: {', '.join(map(str, sorted(unknown)))}"
+            )
+
+    ioprio_set = None
+    ioprio = 0
+    if limits.io_class is not None:
+        number = _IOPRIO_SET_SYSCALLS.get(platform.machine())
+        if number is None:
+            raise ExecutionError(f"I/O scheduling class is not supported on {platform.machine()}")
+        libc = ctypes.CDLL(None, use_errno=True)
+        ioprio = ioprio_value(limits.io_class, limits.io_priority)
+
+        def ioprio_set() -> None:
+            if libc.syscall(number, _IOPRIO_WHO_PROCESS, 0, ioprio) != 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno))
+
+    cgroup_procs = None
+    if limits.cgroup and cgroup_v2_available(cgroup_root):
+        cgroup_procs = os.path.join(cgroup_root, limits.cgroup.strip("/"), "cgroup.procs")
+        if not os.access(cgroup_procs, os.W_OK):
+            raise ExecutionError(f"Cannot place process in cgroup '{limits.cgroup}'")
+
+    nice = limits.nice
+    if not (rlimits or affinity or ioprio_set is not None or cgroup_procs or nice is not None):
+        return None
+
+    def apply_limits() -> None:
+        """Run in the child between fork and exec."""
+        if cgroup_procs is not None:
+            fd = os.open(cgroup_procs, os.O_WRONLY)
+            try:
+                os.write(fd, str(os.getpid()).encode())
+            finally:
+                os.close(fd)
+        for limit, values in rlimits:
+            resource.setrlimit(limit, values)
+        if nice is not None:
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+        if ioprio_set is not None:
+            ioprio_set()
+        if affinity:
+            os.sched_setaffinity(0, affinity)
+
+    return apply_limits
@@ -0,0 +1,109 @@
+"""Synthetic output generator for Ops Deck.
+
+Commands with a ``load`` profile produce output in-process instead of
+running a program, at a controlled rate and with a controlled mix of line
+lengths, stderr lines, ANSI colors and invalid UTF-8, so the runner and
+widgets can be soak-tested reproducibly on any machine.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+
+from ..models import LoadProfile, StreamType
+
+# Text lines are cut from (repeated as needed for longer lines)
+_TEXT = (
+    b"lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    b"incididunt ut labore et dolore magna aliqua ut enim ad minim veniam quis nostrud "
+    b"exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat "
+)
+# Byte sequences that are not valid UTF-8
+_INVALID = (b"\xff", b"\xc3\x28", b"\xe2\x82", b"\xf0\x28\x8c\xbc")
+_COLORS = (b"\x1b[31m", b"\x1b[1;32m", b"\x1b[33m", b"\x1b[38;5;208m", b"\x1b[7m")
+_RESET = b"\x1b[0m"
+# Longest pause between bursts, so cancellation and timeouts stay responsive
+_MAX_SLEEP = 0.25
+
+
+class LoadGenerator:
+    """Produces the lines described by a load profile."""
+
+    def __init__(self, profile: LoadProfile):
+        """Initialize the generator.
+
+        Args:
+            profile: What to generate
+        """
+        self.profile = profile
+        self._random = random.Random(profile.seed)
+        self._text = _TEXT * (2 * profile.line_length // len(_TEXT) + 2)
+        self.lines_written = 0
+
+    def line_length(self) -> int:
+        """Draw the length of the next line from the profile's distribution."""
+        mean = self.profile.line_length
+        distribution = self.profile.length_distribution
+        if distribution == "fixed" or mean == 0:
+            return mean
+        if distribution == "uniform":
+            return self._random.randint(0, 2 * mean)
+        return min(int(self._random.expovariate(1 / mean)), len(self._text) - 1)
+
+    def make_line(self) -> tuple[StreamType, bytes]:
+        """Build the next line (with its newline) and pick its stream."""
+        profile = self.profile
+        rand = self._random.random
+        number = b"%08d " % self.lines_written
+        length = self.line_length()
+        offset = self._random.randrange(len(_TEXT))
+        body = self._text[offset : offset + length]
+        if profile.ansi_ratio and rand() < profile.ansi_ratio:
+            cut = len(body) // 2
+            color = _COLORS[self._random.randrange(len(_COLORS))]
+            body = color + body[:cut] + _RESET + body[cut:]
+        if profile.invalid_utf8_ratio and rand() < profile.invalid_utf8_ratio:
+            cut = self._random.randrange(len(body) + 1)
+            body = body[:cut] + _INVALID[self._random.randrange(len(_INVALID))] + body[cut:]
+        stream = (
+            StreamType.STDERR
+            if profile.stderr_ratio and rand() < profile.stderr_ratio
+            else StreamType.STDOUT
+        )
+        self.lines_written += 1
+        return stream, number + body + b"\n"
+
+    async def run(self, on_line: Callable[[StreamType, bytes], None]) -> int:
+        """Write lines until the profile's line count or duration is reached.
+
+        Lines are written in bursts of ``burst_size``; bursts are scheduled
+        against the start time so the average rate holds however long each
+        burst takes to handle.
+
+        Args:
+            on_line: Callback receiving (stream, raw line bytes)
+
+        Returns:
+            The profile's exit code
+        """
+        profile = self.profile
+        interval = profile.burst_size / profile.lines_per_second
+        start = time.monotonic()
+        due = 0.0
+        while True:
+            elapsed = time.monotonic() - start
+            if profile.duration is not None and elapsed >= profile.duration:
+                break
+            if due > elapsed:
+                await asyncio.sleep(min(due - elapsed, _MAX_SLEEP))
+                continue
+            for _ in range(profile.burst_size):
+                if profile.lines is not None and self.lines_written >= profile.lines:
+                    return profile.exit_code
+                on_line(*self.make_line())
+            due += interval
+            if due <= elapsed:
+                # Running behind: still let the event loop (and the UI) run
+                await asyncio.sleep(0)
+        return profile.exit_code
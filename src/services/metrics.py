@@ -0,0 +1,231 @@
+"""Metrics extracted from command output for Ops Deck.
+
+A command's ``metrics`` pull numbers out of its output lines as they
+stream, with a regular expression or a path into JSON lines. Every value
+found is appended to the command's time series of that metric: a ring
+buffer of the last ``points`` values, so memory per series is fixed and no
+output is kept. The deck draws each series as a sparkline in the command
+list.
+"""
+
+import json
+import math
+import re
+import threading
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+
+from ..models import Command, MetricExtractor
+
+_BLOCKS = "▁▂▃▄▅▆▇█"
+_PATH_PART = re.compile(r"[^.\[\]]+")
+
+
+class MetricSeries:
+    """The most recent values of a metric, in a fixed-size ring buffer."""
+
+    def __init__(self, capacity: int):
+        """Initialize an empty series.
+
+        Args:
+            capacity: Values kept; older ones are overwritten
+        """
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        """Add a value, overwriting the oldest when full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def values(self) -> list[float]:
+        """Get the values, oldest first."""
+        if self._count < self.capacity:
+            return self._values[: self._count].tolist()
+        return (self._values[self._next :] + self._values[: self._next]).tolist()
+
+    @property
+    def last(self) -> float | None:
+        """The most recent value, if any."""
+        return self._values[self._next - 1] if self._count else None
+
+
+def sparkline(values: Sequence[float], width: int) -> str:
+    """Draw the last values of a series as block characters.
+
+    Args:
+        values: Values, oldest first
+        width: Characters to draw (the most recent values are shown)
+
+    Returns:
+        Sparkline, scaled between the smallest and largest value shown
+    """
+    values = [value for value in values[-width:] if math.isfinite(value)]
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    if high == low:
+        return _BLOCKS[len(_BLOCKS) // 2] * len(values)
+    scale = (len(_BLOCKS) - 1) / (high - low)
+    return "".join(_BLOCKS[round((value - low) * scale)] for value in values)
+
+
+def format_value(value: float) -> str:
+    """Format a metric value compactly (e.g. ``1.2k``, ``35.5``)."""
+    magnitude = abs(value)
+    for limit, suffix in ((1e12, "T"), (1e9, "G"), (1e6, "M"), (1e3, "k")):
+        if magnitude >= limit:
+            return f"{value / limit:.1f}{suffix}"
+    return f"{value:.3g}" if magnitude < 100 else f"{value:.0f}"
+
+
+def _parse_path(path: str) -> tuple[str | int, ...]:
+    """Split a JSON path like ``disks[0].free`` into keys and list indices."""
+    return tuple(int(part) if part.isdigit() else part for part in _PATH_PART.findall(path))
+
+
+def _lookup(value: object, path: tuple[str | int, ...]) -> object:
+    """Follow a parsed path into a JSON value (None where it does not exist)."""
+    for part in path:
+        if isinstance(value, dict):
+            value = value.get(str(part))
+        elif isinstance(value, list) and isinstance(part, int) and part < len(value):
+            value = value[part]
+        else:
+            return None
+    return value
+
+
+def _number(value: object) -> float | None:
+    """Convert a matched value to a number, if it is one."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, bytes):
+        value = value.decode("ascii", "replace")
+    try:
+        return float(str(value).replace(",", "").strip())
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def compile_metrics(
+    extractors: tuple[tuple[str, str | None, str | None], ...],
+) -> tuple[
+    tuple[tuple[str, re.Pattern[bytes], int | str], ...],
+    tuple[tuple[str, tuple[str | int, ...]], ...],
+]:
+    """Compile metric extractors.
+
+    Args:
+        extractors: (name, pattern, json_path) of each metric
+
+    Returns:
+        Tuple of (name, regex over raw bytes, group) of the pattern metrics
+        and (name, parsed path) of the JSON metrics
+
+    Raises:
+        re.error: If a pattern is not a valid regular expression
+    """
+    patterns = []
+    paths = []
+    for name, pattern, json_path in extractors:
+        if pattern is None:
+            paths.append((name, _parse_path(json_path or "")))
+            continue
+        try:
+            regex = re.compile(pattern.encode())
+        except re.error as e:
+            raise re.error(f"invalid metric {name!r} pattern {pattern!r}: {e}") from e
+        group: int | str = "value" if "value" in regex.groupindex else min(regex.groups, 1)
+        patterns.append((name, regex, group))
+    return tuple(patterns), tuple(paths)
+
+
+class OutputMetrics:
+    """Extracts one execution's metrics from its raw output lines."""
+
+    def __init__(self, extractors: Sequence[MetricExtractor]):
+        """Compile the extractors.
+
+        Args:
+            extractors: Metrics to extract
+
+        Raises:
+            re.error: If a pattern is not a valid regular expression
+        """
+        self.patterns, self.paths = compile_metrics(
+            tuple((metric.name, metric.pattern, metric.json_path) for metric in extractors)
+        )
+
+    @classmethod
+    def for_command(cls, command: Command) -> "OutputMetrics | None":
+        """Create the extractors of a command, or None if it has no metrics."""
+        if not command.metrics:
+            return None
+        return cls(command.metrics)
+
+    def extract(self, data: bytes) -> list[tuple[str, float]]:
+        """Find the metric values in a raw output line.
+
+        Returns:
+            (metric name, value) for every metric found in the line
+        """
+        found = []
+        for name, regex, group in self.patterns:
+            match = regex.search(data)
+            if match is not None:
+                value = _number(match.group(group))
+                if value is not None:
+                    found.append((name, value))
+        if self.paths and data.lstrip()[:1] in (b"{", b"["):
+            try:
+                document = json.loads(data)
+            except ValueError:
+                return found
+            for name, path in self.paths:
+                value = _number(_lookup(document, path))
+                if value is not None:
+                    found.append((name, value))
+        return found
+
+
+class MetricStore:
+    """Time series of every command's metrics, safe to update from any thread."""
+
+    def __init__(self) -> None:
+        self._series: dict[str, dict[str, MetricSeries]] = {}
+        self._lock = threading.Lock()
+        # Incremented on every change, so readers can skip redrawing
+        self.version = 0
+
+    def record(self, command: Command, metric: str, value: float) -> None:
+        """Add a value to a command's series of a metric.
+
+        Args:
+            command: Command whose output had the value
+            metric: Metric name
+            value: Value found
+        """
+        with self._lock:
+            series = self._series.setdefault(command.name, {})
+            metric_series = series.get(metric)
+            if metric_series is None:
+                points = next((m.points for m in command.metrics if m.name == metric), 60)
+                metric_series = series[metric] = MetricSeries(points)
+            metric_series.append(value)
+            self.version += 1
+
+    def series(self, command: str) -> dict[str, list[float]]:
+        """Get the values of each metric of a command, oldest first."""
+        with self._lock:
+            return {name: metric.values() for name, metric in self._series.get(command, {}).items()}
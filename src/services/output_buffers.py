@@ -0,0 +1,370 @@
+"""Per-execution output buffers for Ops Deck.
+
+Every execution (or fan-out/pipeline run) gets its own buffer of output
+lines. The store keeps the total size of the buffers in memory under a
+budget: when it is exceeded, the least recently used buffers of finished
+executions are written to disk and dropped from memory, and are read back
+the next time they are shown. Lines pushed out of a buffer's in-memory
+window by ``max_lines`` are appended to a scrollback file, so the whole
+output stays available to search and export.
+
+Buffers of commands with a structured ``format`` also hold the table parsed
+from their output, which stays in memory while the buffer is open.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TextIO
+
+from ..models import Execution, FanOutResult, OutputLine, PipelineResult
+from .table import TableParser
+
+# Approximate memory taken by one OutputLine besides its text
+LINE_OVERHEAD = 1000
+# Approximate memory taken by one color span
+SPAN_OVERHEAD = 64
+
+
+def line_size(line: OutputLine) -> int:
+    """Estimate the memory used by an output line in bytes."""
+    size = LINE_OVERHEAD + len(line.content)
+    if line.spans:
+        size += SPAN_OVERHEAD * len(line.spans)
+    return size
+
+
+@dataclass
+class OutputBuffer:
+    """Output lines and completion state of one execution."""
+
+    key: str
+    title: str
+    started: datetime = field(default_factory=datetime.now)
+    lines: deque[OutputLine] = field(default_factory=deque)
+    running: bool = True
+    # Command or pipeline the output comes from, once known
+    name: str | None = None
+    execution: Execution | None = None
+    fanout_result: FanOutResult | None = None
+    pipeline_result: PipelineResult | None = None
+    size: int = 0
+    line_count: int = 0
+    spill_path: str | None = None
+    first_line: int = 0
+    scrollback_path: str | None = None
+    table: TableParser | None = None
+
+    @property
+    def resident(self) -> bool:
+        """True if the lines are in memory (not evicted to disk)."""
+        return self.spill_path is None or self.line_count == len(self.lines)
+
+    @property
+    def total_lines(self) -> int:
+        """Lines in the scrollback and the in-memory window together."""
+        return self.first_line + self.line_count
+
+    def executions(self) -> list[Execution]:
+        """Get the finished executions the output came from."""
+        if self.execution is not None:
+            return [self.execution]
+        if self.fanout_result is not None:
+            return [result.execution for result in self.fanout_result.results]
+        if self.pipeline_result is not None:
+            return [
+                node.execution
+                for node in self.pipeline_result.nodes.values()
+                if node.execution is not None
+            ]
+        return []
+
+
+def read_lines(path: str, count: int | None = None, skip: int = 0) -> Iterator[OutputLine]:
+    """Read output lines back from a JSON Lines file.
+
+    Args:
+        path: File written by the store
+        count: Number of lines to read (None for all)
+        skip: Lines to skip first (without parsing them)
+
+    Yields:
+        Output lines in order
+    """
+    with open(path, encoding="utf-8") as lines:
+        for index, line in enumerate(lines):
+            if count is not None and index >= count:
+                return
+            if index >= skip:
+                yield OutputLine.model_validate_json(line)
+
+
+@dataclass(frozen=True)
+class BufferSnapshot:
+    """Point-in-time view of a buffer's whole output, safe to read from a worker thread."""
+
+    scrollback_path: str | None
+    scrollback_lines: int
+    lines: list[OutputLine]
+    spill_path: str | None = None
+    spill_lines: int = 0
+
+    def __len__(self) -> int:
+        return self.scrollback_lines + (self.spill_lines if self.spill_path else len(self.lines))
+
+    def iter_lines(self, start: int = 0) -> Iterator[OutputLine]:
+        """Iterate over the lines from an absolute line number onwards.
+
+        Args:
+            start: Number of the first line (0 is the first line ever output)
+
+        Yields:
+            Output lines in order
+        """
+        if start < self.scrollback_lines and self.scrollback_path:
+            yield from read_lines(self.scrollback_path, self.scrollback_lines, skip=start)
+        window_start = max(0, start - self.scrollback_lines)
+        if self.spill_path:
+            yield from read_lines(self.spill_path, self.spill_lines, skip=window_start)
+        else:
+            yield from self.lines[window_start:]
+
+
+class OutputBufferStore:
+    """Buffers of all executions, kept in memory under a size budget."""
+
+    def __init__(self, memory_budget: int, max_lines: int = 10000, spill_dir: str | None = None):
+        """Initialize the store.
+
+        Args:
+            memory_budget: Approximate bytes of output to keep in memory
+            max_lines: Lines kept per buffer; the oldest are dropped
+            spill_dir: Directory for evicted buffers (a temporary directory
+                is created on first eviction if None)
+        """
+        self.memory_budget = memory_budget
+        self.max_lines = max_lines
+        self._spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+        # Least recently used first
+        self._buffers: OrderedDict[str, OutputBuffer] = OrderedDict()
+        self.resident_size = 0
+        self.evictions = 0
+        # Key of the buffer on screen, which is never evicted
+        self.visible: str | None = None
+        self._scrollback_files: dict[str, TextIO] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._buffers
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def buffers(self) -> list[OutputBuffer]:
+        """Get all buffers in the order they were opened."""
+        return sorted(self._buffers.values(), key=lambda buffer: buffer.started)
+
+    def open(self, key: str, title: str) -> OutputBuffer:
+        """Get the buffer for a key, creating it if needed.
+
+        Args:
+            key: Execution or run ID
+            title: Label shown for the buffer
+
+        Returns:
+            The buffer
+        """
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = OutputBuffer(key=key, title=title)
+        return buffer
+
+    def append(self, key: str, line: OutputLine) -> OutputBuffer:
+        """Add a line to a buffer, dropping its oldest lines past ``max_lines``.
+
+        Args:
+            key: Buffer key (opened with a placeholder title if unknown)
+            line: Output line
+
+        Returns:
+            The buffer the line was added to
+        """
+        buffer = self.open(key, key)
+        if not buffer.resident:
+            self._load(buffer)
+        if buffer.spill_path:
+            # The spilled copy is out of date now
+            self._discard_spill(buffer)
+        size = line_size(line)
+        buffer.lines.append(line)
+        buffer.size += size
+        self.resident_size += size
+        if len(buffer.lines) > self.max_lines:
+            dropped = buffer.lines.popleft()
+            self._write_scrollback(buffer, [dropped])
+            dropped_size = line_size(dropped)
+            buffer.size -= dropped_size
+            self.resident_size -= dropped_size
+        buffer.line_count = len(buffer.lines)
+        self.enforce_budget()
+        return buffer
+
+    def complete(self, key: str) -> OutputBuffer | None:
+        """Mark a buffer finished, making it eligible for eviction.
+
+        Args:
+            key: Buffer key
+
+        Returns:
+            The buffer, or None if the key is unknown
+        """
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return None
+        buffer.running = False
+        self._close_scrollback(key)
+        self._buffers.move_to_end(key)
+        self.enforce_budget()
+        return buffer
+
+    def get(self, key: str) -> OutputBuffer | None:
+        """Get a buffer with its lines in memory, marking it recently used.
+
+        Args:
+            key: Buffer key
+
+        Returns:
+            The buffer, or None if the key is unknown
+        """
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return None
+        self._buffers.move_to_end(key)
+        if not buffer.resident:
+            self._load(buffer)
+            self.enforce_budget()
+        return buffer
+
+    def remove(self, key: str) -> None:
+        """Forget a buffer and delete its spill file."""
+        buffer = self._buffers.pop(key, None)
+        if buffer is None:
+            return
+        if buffer.resident:
+            self.resident_size -= buffer.size
+        self._discard_spill(buffer)
+        self._close_scrollback(key)
+        if buffer.scrollback_path:
+            try:
+                os.unlink(buffer.scrollback_path)
+            except OSError:
+                pass
+        if self.visible == key:
+            self.visible = None
+
+    def snapshot(self, key: str) -> BufferSnapshot | None:
+        """Capture a buffer's whole output for reading outside the UI thread.
+
+        The in-memory window is copied (references only) and the scrollback
+        is flushed, so later appends do not disturb a reader.
+
+        Args:
+            key: Buffer key
+
+        Returns:
+            Snapshot, or None if the key is unknown
+        """
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return None
+        scrollback = self._scrollback_files.get(key)
+        if scrollback is not None:
+            scrollback.flush()
+        if buffer.resident:
+            return BufferSnapshot(buffer.scrollback_path, buffer.first_line, list(buffer.lines))
+        return BufferSnapshot(
+            buffer.scrollback_path,
+            buffer.first_line,
+            [],
+            spill_path=buffer.spill_path,
+            spill_lines=buffer.line_count,
+        )
+
+    def enforce_budget(self) -> None:
+        """Evict finished buffers, least recently used first, until under budget."""
+        if self.resident_size <= self.memory_budget:
+            return
+        for buffer in list(self._buffers.values()):
+            if self.resident_size <= self.memory_budget:
+                break
+            evictable = not buffer.running and buffer.key != self.visible
+            if evictable and buffer.resident and buffer.lines:
+                self._evict(buffer)
+
+    def close(self) -> None:
+        """Delete all spill files."""
+        for key in list(self._buffers):
+            self.remove(key)
+        if self._owns_spill_dir and self._spill_dir:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _spill_directory(self) -> str:
+        """Get the directory for files on disk, creating it on first use."""
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="ops-deck-output-")
+        return self._spill_dir
+
+    def _write_scrollback(self, buffer: OutputBuffer, lines: list[OutputLine]) -> None:
+        """Append lines pushed out of the in-memory window to the scrollback file."""
+        scrollback = self._scrollback_files.get(buffer.key)
+        if scrollback is None:
+            if buffer.scrollback_path is None:
+                buffer.scrollback_path = os.path.join(
+                    self._spill_directory(), f"{buffer.key}.scrollback.jsonl"
+                )
+            scrollback = open(buffer.scrollback_path, "a", encoding="utf-8")
+            self._scrollback_files[buffer.key] = scrollback
+        for line in lines:
+            scrollback.write(line.model_dump_json())
+            scrollback.write("\n")
+        buffer.first_line += len(lines)
+
+    def _close_scrollback(self, key: str) -> None:
+        """Close a buffer's scrollback file if it is open."""
+        scrollback = self._scrollback_files.pop(key, None)
+        if scrollback is not None:
+            scrollback.close()
+
+    def _evict(self, buffer: OutputBuffer) -> None:
+        """Write a finished buffer to disk (once) and drop its lines."""
+        if buffer.spill_path is None:
+            path = os.path.join(self._spill_directory(), f"{buffer.key}.jsonl")
+            with open(path, "w", encoding="utf-8") as spill:
+                for line in buffer.lines:
+                    spill.write(line.model_dump_json())
+                    spill.write("\n")
+            buffer.spill_path = path
+        # A finished buffer never changes, so an existing spill file is current
+        buffer.lines = deque()
+        self.resident_size -= buffer.size
+        self.evictions += 1
+
+    def _discard_spill(self, buffer: OutputBuffer) -> None:
+        """Delete a buffer's spill file."""
+        if buffer.spill_path:
+            try:
+                os.unlink(buffer.spill_path)
+            except OSError:
+                pass
+            buffer.spill_path = None
+
+    def _load(self, buffer: OutputBuffer) -> None:
+        """Read an evicted buffer back into memory."""
+        with open(buffer.spill_path, encoding="utf-8") as spill:  # type: ignore[arg-type]
+            buffer.lines = deque(OutputLine.model_validate_json(line) for line in spill)
+        self.resident_size += buffer.size
@@ -0,0 +1,111 @@
+"""Helpers for combining user-supplied regular expressions.
+
+Several features (output triggers, highlighting) join many configured
+patterns into one alternation with a named group per pattern, so a line is
+scanned once however many patterns there are.
+"""
+
+import re
+from collections.abc import Sequence
+
+# Leading global flags such as "(?i)", which are only valid at the very start
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+# Pattern pieces that refer to a group by number: a "\N" backreference (a
+# leading 0 or three octal digits make an octal escape instead) or the test of
+# a "(?(N)...)" conditional. Other escapes, sets and comments are matched so
+# that digits inside them are left alone.
+_NUMBERED_REFERENCE = re.compile(
+    r"\\(?:0[0-7]{0,2}|[0-7]{3}|(?P<number>[1-9][0-9]?)|.)"
+    r"|\[\^?\]?(?:\\.|[^\]\\])*\]"
+    r"|\(\?#[^)]*\)"
+    r"|\(\?\((?P<condition>[0-9]+)\)",
+    re.DOTALL,
+)
+
+# Python only accepts backreferences to the first 99 groups
+_MAX_BACKREFERENCE = 99
+
+
+def scope_global_flags(pattern: str) -> str:
+    """Turn leading global flags into a scoped group so a pattern can be joined.
+
+    Args:
+        pattern: Regular expression, e.g. ``(?i)error``
+
+    Returns:
+        Equivalent pattern without global flags, e.g. ``(?i:error)``
+    """
+    flags = _GLOBAL_FLAGS.match(pattern)
+    if flags is None:
+        return pattern
+    return f"(?{flags.group(1)}:{pattern[flags.end():]})"
+
+
+def combine_patterns(patterns: Sequence[str], group_prefix: str) -> str:
+    """Join patterns into one alternation with a named group per pattern.
+
+    Group ``<group_prefix><N>`` wraps pattern N. It closes after any groups
+    inside the pattern, so ``match.lastgroup`` names the pattern that matched.
+    Earlier patterns win when several match at the same position. Numbered
+    backreferences are renumbered to the groups' place in the combined pattern.
+
+    Args:
+        patterns: Patterns to join (each must compile on its own)
+        group_prefix: Prefix of the wrapper group names
+
+    Returns:
+        Combined pattern source
+
+    Raises:
+        re.error: If two patterns use the same group name, or a backreference
+            would point past group 99 once the patterns are joined
+    """
+    names: dict[str, str] = {}
+    parts = []
+    offset = 1
+    for i, pattern in enumerate(patterns):
+        compiled = re.compile(pattern)
+        for name in compiled.groupindex:
+            if name in names:
+                raise re.error(
+                    f"group name {name!r} in pattern {pattern!r} is already used "
+                    f"by pattern {names[name]!r}"
+                )
+            names[name] = pattern
+        source = _shift_references(scope_global_flags(pattern), offset, pattern)
+        parts.append(f"(?P<{group_prefix}{i}>{source})")
+        offset += compiled.groups + 1
+    return "|".join(parts)
+
+
+def _shift_references(source: str, offset: int, pattern: str) -> str:
+    """Add ``offset`` to the group numbers a pattern refers to.
+
+    Args:
+        source: Pattern source to rewrite
+        offset: Number of groups before the pattern's own first group
+        pattern: Pattern as configured (for error messages)
+
+    Returns:
+        Rewritten pattern source
+
+    Raises:
+        re.error: If a backreference would point past group 99
+    """
+
+    def shift(match: re.Match[str]) -> str:
+        if match.group("number"):
+            number = int(match.group("number")) + offset
+            if number > _MAX_BACKREFERENCE:
+                raise re.error(
+                    f"backreference in pattern {pattern!r} refers to group {number} once "
+                    f"joined with the other patterns (at most {_MAX_BACKREFERENCE})"
+                )
+            # Grouped so a digit after the reference is not read as part of it
+            return f"(?:\\{number})"
+        if match.group("condition"):
+            return f"(?({int(match.group('condition')) + offset})"
+        return match.group()
+
+    return _NUMBERED_REFERENCE.sub(shift, source)
@@ -0,0 +1,196 @@
+"""Pipeline (DAG) execution service for Ops Deck.
+
+Runs every node whose dependencies have succeeded concurrently, up to a
+limit, and skips the dependents of failed nodes.
+"""
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+
+from ..exceptions import ConfigError, OpsError
+from ..models import (
+    Command,
+    Execution,
+    ExecutionStatus,
+    NodeResult,
+    OutputLine,
+    Pipeline,
+    PipelineResult,
+)
+from .command_runner import CommandRunner
+
+
+def topological_order(pipeline: Pipeline) -> list[str]:
+    """Order pipeline nodes so every node follows its dependencies.
+
+    Args:
+        pipeline: Pipeline to order
+
+    Returns:
+        Node names in a valid execution order
+
+    Raises:
+        ConfigError: If a dependency is unknown or the graph has a cycle
+    """
+    dependencies = pipeline.dependencies()
+    for name, deps in dependencies.items():
+        for dep in deps:
+            if dep not in dependencies:
+                raise ConfigError(
+                    f"Pipeline '{pipeline.name}': node '{name}' depends on unknown node '{dep}'"
+                )
+
+    remaining = {name: len(deps) for name, deps in dependencies.items()}
+    dependents = _dependents(pipeline)
+    ready = [name for name, count in remaining.items() if count == 0]
+    order: list[str] = []
+    while ready:
+        name = ready.pop()
+        order.append(name)
+        for child in dependents[name]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(child)
+
+    if len(order) != len(dependencies):
+        cyclic = sorted(name for name, count in remaining.items() if count > 0)
+        raise ConfigError(f"Pipeline '{pipeline.name}' has a dependency cycle: {', '.join(cyclic)}")
+    return order
+
+
+def _dependents(pipeline: Pipeline) -> dict[str, list[str]]:
+    """Map each node name to the nodes that depend on it."""
+    dependents: dict[str, list[str]] = {step.node_name: [] for step in pipeline.steps}
+    for step in pipeline.steps:
+        for dep in step.depends_on:
+            dependents.setdefault(dep, []).append(step.node_name)
+    return dependents
+
+
+class PipelineExecutor:
+    """Executes pipelines on top of a CommandRunner."""
+
+    def __init__(self, runner: CommandRunner, max_parallel: int = 8):
+        """Initialize the executor.
+
+        Args:
+            runner: Runner used for each node
+            max_parallel: Default concurrency cap
+        """
+        self.runner = runner
+        self.max_parallel = max_parallel
+
+    async def run(
+        self,
+        pipeline: Pipeline,
+        commands: dict[str, Command],
+        output_callback: Callable[[str, OutputLine], None] | None = None,
+        node_callback: Callable[[PipelineResult, NodeResult], None] | None = None,
+    ) -> PipelineResult:
+        """Run a pipeline with maximal parallelism.
+
+        Args:
+            pipeline: Pipeline to run
+            commands: Configured commands by name
+            output_callback: Optional callback receiving (node name, line)
+            node_callback: Optional callback receiving (result so far, node) when a
+                node finishes or is skipped
+
+        Returns:
+            PipelineResult with a NodeResult for every node
+
+        Raises:
+            ConfigError: If the pipeline is not a valid DAG or names an unknown command
+        """
+        topological_order(pipeline)
+        steps = {step.node_name: step for step in pipeline.steps}
+        for step in steps.values():
+            if step.command not in commands:
+                raise ConfigError(
+                    f"Pipeline '{pipeline.name}': unknown command '{step.command}'"
+                )
+
+        dependents = _dependents(pipeline)
+        remaining = {name: len(step.depends_on) for name, step in steps.items()}
+        result = PipelineResult(
+            pipeline=pipeline,
+            nodes={
+                name: NodeResult(name=name, depends_on=list(step.depends_on), execution=None)
+                for name, step in steps.items()
+            },
+            start_time=datetime.now(),
+            end_time=None,
+        )
+        limit = pipeline.max_parallel or self.max_parallel
+        ready = [step.node_name for step in pipeline.steps if not step.depends_on]
+        running: dict[asyncio.Task[Execution], str] = {}
+
+        def skip_dependents(name: str) -> None:
+            """Mark every transitive dependent of a failed node as skipped."""
+            for child in dependents[name]:
+                node = result.nodes[child]
+                if not node.skipped:
+                    node.skipped = True
+                    if node_callback:
+                        node_callback(result, node)
+                    skip_dependents(child)
+
+        while ready or running:
+            while ready and len(running) < limit:
+                name = ready.pop(0)
+                task = asyncio.ensure_future(
+                    self._run_node(name, commands[steps[name].command], output_callback)
+                )
+                running[task] = name
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                node = result.nodes[name]
+                node.execution = task.result()
+                if node_callback:
+                    node_callback(result, node)
+
+                if node.succeeded():
+                    for child in dependents[name]:
+                        remaining[child] -= 1
+                        if remaining[child] == 0 and not result.nodes[child].skipped:
+                            ready.append(child)
+                else:
+                    skip_dependents(name)
+
+        result.end_time = datetime.now()
+        return result
+
+    async def _run_node(
+        self,
+        name: str,
+        command: Command,
+        output_callback: Callable[[str, OutputLine], None] | None,
+    ) -> Execution:
+        """Run one node, turning runner errors into a failed execution."""
+        finished: list[Execution] = []
+
+        def on_output(line: OutputLine) -> None:
+            if output_callback:
+                output_callback(name, line)
+
+        try:
+            return await self.runner.run(
+                command, output_callback=on_output, completion_callback=finished.append
+            )
+        except OpsError as e:
+            if finished:
+                return finished[-1]
+            return Execution(
+                id=f"exec_error_{name}",
+                command=command,
+                start_time=None,
+                end_time=None,
+                exit_code=None,
+                status=ExecutionStatus.ERROR,
+                error_message=str(e),
+                stop_reason=None,
+                resource_usage=None,
+            )
@@ -0,0 +1,183 @@
+"""Live process-tree sampling for Ops Deck.
+
+Reads ``/proc`` to report CPU, memory, thread and I/O usage per process
+group. Each sample is a single pass over ``/proc``: one ``stat`` read per
+process on the system plus an ``io`` read for members of the watched groups,
+so the cost does not grow with the number of running executions.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+PROC_ROOT = "/proc"
+
+# Columns the monitor can be sorted by, mapped to their sort key
+SORT_KEYS = {
+    "cpu": lambda sample: sample.cpu_percent,
+    "rss": lambda sample: sample.rss_bytes,
+    "threads": lambda sample: sample.threads,
+    "read": lambda sample: sample.read_bytes,
+    "write": lambda sample: sample.write_bytes,
+    "name": lambda sample: sample.name,
+}
+
+
+@dataclass(slots=True)
+class GroupSample:
+    """Aggregated usage of one process group at one point in time."""
+
+    pgid: int
+    name: str
+    processes: int = 0
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+    threads: int = 0
+    read_bytes: int = 0
+    write_bytes: int = 0
+
+
+@dataclass(slots=True)
+class _ProcStat:
+    """The fields of ``/proc/<pid>/stat`` the monitor uses."""
+
+    pgid: int
+    cpu_ticks: int
+    threads: int
+    rss_pages: int
+
+
+def parse_stat(data: bytes) -> _ProcStat | None:
+    """Parse the contents of ``/proc/<pid>/stat``.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        Parsed fields, or None if the contents are malformed
+    """
+    # The command name is parenthesised and may itself contain spaces or ")"
+    end = data.rfind(b")")
+    fields = data[end + 2 :].split()
+    # fields[0] is the state (stat field 3), so stat field N is fields[N - 3]
+    try:
+        return _ProcStat(
+            pgid=int(fields[2]),
+            cpu_ticks=int(fields[11]) + int(fields[12]),
+            threads=int(fields[17]),
+            rss_pages=int(fields[21]),
+        )
+    except (IndexError, ValueError):
+        return None
+
+
+def parse_io(data: bytes) -> tuple[int, int]:
+    """Parse storage read/write bytes from ``/proc/<pid>/io``.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        Tuple of (read_bytes, write_bytes)
+    """
+    values = {}
+    for line in data.splitlines():
+        key, _, value = line.partition(b":")
+        values[key] = value
+    try:
+        return int(values.get(b"read_bytes", 0)), int(values.get(b"write_bytes", 0))
+    except ValueError:
+        return 0, 0
+
+
+def _read(path: str) -> bytes | None:
+    """Read a small /proc file, or None if the process is gone or hidden."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class ProcessMonitor:
+    """Samples the resource usage of a set of process groups.
+
+    CPU percentages are computed from the change in CPU time between two
+    consecutive samples, so the first sample of a group reports 0%.
+    """
+
+    def __init__(self, proc_root: str = PROC_ROOT):
+        """Initialize the monitor.
+
+        Args:
+            proc_root: Mount point of procfs
+        """
+        self.proc_root = proc_root
+        self._previous_ticks: dict[int, int] = {}
+        self._previous_time: float | None = None
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def sample(self, groups: dict[int, str]) -> list[GroupSample]:
+        """Take one sample of the given process groups.
+
+        Args:
+            groups: Process group IDs to watch, mapped to a display name
+
+        Returns:
+            One GroupSample per watched group, in the order given
+        """
+        now = time.monotonic()
+        elapsed = now - self._previous_time if self._previous_time is not None else 0.0
+        self._previous_time = now
+
+        samples = {pgid: GroupSample(pgid=pgid, name=name) for pgid, name in groups.items()}
+        ticks: dict[int, int] = {}
+        try:
+            entries = os.scandir(self.proc_root)
+        except OSError:
+            return list(samples.values())
+
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                data = _read(f"{entry.path}/stat")
+                if data is None:
+                    continue
+                stat = parse_stat(data)
+                if stat is None or stat.pgid not in samples:
+                    continue
+
+                pid = int(entry.name)
+                group = samples[stat.pgid]
+                group.processes += 1
+                group.threads += stat.threads
+                group.rss_bytes += stat.rss_pages * self._page_size
+                ticks[pid] = stat.cpu_ticks
+                previous = self._previous_ticks.get(pid)
+                if previous is not None and elapsed > 0:
+                    seconds = (stat.cpu_ticks - previous) / self._clock_ticks
+                    group.cpu_percent += 100.0 * seconds / elapsed
+
+                io = _read(f"{entry.path}/io")
+                if io is not None:
+                    read_bytes, write_bytes = parse_io(io)
+                    group.read_bytes += read_bytes
+                    group.write_bytes += write_bytes
+
+        self._previous_ticks = ticks
+        return list(samples.values())
+
+
+def sort_samples(samples: list[GroupSample], key: str) -> list[GroupSample]:
+    """Sort samples like ``top``: largest first, names alphabetically.
+
+    Args:
+        samples: Samples to sort
+        key: One of ``SORT_KEYS``
+
+    Returns:
+        Sorted copy of the samples
+    """
+    return sorted(samples, key=SORT_KEYS[key], reverse=key != "name")
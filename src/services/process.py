@@ -0,0 +1,141 @@
+"""Child process handling for Ops Deck.
+
+Wraps ``subprocess.Popen`` with asyncio stream readers and reaps the child
+with ``os.wait4`` so that its resource usage can be recorded.
+"""
+
+import asyncio
+import os
+import resource
+import signal
+import subprocess
+from collections.abc import Callable, Sequence
+
+
+class SpawnedProcess:
+    """A child process started in its own session, with async pipes.
+
+    The child is reaped with ``wait4`` (woken by a pidfd where the kernel
+    supports it, otherwise from a worker thread), which yields the rusage of
+    the child and every descendant it waited for.
+    """
+
+    def __init__(self, popen: subprocess.Popen):
+        """Wrap an already started process.
+
+        Use :meth:`start` instead of calling this directly.
+
+        Args:
+            popen: Process started with stdout/stderr pipes
+        """
+        self.popen = popen
+        self.pid = popen.pid
+        self.stdout: asyncio.StreamReader | None = None
+        self.stderr: asyncio.StreamReader | None = None
+        self.returncode: int | None = None
+        self.rusage: resource.struct_rusage | None = None
+        self._transports: list[asyncio.BaseTransport] = []
+        self._exit: asyncio.Future[int] | None = None
+
+    @classmethod
+    async def start(
+        cls,
+        args: str | Sequence[str],
+        shell: bool,
+        env: dict[str, str] | None = None,
+        preexec_fn: Callable[[], None] | None = None,
+    ) -> "SpawnedProcess":
+        """Start a process in a new session and attach async readers.
+
+        Args:
+            args: Command string (shell) or argument sequence (exec)
+            shell: Whether to run ``args`` through ``/bin/sh -c``
+            env: Environment for the child (None inherits ours)
+            preexec_fn: Optional callable run in the child before exec
+
+        Returns:
+            Started process
+
+        Raises:
+            OSError: If the program cannot be executed
+        """
+        # Forking (and running preexec_fn) blocks, so it happens off the event loop
+        popen = await asyncio.to_thread(
+            subprocess.Popen,
+            args,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            start_new_session=True,
+            preexec_fn=preexec_fn,
+        )
+        process = cls(popen)
+        loop = asyncio.get_running_loop()
+        process.stdout = await process._connect(loop, popen.stdout)
+        process.stderr = await process._connect(loop, popen.stderr)
+        process._watch_exit(loop)
+        return process
+
+    async def _connect(self, loop: asyncio.AbstractEventLoop, pipe) -> asyncio.StreamReader:
+        """Attach an asyncio StreamReader to a pipe."""
+        reader = asyncio.StreamReader(loop=loop)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe
+        )
+        self._transports.append(transport)
+        return reader
+
+    def _watch_exit(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Arrange for the child to be reaped with wait4 when it exits."""
+        self._exit = loop.create_future()
+        try:
+            pidfd = os.pidfd_open(self.pid)
+        except (AttributeError, OSError):
+            waiter = loop.run_in_executor(None, os.wait4, self.pid, 0)
+            waiter.add_done_callback(lambda f: self._reaped(f.result()))
+            return
+
+        def on_exit() -> None:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+            self._reaped(os.wait4(self.pid, 0))
+
+        loop.add_reader(pidfd, on_exit)
+
+    def _reaped(self, result: tuple[int, int, resource.struct_rusage]) -> None:
+        """Record the exit status and resource usage of the reaped child."""
+        _, status, rusage = result
+        self.returncode = os.waitstatus_to_exitcode(status)
+        self.rusage = rusage
+        # Keep Popen from trying to reap the child a second time
+        self.popen.returncode = self.returncode
+        if self._exit and not self._exit.done():
+            self._exit.set_result(self.returncode)
+
+    async def wait(self) -> int:
+        """Wait for the child to exit.
+
+        Safe to call concurrently and to cancel (e.g. under ``wait_for``).
+
+        Returns:
+            Exit code (negative signal number if killed by a signal)
+        """
+        assert self._exit is not None
+        return await asyncio.shield(self._exit)
+
+    def signal_group(self, sig: signal.Signals) -> None:
+        """Send a signal to the child's process group.
+
+        Args:
+            sig: Signal to send
+        """
+        try:
+            os.killpg(self.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def close(self) -> None:
+        """Close the pipe transports (e.g. if a descendant still holds them)."""
+        for transport in self._transports:
+            transport.close()
@@ -0,0 +1,331 @@
+"""Python task backend for Ops Deck.
+
+Commands with a ``callable`` run a Python function in a pool of warm
+worker processes instead of starting an interpreter per run. Whatever the
+function prints, and what it logs, streams back as output lines.
+
+The function's result becomes the exit code: None or True is 0, False is
+1, an int is used as-is. An exception prints its traceback to stderr and
+exits 1; ``SystemExit`` exits with its code.
+
+Each worker runs one task at a time and talks to the deck over its own
+pipe, so a run that times out or is cancelled kills only its worker; the
+pool starts a replacement and other runs carry on.
+"""
+
+import asyncio
+import contextlib
+import importlib
+import io
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import traceback
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from typing import Any
+
+from ..exceptions import ExecutionError
+from ..models import Command, StreamType
+from .capture import OutputCapture
+from .command_runner import ActiveExecution, AsyncCommandRunner, LineCallback
+
+# Message kinds sent from workers
+_STDOUT = "stdout"
+_STDERR = "stderr"
+_FINISHED = "finished"
+_STREAMS = {_STDOUT: StreamType.STDOUT, _STDERR: StreamType.STDERR}
+
+
+def import_callable(target: str) -> Callable[..., Any]:
+    """Import a callable from ``package.module:function`` or ``package.module.function``.
+
+    Raises:
+        ImportError: If the module cannot be imported
+        AttributeError: If the module has no such attribute
+        TypeError: If the attribute is not callable
+    """
+    module_name, _, attribute = target.rpartition(":" if ":" in target else ".")
+    function: Callable[..., Any] = getattr(importlib.import_module(module_name), attribute)
+    if not callable(function):
+        raise TypeError(f"{target} is not callable")
+    return function
+
+
+# --- Worker side -----------------------------------------------------------
+
+_connection: Connection | None = None
+_send_lock = threading.Lock()
+_targets: dict[str, Callable[..., Any]] = {}
+
+
+def _send(kind: str, payload: Any) -> None:
+    """Send a message to the deck (output may come from several threads)."""
+    assert _connection is not None
+    with _send_lock:
+        _connection.send((kind, payload))
+
+
+class _LineWriter(io.TextIOBase):
+    """Text stream that sends each complete line of a task's output to the deck."""
+
+    def __init__(self, stream: str):
+        self.stream = stream
+        self._pending = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._pending += text
+        if "\n" in self._pending:
+            *lines, self._pending = self._pending.split("\n")
+            for line in lines:
+                _send(self.stream, line.encode("utf-8", "surrogateescape"))
+        return len(text)
+
+    def flush(self) -> None:
+        if self._pending:
+            _send(self.stream, self._pending.encode("utf-8", "surrogateescape"))
+            self._pending = ""
+
+
+class _TaskLogHandler(logging.Handler):
+    """Logging handler writing records to the running task's stderr."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            sys.stderr.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+def _exit_code(result: Any) -> int:
+    """Turn a callable's result into an exit code."""
+    if result is None or result is True:
+        return 0
+    if result is False:
+        return 1
+    if isinstance(result, int):
+        return result
+    print(repr(result))
+    return 0
+
+
+def _run_task(target: str, arguments: dict[str, Any]) -> int:
+    """Run a callable with its output redirected to the deck.
+
+    Returns:
+        Exit code
+    """
+    stdout, stderr = _LineWriter(_STDOUT), _LineWriter(_STDERR)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                function = _targets.get(target)
+                if function is None:
+                    function = _targets[target] = import_callable(target)
+                return _exit_code(function(**arguments))
+            except SystemExit as e:
+                return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except BaseException:
+                traceback.print_exc()
+                return 1
+    finally:
+        stdout.flush()
+        stderr.flush()
+
+
+def _worker_main(connection: Connection, cwd: str) -> None:
+    """Run tasks received from the deck until the pipe closes."""
+    global _connection
+    _connection = connection
+    if cwd not in sys.path:
+        sys.path.insert(0, cwd)
+    # Stopping runs is done by killing the worker; don't die on the deck's ^C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    handler = _TaskLogHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+    while True:
+        try:
+            request = connection.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        _send(_FINISHED, _run_task(*request))
+
+
+# --- Deck side -------------------------------------------------------------
+
+
+class _Worker:
+    """A worker process and the deck's end of its pipe."""
+
+    def __init__(self, context: BaseContext, cwd: str):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(  # type: ignore[attr-defined]
+            target=_worker_main, args=(child, cwd), name="ops-deck-python", daemon=True
+        )
+        self.process.start()
+        # Only the worker holds its end now, so its exit ends our reads
+        child.close()
+
+    def stop(self) -> None:
+        """Ask the worker to exit once it is idle."""
+        with contextlib.suppress(OSError):
+            self.connection.send(None)
+        self.connection.close()
+
+    def kill(self) -> None:
+        """Kill the worker, whatever it is doing (reads of its pipe then fail)."""
+        with contextlib.suppress(ProcessLookupError):
+            self.process.kill()
+        self.process.join()
+
+
+def _relay(
+    connection: Connection, loop: asyncio.AbstractEventLoop, on_line: LineCallback
+) -> int:
+    """Deliver a task's output to its event loop until it finishes (thread).
+
+    Returns:
+        Exit code
+
+    Raises:
+        EOFError: If the worker exited
+    """
+    while True:
+        kind, payload = connection.recv()
+        if kind == _FINISHED:
+            return int(payload)
+        loop.call_soon_threadsafe(on_line, _STREAMS[kind], payload)
+
+
+class PythonTaskRunner(AsyncCommandRunner):
+    """Runner that executes ``callable`` commands on a warm process pool.
+
+    Commands without a callable run as with :class:`AsyncCommandRunner`;
+    callables get the same output handling (decoding, triggers, capture,
+    recording) and the same timeout, cancellation and status semantics.
+    """
+
+    def __init__(self, workers: int = 2, **kwargs):
+        """Initialize the runner.
+
+        Args:
+            workers: Idle worker processes kept for callables (more are
+                started while more callables run at once)
+            **kwargs: Passed to :class:`AsyncCommandRunner`
+        """
+        super().__init__(**kwargs)
+        self.workers = workers
+        self._context = multiprocessing.get_context("forkserver")
+        self._idle: list[_Worker] = []
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the idle workers (done on first use if not called)."""
+        with self._lock:
+            self._started = True
+            missing = self.workers - len(self._idle)
+        for _ in range(missing):
+            self._release(self._spawn())
+
+    def close(self) -> None:
+        """Stop the idle workers; running ones stop when their task ends."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._started = False
+        for worker in idle:
+            worker.stop()
+
+    def _spawn(self) -> _Worker:
+        """Start a worker process."""
+        # The first worker starts the fork server and resource tracker, which
+        # inherit stderr: it must be a real file even while a TUI replaces it
+        with contextlib.redirect_stderr(sys.__stderr__):
+            return _Worker(self._context, os.getcwd())
+
+    async def _acquire(self) -> _Worker:
+        """Take an idle worker, or start one if none is idle."""
+        with self._lock:
+            self._started = True
+            if self._idle:
+                return self._idle.pop()
+        # Starting a worker (and the fork server, the first time) blocks
+        return await asyncio.to_thread(self._spawn)
+
+    def _release(self, worker: _Worker) -> None:
+        """Return a worker to the pool, stopping it if the pool is full or closed."""
+        with self._lock:
+            if self._started and len(self._idle) < self.workers:
+                self._idle.append(worker)
+                return
+        worker.stop()
+
+    async def _execute(
+        self,
+        command: Command,
+        active: ActiveExecution,
+        on_line: LineCallback,
+        capture: OutputCapture | None,
+    ) -> int | None:
+        """Run callables on the pool and everything else as usual."""
+        if command.callable is None:
+            return await super()._execute(command, active, on_line, capture)
+        return await self._run_callable(command, active, on_line)
+
+    async def _run_callable(
+        self, command: Command, active: ActiveExecution, on_line: LineCallback
+    ) -> int | None:
+        """Run a command's callable in a pool worker.
+
+        Returns:
+            Exit code, or None if the execution was stopped
+
+        Raises:
+            ExecutionError: If the worker died
+            TimeoutError: If execution exceeds timeout
+        """
+        assert command.callable is not None
+        worker = await self._acquire()
+        try:
+            worker.connection.send((command.callable, command.arguments))
+            work = asyncio.ensure_future(
+                asyncio.to_thread(_relay, worker.connection, asyncio.get_running_loop(), on_line)
+            )
+            finished = await self._supervise(work, active, command.timeout)
+        except BaseException:
+            worker.kill()
+            raise
+        if finished:
+            try:
+                code = work.result()
+            except (EOFError, OSError):
+                worker.kill()
+                worker.connection.close()
+                raise ExecutionError(
+                    f"Python worker process died (exit code {worker.process.exitcode})"
+                )
+            self._release(worker)
+            return code
+
+        # A running function cannot be interrupted: replace its worker
+        worker.kill()
+        with contextlib.suppress(EOFError, OSError):
+            await work
+        worker.connection.close()
+        if self._started:
+            self._release(await asyncio.to_thread(self._spawn))
+        if not active.stop_event.is_set():
+            raise self._timeout_error(active.execution)
+        return None
@@ -0,0 +1,269 @@
+"""Session recording and replay for Ops Deck.
+
+A recording holds an execution's raw output chunks (as read from its
+pipes, before decoding) with the time between them, in a compact binary
+file:
+
+- the magic bytes ``OPSREC1\\n``;
+- a varint-prefixed JSON header (command name and definition, start time);
+- one record per chunk: varint delay in microseconds since the previous
+  chunk, one stream byte, varint length and the raw bytes;
+- an end record (stream byte 2) whose data is the exit code.
+
+:class:`ReplayRunner` plays a recording back through the same decoding,
+trigger and capture path as a live command, at recorded speed, N times
+faster or as fast as possible.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, BinaryIO
+
+from pydantic import ValidationError
+
+from ..exceptions import ExecutionError
+from ..models import Command, Execution, StreamType
+from .capture import OutputCapture
+from .command_runner import ActiveExecution, AsyncCommandRunner, LineCallback
+
+MAGIC = b"OPSREC1\n"
+FILE_SUFFIX = ".opsrec"
+
+_STREAM_CODES = {StreamType.STDOUT: 0, StreamType.STDERR: 1}
+_CODE_STREAMS = {code: stream for stream, code in _STREAM_CODES.items()}
+_END = 2
+_BUFFER_SIZE = 1024 * 1024
+# Chunks replayed between yields to the event loop at maximum speed
+_YIELD_EVERY = 256
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer as a LEB128 varint."""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(file: BinaryIO) -> int | None:
+    """Read a LEB128 varint, or return None at the end of the file."""
+    result = shift = 0
+    while True:
+        byte = file.read(1)
+        if not byte:
+            if shift:
+                raise ExecutionError("Recording is truncated")
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+@dataclass(frozen=True)
+class RecordedChunk:
+    """One chunk of recorded output."""
+
+    delay: float
+    stream: StreamType
+    data: bytes
+
+
+class SessionRecorder:
+    """Writes an execution's output chunks and their timing to a recording."""
+
+    def __init__(self, path: str, command: Command):
+        """Create the recording file and write its header.
+
+        Args:
+            path: File to write
+            command: Command being recorded
+        """
+        self.path = path
+        self.chunks = 0
+        self._file = open(path, "wb", buffering=_BUFFER_SIZE)
+        header = json.dumps(
+            {
+                "name": command.name,
+                # The whole definition, so a replay has the same triggers and capture
+                "command": command.model_dump(mode="json"),
+                "started": datetime.now().isoformat(),
+            }
+        ).encode()
+        self._file.write(MAGIC + _encode_varint(len(header)) + header)
+        self._last = time.perf_counter_ns()
+
+    @classmethod
+    def for_execution(cls, directory: str, execution: Execution) -> "SessionRecorder":
+        """Start a recording named after an execution in a directory."""
+        os.makedirs(directory, exist_ok=True)
+        name = f"{execution.command.name}-{execution.id}{FILE_SUFFIX}".replace(os.sep, "_")
+        return cls(os.path.join(directory, name), execution.command)
+
+    def record(self, stream: StreamType, data: bytes) -> None:
+        """Append a chunk with the time elapsed since the previous one."""
+        now = time.perf_counter_ns()
+        delay_us = (now - self._last) // 1000
+        self._last = now
+        self._file.write(
+            _encode_varint(delay_us)
+            + bytes((_STREAM_CODES[stream],))
+            + _encode_varint(len(data))
+            + data
+        )
+        self.chunks += 1
+
+    def tap(self, on_line: LineCallback) -> LineCallback:
+        """Wrap a line callback so every chunk is recorded before it is handled."""
+
+        def recorded(stream: StreamType, data: bytes) -> None:
+            self.record(stream, data)
+            on_line(stream, data)
+
+        return recorded
+
+    def close(self, exit_code: int | None) -> None:
+        """Write the end record and close the file."""
+        if self._file.closed:
+            return
+        data = b"" if exit_code is None else str(exit_code).encode()
+        self._file.write(_encode_varint(0) + bytes((_END,)) + _encode_varint(len(data)) + data)
+        self._file.close()
+
+
+class Recording:
+    """A recording opened for reading."""
+
+    def __init__(self, path: str):
+        """Read the header of a recording.
+
+        Args:
+            path: Recording file
+
+        Raises:
+            ExecutionError: If the file is not a recording
+            OSError: If the file cannot be read
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ExecutionError(f"Not an Ops Deck recording: {path}")
+            size = _read_varint(file)
+            if size is None:
+                raise ExecutionError("Recording is truncated")
+            self.header: dict[str, Any] = json.loads(file.read(size))
+            self._data_offset = file.tell()
+        self.exit_code: int | None = None
+
+    def command(self) -> Command:
+        """Build the recorded command (for showing a replay in the deck).
+
+        Older recordings only hold the command line, which is empty for
+        generated output; a replay never runs it, so the file name stands in.
+
+        Raises:
+            ExecutionError: If the header does not describe a valid command
+        """
+        spec = self.header.get("command")
+        if not isinstance(spec, dict):
+            spec = {
+                "name": self.header.get("name") or os.path.basename(self.path),
+                "command": spec or os.path.basename(self.path),
+            }
+        try:
+            return Command.model_validate(spec)
+        except ValidationError as e:
+            raise ExecutionError(f"Recording {self.path} has an invalid command: {e}") from e
+
+    def chunks(self) -> Iterator[RecordedChunk]:
+        """Read the recorded chunks in order, setting :attr:`exit_code` at the end."""
+        with open(self.path, "rb", buffering=_BUFFER_SIZE) as file:
+            file.seek(self._data_offset)
+            while True:
+                delay_us = _read_varint(file)
+                if delay_us is None:
+                    return
+                code = file.read(1)
+                length = _read_varint(file)
+                if not code or length is None:
+                    raise ExecutionError("Recording is truncated")
+                data = file.read(length)
+                if len(data) < length:
+                    raise ExecutionError("Recording is truncated")
+                if code[0] == _END:
+                    self.exit_code = int(data) if data else None
+                    return
+                yield RecordedChunk(delay_us / 1e6, _CODE_STREAMS[code[0]], data)
+
+
+class ReplayRunner(AsyncCommandRunner):
+    """Runner that plays a recorded session back instead of starting a process.
+
+    Output goes through the same decoding, trigger, capture, timeout and
+    cancellation handling as :class:`AsyncCommandRunner`; the execution
+    finishes with the recorded exit code.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, **kwargs):
+        """Initialize the runner.
+
+        Args:
+            path: Recording to play for every command run
+            speed: Playback speed multiplier (0 for as fast as possible)
+            **kwargs: Passed to :class:`AsyncCommandRunner` (a shell pool is
+                never used)
+        """
+        kwargs.pop("shell_pool", None)
+        super().__init__(**kwargs)
+        self.recording = Recording(path)
+        self.speed = speed
+
+    async def _execute(
+        self,
+        command: Command,
+        active: ActiveExecution,
+        on_line: LineCallback,
+        capture: OutputCapture | None,
+    ) -> int | None:
+        """Play the recording in place of running the command.
+
+        Returns:
+            Recorded exit code (-1 if the recording has none), or None if
+            playback was stopped
+
+        Raises:
+            TimeoutError: If playback exceeds the command's timeout
+        """
+        work = asyncio.ensure_future(self._play(on_line, capture))
+        if not await self._supervise(work, active, command.timeout):
+            work.cancel()
+            if not active.stop_event.is_set():
+                raise self._timeout_error(active.execution)
+            return None
+        await work
+        return -1 if self.recording.exit_code is None else self.recording.exit_code
+
+    async def _play(self, on_line: LineCallback, capture: OutputCapture | None) -> None:
+        """Feed recorded chunks to the line callback, keeping their timing."""
+        start = time.perf_counter()
+        # Chunks are scheduled against the start time so sleeps don't drift
+        due = 0.0
+        for index, chunk in enumerate(self.recording.chunks()):
+            if self.speed > 0:
+                due += chunk.delay / self.speed
+                wait = due - (time.perf_counter() - start)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            elif index % _YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+            if capture is not None and capture.capped:
+                capture.drop(chunk.data.count(b"\n"), len(chunk.data))
+            else:
+                on_line(chunk.stream, chunk.data)
@@ -0,0 +1,129 @@
+"""Output search for Ops Deck.
+
+Searches run over a :class:`BufferSnapshot` of an execution's whole output
+(scrollback on disk and the in-memory window) in chunks, so matches can be
+reported while the scan is still going. A search remembers how far it has
+scanned; running it again after more output arrived only scans the new
+lines.
+"""
+
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+
+from .output_buffers import BufferSnapshot
+
+# Lines scanned between progress reports (and cancellation checks)
+CHUNK_LINES = 5000
+# Characters of a line shown for a match outside the in-memory window
+PREVIEW_CHARS = 60
+
+
+def compile_query(query: str, regex: bool = False) -> re.Pattern[str]:
+    """Compile a search query.
+
+    Matching is case-insensitive unless the query contains an uppercase
+    letter ("smart case").
+
+    Args:
+        query: Text or regular expression to find
+        regex: Treat the query as a regular expression
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        re.error: If a regex query is invalid
+    """
+    flags = 0 if any(char.isupper() for char in query) else re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags)
+
+
+@dataclass
+class SearchState:
+    """Matches of one query in one buffer."""
+
+    query: str
+    regex: bool
+    pattern: re.Pattern[str]
+    # Absolute line numbers of matching lines, in order
+    matches: list[int] = field(default_factory=list)
+    # Lines scanned so far
+    scanned: int = 0
+    scanning: bool = False
+    # Index into matches of the current match (-1 before the first jump)
+    current: int = -1
+
+    def same_query(self, query: str, regex: bool) -> bool:
+        """Check whether a query is the one this state was built for."""
+        return self.query == query and self.regex == regex
+
+    def step(self, forward: bool = True) -> int | None:
+        """Move to the next or previous match, wrapping around.
+
+        Returns:
+            Absolute line number of the new current match, or None if there
+            are no matches
+        """
+        if not self.matches:
+            return None
+        if self.current < 0:
+            self.current = 0 if forward else len(self.matches) - 1
+        else:
+            self.current = (self.current + (1 if forward else -1)) % len(self.matches)
+        return self.matches[self.current]
+
+
+def scan(
+    pattern: re.Pattern[str],
+    snapshot: BufferSnapshot,
+    start: int = 0,
+    chunk_lines: int = CHUNK_LINES,
+) -> Iterator[tuple[int, int, list[int]]]:
+    """Scan a snapshot for matching lines, one chunk at a time.
+
+    Args:
+        pattern: Compiled query
+        snapshot: Output to scan
+        start: Absolute number of the first line to scan
+        chunk_lines: Lines per chunk
+
+    Yields:
+        Tuples of (first line of the chunk, line after the chunk, matching
+        line numbers in the chunk)
+    """
+    search = pattern.search
+    lines = snapshot.iter_lines(start)
+    number = start
+    while True:
+        chunk = list(islice(lines, chunk_lines))
+        if not chunk:
+            return
+        first = number
+        found = []
+        for line in chunk:
+            if search(line.content):
+                found.append(number)
+            number += 1
+        yield first, number, found
+
+
+def run_search(
+    state: SearchState,
+    snapshot: BufferSnapshot,
+    on_progress: Callable[[int, int, list[int]], None],
+    cancelled: Callable[[], bool] = lambda: False,
+) -> None:
+    """Scan the lines a search has not seen yet, reporting each chunk.
+
+    Args:
+        state: Search to continue (only read here; ``on_progress`` applies results)
+        snapshot: Output to scan
+        on_progress: Callback receiving each chunk as yielded by :func:`scan`
+        cancelled: Returns True when the scan should stop
+    """
+    for chunk in scan(state.pattern, snapshot, state.scanned):
+        if cancelled():
+            return
+        on_progress(*chunk)
@@ -0,0 +1,311 @@
+"""Pre-forked shell worker pool for Ops Deck.
+
+Keeps persistent ``/bin/sh`` processes around and runs commands in them over
+a framed stdin/stdout protocol, avoiding a fresh shell spawn per execution.
+
+Each request is written to the worker's stdin as::
+
+    ( eval '<command>' ) </dev/null
+    printf '%s %d\\n' '<sentinel>' "$?"
+    printf '%s\\n' '<sentinel>' >&2
+
+The subshell isolates ``cd``/``export`` side effects from later runs, and the
+per-run random sentinel delimits the command's stdout (followed by its exit
+code) and stderr.
+"""
+
+import asyncio
+import os
+import re
+import shlex
+import signal
+import subprocess
+import threading
+import uuid
+from collections.abc import Callable
+
+from ..exceptions import ExecutionError
+from ..models import Command, StreamType
+
+LineCallback = Callable[[StreamType, bytes], None]
+
+# Environment variable names the shell can unset
+_VARIABLE_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class ShellWorker:
+    """A persistent shell process that runs one command at a time."""
+
+    def __init__(self, shell: str = "/bin/sh"):
+        """Start the worker shell.
+
+        This blocks while the shell is forked; use :meth:`start` on an
+        event loop.
+
+        Args:
+            shell: Path of the POSIX shell to run
+        """
+        environment = dict(os.environ)
+        self.process = subprocess.Popen(
+            [shell],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=environment,
+            start_new_session=True,
+        )
+        # Unset for commands with their own env, as the spawn path replaces it
+        self._inherited = sorted(name for name in environment if _VARIABLE_NAME.fullmatch(name))
+        self.runs = 0
+        self._buffers = {StreamType.STDOUT: b"", StreamType.STDERR: b""}
+        self._fds = {
+            StreamType.STDOUT: self.process.stdout.fileno(),  # type: ignore
+            StreamType.STDERR: self.process.stderr.fileno(),  # type: ignore
+        }
+        for fd in self._fds.values():
+            os.set_blocking(fd, False)
+
+    @classmethod
+    async def start(cls, shell: str = "/bin/sh") -> "ShellWorker":
+        """Start a worker shell without blocking the event loop.
+
+        Args:
+            shell: Path of the POSIX shell to run
+
+        Returns:
+            Started worker
+        """
+        return await asyncio.to_thread(cls, shell)
+
+    @property
+    def alive(self) -> bool:
+        """Check if the worker shell is still running."""
+        return self.process.poll() is None
+
+    def frame(self, command: Command, sentinel: str) -> bytes:
+        """Build the request script for one command.
+
+        Commands with ``env`` get exactly that environment (matching the
+        spawn path): the subshell unsets the worker's variables and exports
+        the command's. Others inherit the worker's environment.
+
+        Args:
+            command: Command to run
+            sentinel: Per-run delimiter
+
+        Returns:
+            Script bytes to write to the worker's stdin
+        """
+        script = f"eval {shlex.quote(command.command)}"
+        if command.env:
+            assignments = " ".join(shlex.quote(f"{k}={v}") for k, v in command.env.items())
+            script = f"export {assignments}; {script}"
+            if self._inherited:
+                script = f"unset -v {' '.join(self._inherited)}; {script}"
+        body = f"( {script} )"
+        return (
+            f"{body} </dev/null\n"
+            f"printf '%s %d\\n' '{sentinel}' \"$?\"\n"
+            f"printf '%s\\n' '{sentinel}' >&2\n"
+        ).encode()
+
+    async def run(self, command: Command, on_line: LineCallback) -> int:
+        """Run a command and stream its output lines.
+
+        Args:
+            command: Command to run
+            on_line: Callback receiving (stream, raw line bytes)
+
+        Returns:
+            Command exit code
+
+        Raises:
+            ExecutionError: If the worker dies before the command finishes
+        """
+        self.runs += 1
+        sentinel = f"__OPS_DECK_{uuid.uuid4().hex}__"
+        marker = sentinel.encode()
+        loop = asyncio.get_running_loop()
+        finished = {stream: loop.create_future() for stream in self._fds}
+
+        def on_readable(stream: StreamType) -> None:
+            future = finished[stream]
+            if future.done():
+                return
+            try:
+                data = os.read(self._fds[stream], 65536)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                future.set_exception(ExecutionError(f"Shell worker failed: {e}"))
+                return
+            if not data:
+                future.set_exception(ExecutionError("Shell worker exited unexpectedly"))
+                return
+
+            buffer = self._buffers[stream] + data
+            while True:
+                newline = buffer.find(b"\n")
+                if newline < 0:
+                    break
+                line, buffer = buffer[: newline + 1], buffer[newline + 1 :]
+                position = line.find(marker)
+                if position < 0:
+                    on_line(stream, line)
+                    continue
+                # Output without a trailing newline is glued to the sentinel
+                if position > 0:
+                    on_line(stream, line[:position])
+                future.set_result(line[position + len(marker) :].strip())
+                break
+            self._buffers[stream] = buffer
+
+        for stream, fd in self._fds.items():
+            loop.add_reader(fd, on_readable, stream)
+        try:
+            os.write(self.process.stdin.fileno(), self.frame(command, sentinel))  # type: ignore
+            results = await asyncio.gather(*finished.values())
+        except BrokenPipeError:
+            raise ExecutionError("Shell worker exited unexpectedly")
+        finally:
+            for fd in self._fds.values():
+                loop.remove_reader(fd)
+
+        return int(results[0])
+
+    def close(self) -> None:
+        """Terminate the worker and everything it started.
+
+        This blocks until the shell is reaped; use :meth:`aclose` on an
+        event loop.
+        """
+        if self.alive:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout, self.process.stderr):
+            if pipe:
+                pipe.close()
+
+    async def aclose(self) -> None:
+        """Terminate the worker without blocking the event loop."""
+        await asyncio.to_thread(self.close)
+
+
+class ShellWorkerPool:
+    """Pool of pre-forked shell workers shared by all executions.
+
+    Workers are handed out to one execution at a time. A worker is recycled
+    after ``max_runs`` executions, after a timeout (it is killed), or when it
+    crashes. If every worker is busy an extra one is started, and surplus
+    workers are closed when returned.
+    """
+
+    def __init__(self, size: int = 4, max_runs: int = 100, shell: str = "/bin/sh"):
+        """Initialize the pool.
+
+        Args:
+            size: Number of idle workers to keep ready
+            max_runs: Executions after which a worker is replaced
+            shell: Path of the POSIX shell to run
+        """
+        self.size = size
+        self.max_runs = max_runs
+        self.shell = shell
+        self._idle: list[ShellWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        """Pre-fork the idle workers."""
+        with self._lock:
+            while len(self._idle) < self.size:
+                self._idle.append(ShellWorker(self.shell))
+
+    def idle_count(self) -> int:
+        """Get the number of idle workers."""
+        with self._lock:
+            return len(self._idle)
+
+    async def run(
+        self, command: Command, on_line: LineCallback, timeout: float | None = None
+    ) -> int:
+        """Run a command on an idle worker.
+
+        If the run is cancelled or times out, the worker and everything it
+        started are killed and a replacement is forked.
+
+        Args:
+            command: Command to run
+            on_line: Callback receiving (stream, raw line bytes)
+            timeout: Optional seconds before the worker is killed
+
+        Returns:
+            Command exit code
+
+        Raises:
+            asyncio.TimeoutError: If the command exceeds the timeout
+            ExecutionError: If the worker crashes
+        """
+        worker = await self._acquire()
+        healthy = False
+        try:
+            exit_code = await asyncio.wait_for(worker.run(command, on_line), timeout=timeout)
+            healthy = True
+            return exit_code
+        finally:
+            # A stopped run's background children could write into the next run
+            await self._release(worker, healthy)
+
+    def close(self) -> None:
+        """Terminate all idle workers and stop accepting new runs."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+    async def _acquire(self) -> ShellWorker:
+        """Take an idle worker, starting a new one if none is available."""
+        worker: ShellWorker | None = None
+        dead = []
+        with self._lock:
+            if self._closed:
+                raise ExecutionError("Shell worker pool is closed")
+            while self._idle:
+                candidate = self._idle.pop()
+                if candidate.alive:
+                    worker = candidate
+                    break
+                dead.append(candidate)
+        for crashed in dead:
+            await crashed.aclose()
+        if worker is None:
+            worker = await ShellWorker.start(self.shell)
+        return worker
+
+    async def _release(self, worker: ShellWorker, healthy: bool) -> None:
+        """Return a worker to the pool, or kill it and fork a replacement."""
+        with self._lock:
+            keep = (
+                healthy
+                and not self._closed
+                and worker.alive
+                and worker.runs < self.max_runs
+                and len(self._idle) < self.size
+            )
+            if keep:
+                self._idle.append(worker)
+                return
+        await worker.aclose()
+        with self._lock:
+            if self._closed or len(self._idle) >= self.size:
+                return
+        replacement = await ShellWorker.start(self.shell)
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(replacement)
+                return
+        await replacement.aclose()
@@ -0,0 +1,56 @@
+"""Shell syntax detection for Ops Deck.
+
+Decides whether a command string needs ``/bin/sh`` or can be split with
+``shlex`` and executed directly.
+"""
+
+import shlex
+from functools import lru_cache
+
+# Characters that trigger shell expansion, redirection, job control or grouping
+SHELL_METACHARACTERS = frozenset("|&;<>()$`\\*?[]#~{}!\n")
+
+# Builtins and keywords that only exist inside a shell
+SHELL_BUILTINS = frozenset(
+    {
+        ".", ":", "alias", "bg", "break", "case", "cd", "command", "continue", "declare",
+        "eval", "exec", "exit", "export", "fg", "for", "function", "getopts", "hash", "if",
+        "jobs", "local", "read", "readonly", "return", "select", "set", "shift", "source",
+        "time", "times", "trap", "type", "typeset", "ulimit", "umask", "unalias", "unset",
+        "until", "wait", "while",
+    }
+)
+
+
+@lru_cache(maxsize=1024)
+def split_command(command: str) -> tuple[str, ...] | None:
+    """Split a command string into argv if it can run without a shell.
+
+    Args:
+        command: Command string
+
+    Returns:
+        Argument tuple, or None if the command needs a shell
+    """
+    if not command.strip() or any(char in SHELL_METACHARACTERS for char in command):
+        return None
+    try:
+        argv = tuple(shlex.split(command))
+    except ValueError:
+        # Unbalanced quotes; let the shell report the error
+        return None
+    if not argv or argv[0] in SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
+
+
+def needs_shell(command: str) -> bool:
+    """Check whether a command string uses shell features.
+
+    Args:
+        command: Command string
+
+    Returns:
+        True if the command must be run through ``/bin/sh``
+    """
+    return split_command(command) is None
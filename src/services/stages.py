@@ -0,0 +1,280 @@
+"""Output pipeline stages for Ops Deck.
+
+A command's ``stages`` sit between decoding and the output callback:
+raw bytes are decoded into :class:`OutputLine` objects, then every stage
+filters or transforms them in order, and the surviving lines go to the sink
+(the output pane, an export file, ...).
+
+Filters (``include``/``exclude``) are cheap and run inline on the runner's
+event loop. From the first transform (``replace``/``json``) on, the rest of
+the chain is CPU work: with a :class:`StagePool`, it runs on worker
+processes in batches of lines, so concurrent executions use several cores.
+Lines reach the sink in their original order either way.
+
+Triggers (``until``/``fail_on``/``alert_on``) see the raw line before any
+stage runs.
+"""
+
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import re
+import sys
+import uuid
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from ..models import OutputLine, OutputStage
+
+# Lines sent to a worker at once
+BATCH_LINES = 512
+# Seconds a partial batch waits for more lines before it is sent anyway
+BATCH_DELAY = 0.05
+
+# (type, pattern, replacement, indent): picklable and hashable form of a stage
+StageSpec = tuple[str, str | None, str, int]
+
+_FILTERS = frozenset({"include", "exclude"})
+
+
+def stage_specs(stages: Sequence[OutputStage]) -> tuple[StageSpec, ...]:
+    """Convert stage models to the specs the stage functions take."""
+    return tuple((stage.type, stage.pattern, stage.replacement, stage.indent) for stage in stages)
+
+
+@lru_cache(maxsize=256)
+def compile_stages(
+    specs: tuple[StageSpec, ...],
+) -> tuple[Callable[[str], list[str]], ...]:
+    """Build one function per stage, mapping a line to its output lines.
+
+    Raises:
+        re.error: If a pattern is not a valid regular expression
+    """
+    functions = []
+    for kind, pattern, replacement, indent in specs:
+        if kind == "json":
+            functions.append(_json_stage(indent))
+            continue
+        try:
+            regex = re.compile(pattern or "")
+        except re.error as e:
+            raise re.error(f"invalid {kind} stage pattern {pattern!r}: {e}") from e
+        if kind == "replace":
+            functions.append(_replace_stage(regex, replacement))
+        else:
+            functions.append(_filter_stage(regex, keep=kind == "include"))
+    return tuple(functions)
+
+
+def _filter_stage(regex: re.Pattern[str], keep: bool) -> Callable[[str], list[str]]:
+    """Stage keeping (or dropping) lines that match."""
+    search = regex.search
+
+    def stage(text: str) -> list[str]:
+        return [text] if (search(text) is not None) == keep else []
+
+    return stage
+
+
+def _replace_stage(regex: re.Pattern[str], replacement: str) -> Callable[[str], list[str]]:
+    """Stage substituting a replacement for every match."""
+    sub = regex.sub
+
+    def stage(text: str) -> list[str]:
+        return [sub(replacement, text)]
+
+    return stage
+
+
+def _json_stage(indent: int) -> Callable[[str], list[str]]:
+    """Stage pretty-printing lines that hold a JSON object or array."""
+
+    def stage(text: str) -> list[str]:
+        stripped = text.lstrip()
+        if not stripped.startswith(("{", "[")):
+            return [text]
+        try:
+            value = json.loads(stripped)
+        except ValueError:
+            return [text]
+        return json.dumps(value, indent=indent or None, ensure_ascii=False).split("\n")
+
+    return stage
+
+
+def apply_stages(specs: tuple[StageSpec, ...], texts: list[str]) -> list[list[str]]:
+    """Run lines through stages.
+
+    Args:
+        specs: Stages to apply in order
+        texts: Line contents
+
+    Returns:
+        The output lines of each input line (empty if it was filtered out)
+    """
+    functions = compile_stages(specs)
+    results = []
+    for text in texts:
+        lines = [text]
+        for function in functions:
+            lines = [out for line in lines for out in function(line)]
+            if not lines:
+                break
+        results.append(lines)
+    return results
+
+
+def has_offloaded_stages(stages: Sequence[OutputStage]) -> bool:
+    """Check if any stage would run on a :class:`StagePool`."""
+    return any(stage.type not in _FILTERS for stage in stages)
+
+
+class StagePool:
+    """Worker processes that run CPU-heavy output stages."""
+
+    def __init__(self, workers: int = 2):
+        """Initialize the pool (no process is started yet).
+
+        Args:
+            workers: Worker processes
+        """
+        self.workers = workers
+        self.executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        """Start the worker processes."""
+        if self.executor is not None:
+            return
+        # The first workers start the fork server and resource tracker, which
+        # inherit stderr: it must be a real file even while a TUI replaces it
+        with contextlib.redirect_stderr(sys.__stderr__):
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+            for _ in range(self.workers):
+                self.executor.submit(apply_stages, (), [])
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+class OutputPipeline:
+    """Runs one execution's output lines through its stages to a sink.
+
+    Must be used on a single event loop; :meth:`close` delivers the lines
+    still being processed.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[OutputStage],
+        sink: Callable[[OutputLine], None],
+        pool: StagePool | None = None,
+    ):
+        """Compile the stages.
+
+        Args:
+            stages: Stages to apply in order
+            sink: Receives the lines that come out of the last stage
+            pool: Workers for the stages after the first transform (None to
+                run every stage inline)
+
+        Raises:
+            re.error: If a pattern is not a valid regular expression
+        """
+        specs = stage_specs(stages)
+        split = len(specs)
+        if pool is not None:
+            split = next((i for i, spec in enumerate(specs) if spec[0] not in _FILTERS), split)
+        self.sink = sink
+        self._inline = specs[:split]
+        self._offloaded = specs[split:]
+        # Compiled here so that invalid patterns fail before any output
+        compile_stages(specs)
+        self._pool = pool
+        self._batch: list[OutputLine] = []
+        self._pending: deque[tuple[list[OutputLine], asyncio.Future[list[list[str]]]]] = deque()
+        self._timer: asyncio.TimerHandle | None = None
+        self._drain: asyncio.Task[None] | None = None
+
+    def feed(self, line: OutputLine) -> None:
+        """Process a decoded line."""
+        lines = [line]
+        if self._inline:
+            lines = _rebuild(line, apply_stages(self._inline, [line.content])[0])
+        if not self._offloaded:
+            for output in lines:
+                self.sink(output)
+            return
+        self._batch.extend(lines)
+        if len(self._batch) >= BATCH_LINES:
+            self._submit()
+        elif self._batch and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(BATCH_DELAY, self._submit)
+
+    async def close(self) -> None:
+        """Process the remaining lines and wait until all reached the sink."""
+        self._submit()
+        if self._drain is not None:
+            await self._drain
+
+    def _submit(self) -> None:
+        """Send the current batch to a worker."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        loop = asyncio.get_running_loop()
+        executor = self._pool.executor if self._pool is not None else None
+        if executor is None:
+            future: asyncio.Future[list[list[str]]] = loop.create_future()
+            future.set_result(apply_stages(self._offloaded, [line.content for line in batch]))
+        else:
+            future = loop.run_in_executor(
+                executor, apply_stages, self._offloaded, [line.content for line in batch]
+            )
+        self._pending.append((batch, future))
+        if self._drain is None or self._drain.done():
+            self._drain = loop.create_task(self._deliver())
+
+    async def _deliver(self) -> None:
+        """Pass processed batches to the sink in the order they were sent."""
+        while self._pending:
+            batch, future = self._pending[0]
+            try:
+                results = await future
+            except Exception:
+                # The pool broke (e.g. a worker was killed): process here instead
+                results = apply_stages(self._offloaded, [line.content for line in batch])
+            self._pending.popleft()
+            for line, texts in zip(batch, results, strict=True):
+                for output in _rebuild(line, texts):
+                    self.sink(output)
+
+
+def _rebuild(line: OutputLine, texts: list[str]) -> list[OutputLine]:
+    """Turn a line's stage output back into output lines.
+
+    An unchanged line is passed on as-is (keeping its colors); changed text
+    loses its color spans, and extra lines get IDs of their own.
+    """
+    if len(texts) == 1 and texts[0] == line.content:
+        return [line]
+    lines = []
+    for index, text in enumerate(texts):
+        if not text:
+            continue
+        update: dict[str, object] = {"content": text, "spans": None}
+        if index:
+            update["id"] = f"out_{uuid.uuid4().hex[:8]}"
+        lines.append(line.model_copy(update=update))
+    return lines
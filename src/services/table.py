@@ -0,0 +1,361 @@
+"""Structured output tables for Ops Deck.
+
+Commands with a ``format`` other than ``text`` print records: JSON objects
+one per line (``jsonl``), comma-separated values (``csv``) or a
+whitespace-aligned table with a header row (``table``, as printed by ``ps``,
+``df`` or ``kubectl get``). A :class:`TableParser` turns each stdout line
+into a row of a :class:`ColumnTable` as it arrives.
+
+Rows are stored by column (one list of cell strings per column) so that
+sorting and filtering touch one column at a time; numeric values of a
+column are parsed once, on first sort, into a compact array. Sorting and
+filtering return lists of row indices, leaving the table itself untouched,
+so a view can be computed from a worker thread while rows keep arriving.
+"""
+
+import csv
+import heapq
+import json
+import math
+import re
+import threading
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Widest a column is shown, in characters
+MAX_COLUMN_WIDTH = 40
+# Rows sorted in one call: larger sorts merge sorted chunks, so that other
+# threads (the UI) get the interpreter between chunks
+SORT_CHUNK = 65536
+
+FORMATS = ("jsonl", "csv", "table")
+
+_decode = json.JSONDecoder().raw_decode
+
+
+class ColumnTable:
+    """Rows of cell strings stored column by column.
+
+    Rows are only ever appended, so a row count read once stays valid for
+    readers in other threads.
+    """
+
+    def __init__(self, columns: list[str] | None = None):
+        """Initialize the table.
+
+        Args:
+            columns: Column names (more can be added as rows arrive)
+        """
+        self.columns: list[str] = []
+        self.cells: list[list[str]] = []
+        self.row_count = 0
+        self._index: dict[str, int] = {}
+        self._keys: tuple[str, ...] = ()
+        self._widths: list[int] = []
+        self._measured = 0
+        self._numbers: dict[int, array] = {}
+        self._numbers_lock = threading.Lock()
+        for name in columns or []:
+            self.add_column(name)
+
+    def add_column(self, name: str) -> int:
+        """Add a column, empty in the rows already stored.
+
+        Args:
+            name: Column name
+
+        Returns:
+            Position of the column (the existing one if the name is taken)
+        """
+        index = self._index.get(name)
+        if index is None:
+            index = self._index[name] = len(self.columns)
+            self.columns.append(name)
+            self.cells.append([""] * self.row_count)
+            self._widths.append(0)
+        return index
+
+    def append(self, values: list[str]) -> None:
+        """Add a row of cells in column order; missing cells are empty.
+
+        Extra values beyond the last column are dropped.
+        """
+        if len(values) < len(self.cells):
+            values = [*values, *[""] * (len(self.cells) - len(values))]
+        for column, value in zip(self.cells, values):
+            column.append(value)
+        self.row_count += 1
+
+    def append_record(self, record: dict[str, str]) -> None:
+        """Add a row of named cells, adding columns for new names."""
+        keys = tuple(record)
+        if keys == self._keys:
+            # Same fields in the same order as the previous record
+            self.append(list(record.values()))
+            return
+        for name in keys:
+            if name not in self._index:
+                self.add_column(name)
+        if keys == tuple(self.columns):
+            self._keys = keys
+            self.append(list(record.values()))
+            return
+        index = self._index
+        values = [""] * len(self.columns)
+        for name, value in record.items():
+            values[index[name]] = value
+        self.append(values)
+
+    def widths(self) -> list[int]:
+        """Get the display width of each column: its widest cell or name, capped."""
+        count = self.row_count
+        if self._measured < count:
+            start = self._measured
+            for index, column in enumerate(self.cells):
+                widest = max(map(len, column[start:count]), default=0)
+                self._widths[index] = max(self._widths[index], widest)
+            self._measured = count
+        return [
+            min(max(width, len(name)), MAX_COLUMN_WIDTH)
+            for width, name in zip(self._widths, self.columns)
+        ]
+
+    def row(self, index: int) -> list[str]:
+        """Get the cells of a row."""
+        return [column[index] for column in self.cells]
+
+    def numbers(self, column: int) -> array:
+        """Get a column's values as numbers (NaN where a cell is not a number).
+
+        Parsed on first use and extended with the rows added since.
+        """
+        with self._numbers_lock:
+            parsed = self._numbers.get(column)
+            if parsed is None:
+                parsed = self._numbers[column] = array("d")
+            cells = self.cells[column]
+            count = self.row_count
+            if len(parsed) < count:
+                parsed.extend(_number(cell) for cell in cells[len(parsed) : count])
+            return parsed
+
+    def is_numeric(self, column: int, rows: int | None = None) -> bool:
+        """Check if a column holds numbers (empty cells aside)."""
+        numbers = self.numbers(column)
+        cells = self.cells[column]
+        count = min(len(numbers), self.row_count if rows is None else rows)
+        return any(cells[i] for i in range(count)) and all(
+            not cells[i] or not math.isnan(numbers[i]) for i in range(count)
+        )
+
+    def sort_rows(
+        self, column: int, descending: bool = False, rows: list[int] | None = None
+    ) -> list[int]:
+        """Order rows by a column.
+
+        Numeric columns sort by value, others by text; the sort is stable, and
+        cells that are not numbers go last in a numeric column either way.
+
+        Args:
+            column: Column position
+            descending: Largest first
+            rows: Rows to order (all rows by default)
+
+        Returns:
+            Row indices in order
+        """
+        if rows is None:
+            rows = list(range(self.row_count))
+        count = max(rows, default=-1) + 1
+        if self.is_numeric(column, count):
+            numbers = self.numbers(column)
+            missing = -math.inf if descending else math.inf
+            keys = [missing if math.isnan(value) else value for value in numbers[:count]]
+            return _sort(rows, keys.__getitem__, descending)
+        return _sort(rows, self.cells[column].__getitem__, descending)
+
+    def filter_rows(
+        self,
+        pattern: re.Pattern[str],
+        rows: list[int] | None = None,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> list[int]:
+        """Keep the rows with a cell matching a pattern.
+
+        Args:
+            pattern: Pattern searched in every cell
+            rows: Rows to filter, in the order to keep (all rows by default)
+            cancelled: Polled between columns; stops early when True
+
+        Returns:
+            Matching row indices in the order given
+        """
+        count = self.row_count if rows is None else max(rows, default=-1) + 1
+        matched = bytearray(count)
+        search = pattern.search
+        for column in self.cells:
+            if cancelled is not None and cancelled():
+                break
+            for index in range(count):
+                if not matched[index] and search(column[index]) is not None:
+                    matched[index] = 1
+        if rows is None:
+            return [index for index in range(count) if matched[index]]
+        return [index for index in rows if matched[index]]
+
+
+@dataclass
+class TableView:
+    """How a table is shown: selected column, sort order and filter."""
+
+    # Column the cursor is on
+    column: int = 0
+    sort_column: int | None = None
+    descending: bool = False
+    pattern: re.Pattern[str] | None = None
+    # Rows shown, in order, as of the last sort or filter (None for all rows
+    # in arrival order)
+    rows: list[int] | None = None
+    # Rows of the table when ``rows`` was computed
+    computed_for: int = 0
+    computing: bool = False
+
+    @property
+    def active(self) -> bool:
+        """True if the view is sorted or filtered."""
+        return self.sort_column is not None or self.pattern is not None
+
+
+def compute_view(
+    table: ColumnTable, view: TableView, cancelled: Callable[[], bool] | None = None
+) -> tuple[list[int] | None, int]:
+    """Filter, then sort, the rows of a table as a view asks.
+
+    Args:
+        table: Table to read (rows may keep arriving meanwhile)
+        view: Sort column, direction and filter
+        cancelled: Polled while filtering; stops early when True
+
+    Returns:
+        Rows in order (None if the view is neither sorted nor filtered), and
+        the number of table rows they were computed from
+    """
+    count = table.row_count
+    if not view.active:
+        return None, count
+    rows = list(range(count))
+    if view.pattern is not None:
+        rows = table.filter_rows(view.pattern, rows, cancelled)
+    if view.sort_column is not None:
+        rows = table.sort_rows(view.sort_column, view.descending, rows)
+    return rows, count
+
+
+def _sort(rows: list[int], key: Callable[[int], Any], descending: bool) -> list[int]:
+    """Stable sort of row indices, in chunks merged together when there are many."""
+    if len(rows) <= SORT_CHUNK:
+        return sorted(rows, key=key, reverse=descending)
+    chunks = [
+        sorted(rows[start : start + SORT_CHUNK], key=key, reverse=descending)
+        for start in range(0, len(rows), SORT_CHUNK)
+    ]
+    # Ties are taken from earlier chunks first, which keeps the sort stable
+    return list(heapq.merge(*chunks, key=key, reverse=descending))
+
+
+def _number(text: str) -> float:
+    """Parse a cell as a number, NaN if it is not one."""
+    try:
+        return float(text.replace(",", "")) if text else math.nan
+    except ValueError:
+        return math.nan
+
+
+def _cell(value: Any) -> str:
+    """Format a JSON value as a cell."""
+    kind = type(value)
+    if kind is str:
+        return value  # type: ignore[no-any-return]
+    if kind is int or kind is float:
+        return repr(value)
+    if value is None:
+        return ""
+    if kind is bool:
+        return "true" if value else "false"
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _flatten(record: dict[str, Any], prefix: str = "") -> dict[str, str]:
+    """Flatten nested objects into dotted column names."""
+    cells: dict[str, str] = {}
+    for key, value in record.items():
+        if type(value) is dict and value:
+            cells.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            cells[prefix + key] = _cell(value)
+    return cells
+
+
+class TableParser:
+    """Turns lines of structured output into rows of a table."""
+
+    def __init__(self, fmt: str, table: ColumnTable | None = None):
+        """Initialize the parser.
+
+        Args:
+            fmt: ``"jsonl"``, ``"csv"`` or ``"table"``
+            table: Table to add rows to (a new one by default)
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported table format: {fmt}")
+        self.format = fmt
+        self.table = table if table is not None else ColumnTable()
+        # Lines that did not parse as a row
+        self.skipped = 0
+        self._has_header = fmt == "jsonl"
+
+    def feed(self, text: str) -> bool:
+        """Parse one line of output.
+
+        Returns:
+            True if the line added a row (or was the header)
+        """
+        if self.format == "jsonl":
+            return self._feed_json(text)
+        if not text.strip():
+            return False
+        if self.format == "csv":
+            values = next(csv.reader([text]), [])
+        elif self._has_header:
+            values = text.split(None, len(self.table.columns) - 1)
+        else:
+            values = text.split()
+        if not self._has_header:
+            for name in values:
+                self.table.add_column(name.strip())
+            self._has_header = True
+            return True
+        self.table.append(values)
+        return True
+
+    def _feed_json(self, text: str) -> bool:
+        """Add a JSON object line as a row."""
+        stripped = text.strip()
+        if not stripped.startswith("{"):
+            self.skipped += 1
+            return False
+        try:
+            record, _ = _decode(stripped)
+        except ValueError:
+            self.skipped += 1
+            return False
+        if not isinstance(record, dict):
+            self.skipped += 1
+            return False
+        self.table.append_record(_flatten(record))
+        return True
@@ -0,0 +1,101 @@
+"""Output-pattern triggers for Ops Deck.
+
+A command's ``until``, ``fail_on`` and ``alert_on`` patterns are compiled
+into one combined regular expression, so each output line is scanned once
+however many patterns are configured.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ..models import Command
+from .patterns import combine_patterns
+
+# Trigger kinds in the order their patterns are tried at the same position
+TRIGGER_KINDS = ("fail_on", "until", "alert_on")
+
+
+@dataclass(frozen=True)
+class TriggerMatch:
+    """A trigger pattern that matched an output line."""
+
+    kind: str
+    pattern: str
+
+
+@lru_cache(maxsize=256)
+def compile_triggers(
+    fail_on: tuple[str, ...], until: tuple[str, ...], alert_on: tuple[str, ...]
+) -> tuple[re.Pattern[bytes], tuple[TriggerMatch, ...]]:
+    """Combine trigger patterns into one regex over raw line bytes.
+
+    Each pattern is wrapped in its own named group (see
+    :func:`combine_patterns`), so the group that matched identifies the
+    trigger.
+
+    Args:
+        fail_on: Patterns that fail the execution
+        until: Patterns that finish the execution successfully
+        alert_on: Patterns that raise an alert
+
+    Returns:
+        Tuple of (combined regex, trigger for each group in order)
+
+    Raises:
+        re.error: If a pattern is not a valid regular expression
+    """
+    triggers = tuple(
+        TriggerMatch(kind, pattern)
+        for kind, patterns in zip(TRIGGER_KINDS, (fail_on, until, alert_on), strict=True)
+        for pattern in patterns
+    )
+    for trigger in triggers:
+        # Compile individually so errors name the offending pattern
+        try:
+            re.compile(trigger.pattern.encode())
+        except re.error as e:
+            raise re.error(f"invalid {trigger.kind} pattern {trigger.pattern!r}: {e}") from e
+    combined = combine_patterns([trigger.pattern for trigger in triggers], "_trigger")
+    return re.compile(combined.encode()), triggers
+
+
+class OutputTriggers:
+    """Matches output lines of one execution against its trigger patterns."""
+
+    def __init__(self, command: Command):
+        """Compile the command's patterns.
+
+        Args:
+            command: Command whose ``until``/``fail_on``/``alert_on`` apply
+
+        Raises:
+            re.error: If a pattern is not a valid regular expression
+        """
+        self.regex, self.triggers = compile_triggers(
+            tuple(command.fail_on), tuple(command.until), tuple(command.alert_on)
+        )
+
+    @classmethod
+    def for_command(cls, command: Command) -> "OutputTriggers | None":
+        """Create triggers for a command, or None if it has no patterns."""
+        if not (command.until or command.fail_on or command.alert_on):
+            return None
+        return cls(command)
+
+    def match(self, data: bytes) -> TriggerMatch | None:
+        """Find the first trigger matching a raw output line.
+
+        The earliest match in the line wins; at the same position fail_on
+        patterns win over until, and until over alert_on.
+
+        Args:
+            data: Raw line bytes
+
+        Returns:
+            The matching trigger, or None
+        """
+        found = self.regex.search(data)
+        if found is None:
+            return None
+        return self.triggers[int(found.lastgroup[len("_trigger") :])]  # type: ignore[index]
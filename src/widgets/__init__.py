@@ -1,14 +1,50 @@
 """Widgets package initialization.
 
-Exports all widget components.
+Exports all widget components. Exports are resolved lazily (PEP 562) so that
+Textual is only imported once a widget is actually needed.
 """
 
-from .app import OpsApp
-from .command_list import CommandListPanel
-from .output_pane import OutputPane
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app import OpsApp
+    from .command_list import CommandListPanel
+    from .output_pane import OutputPane
+    from .pipeline_view import PipelineView
+    from .resource_monitor import ResourceMonitor
+    from .target_matrix import TargetMatrix
+
+# Maps each exported name to the submodule that defines it
+_EXPORTS = {
+    "CommandListPanel": ".command_list",
+    "OpsApp": ".app",
+    "OutputPane": ".output_pane",
+    "PipelineView": ".pipeline_view",
+    "ResourceMonitor": ".resource_monitor",
+    "TargetMatrix": ".target_matrix",
+}
 
 __all__ = [
     "CommandListPanel",
     "OpsApp",
     "OutputPane",
+    "PipelineView",
+    "ResourceMonitor",
+    "TargetMatrix",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported widget on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazy exports."""
+    return sorted({*globals(), *__all__})
@@ -1,14 +1,45 @@
 """Main application widget for Ops Deck TUI."""
 
+import os
+import uuid
+from collections.abc import Callable
+
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal
-from textual.widgets import Footer, Header, Static
-
-from ..messages import CommandOutput, ExecutionComplete
-from ..models import AppConfig, Command, OutputLine
+from textual.widgets import Footer, Header, Static, Tabs
+from textual.worker import get_current_worker
+
+from ..exceptions import ExecutionError
+from ..messages import (
+    CommandOutput,
+    ExecutionComplete,
+    FanOutComplete,
+    OutputAlert,
+    PipelineProgress,
+)
+from ..models import (
+    AppConfig,
+    Command,
+    Execution,
+    NodeResult,
+    OutputLine,
+    Pipeline,
+    PipelineResult,
+)
 from ..services.command_runner import AsyncCommandRunner
+from ..services.export import export_filename
+from ..services.fanout import FanOutRunner
+from ..services.highlight import DEFAULT_RULES, Highlighter
+from ..services.history import HistoryStore
+from ..services.metrics import MetricStore
+from ..services.pipeline import PipelineExecutor
+from ..services.proc_monitor import ProcessMonitor
+from ..services.python_runner import PythonTaskRunner
+from ..services.shell_pool import ShellWorkerPool
+from ..services.stages import StagePool, has_offloaded_stages
 from .command_list import CommandListPanel
 from .output_pane import OutputPane
+from .resource_monitor import ResourceMonitor
 
 
 class ErrorScreen(Static):
@@ -56,21 +87,73 @@ class OpsApp(App):
     # Enable parallel execution by setting exclusive=False on workers
     # This allows multiple commands to run concurrently
 
-    def __init__(self, commands: list[Command], config: AppConfig | None = None):
+    def __init__(
+        self,
+        commands: list[Command],
+        config: AppConfig | None = None,
+        pipelines: list[Pipeline] | None = None,
+        on_first_paint: Callable[[], None] | None = None,
+        runner: AsyncCommandRunner | None = None,
+    ):
         """Initialize the app.
 
         Args:
             commands: List of available commands
             config: Application configuration (optional, for error screens)
+            pipelines: List of available pipelines
+            on_first_paint: Optional callback invoked after the first screen refresh
+            runner: Command runner to use instead of one built from the
+                config (e.g. a ReplayRunner)
         """
         super().__init__()
+        self._on_first_paint = on_first_paint
         self.commands = commands
         self.config = config
+        self.pipelines = pipelines or []
         self.selected_command: Command | None = None
         self._running_command_indices: dict[str, int] = {}  # Track execution ID to command index
         self._error_screen: ErrorScreen | None = None
-        self.runner = AsyncCommandRunner()  # Command execution service
+        self.shell_pool: ShellWorkerPool | None = None
+        if config and config.shell_pool_size > 0:
+            self.shell_pool = ShellWorkerPool(
+                size=config.shell_pool_size, max_runs=config.shell_pool_max_runs
+            )
+        # Worker processes only when some command has stages to offload
+        stage_workers = config.stage_workers if config else 2
+        self.stage_pool: StagePool | None = None
+        if stage_workers and any(has_offloaded_stages(command.stages) for command in commands):
+            self.stage_pool = StagePool(stage_workers)
+        self.runner = runner or PythonTaskRunner(  # Command execution service
+            workers=config.python_workers if config else 2,
+            shell_pool=self.shell_pool,
+            stage_pool=self.stage_pool,
+            termination_grace=config.termination_grace if config else 2.0,
+            record_dir=config.record_dir if config else None,
+        )
+        self.runner.alert_callback = self._post_alert
+        # Metric values are recorded from the runner threads and drawn on a timer
+        self.metrics = MetricStore()
+        self._metrics_drawn = 0
+        self.runner.metric_callback = lambda execution, name, value: self.metrics.record(
+            execution.command, name, value
+        )
         self._running_executions: dict[str, int] = {}  # Map execution ID to command index
+        self.history: HistoryStore | None = None
+        self._history_recorded: set[str] = set()  # Execution IDs already in the history
+        if config and config.history_dir:
+            self.history = HistoryStore(config.history_dir)
+        self.process_monitor = ProcessMonitor()
+        rules = config.highlight_rules if config else None
+        self.highlighter = Highlighter(DEFAULT_RULES if rules is None else rules)
+
+    def _post_alert(self, execution: Execution, alert: str) -> None:
+        """Forward an alert from a runner thread to the UI.
+
+        Args:
+            execution: Execution whose output raised the alert
+            alert: Alert message
+        """
+        self.post_message(OutputAlert(execution, alert))
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the layout."""
@@ -83,8 +166,19 @@ class OpsApp(App):
             # Normal layout
             yield Header(show_clock=True)
             with Horizontal(id="main-content"):
-                yield CommandListPanel(self.commands, id="command-panel")
-                yield OutputPane(id="output-pane")
+                yield CommandListPanel(
+                    self.commands, pipelines=self.pipelines, id="command-panel"
+                )
+                yield OutputPane(
+                    id="output-pane",
+                    highlighter=self.highlighter,
+                    max_lines=self.config.max_output_lines if self.config else 10000,
+                    auto_scroll=self.config.auto_scroll if self.config else True,
+                    memory_budget=(self.config.output_memory_mb if self.config else 256)
+                    * 1024
+                    * 1024,
+                )
+            yield ResourceMonitor(id="resource-monitor")
             yield Footer()
 
     def on_mount(self) -> None:
@@ -92,7 +186,45 @@ class OpsApp(App):
         # Note: Custom theme setting is currently disabled due to Textual's
         # strict theme registration requirements. Using default Textual theme.
         # TODO: Re-enable custom theme support when Textual theme API is clearer
-        pass
+        if self.shell_pool:
+            self.shell_pool.start()
+        if self.stage_pool:
+            self.stage_pool.start()
+        if isinstance(self.runner, PythonTaskRunner) and any(
+            command.callable for command in self.commands
+        ):
+            self.runner.start()
+        refresh_rate = self.config.refresh_rate if self.config else 1.0
+        self.set_interval(1.0 / refresh_rate, self._sample_resources)
+        if any(command.metrics for command in self.commands):
+            self.set_interval(1.0 / refresh_rate, self._draw_metrics)
+        if self._on_first_paint:
+            self.call_after_refresh(self._on_first_paint)
+
+    def on_unmount(self) -> None:
+        """Release background resources."""
+        if self.shell_pool:
+            self.shell_pool.close()
+        if self.stage_pool:
+            self.stage_pool.close()
+        if isinstance(self.runner, PythonTaskRunner):
+            self.runner.close()
+        if self.history:
+            self.history.close()
+
+    def _draw_metrics(self) -> None:
+        """Redraw the sparklines of commands whose metrics changed."""
+        version = self.metrics.version
+        if version == self._metrics_drawn:
+            return
+        self._metrics_drawn = version
+        try:
+            command_list = self.query_one(CommandListPanel)
+        except Exception:
+            return
+        for index, command in enumerate(self.commands):
+            if command.metrics:
+                command_list.set_metrics(index, self.metrics.series(command.name))
 
     def action_quit(self) -> None:  # type: ignore
         """Quit the application."""
@@ -109,21 +241,23 @@ class OpsApp(App):
         try:
             command_list = self.query_one(CommandListPanel)
             selected_command = command_list.get_selected_command()
+            selected_pipeline = command_list.get_selected_pipeline()
             command_index = command_list.selected_index
         except Exception:
             return
 
+        if selected_pipeline:
+            self._execute_pipeline(selected_pipeline, command_index)
+            return
+
         if not selected_command:
             return
 
         # Store reference for potential future use
         self.selected_command = selected_command
 
-        # Get output pane and clear previous output
-        try:
-            output_pane = self.query_one(OutputPane)
-            output_pane.clear_output()
-        except Exception:
+        if selected_command.is_parameterized():
+            self._execute_fanout(selected_command, command_index)
             return
 
         # Define output callback - called for each output line
@@ -131,11 +265,20 @@ class OpsApp(App):
             """Handle output line from command execution."""
             self.post_message(CommandOutput(line.execution_id, line))
 
+        started = []
+        finished = []
+
         # Define completion callback - called when execution finishes
         def completion_callback(execution) -> None:  # type: ignore
             """Handle command completion."""
+            finished.append(execution)
             self.post_message(ExecutionComplete(execution))
 
+        def start_callback(execution) -> None:  # type: ignore
+            """Track the execution and open its output buffer before any output."""
+            started.append(execution)
+            self.call_from_thread(self._execution_started, command_index, execution)
+
         # Create and run worker to execute command
         def run_command() -> None:
             """Worker function to run the command asynchronously."""
@@ -148,43 +291,318 @@ class OpsApp(App):
                         selected_command,
                         output_callback=output_callback,
                         completion_callback=completion_callback,
+                        start_callback=start_callback,
                     )
                 )
             except Exception as e:
-                # If execution fails, post error and mark as complete
+                if finished:
+                    # The runner already reported the outcome (e.g. a timeout)
+                    return
+                # The runner failed before finishing: post an error and mark as complete
                 from ..models import Execution, ExecutionStatus
 
                 error_execution = Execution(
-                    id=f"exec_error_{command_index}",
+                    # Same ID as the started execution, so its buffer and spinner are updated
+                    id=started[0].id if started else f"exec_error_{uuid.uuid4().hex[:8]}",
                     command=selected_command,
                     start_time=None,
                     end_time=None,
                     exit_code=None,
                     status=ExecutionStatus.ERROR,
                     error_message=str(e),
+                    stop_reason=None,
+                    resource_usage=None,
                 )
                 completion_callback(error_execution)
 
-        # Track execution with command index
-        # We'll update this when we receive the execution ID from the first output
-        self.mark_command_running(command_index, f"exec_{command_index}", True)
-
         # Spawn the worker (thread=True because run_command is sync and calls asyncio.run())
         self.run_worker(run_command, thread=True)
 
+    def _execution_started(self, command_index: int, execution) -> None:  # type: ignore
+        """Mark a started execution's command running and show its output buffer.
+
+        Args:
+            command_index: Index of the command in the list
+            execution: Execution that has just started
+        """
+        self.mark_command_running(command_index, execution.id, True)
+        try:
+            self.query_one(OutputPane).start_command(execution)
+        except Exception:
+            pass
+
+    def _execute_fanout(self, command: Command, command_index: int) -> None:
+        """Execute a parameterized command against all of its targets.
+
+        Args:
+            command: Parameterized command to execute
+            command_index: Index of the command in the list
+        """
+        max_parallel = self.config.max_parallel if self.config else 8
+        fanout_runner = FanOutRunner(self.runner, max_parallel=max_parallel)
+        tracking_id = f"fanout_{command_index}_{uuid.uuid4().hex[:8]}"
+
+        def output_callback(target: str, line: OutputLine) -> None:
+            """Prefix each output line with its target."""
+            labelled = line.with_prefix(f"{target} | ")
+            self.post_message(CommandOutput(tracking_id, labelled))
+
+        def run_fanout() -> None:
+            """Worker function to run all targets in one event loop."""
+            import asyncio
+
+            from ..models import Execution, ExecutionStatus
+
+            try:
+                result = asyncio.run(fanout_runner.run(command, output_callback=output_callback))
+                self.post_message(FanOutComplete(result, run_id=tracking_id))
+            except Exception as e:
+                error_execution = Execution(
+                    id=tracking_id,
+                    command=command,
+                    start_time=None,
+                    end_time=None,
+                    exit_code=None,
+                    status=ExecutionStatus.ERROR,
+                    error_message=str(e),
+                    stop_reason=None,
+                    resource_usage=None,
+                )
+                self.post_message(ExecutionComplete(error_execution))
+            finally:
+                self.call_from_thread(self.mark_command_running, command_index, tracking_id, False)
+
+        self.mark_command_running(command_index, tracking_id, True)
+        try:
+            self.query_one(OutputPane).start_run(tracking_id, command.name)
+        except Exception:
+            pass
+        self.run_worker(run_fanout, thread=True)
+
+    def _execute_pipeline(self, pipeline: Pipeline, entry_index: int) -> None:
+        """Execute a pipeline, running independent nodes concurrently.
+
+        Args:
+            pipeline: Pipeline to execute
+            entry_index: Index of the pipeline entry in the command list
+        """
+        try:
+            output_pane = self.query_one(OutputPane)
+        except Exception:
+            return
+
+        max_parallel = self.config.max_parallel if self.config else 8
+        executor = PipelineExecutor(self.runner, max_parallel=max_parallel)
+        commands = {command.name: command for command in self.commands}
+        tracking_id = f"pipeline_{entry_index}_{uuid.uuid4().hex[:8]}"
+
+        def output_callback(node: str, line: OutputLine) -> None:
+            """Prefix each output line with its pipeline node."""
+            labelled = line.with_prefix(f"{node} | ")
+            self.post_message(CommandOutput(tracking_id, labelled))
+
+        def run_pipeline() -> None:
+            """Worker function to run the whole pipeline in one event loop."""
+            import asyncio
+
+            def node_callback(result: PipelineResult, node: NodeResult) -> None:
+                """Publish a snapshot after every node transition."""
+                self.post_message(
+                    PipelineProgress(result.model_copy(deep=True), run_id=tracking_id)
+                )
+
+            async def run() -> None:
+                result = await executor.run(
+                    pipeline,
+                    commands,
+                    output_callback=output_callback,
+                    node_callback=node_callback,
+                )
+                self.post_message(PipelineProgress(result, finished=True, run_id=tracking_id))
+
+            try:
+                asyncio.run(run())
+            except Exception as e:
+                self.call_from_thread(self.notify, str(e), title="Pipeline failed", severity="error")
+            finally:
+                self.call_from_thread(self.mark_command_running, entry_index, tracking_id, False)
+
+        self.mark_command_running(entry_index, tracking_id, True)
+        output_pane.start_run(tracking_id, pipeline.name)
+        self.run_worker(run_pipeline, thread=True)
+
+    def action_cancel(self) -> None:
+        """Cancel the running executions of the selected command or pipeline."""
+        try:
+            command_list = self.query_one(CommandListPanel)
+        except Exception:
+            return
+
+        selected_command = command_list.get_selected_command()
+        selected_pipeline = command_list.get_selected_pipeline()
+        if selected_command:
+            # Fan-out executions are named "<command>[<target>]"
+            names = {selected_command.name}
+            prefix = f"{selected_command.name}["
+        elif selected_pipeline:
+            names = {step.command for step in selected_pipeline.steps}
+            prefix = None
+        else:
+            return
+
+        cancelled = 0
+        for execution in self.runner.active_executions():
+            name = execution.command.name
+            if name in names or (prefix and name.startswith(prefix)):
+                cancelled += self.runner.cancel(execution.id)
+        self.notify(f"Cancelling {cancelled} execution(s)" if cancelled else "Nothing running")
+
+    def action_cancel_all(self) -> None:
+        """Cancel every running execution."""
+        cancelled = self.runner.cancel_all()
+        self.notify(f"Cancelling {cancelled} execution(s)" if cancelled else "Nothing running")
+
+    def action_toggle_monitor(self) -> None:
+        """Show or hide the resource monitor."""
+        try:
+            monitor = self.query_one(ResourceMonitor)
+        except Exception:
+            return
+        monitor.toggle()
+        self._sample_resources()
+
+    def action_cycle_monitor_sort(self) -> None:
+        """Sort the resource monitor by the next column."""
+        try:
+            self.query_one(ResourceMonitor).cycle_sort()
+        except Exception:
+            pass
+
+    def _sample_resources(self) -> None:
+        """Sample the running process groups into the resource monitor.
+
+        Skipped while the monitor is hidden, so /proc is only scanned when
+        someone is looking.
+        """
+        try:
+            monitor = self.query_one(ResourceMonitor)
+        except Exception:
+            return
+        if not monitor.display:
+            return
+        groups = {
+            pgid: execution.command.name
+            for pgid, execution in self.runner.process_groups().items()
+        }
+        monitor.show_samples(self.process_monitor.sample(groups))
+
     def action_navigate_up(self) -> None:
         """Navigate up in command list."""
         try:
             command_list = self.query_one(CommandListPanel)
             command_list.navigate_up()
         except Exception:
-            pass
+            return
+        self._show_selected_output(command_list)
 
     def action_navigate_down(self) -> None:
         """Navigate down in command list."""
         try:
             command_list = self.query_one(CommandListPanel)
             command_list.navigate_down()
+        except Exception:
+            return
+        self._show_selected_output(command_list)
+
+    def _show_selected_output(self, command_list: CommandListPanel) -> None:
+        """Show the latest output buffer of the selected command or pipeline."""
+        entry = command_list.get_selected_command() or command_list.get_selected_pipeline()
+        if entry is None:
+            return
+        try:
+            self.query_one(OutputPane).show_latest(entry.name)
+        except Exception:
+            pass
+
+    def action_previous_output(self) -> None:
+        """Show the previous output tab."""
+        try:
+            self.query_one("#output-tabs", Tabs).action_previous_tab()
+        except Exception:
+            pass
+
+    def action_next_output(self) -> None:
+        """Show the next output tab."""
+        try:
+            self.query_one("#output-tabs", Tabs).action_next_tab()
+        except Exception:
+            pass
+
+    def action_close_output(self) -> None:
+        """Close the output tab on screen."""
+        try:
+            self.query_one(OutputPane).close_buffer()
+        except Exception:
+            pass
+
+    def action_export_output(self) -> None:
+        """Export the output tab on screen to a file in the export directory."""
+        try:
+            output_pane = self.query_one(OutputPane)
+        except Exception:
+            return
+        buffer = output_pane.current_buffer
+        if buffer is None:
+            self.notify("No output to export", severity="warning")
+            return
+        fmt = self.config.export_format.value if self.config else "text"
+        compress = self.config.export_gzip if self.config else False
+        name = buffer.title.rsplit(" ", 1)[0]
+        path = os.path.join(
+            self.config.export_dir if self.config else ".",
+            export_filename(name, buffer.started, fmt, compress),
+        )
+        output_pane.export_buffer(path, fmt, compress)
+
+    def action_toggle_table(self) -> None:
+        """Switch the output on screen between its table and raw output."""
+        try:
+            self.query_one(OutputPane).toggle_table()
+        except Exception:
+            pass
+
+    def action_diff_output(self) -> None:
+        """Show what changed in the output on screen since an earlier run."""
+        try:
+            self.query_one(OutputPane).toggle_diff()
+        except Exception:
+            pass
+
+    def action_pin_baseline(self) -> None:
+        """Compare later runs of the command on screen with its output on screen."""
+        try:
+            self.query_one(OutputPane).pin_baseline()
+        except Exception:
+            pass
+
+    def action_search_output(self) -> None:
+        """Open the search bar of the output pane."""
+        try:
+            self.query_one(OutputPane).open_search()
+        except Exception:
+            pass
+
+    def action_next_match(self) -> None:
+        """Jump to the next search match in the output."""
+        try:
+            self.query_one(OutputPane).search_step()
+        except Exception:
+            pass
+
+    def action_previous_match(self) -> None:
+        """Jump to the previous search match in the output."""
+        try:
+            self.query_one(OutputPane).search_step(forward=False)
         except Exception:
             pass
 
@@ -205,8 +623,10 @@ class OpsApp(App):
                 command_list.set_command_running(command_index, True)
             else:
                 if execution_id in self._running_command_indices:
-                    command_list.set_command_running(command_index, False)
                     del self._running_command_indices[execution_id]
+                    # Keep the spinner while another run of the same entry is active
+                    if command_index not in self._running_command_indices.values():
+                        command_list.set_command_running(command_index, False)
                 if execution_id in self._running_executions:
                     del self._running_executions[execution_id]
         except Exception:
@@ -220,7 +640,7 @@ class OpsApp(App):
         """
         try:
             output_pane = self.query_one(OutputPane)
-            output_pane.add_output_line(message.output_line)
+            output_pane.add_output_line(message.output_line, key=message.execution_id)
         except Exception:
             pass
 
@@ -236,6 +656,8 @@ class OpsApp(App):
 
             # Update output pane with completion status
             output_pane.set_execution_complete(execution)
+            if self.history:
+                self._record_history(output_pane, execution)
 
             # Mark command as no longer running
             if execution.id in self._running_executions:
@@ -244,6 +666,70 @@ class OpsApp(App):
         except Exception:
             pass
 
+    def _record_history(self, output_pane: OutputPane, execution: Execution) -> None:
+        """Store a finished execution's output in its command's history.
+
+        The output is read from a snapshot of its buffer in a worker thread.
+        An execution reported complete more than once is recorded once.
+        """
+        snapshot = output_pane.buffers.snapshot(execution.id)
+        history = self.history
+        if snapshot is None or history is None or execution.id in self._history_recorded:
+            return
+        self._history_recorded.add(execution.id)
+
+        def store() -> None:
+            lines = [line.content for line in snapshot.iter_lines()]
+            if get_current_worker().is_cancelled:
+                return
+            try:
+                history.record(execution, lines)
+            except (OSError, ExecutionError) as e:
+                self.call_from_thread(
+                    self.notify, str(e), title="History not saved", severity="error", markup=False
+                )
+
+        self.run_worker(store, thread=True, group="history")
+
+    def on_output_alert(self, message: OutputAlert) -> None:
+        """Notify about output that matched an alert pattern.
+
+        Args:
+            message: OutputAlert message with the execution and match
+        """
+        self.notify(
+            message.alert,
+            title=message.execution.command.name,
+            severity="warning",
+            markup=False,
+        )
+
+    def on_fan_out_complete(self, message: FanOutComplete) -> None:
+        """Handle completion of a parameterized command on all targets.
+
+        Args:
+            message: FanOutComplete message with the per-target result
+        """
+        try:
+            output_pane = self.query_one(OutputPane)
+            output_pane.set_fanout_complete(message.result, key=message.run_id)
+        except Exception:
+            pass
+
+    def on_pipeline_progress(self, message: PipelineProgress) -> None:
+        """Handle pipeline node transitions and completion.
+
+        Args:
+            message: PipelineProgress message with the result so far
+        """
+        try:
+            output_pane = self.query_one(OutputPane)
+            output_pane.set_pipeline_progress(
+                message.result, message.finished, key=message.run_id
+            )
+        except Exception:
+            pass
+
     def show_error(self, title: str, message: str, details: str = "") -> None:
         """Display an error screen.
 
@@ -259,6 +745,20 @@ class OpsApp(App):
     BINDINGS = [  # noqa: RUF012
         ("q", "quit", "Quit"),
         ("enter", "execute", "Execute"),
+        ("x", "cancel", "Cancel"),
+        ("X", "cancel_all", "Cancel all"),
+        ("m", "toggle_monitor", "Monitor"),
+        ("s", "cycle_monitor_sort", "Sort monitor"),
+        ("[", "previous_output", "Prev tab"),
+        ("]", "next_output", "Next tab"),
+        ("w", "close_output", "Close tab"),
+        ("e", "export_output", "Export"),
+        ("t", "toggle_table", "Table"),
+        ("d", "diff_output", "Diff"),
+        ("b", "pin_baseline", "Baseline"),
+        ("slash", "search_output", "Search"),
+        ("n", "next_match", "Next match"),
+        ("N", "previous_match", "Prev match"),
         ("up", "navigate_up", "Up"),
         ("down", "navigate_down", "Down"),
     ]
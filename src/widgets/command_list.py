@@ -4,7 +4,11 @@ from textual.containers import Container, ScrollableContainer, Vertical
 from textual.reactive import reactive
 from textual.widgets import Label, Static
 
-from ..models import Command
+from ..models import Command, Pipeline
+from ..services.metrics import format_value, sparkline
+
+# Values drawn in each metric's sparkline
+SPARKLINE_WIDTH = 12
 
 
 class CommandListPanel(Container):
@@ -12,16 +16,24 @@ class CommandListPanel(Container):
 
     selected_index: reactive[int] = reactive(0)
 
-    def __init__(self, commands: list[Command], *args, **kwargs):
+    def __init__(
+        self, commands: list[Command], *args, pipelines: list[Pipeline] | None = None, **kwargs
+    ):
         """Initialize command list panel.
 
+        Pipelines are listed after the commands and share the same index space.
+
         Args:
             commands: List of available commands
+            pipelines: Optional list of pipelines
         """
         super().__init__(*args, **kwargs)
         self.commands = commands
+        self.pipelines = pipelines or []
         self.selected_index = 0
         self._running_indices: set[int] = set()  # Track which commands are running
+        # Sparkline rows shown under commands with metrics
+        self._metric_lines: dict[int, list[str]] = {}
 
     def _format_command_line(self, index: int, command: Command) -> str:
         """Format a command line for display.
@@ -46,16 +58,48 @@ class CommandListPanel(Container):
 
         # Truncate description to fit in 30 column panel
         desc = command.description[:24] if command.description else command.command[:24]
-        return f"{prefix}{command.name:12} {desc}"
+        line = f"{prefix}{command.name:12} {desc}"
+        for metric_line in self._metric_lines.get(index, []):
+            line += f"\n{metric_line}"
+        return line
+
+    def _format_pipeline_line(self, index: int, pipeline: Pipeline) -> str:
+        """Format a pipeline line for display.
+
+        Args:
+            index: Entry index (after all commands)
+            pipeline: Pipeline object
+
+        Returns:
+            Formatted string
+        """
+        if index in self._running_indices:
+            prefix = "⟳ "
+        elif index == self.selected_index:
+            prefix = "▶ "
+        else:
+            prefix = "  "
+        return f"{prefix}{pipeline.name:12} ⇉ {len(pipeline.steps)} steps"
+
+    def _format_entry_line(self, index: int) -> str:
+        """Format the command or pipeline entry at an index."""
+        if index < len(self.commands):
+            return self._format_command_line(index, self.commands[index])
+        return self._format_pipeline_line(index, self.pipelines[index - len(self.commands)])
+
+    @property
+    def entry_count(self) -> int:
+        """Total number of selectable entries (commands and pipelines)."""
+        return len(self.commands) + len(self.pipelines)
 
     def compose(self):
         """Compose the command list panel."""
         with Vertical():
             yield Label("Commands", id="command-header")
             with ScrollableContainer(id="command-scroll"):
-                for i, cmd in enumerate(self.commands):
+                for i in range(self.entry_count):
                     is_selected = i == self.selected_index
-                    line = self._format_command_line(i, cmd)
+                    line = self._format_entry_line(i)
                     yield Static(
                         line,
                         id=f"cmd_{i}",
@@ -73,17 +117,17 @@ class CommandListPanel(Container):
 
     def navigate_down(self) -> None:
         """Move selection down."""
-        if self.selected_index < len(self.commands) - 1:
+        if self.selected_index < self.entry_count - 1:
             self.selected_index += 1
             self._update_display()
 
     def _update_display(self) -> None:
         """Update the display after selection change."""
         # Update all command items
-        for i, cmd in enumerate(self.commands):
+        for i in range(self.entry_count):
             try:
                 item = self.query_one(f"#{f'cmd_{i}'}", Static)
-                line = self._format_command_line(i, cmd)
+                line = self._format_entry_line(i)
                 item.update(line)
                 if i == self.selected_index:
                     item.add_class("active")
@@ -97,10 +141,10 @@ class CommandListPanel(Container):
         """Update the description display for the selected command."""
         try:
             desc_label = self.query_one("#command-description", Label)
-            selected_cmd = self.get_selected_command()
-            if selected_cmd and selected_cmd.description:
+            selected = self.get_selected_command() or self.get_selected_pipeline()
+            if selected and selected.description:
                 # Show full description truncated to panel width
-                desc_text = f"📝 {selected_cmd.description}"
+                desc_text = f"📝 {selected.description}"
                 desc_label.update(desc_text)
             else:
                 desc_label.update("")
@@ -117,6 +161,35 @@ class CommandListPanel(Container):
             return self.commands[self.selected_index]
         return None
 
+    def get_selected_pipeline(self) -> Pipeline | None:
+        """Get the currently selected pipeline.
+
+        Returns:
+            Selected Pipeline or None if a command (or nothing) is selected
+        """
+        pipeline_index = self.selected_index - len(self.commands)
+        if 0 <= pipeline_index < len(self.pipelines):
+            return self.pipelines[pipeline_index]
+        return None
+
+    def set_metrics(self, index: int, series: dict[str, list[float]]) -> None:
+        """Show sparklines of a command's metrics under its entry.
+
+        Args:
+            index: Command index
+            series: Values of each metric, oldest first
+        """
+        self._metric_lines[index] = [
+            f"  {name[:6]:6} {sparkline(values, SPARKLINE_WIDTH):{SPARKLINE_WIDTH}} "
+            f"{format_value(values[-1])}"
+            for name, values in series.items()
+            if values
+        ]
+        try:
+            self.query_one(f"#cmd_{index}", Static).update(self._format_entry_line(index))
+        except Exception:
+            pass
+
     def set_command_running(self, index: int, running: bool) -> None:
         """Mark a command as running or completed.
 
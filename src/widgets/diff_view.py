@@ -0,0 +1,179 @@
+"""Virtualized diff view for Ops Deck."""
+
+import re
+
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from ..services.diff import CONTEXT_LINES, DiffDocument
+
+# Control characters that would corrupt the terminal if drawn as-is
+_sub_control = re.compile("[\u0000-\u0008\u000b-\u001f\u007f]").sub
+
+_MARKS = {"equal": "  ", "delete": "- ", "insert": "+ "}
+# Rows above the diff: title and summary
+_HEADER_ROWS = 2
+# Unchanged rows left above a change scrolled to
+_LEAD_ROWS = 2
+
+
+class DiffView(ScrollView, can_focus=True):
+    """Scrollable diff of two outputs that only renders what is visible.
+
+    Long unchanged regions are folded into one row each; ``z`` unfolds or
+    folds them again and ``n``/``N`` move between changes.
+    """
+
+    COMPONENT_CLASSES = {  # noqa: RUF012
+        "diff-view--header",
+        "diff-view--delete",
+        "diff-view--insert",
+        "diff-view--fold",
+    }
+
+    DEFAULT_CSS = """
+    DiffView {
+        height: 1fr;
+        background: $surface;
+        overflow: auto;
+    }
+    DiffView > .diff-view--header {
+        text-style: bold;
+    }
+    DiffView > .diff-view--delete {
+        color: $error;
+    }
+    DiffView > .diff-view--insert {
+        color: $success;
+    }
+    DiffView > .diff-view--fold {
+        color: $text-muted;
+        text-style: italic;
+    }
+    """
+
+    BINDINGS = [  # noqa: RUF012
+        Binding("n", "next_hunk", "Next change"),
+        Binding("N", "previous_hunk", "Prev change"),
+        Binding("z", "toggle_fold", "Fold"),
+    ]
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the view with nothing to show."""
+        super().__init__(*args, **kwargs)
+        self.document: DiffDocument | None = None
+        self.title_text = ""
+        self._hunks: list[int] = []
+        self._width = 0
+        self._styles: dict[str, Style] = {}
+
+    def show_diff(self, document: DiffDocument | None, title: str = "") -> None:
+        """Display a diff, scrolled to its first change.
+
+        Args:
+            document: Diff to show (None to show nothing)
+            title: Which outputs are compared
+        """
+        self.document = document
+        self.title_text = title
+        self._width = 0
+        self._layout_changed()
+        if not self.is_mounted:
+            return
+        self.scroll_home(animate=False)
+        if self._hunks:
+            # Once the view has its size, or the scroll would be clamped to nothing
+            self.call_after_refresh(self._scroll_to_hunk, self._hunks[0])
+
+    def _layout_changed(self) -> None:
+        """Resize the scrollable area after the rows changed."""
+        document = self.document
+        rows = document.row_count if document is not None else 0
+        self._hunks = document.hunk_rows() if document is not None else []
+        if document is not None and not self._width:
+            # Sampled: measuring every line of a long output is not needed to scroll
+            sample = [*document.old[:2000], *document.new[:2000]]
+            self._width = 2 + max(map(cell_len, sample), default=0)
+        self.virtual_size = Size(max(self._width, cell_len(self.title_text)), _HEADER_ROWS + rows)
+        self.refresh()
+
+    def action_toggle_fold(self) -> None:
+        """Show every unchanged line, or fold long unchanged regions again."""
+        if self.document is None:
+            return
+        self.document.layout(CONTEXT_LINES if self.document.context is None else None)
+        self._layout_changed()
+
+    def action_next_hunk(self) -> None:
+        """Scroll to the next change."""
+        top = self.scroll_offset.y
+        target = next((hunk for hunk in self._hunks if hunk - _LEAD_ROWS > top), None)
+        if target is not None:
+            self._scroll_to_hunk(target)
+
+    def action_previous_hunk(self) -> None:
+        """Scroll to the previous change."""
+        top = self.scroll_offset.y
+        target = next(
+            (hunk for hunk in reversed(self._hunks) if max(0, hunk - _LEAD_ROWS) < top), None
+        )
+        if target is not None:
+            self._scroll_to_hunk(target)
+
+    def _scroll_to_hunk(self, row: int) -> None:
+        """Scroll a change near the top, below a few unchanged rows."""
+        self.scroll_to(y=max(0, row - _LEAD_ROWS), animate=False)
+
+    def notify_style_update(self) -> None:
+        """Drop cached styles when CSS changes."""
+        super().notify_style_update()
+        self._styles.clear()
+
+    def render_line(self, y: int) -> Strip:
+        """Render one visible row.
+
+        Args:
+            y: Row relative to the top of the widget
+
+        Returns:
+            Rendered row cropped to the widget width
+        """
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        base = self.rich_style
+        document = self.document
+        if document is None:
+            return Strip.blank(width, base)
+        if y < _HEADER_ROWS:
+            if y == 0:
+                text = self.title_text
+            else:
+                text = f"+{document.added:,} -{document.removed:,} lines"
+            return Strip([Segment(text, base + self._style("diff-view--header"))]).crop_extend(
+                0, width, base
+            )
+        index = scroll_y + y - _HEADER_ROWS
+        if index >= document.row_count:
+            return Strip.blank(width, base)
+        row = document.row(index)
+        if row.kind == "fold":
+            text = f"  ⋯ {row.folded:,} unchanged lines ⋯"
+            style = base + self._style("diff-view--fold")
+        else:
+            text = _MARKS[row.kind] + _sub_control("�", row.text).expandtabs()
+            style = base
+            if row.kind != "equal":
+                style += self._style(f"diff-view--{row.kind}")
+        return Strip([Segment(text, style)]).crop_extend(scroll_x, scroll_x + width, base)
+
+    def _style(self, name: str) -> Style:
+        """Get the style a component class adds on top of the widget style."""
+        style = self._styles.get(name)
+        if style is None:
+            style = self._styles[name] = self.get_component_rich_style(name, partial=True)
+        return style
@@ -0,0 +1,367 @@
+"""Virtualized output log widget for Ops Deck."""
+
+import re
+import time
+from collections import deque
+
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
+from rich.text import Text
+from textual.cache import LRUCache
+from textual.geometry import Offset, Region, Size
+from textual.scroll_view import ScrollView
+from textual.selection import Selection
+from textual.strip import Strip
+
+from ..models import OutputLine, StreamType
+from ..services.highlight import Highlighter
+
+# Control characters that would corrupt the terminal if drawn as-is
+_sub_control = re.compile("[\u0000-\u0008\u000b-\u001f\u007f]").sub
+
+_PREFIXES = {StreamType.STDOUT: "[OUT] ", StreamType.STDERR: "[ERR] "}
+_STREAM_CLASSES = {
+    StreamType.STDOUT: "output-log--stdout",
+    StreamType.STDERR: "output-log--stderr",
+}
+
+
+class OutputLog(ScrollView):
+    """Scrollable view of output lines that only renders what is visible.
+
+    Lines are stored as they arrive and turned into styled strips (with
+    highlight rules applied) only when they are drawn; rendered strips are
+    cached per line. Output is never parsed as console markup: each line is
+    built as a ``Text`` with its stream's style attached directly.
+    """
+
+    COMPONENT_CLASSES = {  # noqa: RUF012
+        "output-log--stdout",
+        "output-log--stderr",
+        "output-log--prefix",
+        "output-log--match",
+        "output-log--current-match",
+    }
+
+    DEFAULT_CSS = """
+    OutputLog {
+        height: 1fr;
+        background: $surface;
+        overflow: auto;
+    }
+    OutputLog > .output-log--stderr {
+        color: $error;
+    }
+    OutputLog > .output-log--prefix {
+        text-style: dim;
+    }
+    OutputLog > .output-log--match {
+        text-style: reverse;
+    }
+    OutputLog > .output-log--current-match {
+        background: $accent-darken-2;
+    }
+    """
+
+    def __init__(
+        self,
+        highlighter: Highlighter | None = None,
+        max_lines: int = 10000,
+        auto_scroll: bool = True,
+        *args,
+        **kwargs,
+    ):
+        """Initialize the log.
+
+        Args:
+            highlighter: Highlight rules to apply (None for plain output)
+            max_lines: Output lines to keep; the oldest are dropped
+            auto_scroll: Follow new lines while scrolled to the end
+        """
+        super().__init__(*args, **kwargs)
+        self.highlighter = highlighter
+        self.max_lines = max_lines
+        self.auto_scroll = auto_scroll
+        self.lines: deque[OutputLine] = deque()
+        self.header: list[str] = []
+        self.footer: list[tuple[str, str]] = []
+        self._width = 0
+        self._strip_cache: LRUCache[str, Strip] = LRUCache(1024)
+        self._style_cache: dict[str, Style] = {}
+        self._stream_styles: dict[str, Style] = {}
+        # Seconds taken to render each of the most recent frames
+        self.frame_times: deque[float] = deque(maxlen=120)
+        self._frame_style = Style()
+        # Search matches are highlighted on visible rows only
+        self.search_pattern: re.Pattern[str] | None = None
+        self._marked_id: str | None = None
+
+    @property
+    def line_count(self) -> int:
+        """Total rows, including header and footer."""
+        return len(self.header) + len(self.lines) + len(self.footer)
+
+    def add_line(self, line: OutputLine) -> None:
+        """Append an output line.
+
+        Args:
+            line: Output line to append
+        """
+        self.lines.append(line)
+        if len(self.lines) > self.max_lines:
+            self.lines.popleft()
+        self.lines_added([line])
+
+    def lines_added(self, lines: list[OutputLine]) -> None:
+        """Update the view after lines were appended to the shown list.
+
+        Args:
+            lines: The lines that were appended
+        """
+        follow = self.auto_scroll and self.is_vertical_scroll_end
+        for line in lines:
+            self._width = max(self._width, len(_PREFIXES[line.stream]) + cell_len(line.content))
+        self._update_virtual_size(follow)
+
+    def show_lines(self, lines: deque[OutputLine]) -> None:
+        """Display another list of lines, scrolled to its end.
+
+        The list is shown as-is (not copied), so lines appended to it later
+        appear after a call to :meth:`lines_added`.
+
+        Args:
+            lines: Output lines to display
+        """
+        self.lines = lines
+        self._width = max(
+            (len(_PREFIXES[line.stream]) + cell_len(line.content) for line in lines), default=0
+        )
+        self._strip_cache.clear()
+        self._update_virtual_size(self.auto_scroll)
+        if not self.auto_scroll and self.is_mounted:
+            self.scroll_home(animate=False)
+
+    def set_header(self, lines: list[str]) -> None:
+        """Set the plain-text lines shown above the output."""
+        self.header = lines
+        self._strip_cache.clear()
+        self._update_virtual_size(self.auto_scroll and self.is_vertical_scroll_end)
+
+    def set_footer(self, lines: list[str], style: str = "") -> None:
+        """Set the lines shown below the output.
+
+        Args:
+            lines: Plain-text lines
+            style: Rich style applied to the lines
+        """
+        self.footer = [(line, style) for line in lines]
+        self._strip_cache.clear()
+        self._update_virtual_size(self.auto_scroll and self.is_vertical_scroll_end)
+
+    def clear(self) -> None:
+        """Remove all lines, header and footer."""
+        self.lines.clear()
+        self.header = []
+        self.footer = []
+        self._width = 0
+        self._strip_cache.clear()
+        self._update_virtual_size(False)
+        if self.is_mounted:
+            self.scroll_home(animate=False)
+
+    def set_search(self, pattern: re.Pattern[str] | None) -> None:
+        """Highlight the matches of a search (None to stop highlighting)."""
+        if pattern == self.search_pattern:
+            return
+        self.search_pattern = pattern
+        self._marked_id = None
+        self._strip_cache.clear()
+        self.refresh()
+
+    def mark_line(self, index: int | None) -> None:
+        """Mark a line as the current search match and scroll it into view.
+
+        Args:
+            index: Position of the line in :attr:`lines` (None to unmark)
+        """
+        for line_id in (self._marked_id, self.lines[index].id if index is not None else None):
+            if line_id is not None:
+                self._strip_cache.discard(line_id)
+        if index is None:
+            self._marked_id = None
+        else:
+            self._marked_id = self.lines[index].id
+            row = len(self.header) + index
+            if self.is_mounted:
+                self.scroll_to(y=max(0, row - self.size.height // 2), animate=False)
+        self.refresh()
+
+    def _update_virtual_size(self, follow: bool) -> None:
+        """Resize the scrollable area and keep following the end if asked."""
+        self.virtual_size = Size(self._width, self.line_count)
+        if follow and self.is_mounted:
+            self.scroll_end(animate=False, x_axis=False)
+        self.refresh()
+
+    def get_selection(self, selection: Selection) -> tuple[str, str] | None:
+        """Get the selected text, building only the selected rows.
+
+        Args:
+            selection: Selection in row and column coordinates
+
+        Returns:
+            Tuple of the selected text and the line ending
+        """
+        if not self.line_count:
+            return None
+        first = selection.start.y if selection.start is not None else 0
+        last = selection.end.y if selection.end is not None else self.line_count - 1
+        last = min(last, self.line_count - 1)
+        text = "\n".join(self._row_text(row) for row in range(first, last + 1))
+        # Coordinates relative to the first selected row
+        start, end = selection
+        selection = Selection(
+            None if start is None else Offset(start.x, start.y - first),
+            None if end is None else Offset(end.x, end.y - first),
+        )
+        return selection.extract(text), "\n"
+
+    def selection_updated(self, selection: Selection | None) -> None:
+        """Redraw after the selection changed."""
+        self.refresh()
+
+    def _row_text(self, row: int) -> str:
+        """Plain text of one row as displayed."""
+        header_rows = len(self.header)
+        if row < header_rows:
+            return self.header[row]
+        index = row - header_rows
+        if index < len(self.lines):
+            line = self.lines[index]
+            return _PREFIXES[line.stream] + line.content
+        index -= len(self.lines)
+        return self.footer[index][0] if index < len(self.footer) else ""
+
+    def notify_style_update(self) -> None:
+        """Drop cached strips when CSS changes."""
+        super().notify_style_update()
+        self._strip_cache.clear()
+        self._stream_styles.clear()
+
+    def render_lines(self, crop: Region) -> list[Strip]:
+        """Render the visible rows, recording how long the frame took."""
+        start = time.perf_counter()
+        # Resolved once per frame rather than once per row
+        self._frame_style = self.rich_style
+        strips = super().render_lines(crop)
+        self.frame_times.append(time.perf_counter() - start)
+        return strips
+
+    def render_line(self, y: int) -> Strip:
+        """Render one visible row.
+
+        Args:
+            y: Row relative to the top of the widget
+
+        Returns:
+            Rendered row cropped to the widget width
+        """
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        style = self._frame_style
+        row = scroll_y + y
+        strip = self._row_strip(row)
+        if strip is None:
+            return Strip.blank(width, style)
+        selection = self.text_selection
+        if selection is not None and (span := selection.get_span(row)) is not None:
+            strip = self._select(strip, *span)
+        # Offsets map mouse positions to text positions for selection
+        return strip.crop_extend(scroll_x, scroll_x + width, style).apply_offsets(scroll_x, row)
+
+    def _select(self, strip: Strip, start: int, end: int) -> Strip:
+        """Apply the selection style to a span of columns of a row."""
+        if end == -1:
+            end = strip.cell_length
+        before, selected, after = strip.divide([start, end, strip.cell_length])
+        selection_style = self.screen.get_component_rich_style("screen--selection")
+        selected = Strip(
+            Segment.apply_style(selected, post_style=selection_style), selected.cell_length
+        )
+        return Strip.join([before, selected, after])
+
+    def _row_strip(self, row: int) -> Strip | None:
+        """Get the (cached) uncropped strip of one row, or None past the end."""
+        header_rows = len(self.header)
+        if row < header_rows:
+            return self._text_strip(f"h{row}", self.header[row], "bold")
+
+        index = row - header_rows
+        if index < len(self.lines):
+            line = self.lines[index]
+            cached = self._strip_cache.get(line.id)
+            if cached is None:
+                cached = self._render_output_line(line)
+                self._strip_cache[line.id] = cached
+            return cached
+
+        index -= len(self.lines)
+        if index < len(self.footer):
+            content, style = self.footer[index]
+            return self._text_strip(f"f{index}", content, style)
+        return None
+
+    def _text_strip(self, key: str, content: str, style: str) -> Strip:
+        """Render (and cache) a plain header or footer row."""
+        cached = self._strip_cache.get(key)
+        if cached is None:
+            text = Text(content, style=self._style(style), no_wrap=True)
+            text.stylize(self.rich_style)
+            cached = Strip(text.render(self.app.console), text.cell_len)
+            self._strip_cache[key] = cached
+        return cached
+
+    def _render_output_line(self, line: OutputLine) -> Strip:
+        """Render an output line with its stream prefix and color or highlight spans.
+
+        Lines that carry their own ANSI colors are shown as the command
+        colored them; highlight rules only apply to uncolored lines.
+        """
+        body = Text(_sub_control("�", line.content), no_wrap=True, end="")
+        if line.spans:
+            for start, end, style in line.spans:
+                body.stylize(self._style(style), start, end)
+        elif self.highlighter is not None:
+            for start, end, style in self.highlighter.spans(body.plain):
+                body.stylize(self._style(style), start, end)
+        if self.search_pattern is not None:
+            match_style = self._component_style("output-log--match")
+            for match in self.search_pattern.finditer(body.plain):
+                if match.end() > match.start():
+                    body.stylize(match_style, match.start(), match.end())
+        if "\t" in body.plain:
+            body.expand_tabs()
+
+        line_style = self._frame_style + self._component_style(_STREAM_CLASSES[line.stream])
+        if line.id == self._marked_id:
+            line_style += self._component_style("output-log--current-match")
+        text = Text(no_wrap=True, end="", style=line_style)
+        text.append(_PREFIXES[line.stream], self._component_style("output-log--prefix"))
+        text.append_text(body)
+        return Strip(text.render(self.app.console), text.cell_len)
+
+    def _component_style(self, name: str) -> Style:
+        """Get the style a component class adds on top of the widget style."""
+        style = self._stream_styles.get(name)
+        if style is None:
+            style = self._stream_styles[name] = self.get_component_rich_style(name, partial=True)
+        return style
+
+    def _style(self, style: str) -> Style:
+        """Parse a style string once."""
+        parsed = self._style_cache.get(style)
+        if parsed is None:
+            parsed = Style.parse(style) if style else Style()
+            self._style_cache[style] = parsed
+        return parsed
@@ -1,122 +1,868 @@
 """Output pane widget for Ops Deck."""
 
-
-from textual.containers import Container, ScrollableContainer, Vertical
+import contextlib
+import dataclasses
+import os
+import re
+from collections import deque
+from datetime import datetime
+
+from textual.await_complete import AwaitComplete
+from textual.containers import Container, Vertical
+from textual.content import Content
 from textual.reactive import reactive
-from textual.widgets import Label, Static
-
-from ..models import Execution, OutputLine, StreamType
+from textual.widgets import Label, Tab, Tabs
+from textual.worker import get_current_worker
+
+from ..models import (
+    Execution,
+    ExecutionStatus,
+    FanOutResult,
+    OutputLine,
+    PipelineResult,
+    StreamType,
+)
+from ..services.diff import DiffDocument
+from ..services.export import export_lines
+from ..services.highlight import Highlighter
+from ..services.output_buffers import OutputBuffer, OutputBufferStore
+from ..services.search import PREVIEW_CHARS, SearchState, compile_query, run_search
+from ..services.table import TableParser, TableView, compute_view
+from .diff_view import DiffView
+from .output_log import OutputLog
+from .output_table import OutputTable
+from .pipeline_view import PipelineView
+from .search_bar import SearchBar
+from .target_matrix import TargetMatrix
+
+_TAB_PREFIX = "tab-"
 
 
 class OutputPane(Container):
-    """Pane for displaying command output."""
+    """Pane for displaying command output.
+
+    Each execution (or fan-out/pipeline run) writes to its own buffer,
+    shown as a tab; the pane displays one buffer at a time. The stdout of a
+    command with a structured ``format`` is also parsed into a table, shown
+    instead of the raw output until toggled. A buffer can also be shown as a
+    diff against an earlier run of the same command.
+    """
 
     lines_count: reactive[int] = reactive(0)
 
-    def __init__(self, *args, **kwargs):
-        """Initialize output pane."""
+    def __init__(
+        self,
+        *args,
+        highlighter: Highlighter | None = None,
+        max_lines: int = 10000,
+        auto_scroll: bool = True,
+        memory_budget: int = 256 * 1024 * 1024,
+        **kwargs,
+    ):
+        """Initialize output pane.
+
+        Args:
+            highlighter: Highlight rules applied to visible output lines
+            max_lines: Output lines to keep per execution
+            auto_scroll: Follow new output while scrolled to the end
+            memory_budget: Approximate bytes of output kept in memory across
+                all executions before finished ones are evicted to disk
+        """
         super().__init__(*args, **kwargs)
-        self.output_lines: list[OutputLine] = []
-        self._is_running = False
-        self._current_execution: Execution | None = None
-        self._user_scrolled = False  # Track if user manually scrolled
-        self._auto_scroll_enabled = True  # Enable/disable auto-scroll
+        self.buffers = OutputBufferStore(memory_budget, max_lines=max_lines)
+        self._log = OutputLog(
+            highlighter=highlighter,
+            max_lines=max_lines,
+            auto_scroll=auto_scroll,
+            id="output-log",
+        )
+        self._table = OutputTable(id="output-table")
+        self._table.display = False
+        self._diff = DiffView(id="output-diff")
+        self._diff.display = False
+        self._tabs = Tabs(id="output-tabs")
+        self._search_bar = SearchBar(id="search-bar")
+        # Search of each buffer, kept while switching tabs
+        self._searches: dict[str, SearchState] = {}
+        self._step_after_scan: str | None = None
+        # Sort and filter of each buffer's table, and buffers showing raw output instead
+        self._table_views: dict[str, TableView] = {}
+        self._raw_views: set[str] = set()
+        # Buffer shown as a diff, and the buffer each command's runs are compared with
+        self._diff_key: str | None = None
+        self._baselines: dict[str, str] = {}
+
+    @property
+    def output_lines(self) -> deque[OutputLine]:
+        """Output lines of the buffer on screen."""
+        return self._log.lines
+
+    @property
+    def current_buffer(self) -> OutputBuffer | None:
+        """The buffer on screen, if any."""
+        key = self.buffers.visible
+        return self.buffers.get(key) if key is not None else None
+
+    @property
+    def _current_execution(self) -> Execution | None:
+        buffer = self.current_buffer
+        return buffer.execution if buffer else None
+
+    @property
+    def _is_running(self) -> bool:
+        buffer = self.current_buffer
+        return buffer.running if buffer else False
 
     def compose(self):
         """Compose the output pane."""
         with Vertical():
             yield Label("Output", id="output-header")
-            with ScrollableContainer(id="output-container"):
-                yield Static("Ready to execute commands...", id="output-content")
+            yield self._tabs
+            yield self._log
+            yield self._table
+            yield self._diff
+            yield self._search_bar
+            yield TargetMatrix(id="target-matrix")
+            yield PipelineView(id="pipeline-view")
+
+    def on_mount(self) -> None:
+        """Add tabs for buffers opened before mounting and show the placeholder."""
+        for buffer in self.buffers.buffers():
+            self._tabs.add_tab(self._make_tab(buffer))
+        self._update_display()
+
+    def on_unmount(self) -> None:
+        """Delete evicted buffers from disk."""
+        self.buffers.close()
 
-    def add_output_line(self, line: OutputLine) -> None:
-        """Add an output line to the display.
+    def open_buffer(
+        self,
+        key: str,
+        title: str,
+        execution: Execution | None = None,
+        show: bool = True,
+        name: str | None = None,
+    ) -> OutputBuffer:
+        """Open the buffer of a new execution or run and add its tab.
 
         Args:
-            line: OutputLine to add
+            key: Execution or run ID
+            title: Label for the tab
+            execution: Execution writing to the buffer, if known
+            show: Switch to the buffer
+            name: Command or pipeline the output comes from, if known
+
+        Returns:
+            The buffer
+        """
+        is_new = key not in self.buffers
+        buffer = self.buffers.open(key, title)
+        if name is not None:
+            buffer.name = name
+        if execution is not None:
+            buffer.execution = execution
+            self._attach_table(buffer)
+        if is_new and self.is_mounted:
+            first = not self._tabs.tab_count
+            added = self._tabs.add_tab(self._make_tab(buffer))
+            if first:
+                self.run_worker(self._reselect_tab(added), group="tabs")
+        if show or self.buffers.visible is None:
+            self.show_buffer(key)
+        return buffer
+
+    async def _reselect_tab(self, added: AwaitComplete) -> None:
+        """Select the tab on screen again once a first tab is mounted.
+
+        Tabs activates its first tab after mounting it, by which time another
+        buffer may have been opened and shown.
         """
-        self.output_lines.append(line)
-        self.lines_count = len(self.output_lines)
+        await added
+        key = self.buffers.visible
+        if key is not None and self._tabs.query(f"#{_TAB_PREFIX}{key}"):
+            self._tabs.active = _TAB_PREFIX + key
+
+    def show_buffer(self, key: str) -> None:
+        """Display a buffer, reading it back from disk if it was evicted.
+
+        Args:
+            key: Buffer key
+        """
+        if key not in self.buffers:
+            return
+        if key != self._diff_key:
+            self._diff_key = None
+        # Marked visible first so reading it back cannot evict it again
+        self.buffers.visible = key
+        buffer = self.buffers.get(key)
+        assert buffer is not None
+        self._log.show_lines(buffer.lines)
+        self._show_table(buffer)
+        search = self._searches.get(key)
+        self._log.set_search(search.pattern if search else None)
+        self._show_search_status()
+        self.lines_count = len(buffer.lines)
+        try:
+            matrix = self.query_one(TargetMatrix)
+            pipeline_view = self.query_one(PipelineView)
+        except Exception:
+            # Widget not yet mounted
+            pass
+        else:
+            if buffer.fanout_result:
+                matrix.show_result(buffer.fanout_result)
+            else:
+                matrix.clear_result()
+            if buffer.pipeline_result:
+                pipeline_view.show_result(buffer.pipeline_result)
+            else:
+                pipeline_view.clear_result()
+        if self.is_mounted and self._tabs.active != _TAB_PREFIX + key:
+            self._tabs.active = _TAB_PREFIX + key
         self._update_display()
 
+    def show_latest(self, name: str) -> bool:
+        """Display the most recent buffer of a command or pipeline.
+
+        Args:
+            name: Command or pipeline name
+
+        Returns:
+            True if the command or pipeline has a buffer
+        """
+        for buffer in reversed(self.buffers.buffers()):
+            if buffer.title.rsplit(" ", 1)[0] == name:
+                if buffer.key != self.buffers.visible:
+                    self.show_buffer(buffer.key)
+                return True
+        return False
+
+    def close_buffer(self, key: str | None = None) -> None:
+        """Close a buffer (the one on screen by default) and its tab.
+
+        Args:
+            key: Buffer key
+        """
+        key = key or self.buffers.visible
+        if key is None or key not in self.buffers:
+            return
+        if self.is_mounted:
+            self._tabs.remove_tab(_TAB_PREFIX + key)
+        was_visible = key == self.buffers.visible
+        self.buffers.remove(key)
+        self._searches.pop(key, None)
+        self._table_views.pop(key, None)
+        self._raw_views.discard(key)
+        self._baselines = {name: base for name, base in self._baselines.items() if base != key}
+        if was_visible:
+            remaining = self.buffers.buffers()
+            if remaining:
+                self.show_buffer(remaining[-1].key)
+            else:
+                self._show_nothing()
+
+    def on_tabs_tab_activated(self, event: Tabs.TabActivated) -> None:
+        """Show the buffer of the selected tab."""
+        event.stop()
+        if event.tab is None or event.tab.id is None or event.tab.id != self._tabs.active:
+            # Stale: another tab was activated since, e.g. by tabs opened in a row
+            return
+        key = event.tab.id.removeprefix(_TAB_PREFIX)
+        if key != self.buffers.visible:
+            self.show_buffer(key)
+
+    def on_tabs_cleared(self, event: Tabs.Cleared) -> None:
+        """Handle the last tab being removed."""
+        event.stop()
+
+    def add_output_line(self, line: OutputLine, key: str | None = None) -> None:
+        """Add an output line to its execution's buffer.
+
+        Args:
+            line: OutputLine to add
+            key: Buffer key (defaults to the line's execution ID)
+        """
+        key = key or line.execution_id
+        if key not in self.buffers:
+            self.open_buffer(key, key, show=False)
+        buffer = self.buffers.append(key, line)
+        table = buffer.table
+        added_row = (
+            table is not None and line.stream == StreamType.STDOUT and table.feed(line.content)
+        )
+        if key == self.buffers.visible:
+            if added_row and self._table.display:
+                self._table.rows_added()
+            self._log.lines_added([line])
+            self.lines_count = len(buffer.lines)
+            if self.lines_count == 1:
+                # Replace the placeholder
+                self._update_display()
+
     def clear_output(self) -> None:
-        """Clear all output lines."""
-        self.output_lines.clear()
-        self.lines_count = 0
-        self._update_display()
+        """Close every buffer."""
+        if self.is_mounted:
+            self._tabs.clear()
+        self.buffers.close()
+        self._searches.clear()
+        self._table_views.clear()
+        self._raw_views.clear()
+        self._baselines.clear()
+        self._show_nothing()
 
     def set_running(self, running: bool) -> None:
-        """Set execution status.
+        """Set execution status of the buffer on screen.
 
         Args:
             running: True if command is running
         """
-        self._is_running = running
+        buffer = self.current_buffer
+        if buffer is not None:
+            buffer.running = running
         self._update_display()
 
-    def set_execution_complete(self, execution: Execution) -> None:
+    def set_execution_complete(self, execution: Execution, key: str | None = None) -> None:
         """Handle execution completion.
 
         Args:
             execution: Completed Execution object
+            key: Buffer key (defaults to the execution ID)
         """
-        self._current_execution = execution
-        self._is_running = False
-        self._update_display()
+        key = key or execution.id
+        name = execution.command.name
+        buffer = self.open_buffer(key, self._title(name), show=False, name=name)
+        buffer.execution = execution
+        self._attach_table(buffer)
+        self._finish(buffer)
+
+    def set_fanout_complete(self, result: FanOutResult, key: str | None = None) -> None:
+        """Handle completion of a parameterized command on all targets.
+
+        Args:
+            result: Aggregated per-target result
+            key: Buffer key of the fan-out run
+        """
+        buffer = self.current_buffer if key is None else self.buffers.get(key)
+        if buffer is None:
+            return
+        buffer.fanout_result = result
+        self._finish(buffer)
 
-    def start_command(self, execution: Execution) -> None:
+    def set_pipeline_progress(
+        self, result: PipelineResult, finished: bool, key: str | None = None
+    ) -> None:
+        """Show the per-node state of a pipeline run.
+
+        Args:
+            result: Pipeline result so far
+            finished: True once the pipeline has completed
+            key: Buffer key of the pipeline run
+        """
+        buffer = self.current_buffer if key is None else self.buffers.get(key)
+        if buffer is None:
+            return
+        buffer.pipeline_result = result
+        if finished:
+            self._finish(buffer)
+        elif buffer.key == self.buffers.visible:
+            try:
+                self.query_one(PipelineView).show_result(result)
+            except Exception:
+                # Widget not yet mounted
+                pass
+
+    def start_command(self, execution: Execution, key: str | None = None) -> None:
         """Handle start of a new command execution.
 
+        Opens the execution's buffer and switches to it.
+
         Args:
             execution: Execution object for the new command
+            key: Buffer key (defaults to the execution ID)
         """
-        # Add command header
-        self._is_running = True
-        self._current_execution = execution
-        self._auto_scroll_enabled = True
-        self._user_scrolled = False
+        name = execution.command.name
+        self.open_buffer(key or execution.id, self._title(name), execution, name=name)
 
-        # Add header to output lines as special marker
-        # We'll format this separately in display
-        self._update_display()
-
-    def _get_stream_class(self, stream_type: StreamType) -> str:
-        """Get CSS class for stream type.
+    def start_run(self, key: str, name: str) -> None:
+        """Open and switch to the buffer of a fan-out or pipeline run.
 
         Args:
-            stream_type: Type of stream (STDOUT or STDERR)
+            key: Run ID
+            name: Command or pipeline name
+        """
+        self.open_buffer(key, self._title(name), name=name)
+
+    def toggle_table(self) -> None:
+        """Switch the buffer on screen between its table and its raw output."""
+        buffer = self.current_buffer
+        if buffer is None or buffer.table is None:
+            self.notify("This output has no table format", severity="warning")
+            return
+        self._raw_views ^= {buffer.key}
+        self._diff_key = None
+        self._show_table(buffer)
+        self._show_search_status()
+        (self._table if self._table.display else self._log).focus()
+
+    def on_output_table_view_changed(self, event: OutputTable.ViewChanged) -> None:
+        """Re-sort the table on screen."""
+        event.stop()
+        if self.buffers.visible is not None:
+            self._compute_table_view(self.buffers.visible)
+
+    def _attach_table(self, buffer: OutputBuffer) -> None:
+        """Start parsing a buffer's output if its command has a table format."""
+        execution = buffer.execution
+        if buffer.table is not None or execution is None or execution.command.format == "text":
+            return
+        buffer.table = TableParser(execution.command.format)
+        # Lines that arrived before the execution was known
+        for line in buffer.lines:
+            if line.stream == StreamType.STDOUT:
+                buffer.table.feed(line.content)
+
+    def _show_table(self, buffer: OutputBuffer) -> None:
+        """Show a buffer's table, or its raw output if it has none or it was toggled."""
+        shown = buffer.table is not None and buffer.key not in self._raw_views
+        if buffer.table is not None and shown:
+            view = self._table_views.setdefault(buffer.key, TableView())
+            self._table.show_table(buffer.table.table, view)
+        else:
+            self._table.show_table(None)
+        diffing = buffer.key == self._diff_key
+        self._diff.display = diffing
+        self._table.display = shown and not diffing
+        self._log.display = not shown and not diffing
+
+    def pin_baseline(self) -> None:
+        """Compare later runs of the command on screen with its output on screen."""
+        buffer = self.current_buffer
+        name = buffer.name if buffer is not None else None
+        if buffer is None or name is None:
+            self.notify("No output to pin", severity="warning")
+            return
+        self._baselines[name] = buffer.key
+        self.notify(f"Diffs of {name} now compare with {buffer.title}", title="Baseline pinned")
+
+    def toggle_diff(self) -> None:
+        """Show what changed in the output on screen since an earlier run, or stop.
+
+        The output is compared with the command's pinned baseline, or else its
+        previous run. Both outputs are read and diffed in a worker thread.
+        """
+        buffer = self.current_buffer
+        if buffer is None:
+            self.notify("No output to compare", severity="warning")
+            return
+        if self._diff_key == buffer.key:
+            self._diff_key = None
+            self._show_table(buffer)
+            (self._table if self._table.display else self._log).focus()
+            return
+        name = buffer.name
+        base = self._baseline(name, buffer.key) if name is not None else None
+        if name is None or base is None:
+            self.notify(
+                f"No earlier output of {name or buffer.title} to compare with", severity="warning"
+            )
+            return
+        old = self.buffers.snapshot(base.key)
+        new = self.buffers.snapshot(buffer.key)
+        if old is None or new is None:
+            return
+        pinned = " (baseline)" if self._baselines.get(name) == base.key else ""
+        title = f"{base.title}{pinned} → {buffer.title}"
+        key = buffer.key
+
+        def compute() -> None:
+            old_lines = [line.content for line in old.iter_lines()]
+            new_lines = [line.content for line in new.iter_lines()]
+            document = DiffDocument.build(old_lines, new_lines)
+            if not get_current_worker().is_cancelled:
+                self.app.call_from_thread(self._diff_done, key, document, title)
+
+        # A newer comparison replaces this one
+        self.run_worker(compute, thread=True, group="diff", exclusive=True)
+
+    def _baseline(self, name: str, key: str) -> OutputBuffer | None:
+        """Find the buffer a command's buffer is compared with."""
+        pinned = self._baselines.get(name)
+        if pinned is not None and pinned != key and pinned in self.buffers:
+            return self.buffers.get(pinned)
+        previous = None
+        for buffer in self.buffers.buffers():
+            if buffer.key == key:
+                return previous
+            if buffer.name == name:
+                previous = buffer
+        return None
+
+    def _diff_done(self, key: str, document: DiffDocument, title: str) -> None:
+        """Show a finished diff if its buffer is still on screen."""
+        buffer = self.current_buffer
+        if buffer is None or buffer.key != key:
+            return
+        self._diff_key = key
+        self._diff.show_diff(document, title)
+        self._show_table(buffer)
+        self._diff.focus()
+
+    def _compute_table_view(self, key: str) -> None:
+        """Sort and filter a buffer's table in a worker thread."""
+        buffer = self.buffers.get(key)
+        if buffer is None or buffer.table is None:
+            return
+        table = buffer.table.table
+        view = self._table_views.setdefault(key, TableView())
+        view.computing = True
+        self._table.refresh()
+        # The worker reads a copy, so the cursor can move meanwhile
+        request = dataclasses.replace(view)
+
+        def compute() -> None:
+            worker = get_current_worker()
+            rows, count = compute_view(table, request, cancelled=lambda: worker.is_cancelled)
+            if not worker.is_cancelled:
+                self.app.call_from_thread(self._table_view_done, key, view, rows, count)
+
+        # A newer sort or filter of the same table replaces this one
+        self.run_worker(compute, thread=True, group=f"table-{key}", exclusive=True)
+
+    def _table_view_done(
+        self, key: str, view: TableView, rows: list[int] | None, count: int
+    ) -> None:
+        """Show the rows of a finished sort or filter."""
+        view.rows = rows
+        view.computed_for = count
+        view.computing = False
+        if key == self.buffers.visible and self._table.view is view:
+            self._table.rows_added()
+            self._table.scroll_home(animate=False)
+            self._show_search_status()
+
+    def open_search(self) -> None:
+        """Show the search bar."""
+        self._search_bar.open()
+
+    def on_search_bar_submitted(self, event: SearchBar.Submitted) -> None:
+        """Search for the submitted query."""
+        event.stop()
+        self.search(event.query, event.regex)
+
+    def on_search_bar_closed(self, event: SearchBar.Closed) -> None:
+        """Return focus to the output when the search bar closes."""
+        event.stop()
+        self._log.focus()
+
+    def search(self, query: str, regex: bool = False) -> None:
+        """Search the whole output of the buffer on screen, scrollback included.
+
+        A new query is scanned from the first line in a background worker,
+        jumping to the first match as soon as one is found. Submitting the
+        same query again moves to its next match and scans only the lines
+        output since the last scan.
 
-        Returns:
-            CSS class name
+        Args:
+            query: Text or regular expression to find (empty to stop searching)
+            regex: Treat the query as a regular expression
         """
-        return "stdout" if stream_type == StreamType.STDOUT else "stderr"
+        key = self.buffers.visible
+        if key is None:
+            return
+        if self._table.display:
+            self._filter_table(key, query, regex)
+            return
+        if not query:
+            self._searches.pop(key, None)
+            self._log.set_search(None)
+            self._show_search_status()
+            return
+        state = self._searches.get(key)
+        if state is not None and state.same_query(query, regex):
+            buffer = self.buffers.get(key)
+            if buffer is None:
+                return
+            if state.current + 1 < len(state.matches) or buffer.total_lines <= state.scanned:
+                self.search_step()
+            else:
+                # The next match may be in the new lines: move once they are scanned
+                self._step_after_scan = key
+        else:
+            try:
+                pattern = compile_query(query, regex)
+            except re.error as e:
+                self._search_bar.set_status(f"invalid regex: {e}")
+                return
+            state = self._searches[key] = SearchState(query, regex, pattern)
+            self._log.set_search(pattern)
+        self._scan(key, state)
+
+    def _filter_table(self, key: str, query: str, regex: bool) -> None:
+        """Show only the table rows with a cell matching a query (empty for all)."""
+        view = self._table_views.setdefault(key, TableView())
+        if not query:
+            view.pattern = None
+        else:
+            try:
+                view.pattern = compile_query(query, regex)
+            except re.error as e:
+                self._search_bar.set_status(f"invalid regex: {e}")
+                return
+        self._compute_table_view(key)
 
-    def _format_output_line(self, line: OutputLine) -> str:
-        """Format an OutputLine for display.
+    def search_step(self, forward: bool = True) -> None:
+        """Jump to the next or previous match of the search on screen.
 
         Args:
-            line: OutputLine to format
+            forward: Move to the next match (False for the previous one)
+        """
+        key = self.buffers.visible
+        if key is None or self._table.display:
+            return
+        state = self._searches.get(key)
+        if state is None:
+            return
+        number = state.step(forward)
+        if number is not None:
+            self._jump(key, state, number)
+        self._show_search_status()
+
+    def _scan(self, key: str, state: SearchState) -> None:
+        """Scan the lines a search has not seen yet in a worker thread."""
+        snapshot = self.buffers.snapshot(key)
+        if snapshot is None or len(snapshot) <= state.scanned:
+            self._show_search_status()
+            return
+        state.scanning = True
+        self._show_search_status()
+
+        def scan_output() -> None:
+            worker = get_current_worker()
+            run_search(
+                state,
+                snapshot,
+                lambda *chunk: self.app.call_from_thread(self._search_progress, key, state, *chunk),
+                cancelled=lambda: worker.is_cancelled,
+            )
+            self.app.call_from_thread(self._search_done, key, state)
+
+        # A newer scan replaces this one; its progress so far is kept
+        self.run_worker(scan_output, thread=True, group="search", exclusive=True)
+
+    def _search_progress(
+        self, key: str, state: SearchState, first: int, end: int, found: list[int]
+    ) -> None:
+        """Record the matches of a scanned chunk."""
+        if self._searches.get(key) is not state or first != state.scanned:
+            # Stale: the search was replaced or the chunk already recorded
+            return
+        state.matches.extend(found)
+        state.scanned = end
+        if key == self.buffers.visible:
+            if state.current < 0 and state.matches:
+                number = state.step()
+                if number is not None:
+                    self._jump(key, state, number)
+            self._show_search_status()
+
+    def _search_done(self, key: str, state: SearchState) -> None:
+        """Mark a scan finished."""
+        state.scanning = False
+        if key == self.buffers.visible and self._searches.get(key) is state:
+            if self._step_after_scan == key:
+                self._step_after_scan = None
+                self.search_step()
+            self._show_search_status()
+
+    def _jump(self, key: str, state: SearchState, number: int) -> None:
+        """Scroll to a match, or preview it if it is no longer in memory."""
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            return
+        index = number - buffer.first_line
+        if 0 <= index < len(buffer.lines):
+            self._log.mark_line(index)
+            return
+        self._log.mark_line(None)
+        snapshot = self.buffers.snapshot(key)
+        line = next(snapshot.iter_lines(number), None) if snapshot else None
+        if line is not None:
+            self.notify(
+                line.content[:PREVIEW_CHARS],
+                title=f"Line {number + 1} (scrolled out of view)",
+                markup=False,
+            )
+
+    def _show_search_status(self) -> None:
+        """Show the match count of the search on screen."""
+        key = self.buffers.visible
+        if key is not None and self._table.display:
+            view = self._table_views.get(key)
+            if view is not None and view.pattern is not None and view.rows is not None:
+                self._search_bar.set_status(f"{len(view.rows):,} matching rows")
+            else:
+                self._search_bar.set_status("")
+            return
+        state = self._searches.get(key) if key is not None else None
+        if state is None:
+            self._search_bar.set_status("")
+            return
+        status = f"{state.current + 1}/{len(state.matches)}" if state.matches else "no matches"
+        if state.scanning:
+            status += f" (scanning, {state.scanned:,} lines)"
+        self._search_bar.set_status(status)
+
+    def export_buffer(
+        self, path: str, fmt: str = "text", compress: bool | None = None, key: str | None = None
+    ) -> None:
+        """Write a buffer's whole output to a file from a worker thread.
+
+        The output is streamed from a snapshot (scrollback file and the
+        in-memory lines), so lines arriving meanwhile are not exported. The
+        finished executions' outcomes and resource usage follow the lines.
+        A cancelled export deletes its incomplete file.
 
-        Returns:
-            Formatted string
+        Args:
+            path: File to write
+            fmt: Export format (``"text"`` or ``"jsonl"``)
+            compress: Gzip the file (by default, when the path ends in ``.gz``)
+            key: Buffer key (defaults to the buffer on screen)
         """
-        # Add stream prefix to distinguish stdout vs stderr
-        prefix = "[OUT] " if line.stream == StreamType.STDOUT else "[ERR] "
-        return f"{prefix}{line.content}"
+        key = key or self.buffers.visible
+        snapshot = self.buffers.snapshot(key) if key is not None else None
+        buffer = self.buffers.get(key) if key is not None else None
+        if snapshot is None or buffer is None:
+            self.notify("No output to export", severity="warning")
+            return
+        executions = buffer.executions()
+
+        def write_export() -> None:
+            worker = get_current_worker()
+            try:
+                count = export_lines(
+                    snapshot.iter_lines(),
+                    path,
+                    fmt,
+                    compress,
+                    cancelled=lambda: worker.is_cancelled,
+                    executions=executions,
+                )
+            except (OSError, ValueError) as e:
+                self.app.call_from_thread(
+                    self.notify, str(e), title="Export failed", severity="error", markup=False
+                )
+                return
+            if worker.is_cancelled:
+                with contextlib.suppress(OSError):
+                    os.unlink(path)
+                return
+            self.app.call_from_thread(
+                self.notify,
+                f"{count:,} lines written to {path}",
+                title="Output exported",
+                markup=False,
+            )
+
+        self.run_worker(write_export, thread=True, group="export")
+
+    def _finish(self, buffer: OutputBuffer) -> None:
+        """Mark a buffer complete and refresh its tab and, if shown, the pane."""
+        self.buffers.complete(buffer.key)
+        self._refresh_tab(buffer)
+        if buffer.key == self.buffers.visible:
+            self.show_buffer(buffer.key)
+        view = self._table_views.get(buffer.key)
+        if view is not None and view.active and buffer.table is not None:
+            # Include the rows that arrived after the last sort or filter
+            if view.computed_for < buffer.table.table.row_count:
+                self._compute_table_view(buffer.key)
+
+    def _show_nothing(self) -> None:
+        """Reset the pane to the placeholder."""
+        self.buffers.visible = None
+        self._log.show_lines(deque())
+        self._table.show_table(None)
+        self._table.display = False
+        self._diff_key = None
+        self._diff.show_diff(None)
+        self._diff.display = False
+        self._log.display = True
+        self.lines_count = 0
+        try:
+            self.query_one(TargetMatrix).clear_result()
+            self.query_one(PipelineView).clear_result()
+        except Exception:
+            pass
+        self._update_display()
+
+    @staticmethod
+    def _title(name: str) -> str:
+        """Tab title for a run of a command or pipeline started now."""
+        return f"{name} {datetime.now():%H:%M:%S}"
+
+    def _tab_label(self, buffer: OutputBuffer) -> Content:
+        """Tab label with a status mark (not parsed as markup)."""
+        if buffer.running:
+            mark = "⟳"
+        elif buffer.execution is not None and buffer.execution.status != ExecutionStatus.SUCCESS:
+            mark = "✗"
+        elif buffer.fanout_result is not None and buffer.fanout_result.failure_count():
+            mark = "✗"
+        elif (
+            buffer.pipeline_result is not None
+            and buffer.pipeline_result.status() != ExecutionStatus.SUCCESS.value
+        ):
+            mark = "✗"
+        else:
+            mark = "✓"
+        return Content(f"{mark} {buffer.title}")
+
+    def _make_tab(self, buffer: OutputBuffer) -> Tab:
+        """Create the tab of a buffer."""
+        return Tab(self._tab_label(buffer), id=_TAB_PREFIX + buffer.key)
+
+    def _refresh_tab(self, buffer: OutputBuffer) -> None:
+        """Update a buffer's tab label after its status changed."""
+        if not self.is_mounted:
+            return
+        try:
+            self._tabs.query_one(f"#{_TAB_PREFIX}{buffer.key}", Tab).label = self._tab_label(
+                buffer
+            )
+        except Exception:
+            pass
 
     def _format_completion_message(self) -> str:
         """Format the completion status message.
 
+        Includes why the execution was stopped early, any alerts it raised
+        and the resource usage of the process tree when it was recorded.
+
         Returns:
             Formatted completion message with status indicator
         """
         if not self._current_execution:
             return ""
 
-        if self._current_execution.exit_code == 0:
-            return "✓ Command succeeded"
+        execution = self._current_execution
+        if execution.status == ExecutionStatus.CANCELLED:
+            message = "⊘ Command cancelled"
+        elif execution.status == ExecutionStatus.SUCCESS:
+            message = "✓ Command succeeded"
+        elif execution.stop_reason:
+            message = "✗ Command failed"
         else:
-            return f"✗ Command failed (exit code: {self._current_execution.exit_code})"
+            message = f"✗ Command failed (exit code: {execution.exit_code})"
+
+        if execution.stop_reason and execution.status != ExecutionStatus.CANCELLED:
+            message += f"\n  {execution.stop_reason}"
+        for alert in execution.alerts:
+            message += f"\n  ⚠ {alert}"
+
+        usage = self._current_execution.resource_usage
+        if usage is not None:
+            message += f"\n  {usage.summary()}"
+        return message
 
     def _format_command_header(self) -> str:
         """Format the command execution header.
@@ -136,78 +882,22 @@ class OutputPane(Container):
         return f"[START] {command_name} at {start_time}"
 
     def _update_display(self) -> None:
-        """Update the output display."""
-        try:
-            content_widget = self.query_one("#output-content", Static)
-
-            if not self.output_lines and not self._current_execution:
-                content_widget.update(
-                    "Ready to execute commands..." if not self._is_running else "Running..."
-                )
-            else:
-                # Build output with all lines
-                output_lines = []
-
-                # Add command header if execution is running or just started
-                if self._current_execution and (self._is_running or self.output_lines):
-                    # Only show header once at the start
-                    if not self.output_lines or len(self.output_lines) == 0:
-                        header = self._format_command_header()
-                        if header:
-                            output_lines.append(header)
-                            output_lines.append("-" * 50)
-
-                # Add command output lines
-                for line in self.output_lines:
-                    formatted = self._format_output_line(line)
-                    output_lines.append(formatted)
-
-                # Add completion message if execution finished
-                if self._current_execution and not self._is_running:
-                    completion_msg = self._format_completion_message()
-                    if completion_msg:
-                        # Add blank line before completion message
-                        output_lines.append("")
-                        # Color the message based on exit code
-                        if self._current_execution.exit_code == 0:
-                            output_lines.append(f"[SUCCESS] {completion_msg}")
-                        else:
-                            output_lines.append(f"[ERROR] {completion_msg}")
-
-                # Limit to max_output_lines (default 10000)
-                content = "\n".join(output_lines[-10000:])
-                content_widget.update(content)
-
-                # Auto-scroll to bottom by scrolling the container
-                try:
-                    container = self.query_one("#output-container", ScrollableContainer)
-
-                    # Check if user has scrolled up
-                    if hasattr(container, 'vertical_scroll'):
-                        max_scroll = container.scrollable_content_size.height - container.size.height  # type: ignore
-                        current_scroll = container.vertical_scroll
-                        # If we're not at the bottom, user has scrolled up
-                        if current_scroll < max_scroll - 5:
-                            self._user_scrolled = True
-                        elif self._user_scrolled and current_scroll >= max_scroll - 5:
-                            # User scrolled back to bottom, resume auto-scroll
-                            self._user_scrolled = False
-
-                    # Only auto-scroll if enabled and user hasn't scrolled up
-                    if self._auto_scroll_enabled and not self._user_scrolled:
-                        container.scroll_end(animate=False)
-                except Exception:
-                    pass
-
-        except Exception:
-            # Widget not yet mounted
-            pass
-
-    def get_output_text(self) -> str:
-        """Get all output as text.
-
-        Returns:
-            All output lines as newline-separated text
-        """
-        return "\n".join(self._format_output_line(line) for line in self.output_lines)
-
+        """Update the header and completion rows around the output."""
+        execution = self._current_execution
+        if not self.output_lines and not execution:
+            placeholder = "Running..." if self._is_running else "Ready to execute commands..."
+            self._log.set_header([placeholder])
+            self._log.set_footer([])
+            return
+
+        header = self._format_command_header()
+        self._log.set_header([header, "-" * 50] if header else [])
+
+        completion_msg = self._format_completion_message() if not self._is_running else ""
+        if execution and completion_msg:
+            # Blank line before the completion message, colored by status
+            succeeded = execution.status == ExecutionStatus.SUCCESS
+            style = "bold green" if succeeded else "bold red"
+            self._log.set_footer(["", *completion_msg.split("\n")], style)
+        else:
+            self._log.set_footer([])
@@ -0,0 +1,218 @@
+"""Virtualized table of structured output for Ops Deck."""
+
+import re
+
+from rich.cells import set_cell_size
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from ..services.table import ColumnTable, TableView
+
+# Control characters that would corrupt the terminal if drawn as-is
+_sub_control = re.compile("[\u0000-\u001f\u007f]").sub
+
+_SEPARATOR = "  "
+# Rows above the data: status line and column names
+_HEADER_ROWS = 2
+
+
+class OutputTable(ScrollView, can_focus=True):
+    """Scrollable table of parsed output rows that only renders what is visible.
+
+    The column names stay at the top while rows scroll. Left and right
+    select a column and ``s`` sorts by it (again to reverse the order); the
+    sorting and filtering themselves are done by the owner of the widget
+    when it posts :class:`ViewChanged`.
+    """
+
+    COMPONENT_CLASSES = {  # noqa: RUF012
+        "output-table--status",
+        "output-table--header",
+        "output-table--column",
+    }
+
+    DEFAULT_CSS = """
+    OutputTable {
+        height: 1fr;
+        background: $surface;
+        overflow: auto;
+    }
+    OutputTable > .output-table--status {
+        color: $text-muted;
+    }
+    OutputTable > .output-table--header {
+        text-style: bold;
+    }
+    OutputTable > .output-table--column {
+        background: $boost;
+    }
+    """
+
+    BINDINGS = [  # noqa: RUF012
+        Binding("left", "select_column(-1)", "Prev column", show=False),
+        Binding("right", "select_column(1)", "Next column", show=False),
+        Binding("s", "sort", "Sort column"),
+        Binding("S", "clear_sort", "Unsort"),
+    ]
+
+    class ViewChanged(Message):
+        """Posted when the sort order was changed and the rows must be recomputed."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the table with nothing to show."""
+        super().__init__(*args, **kwargs)
+        self.table: ColumnTable | None = None
+        self.view = TableView()
+        self._widths: list[int] = []
+        self._offsets: list[int] = []
+        self._styles: dict[str, Style] = {}
+
+    @property
+    def row_count(self) -> int:
+        """Rows shown."""
+        if self.table is None:
+            return 0
+        return len(self.view.rows) if self.view.rows is not None else self.table.row_count
+
+    def show_table(self, table: ColumnTable | None, view: TableView | None = None) -> None:
+        """Display a table.
+
+        Args:
+            table: Table to show (None to show nothing)
+            view: Sort and filter state of the table (kept by the caller so
+                that it survives switching tables)
+        """
+        self.table = table
+        self.view = view if view is not None else TableView()
+        self.rows_added()
+
+    def rows_added(self) -> None:
+        """Update the view after rows (or columns) were added to the table."""
+        if self.table is None:
+            self._widths = []
+        else:
+            self._widths = self.table.widths()
+        self._offsets = []
+        offset = 0
+        for width in self._widths:
+            self._offsets.append(offset)
+            offset += width + len(_SEPARATOR)
+        self.virtual_size = Size(offset, _HEADER_ROWS + self.row_count)
+        self.refresh()
+
+    def action_select_column(self, step: int) -> None:
+        """Move the column cursor, scrolling the column into view."""
+        if not self._widths:
+            return
+        column = min(max(self.view.column + step, 0), len(self._widths) - 1)
+        self.view.column = column
+        start = self._offsets[column]
+        end = start + self._widths[column]
+        if start < self.scroll_x:
+            self.scroll_to(x=start, animate=False)
+        elif end > self.scroll_x + self.size.width:
+            self.scroll_to(x=end - self.size.width, animate=False)
+        self.refresh()
+
+    def action_sort(self) -> None:
+        """Sort by the selected column, or reverse the order if already sorted by it."""
+        if not self._widths:
+            return
+        view = self.view
+        if view.sort_column == view.column:
+            view.descending = not view.descending
+        else:
+            view.sort_column = view.column
+            view.descending = False
+        self.post_message(self.ViewChanged())
+        self.refresh()
+
+    def action_clear_sort(self) -> None:
+        """Show rows in the order they arrived (keeping the filter)."""
+        if self.view.sort_column is not None:
+            self.view.sort_column = None
+            self.post_message(self.ViewChanged())
+            self.refresh()
+
+    def notify_style_update(self) -> None:
+        """Drop cached styles when CSS changes."""
+        super().notify_style_update()
+        self._styles.clear()
+
+    def status(self) -> str:
+        """Describe the rows shown and how they are ordered."""
+        table, view = self.table, self.view
+        if table is None:
+            return ""
+        total = table.row_count
+        text = (
+            f"{self.row_count:,} of {total:,} rows" if view.rows is not None else f"{total:,} rows"
+        )
+        if view.sort_column is not None and view.sort_column < len(table.columns):
+            direction = "descending" if view.descending else "ascending"
+            text += f", sorted by {table.columns[view.sort_column]} ({direction})"
+        if view.pattern is not None:
+            text += f", filtered by {view.pattern.pattern!r}"
+        if view.computing:
+            text += " (updating...)"
+        elif view.rows is not None and view.computed_for < total:
+            text += f" ({total - view.computed_for:,} new, press s to re-sort)"
+        return text
+
+    def render_line(self, y: int) -> Strip:
+        """Render one visible row.
+
+        Args:
+            y: Row relative to the top of the widget
+
+        Returns:
+            Rendered row cropped to the widget width
+        """
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        base = self.rich_style
+        table = self.table
+        if table is None:
+            return Strip.blank(width, base)
+        if y == 0:
+            text = set_cell_size(self.status(), width)
+            return Strip([Segment(text, base + self._style("output-table--status"))])
+        if y == 1:
+            names = []
+            for index, name in enumerate(table.columns[: len(self._widths)]):
+                if index == self.view.sort_column:
+                    name = ("▼ " if self.view.descending else "▲ ") + name
+                names.append(name)
+            strip = self._row_strip(names, base + self._style("output-table--header"))
+        else:
+            position = scroll_y + y - _HEADER_ROWS
+            if position >= self.row_count:
+                return Strip.blank(width, base)
+            rows = self.view.rows
+            row = rows[position] if rows is not None else position
+            strip = self._row_strip([column[row] for column in table.cells], base)
+        return strip.crop_extend(scroll_x, scroll_x + width, base)
+
+    def _row_strip(self, cells: list[str], style: Style) -> Strip:
+        """Lay out the cells of a row in their columns."""
+        selected = self.view.column
+        column_style = style + self._style("output-table--column")
+        segments = []
+        for index, width in enumerate(self._widths):
+            text = cells[index] if index < len(cells) else ""
+            text = set_cell_size(_sub_control(" ", text), width)
+            segments.append(Segment(text, column_style if index == selected else style))
+            segments.append(Segment(_SEPARATOR, style))
+        return Strip(segments)
+
+    def _style(self, name: str) -> Style:
+        """Get the style a component class adds on top of the widget style."""
+        style = self._styles.get(name)
+        if style is None:
+            style = self._styles[name] = self.get_component_rich_style(name, partial=True)
+        return style
@@ -0,0 +1,90 @@
+"""Pipeline result view widget for Ops Deck."""
+
+from textual.widgets import Static
+
+from ..models import PipelineResult
+
+# Markup color for each node status
+_STATUS_COLORS = {
+    "success": "green",
+    "error": "red",
+    "timeout": "yellow",
+    "cancelled": "magenta",
+    "skipped": "dim",
+    "running": "cyan",
+    "pending": "dim",
+}
+
+
+class PipelineView(Static):
+    """Per-node timing table of a pipeline run, with its critical path."""
+
+    DEFAULT_CSS = """
+    PipelineView {
+        display: none;
+        height: auto;
+        max-height: 50%;
+        padding: 1 1 0 1;
+    }
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the pipeline view."""
+        super().__init__("", *args, **kwargs)
+        self.result: PipelineResult | None = None
+
+    def show_result(self, result: PipelineResult) -> None:
+        """Display a pipeline result.
+
+        Args:
+            result: Pipeline result (complete or in progress)
+        """
+        self.result = result
+        self.update(self.format_result(result))
+        self.display = True
+
+    def clear_result(self) -> None:
+        """Remove the displayed result."""
+        self.result = None
+        self.update("")
+        self.display = False
+
+    @staticmethod
+    def format_result(result: PipelineResult) -> str:
+        """Format a pipeline result as a text table.
+
+        Args:
+            result: Pipeline result to format
+
+        Returns:
+            Rich markup string with one row per node; critical-path nodes
+            are marked with ``*``
+        """
+        critical = result.critical_path()
+        width = max([len("NODE"), *(len(name) for name in result.nodes)])
+        wall = result.duration_seconds()
+        lines = [
+            f"[bold]{result.pipeline.name}[/bold]: {result.status()}"
+            + (f" in {wall:.2f}s" if wall is not None else "")
+            + f" (serial {result.serial_seconds():.2f}s)",
+            f"  {'NODE':<{width}}  {'STATUS':<8} {'START':>8} {'DURATION':>9}",
+        ]
+
+        for name, node in result.nodes.items():
+            color = _STATUS_COLORS.get(node.status(), "white")
+            execution = node.execution
+            if execution and execution.start_time and result.start_time:
+                offset = (execution.start_time - result.start_time).total_seconds()
+                start_text = f"+{offset:.2f}s"
+                duration_text = f"{node.duration_seconds():.2f}s"
+            else:
+                start_text = duration_text = "-"
+            marker = "*" if name in critical else " "
+            lines.append(
+                f"{marker} {name:<{width}}  [{color}]{node.status():<8}[/{color}] "
+                f"{start_text:>8} {duration_text:>9}"
+            )
+
+        critical_seconds = sum(result.nodes[name].duration_seconds() for name in critical)
+        lines.append(f"Critical path: {' → '.join(critical)} ({critical_seconds:.2f}s)")
+        return "\n".join(lines)
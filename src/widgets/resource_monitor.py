@@ -0,0 +1,86 @@
+"""Live resource monitor widget for Ops Deck."""
+
+from rich.markup import escape
+from textual.widgets import Static
+
+from ..services.proc_monitor import SORT_KEYS, GroupSample, sort_samples
+
+
+def _format_bytes(value: int) -> str:
+    """Format a byte count with a binary unit suffix."""
+    size = float(value)
+    for unit in ("B", "K", "M", "G"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}T"
+
+
+class ResourceMonitor(Static):
+    """Top-like table of the process trees of running executions."""
+
+    DEFAULT_CSS = """
+    ResourceMonitor {
+        display: none;
+        height: auto;
+        max-height: 40%;
+        border: solid $accent;
+        padding: 0 1;
+        background: $panel;
+    }
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the resource monitor."""
+        super().__init__("", *args, **kwargs)
+        self.sort_key = "cpu"
+        self.samples: list[GroupSample] = []
+
+    def toggle(self) -> None:
+        """Show or hide the monitor."""
+        self.display = not self.display
+
+    def cycle_sort(self) -> None:
+        """Sort by the next column."""
+        keys = list(SORT_KEYS)
+        self.sort_key = keys[(keys.index(self.sort_key) + 1) % len(keys)]
+        self.show_samples(self.samples)
+
+    def show_samples(self, samples: list[GroupSample]) -> None:
+        """Display the latest samples.
+
+        Args:
+            samples: One sample per running execution
+        """
+        self.samples = samples
+        self.update(self.format_samples(samples, self.sort_key))
+
+    @staticmethod
+    def format_samples(samples: list[GroupSample], sort_key: str) -> str:
+        """Format samples as a text table.
+
+        Args:
+            samples: Samples to format
+            sort_key: Column to sort by (one of ``SORT_KEYS``)
+
+        Returns:
+            Rich markup string with one row per process group
+        """
+        header = f"[bold]Resources[/bold] (sorted by {sort_key}, s: change)"
+        if not samples:
+            return f"{header}\n  [dim]No running processes[/dim]"
+
+        width = max([len("COMMAND"), *(len(sample.name) for sample in samples)])
+        lines = [
+            header,
+            f"  {'COMMAND':<{width}} {'PGID':>7} {'PROCS':>5} {'CPU%':>6} "
+            f"{'RSS':>8} {'THR':>4} {'READ':>8} {'WRITE':>8}",
+        ]
+        for sample in sort_samples(samples, sort_key):
+            lines.append(
+                f"  {escape(sample.name.ljust(width))} {sample.pgid:>7} {sample.processes:>5} "
+                f"{sample.cpu_percent:>6.1f} {_format_bytes(sample.rss_bytes):>8} "
+                f"{sample.threads:>4} {_format_bytes(sample.read_bytes):>8} "
+                f"{_format_bytes(sample.write_bytes):>8}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,98 @@
+"""Output search bar widget for Ops Deck."""
+
+from textual.containers import Horizontal
+from textual.content import Content
+from textual.message import Message
+from textual.widgets import Input, Label
+
+
+class SearchBar(Horizontal):
+    """Query input and match status for searching the output on screen.
+
+    Hidden until opened; Enter searches (or jumps to the next match when
+    the query is unchanged), Escape closes the bar and ctrl+r switches
+    between literal and regular expression queries.
+    """
+
+    DEFAULT_CSS = """
+    SearchBar {
+        display: none;
+        height: 1;
+    }
+    SearchBar > Input {
+        width: 1fr;
+        height: 1;
+        border: none;
+        padding: 0 1;
+    }
+    SearchBar > Label {
+        width: auto;
+        padding: 0 1;
+        color: $text-muted;
+    }
+    """
+
+    BINDINGS = [  # noqa: RUF012
+        ("escape", "close", "Close search"),
+        ("ctrl+r", "toggle_regex", "Regex"),
+    ]
+
+    class Submitted(Message):
+        """Posted when a query is submitted."""
+
+        def __init__(self, query: str, regex: bool):
+            """Initialize the message.
+
+            Args:
+                query: Search text
+                regex: True if the query is a regular expression
+            """
+            super().__init__()
+            self.query = query
+            self.regex = regex
+
+    class Closed(Message):
+        """Posted when the bar is closed."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the search bar."""
+        super().__init__(*args, **kwargs)
+        self.regex = False
+        self._input = Input(placeholder="Search output", id="search-input")
+        self._status = Label(Content("[text]"), id="search-status")
+
+    def compose(self):
+        """Compose the search bar."""
+        yield self._input
+        yield self._status
+
+    @property
+    def value(self) -> str:
+        """The text in the input."""
+        return str(self._input.value)
+
+    def open(self) -> None:
+        """Show the bar and focus the input."""
+        self.display = True
+        self._input.focus()
+
+    def set_status(self, text: str) -> None:
+        """Show the match count or an error next to the input."""
+        mode = "regex" if self.regex else "text"
+        # Content, so match previews are never parsed as markup
+        self._status.update(Content(f"[{mode}] {text}" if text else f"[{mode}]"))
+
+    def action_close(self) -> None:
+        """Hide the bar."""
+        self.display = False
+        self.post_message(self.Closed())
+
+    def action_toggle_regex(self) -> None:
+        """Switch between literal and regular expression queries."""
+        self.regex = not self.regex
+        self.set_status("")
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Forward the query to the pane."""
+        event.stop()
+        self.post_message(self.Submitted(event.value, self.regex))
@@ -0,0 +1,81 @@
+"""Fan-out result matrix widget for Ops Deck."""
+
+from textual.widgets import Static
+
+from ..models import ExecutionStatus, FanOutResult
+
+# Status indicator and markup color for each execution status
+_STATUS_STYLES = {
+    ExecutionStatus.SUCCESS: ("✓", "green"),
+    ExecutionStatus.ERROR: ("✗", "red"),
+    ExecutionStatus.TIMEOUT: ("⏱", "yellow"),
+    ExecutionStatus.CANCELLED: ("⊘", "magenta"),
+    ExecutionStatus.RUNNING: ("⟳", "cyan"),
+    ExecutionStatus.PENDING: ("·", "dim"),
+}
+
+
+class TargetMatrix(Static):
+    """Per-target success/fail/duration matrix for a fan-out execution."""
+
+    DEFAULT_CSS = """
+    TargetMatrix {
+        display: none;
+        height: auto;
+        max-height: 50%;
+        padding: 1 1 0 1;
+    }
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the target matrix."""
+        super().__init__("", *args, **kwargs)
+        self.result: FanOutResult | None = None
+
+    def show_result(self, result: FanOutResult) -> None:
+        """Display a fan-out result.
+
+        Args:
+            result: Completed fan-out result
+        """
+        self.result = result
+        self.update(self.format_matrix(result))
+        self.display = True
+
+    def clear_result(self) -> None:
+        """Remove the displayed result."""
+        self.result = None
+        self.update("")
+        self.display = False
+
+    @staticmethod
+    def format_matrix(result: FanOutResult) -> str:
+        """Format a fan-out result as a text table.
+
+        Args:
+            result: Fan-out result to format
+
+        Returns:
+            Rich markup string with one row per target
+        """
+        width = max([len("TARGET"), *(len(r.target) for r in result.results)])
+        total = result.duration_seconds()
+        lines = [
+            f"[bold]{result.command.name}[/bold]: "
+            f"{result.success_count()} ok, {result.failure_count()} failed"
+            + (f" in {total:.2f}s" if total is not None else ""),
+            f"{'TARGET':<{width}}  {'STATUS':<9} {'EXIT':>4} {'DURATION':>9}",
+        ]
+
+        for target_result in result.results:
+            execution = target_result.execution
+            symbol, color = _STATUS_STYLES.get(execution.status, ("?", "white"))
+            duration = execution.duration_seconds()
+            exit_code = "-" if execution.exit_code is None else str(execution.exit_code)
+            duration_text = "-" if duration is None else f"{duration:.2f}s"
+            lines.append(
+                f"{target_result.target:<{width}}  "
+                f"[{color}]{symbol} {execution.status.value:<7}[/{color}] "
+                f"{exit_code:>4} {duration_text:>9}"
+            )
+        return "\n".join(lines)
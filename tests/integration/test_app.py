@@ -174,3 +174,21 @@ def test_app_config_loading():
     assert config.log_level == LogLevel.DEBUG
     assert config.command_timeout == 600
     assert config.max_output_lines == 50000
+
+
+@pytest.mark.asyncio
+async def test_timed_out_run_keeps_its_outcome():
+    """Test a timeout is reported once, without a second error completion."""
+    from src.models import Command, ExecutionStatus
+    from src.widgets import OutputPane
+
+    app = OpsApp([Command(name="slow", command="echo started; sleep 5", timeout=1)])
+    async with app.run_test() as pilot:
+        app.action_execute()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        buffer = app.query_one(OutputPane).current_buffer
+        assert buffer.execution.status == ExecutionStatus.TIMEOUT
+        assert buffer.execution.start_time is not None
+        assert buffer.execution.resource_usage is not None
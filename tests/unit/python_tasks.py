@@ -0,0 +1,29 @@
+"""Callables run by the Python task runner tests (imported in pool workers)."""
+
+import logging
+import sys
+import time
+
+
+def greet(name: str = "world", count: int = 1) -> None:
+    """Print a greeting per line, then log and write to stderr."""
+    for index in range(count):
+        print(f"hello {name} {index}")
+    logging.getLogger("tasks").warning("careful")
+    sys.stderr.write("partial line without newline")
+
+
+def exit_with(code: int) -> int:
+    """Return an exit code."""
+    return code
+
+
+def fail() -> None:
+    """Raise an exception."""
+    raise RuntimeError("task broke")
+
+
+def sleep(seconds: float) -> None:
+    """Sleep, printing once first."""
+    print("sleeping", flush=True)
+    time.sleep(seconds)
@@ -0,0 +1,68 @@
+"""Unit tests for ANSI escape sequence decoding."""
+
+import pytest
+
+from src.models import Command
+from src.services.ansi import DEFAULT_STATE, AnsiDecoder, apply_sgr, strip_ansi
+from src.services.command_runner import AsyncCommandRunner
+
+
+def test_sgr_sequences_become_spans():
+    """Test colors and attributes turn into styled spans over plain text."""
+    decoder = AnsiDecoder()
+
+    content, spans = decoder.decode("\x1b[1;31mFAILED\x1b[0m test_x \x1b[38;5;208m42%\x1b[m")
+
+    assert content == "FAILED test_x 42%"
+    assert spans == [(0, 6, "bold color(1)"), (14, 17, "color(208)")]
+
+
+def test_style_carries_across_lines():
+    """Test state persists between lines but a cut-off sequence does not."""
+    decoder = AnsiDecoder()
+
+    assert decoder.decode("\x1b[32mstart") == ("start", [(0, 5, "color(2)")])
+    assert decoder.decode("still green\x1b[3") == ("still green", [(0, 11, "color(2)")])
+    assert decoder.decode("4mnext") == ("4mnext", [(0, 6, "color(2)")])
+    assert decoder.decode("\x1b]8;;http://x") == ("", [])
+    assert decoder.decode("after") == ("after", [(0, 5, "color(2)")])
+
+
+def test_non_sgr_sequences_dropped():
+    """Test cursor, erase and OSC sequences are removed without styling."""
+    decoder = AnsiDecoder()
+
+    content, spans = decoder.decode("\x1b]0;title\x07a\x1b[2Kb\x1b[?25lc\x1b(Bd")
+
+    assert (content, spans) == ("abcd", [])
+
+
+def test_truecolor_and_reset_codes():
+    """Test 24-bit colors, colon sub-parameters and attribute resets."""
+    state = apply_sgr(DEFAULT_STATE, "1;38;2;255;0;10;48:2::0:0:255")
+    assert (state.bold, state.fg, state.bg) == (True, "#ff000a", "#0000ff")
+    assert apply_sgr(state, "22;39").fg == "" and not apply_sgr(state, "22;39").bold
+    assert apply_sgr(state, "0") == DEFAULT_STATE
+
+
+def test_strip_ansi():
+    """Test escape sequences are removed and plain text returned unchanged."""
+    assert strip_ansi("\x1b[01;34mdir\x1b[0m/") == "dir/"
+    assert strip_ansi("plain") == "plain"
+
+
+@pytest.mark.asyncio
+async def test_runner_attaches_color_spans_or_strips():
+    """Test colored output is decoded by the runner, or stripped when configured."""
+    script = r"printf '\033[31mred\033[0m plain\n'"
+    colored, stripped = [], []
+
+    await AsyncCommandRunner().run(Command(name="c", command=script), output_callback=colored.append)
+    await AsyncCommandRunner().run(
+        Command(name="c", command=script, strip_ansi=True), output_callback=stripped.append
+    )
+
+    assert colored[0].content == "red plain"
+    assert colored[0].spans == [(0, 3, "color(1)")]
+    assert stripped[0].content == "red plain"
+    assert stripped[0].spans is None
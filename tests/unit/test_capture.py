@@ -0,0 +1,82 @@
+"""Unit tests for head+tail output capture."""
+
+import pytest
+
+from src.models import Command, ExecutionStatus, StreamType
+from src.services.capture import OutputCapture
+from src.services.command_runner import AsyncCommandRunner
+
+
+def _feed(capture: OutputCapture, count: int) -> None:
+    for i in range(1, count + 1):
+        capture.feed(StreamType.STDOUT, f"{i}\n".encode())
+
+
+def test_capture_keeps_head_and_tail():
+    """Test the middle is replaced by a marker counting lines and bytes."""
+    kept = []
+    capture = OutputCapture(lambda s, d: kept.append(d), keep_head=2, keep_tail=2)
+
+    _feed(capture, 10)
+    assert kept == [b"1\n", b"2\n"]
+    capture.finish()
+
+    assert kept == [b"1\n", b"2\n", "… 6 lines / 12 bytes elided …".encode(), b"9\n", b"10\n"]
+
+
+def test_capture_short_output_unchanged():
+    """Test output within head+tail is passed through without a marker."""
+    kept = []
+    capture = OutputCapture(lambda s, d: kept.append(d), keep_head=3, keep_tail=3)
+
+    _feed(capture, 5)
+    capture.finish()
+
+    assert kept == [f"{i}\n".encode() for i in range(1, 6)]
+
+
+def test_capture_byte_cap_drops_rest():
+    """Test output past max_bytes is counted and reported, not kept."""
+    kept = []
+    capped = []
+    capture = OutputCapture(lambda s, d: kept.append(d), max_bytes=6, on_cap=capped.append)
+
+    _feed(capture, 5)
+    capture.finish()
+
+    assert kept[:3] == [b"1\n", b"2\n", b"3\n"]
+    assert b"2 lines / 4 bytes elided (max_output_bytes reached)" in kept[3]
+    assert capped == [6]
+
+
+@pytest.mark.asyncio
+async def test_runner_elides_middle_of_long_output():
+    """Test a runaway command keeps only its head and tail lines."""
+    command = Command(name="seq", command="seq 1 200000", keep_head=3, keep_tail=2)
+    lines = []
+
+    execution = await AsyncCommandRunner().run(
+        command, output_callback=lambda line: lines.append(line.content)
+    )
+
+    assert execution.status == ExecutionStatus.SUCCESS
+    assert lines[:3] == ["1", "2", "3"]
+    assert lines[3].startswith("… 199995 lines / ")
+    assert lines[4:] == ["199999", "200000"]
+
+
+@pytest.mark.asyncio
+async def test_runner_kills_at_output_cap():
+    """Test kill_on_max_output stops a command that never ends."""
+    command = Command(
+        name="yes", command="yes", timeout=30, max_output_bytes=100_000, kill_on_max_output=True
+    )
+    lines = []
+
+    execution = await AsyncCommandRunner(termination_grace=0.5).run(
+        command, output_callback=lambda line: lines.append(line.content)
+    )
+
+    assert execution.status == ExecutionStatus.ERROR
+    assert "max_output_bytes" in (execution.error_message or "")
+    assert len(lines) == 50_001
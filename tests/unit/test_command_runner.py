@@ -106,3 +106,132 @@ async def test_execution_metadata():
     assert execution.end_time is not None
     assert execution.duration_seconds() is not None
     assert execution.duration_seconds() >= 0
+
+
+@pytest.mark.asyncio
+async def test_direct_exec_missing_program():
+    """Test that a missing program reports exit code 127 like the shell."""
+    runner = AsyncCommandRunner()
+    command = Command(name="missing", command="no-such-program-ops-deck --flag", timeout=10)
+
+    output_lines = []
+    execution = await runner.run(command, output_callback=output_lines.append)
+
+    assert execution.status == ExecutionStatus.ERROR
+    assert execution.exit_code == 127
+    assert output_lines[0].is_error()
+
+
+@pytest.mark.asyncio
+async def test_shell_false_passes_metacharacters_literally():
+    """Test that shell: false execs directly without shell expansion."""
+    runner = AsyncCommandRunner()
+    command = Command(name="literal", command="echo $HOME '*'", shell=False, timeout=10)
+
+    output_lines = []
+    await runner.run(command, output_callback=output_lines.append)
+
+    assert output_lines[0].content == "$HOME *"
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_grandchildren():
+    """Test that a timeout stops the whole process group, not just the shell."""
+    import time
+
+    from src.exceptions import TimeoutError as OpsTimeoutError
+
+    runner = AsyncCommandRunner(termination_grace=0.5)
+    command = Command(name="tree", command="sleep 30 & sleep 30; wait", timeout=1)
+
+    start = time.monotonic()
+    with pytest.raises(OpsTimeoutError):
+        await runner.run(command)
+
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.asyncio
+async def test_termination_escalates_to_sigkill():
+    """Test that processes ignoring SIGTERM are killed after the grace period."""
+    from src.exceptions import TimeoutError as OpsTimeoutError
+
+    runner = AsyncCommandRunner(termination_grace=0.5)
+    command = Command(name="stubborn", command="trap '' TERM; sleep 30", timeout=1)
+
+    with pytest.raises(OpsTimeoutError):
+        await runner.run(command)
+
+    assert runner.active_executions() == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_execution():
+    """Test cancelling an execution by ID."""
+    import asyncio
+
+    runner = AsyncCommandRunner(termination_grace=0.5)
+    command = Command(name="sleep", command="echo started; sleep 30", timeout=60)
+    started = asyncio.Event()
+
+    task = asyncio.ensure_future(runner.run(command, output_callback=lambda line: started.set()))
+    await asyncio.wait_for(started.wait(), timeout=5)
+    assert runner.cancel_all() == 1
+
+    execution = await asyncio.wait_for(task, timeout=5)
+
+    assert execution.status == ExecutionStatus.CANCELLED
+    assert execution.is_complete()
+    assert not runner.cancel(execution.id)
+
+
+def test_cancel_after_loop_closed():
+    """Test cancelling from another thread once the execution's loop has closed."""
+    import asyncio
+
+    from src.models import Execution
+    from src.services.command_runner import ActiveExecution
+
+    runner = AsyncCommandRunner()
+    loop = asyncio.new_event_loop()
+    loop.close()
+    execution = Execution(id="exec_closed", command=Command(name="sleep", command="sleep 30"))
+    runner._active[execution.id] = ActiveExecution(
+        execution=execution, loop=loop, stop_event=asyncio.Event()
+    )
+
+    assert not runner.cancel(execution.id)
+
+
+@pytest.mark.asyncio
+async def test_resource_usage_includes_waited_children():
+    """Test rusage covers the shell and the children it waited for."""
+    runner = AsyncCommandRunner()
+    command = Command(
+        name="burn",
+        command="python3 -c 'x = bytearray(64 * 1024 * 1024); sum(range(2000000))' && true",
+        timeout=30,
+    )
+
+    execution = await runner.run(command)
+
+    usage = execution.resource_usage
+    assert usage is not None
+    assert usage.cpu_seconds > 0
+    assert usage.max_rss_kb > 64 * 1024
+    assert "max RSS" in usage.summary()
+
+
+@pytest.mark.asyncio
+async def test_resource_usage_recorded_on_timeout():
+    """Test rusage is captured for an execution that was killed."""
+    from src.exceptions import TimeoutError as OpsTimeoutError
+
+    runner = AsyncCommandRunner(termination_grace=0.5)
+    command = Command(name="sleep", command="sleep 5", timeout=1)
+    finished = []
+
+    with pytest.raises(OpsTimeoutError):
+        await runner.run(command, completion_callback=finished.append)
+
+    assert finished[0].resource_usage is not None
@@ -0,0 +1,152 @@
+"""Unit tests for output diffs."""
+
+import random
+import time
+from datetime import datetime
+
+import pytest
+from textual.app import App, ComposeResult
+
+from src.models import Command, Execution, ExecutionStatus, OutputLine, StreamType
+from src.services.diff import DiffDocument, diff_lines
+from src.widgets.diff_view import DiffView
+from src.widgets.output_pane import OutputPane
+
+
+def apply(old: list[str], new: list[str], opcodes) -> list[str]:
+    """Rebuild the new lines from the old ones and the opcodes."""
+    result = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            assert old[i1:i2] == new[j1:j2]
+            result.extend(old[i1:i2])
+        else:
+            result.extend(new[j1:j2])
+    return result
+
+
+def test_opcodes_rebuild_new_output():
+    """Test opcodes cover both sides and turn the old lines into the new ones."""
+    rng = random.Random(7)
+    for _ in range(200):
+        old = [rng.choice("abcdefg") for _ in range(rng.randrange(30))]
+        new = list(old)
+        for _ in range(rng.randrange(6)):
+            position = rng.randrange(len(new) + 1)
+            if new and rng.random() < 0.5:
+                del new[position - 1]
+            else:
+                new.insert(position, rng.choice("abcxyz"))
+
+        opcodes = diff_lines(old, new)
+
+        assert apply(old, new, opcodes) == new
+        assert sum(i2 - i1 for _, i1, i2, _, _ in opcodes) == len(old)
+
+
+def test_unique_lines_anchor_the_match():
+    """Test a changed line among repeated ones is found exactly."""
+    old = ["{", "  a: 1", "}", "{", "  b: 2", "}"]
+    new = ["{", "  a: 1", "}", "{", "  b: 3", "}"]
+
+    assert diff_lines(old, new) == [
+        ("equal", 0, 4, 0, 4),
+        ("replace", 4, 5, 4, 5),
+        ("equal", 5, 6, 5, 6),
+    ]
+
+
+def test_unchanged_regions_fold_around_changes():
+    """Test long equal runs fold to context rows, and unfold on request."""
+    old = [f"line {n}" for n in range(100)]
+    new = list(old)
+    new[50] = "changed"
+    document = DiffDocument.build(old, new, context=3)
+
+    kinds = [document.row(index).kind for index in range(document.row_count)]
+    assert kinds == ["fold", *["equal"] * 3, "delete", "insert", *["equal"] * 3, "fold"]
+    assert document.row(0).folded == 47
+    assert document.row(4).text == "line 50"
+    assert document.row(5).text == "changed"
+    assert (document.added, document.removed) == (1, 1)
+    assert document.hunk_rows() == [4]
+
+    document.layout(None)
+    assert document.row_count == 101
+
+
+def test_large_outputs_diff_quickly():
+    """Test hundreds of thousands of lines with scattered changes diff in under a second."""
+    old = [f"{n:08d} request served in {n % 97} ms" for n in range(200_000)]
+    new = list(old)
+    for n in range(0, 200_000, 1000):
+        new[n] = f"{n:08d} request failed"
+    new[20_000:20_000] = old[60_000:60_100]
+
+    start = time.perf_counter()
+    opcodes = diff_lines(old, new)
+    elapsed = time.perf_counter() - start
+
+    assert apply(old, new, opcodes) == new
+    assert elapsed < 1
+
+
+class PaneApp(App):
+    """App hosting a single output pane."""
+
+    def compose(self) -> ComposeResult:
+        yield OutputPane(id="pane")
+
+
+def run_command(pane: OutputPane, number: int, lines: list[str]) -> None:
+    """Show a finished execution of the same command with some output."""
+    execution = Execution(
+        id=f"exec_{number}",
+        command=Command(name="ls", command="ls"),
+        status=ExecutionStatus.SUCCESS,
+    )
+    pane.start_command(execution)
+    for index, content in enumerate(lines):
+        pane.add_output_line(
+            OutputLine(
+                id=f"out_{number}_{index}",
+                execution_id=execution.id,
+                timestamp=datetime.now(),
+                stream=StreamType.STDOUT,
+                content=content,
+            )
+        )
+    pane.set_execution_complete(execution)
+
+
+@pytest.mark.asyncio
+async def test_pane_diffs_against_previous_run_or_baseline():
+    """Test the diff compares with the previous run unless a baseline is pinned."""
+    app = PaneApp()
+    async with app.run_test(size=(80, 20)) as pilot:
+        pane = app.query_one(OutputPane)
+        view = pane.query_one(DiffView)
+        run_command(pane, 1, ["a", "b"])
+        run_command(pane, 2, ["a", "c"])
+        run_command(pane, 3, ["a", "c", "d"])
+
+        pane.toggle_diff()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert view.display
+        assert view.render_line(1).text.split() == ["+1", "-0", "lines"]
+        assert view.render_line(4).text.rstrip() == "+ d"
+
+        pane.toggle_diff()
+        assert not view.display
+        pane.show_buffer("exec_1")
+        pane.pin_baseline()
+        pane.show_buffer("exec_3")
+        pane.toggle_diff()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert "(baseline)" in view.render_line(0).text
+        assert view.render_line(1).text.split() == ["+2", "-1", "lines"]
+
+        pane.show_buffer("exec_2")
+        assert not view.display
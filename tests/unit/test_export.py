@@ -0,0 +1,150 @@
+"""Unit tests for streaming output export."""
+
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+from src.app import export_command
+from src.models import Command, Execution, ExecutionStatus, OutputLine, ResourceUsage, StreamType
+from src.services import export
+from src.services.export import OutputExporter, export_filename, export_lines
+
+
+def make_lines(count: int):
+    """Generate output lines lazily, every third one on stderr."""
+    for index in range(count):
+        yield OutputLine(
+            id=f"exec_{index}",
+            execution_id="exec",
+            timestamp=datetime(2024, 5, 1, 10, 15, 0),
+            stream=StreamType.STDERR if index % 3 == 0 else StreamType.STDOUT,
+            content=f"line {index} ✓",
+        )
+
+
+def test_text_export_in_chunks(tmp_path, monkeypatch):
+    """Test lines are written in chunks, with the remainder written on close."""
+    monkeypatch.setattr(export, "CHUNK_LINES", 4)
+    path = tmp_path / "out.log"
+
+    with OutputExporter(str(path)) as exporter:
+        exporter.write_lines(make_lines(6))
+        assert exporter.lines_written == 4
+
+    assert exporter.lines_written == 6
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "[ERR] line 0 ✓"
+    assert lines[1:3] == ["[OUT] line 1 ✓", "[OUT] line 2 ✓"]
+
+
+def test_gzipped_jsonl_export(tmp_path):
+    """Test a .gz path is compressed and JSON Lines carry stream and timestamp."""
+    path = tmp_path / "out.jsonl.gz"
+
+    assert export_lines(make_lines(3), str(path), "jsonl") == 3
+
+    with gzip.open(path, "rt", encoding="utf-8") as exported:
+        records = [json.loads(line) for line in exported]
+    assert records[0] == {"timestamp": "2024-05-01T10:15:00", "stream": "stderr", "content": "line 0 ✓"}
+    assert [record["stream"] for record in records[1:]] == ["stdout", "stdout"]
+
+
+def test_jsonl_export_ends_with_execution_records(tmp_path):
+    """Test each execution's outcome and resource usage follow the lines."""
+    path = tmp_path / "out.jsonl"
+    usage = ResourceUsage(user_cpu_seconds=0.25, max_rss_kb=2048)
+    execution = Execution(
+        id="exec_1",
+        command=Command(name="build", command="make"),
+        status=ExecutionStatus.SUCCESS,
+        exit_code=0,
+        start_time=datetime(2024, 5, 1, 10, 15, 0),
+        end_time=datetime(2024, 5, 1, 10, 15, 2),
+        resource_usage=usage,
+    )
+
+    assert export_lines(make_lines(2), str(path), "jsonl", executions=[execution]) == 2
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 3
+    assert records[-1]["execution"]["command"] == "build"
+    assert records[-1]["execution"]["exit_code"] == 0
+    assert records[-1]["execution"]["end_time"] == "2024-05-01T10:15:02"
+    assert ResourceUsage(**records[-1]["execution"]["resource_usage"]) == usage
+
+
+def test_export_stops_when_cancelled(tmp_path, monkeypatch):
+    """Test cancellation is checked after each chunk."""
+    monkeypatch.setattr(export, "CHUNK_LINES", 10)
+
+    written = export_lines(make_lines(100), str(tmp_path / "out.log"), cancelled=lambda: True)
+
+    assert written == 10
+
+
+@pytest.mark.asyncio
+async def test_cancelled_pane_export_removes_its_file(tmp_path, monkeypatch):
+    """Test a cancelled export from the output pane deletes the file and reports nothing."""
+    from textual.app import App, ComposeResult
+    from textual.worker import WorkerCancelled, get_current_worker
+
+    from src.widgets import output_pane
+    from src.widgets.output_pane import OutputPane
+
+    def export_then_cancel(lines, path, *args, **kwargs):
+        count = export_lines(lines, path, *args, **kwargs)
+        get_current_worker().cancel()
+        return count
+
+    class PaneApp(App):
+        def compose(self) -> ComposeResult:
+            yield OutputPane()
+
+    monkeypatch.setattr(output_pane, "export_lines", export_then_cancel)
+    path = tmp_path / "out.log"
+    notices = []
+    app = PaneApp()
+    async with app.run_test() as pilot:
+        pane = app.query_one(OutputPane)
+        pane.notify = lambda message, **kwargs: notices.append(message)
+        execution = Execution(id="exec_1", command=Command(name="ls", command="ls"))
+        pane.start_command(execution)
+        for line in make_lines(3):
+            pane.add_output_line(line)
+        pane.set_execution_complete(execution)
+
+        pane.export_buffer(str(path))
+        with pytest.raises(WorkerCancelled):
+            await app.workers.wait_for_complete()
+        await pilot.pause()
+
+    assert not path.exists()
+    assert notices == []
+
+
+def test_export_filename():
+    """Test file names are made safe and carry the start time and format."""
+    started = datetime(2024, 5, 1, 10, 15, 0)
+
+    assert export_filename("deploy/app prod", started) == "deploy_app_prod-20240501-101500.log"
+    assert export_filename("x", started, "jsonl", compress=True) == "x-20240501-101500.jsonl.gz"
+
+
+def test_export_command_runs_each_target(tmp_path):
+    """Test exporting a parameterized command renders and runs it once per target."""
+    config_file = tmp_path / "commands.yaml"
+    config_file.write_text(
+        "commands:\n"
+        "  - name: ping\n"
+        "    command: 'echo pong {host}; test {host} != b'\n"
+        "    targets: [a, b]\n"
+    )
+    path = tmp_path / "ping.log"
+
+    assert export_command(str(config_file), "ping", str(path)) == 1
+    lines = path.read_text().splitlines()
+    assert sorted(lines[:2]) == ["[OUT] a | pong a", "[OUT] b | pong b"]
+    assert lines[2].startswith("[END] ping[a]: success (exit 0) · CPU ")
+    assert lines[3].startswith("[END] ping[b]: error (exit 1) · CPU ")
@@ -0,0 +1,109 @@
+"""Unit tests for parameterized command fan-out."""
+
+import time
+
+import pytest
+
+from src.exceptions import ExecutionError
+from src.models import Command, ExecutionStatus
+from src.services.command_runner import AsyncCommandRunner
+from src.services.config import ConfigLoader
+from src.services.fanout import FanOutRunner, expand_targets, render_command
+
+
+def test_render_named_placeholder_from_string_target():
+    """Test that a string target binds the template's single placeholder."""
+    assert render_command("ping -c1 {host}", "web1") == "ping -c1 web1"
+    assert render_command("echo {target}", "db") == "echo db"
+
+
+def test_render_mapping_target():
+    """Test rendering with multiple placeholders from a mapping target."""
+    rendered = render_command("ssh {host} systemctl status {unit}", {"host": "h1", "unit": "nginx"})
+    assert rendered == "ssh h1 systemctl status nginx"
+
+
+def test_render_ambiguous_string_target():
+    """Test that string targets are rejected for multi-placeholder templates."""
+    with pytest.raises(ExecutionError):
+        render_command("ssh {host} systemctl status {unit}", "h1")
+
+
+def test_expand_targets():
+    """Test that each target gets its own rendered command."""
+    command = Command(name="ping", command="ping {host}", targets=["a", "b"])
+
+    expanded = expand_targets(command)
+
+    assert [label for label, _ in expanded] == ["a", "b"]
+    assert [cmd.command for _, cmd in expanded] == ["ping a", "ping b"]
+    assert not any(cmd.is_parameterized() for _, cmd in expanded)
+
+
+@pytest.mark.asyncio
+async def test_fanout_runs_targets_in_parallel():
+    """Test that fan-out takes about the time of the slowest target."""
+    command = Command(
+        name="sleepy",
+        command="sleep 0.5 && test {target} != bad",
+        targets=["one", "two", "three", "bad"],
+        timeout=10,
+    )
+    runner = FanOutRunner(AsyncCommandRunner(), max_parallel=4)
+
+    start = time.monotonic()
+    result = await runner.run(command)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.5
+    assert [r.target for r in result.results] == ["one", "two", "three", "bad"]
+    assert result.success_count() == 3
+    assert result.results[-1].execution.status == ExecutionStatus.ERROR
+
+
+@pytest.mark.asyncio
+async def test_fanout_records_timeouts():
+    """Test that a timed-out target is recorded instead of raised."""
+    command = Command(name="slow", command="sleep {target}", targets=["0", "5"], timeout=1)
+    runner = FanOutRunner(AsyncCommandRunner())
+
+    result = await runner.run(command)
+
+    assert result.results[0].succeeded()
+    assert result.results[1].execution.status == ExecutionStatus.TIMEOUT
+
+
+def test_config_resolves_target_groups_into_a_copy():
+    """Test group targets are appended to a copy, leaving the parsed command alone."""
+    config = {
+        "target_groups": {"web": ["w1", "w2"]},
+        "commands": [
+            {"name": "a", "command": "ping {target}", "targets": ["db"], "target_groups": ["web"]},
+            {"name": "b", "command": "ping {target}", "target_groups": ["web"]},
+        ],
+    }
+
+    commands, _ = ConfigLoader().validate(config)
+
+    assert commands[0].targets == ["db", "w1", "w2"]
+    assert commands[1].targets == ["w1", "w2"]
+    assert config["target_groups"]["web"] == ["w1", "w2"]
+    assert config["commands"][0]["targets"] == ["db"]
+
+
+@pytest.mark.asyncio
+async def test_fanout_error_ids_are_unique():
+    """Test targets that fail to start get distinct ids on every run."""
+
+    class FailingRunner(AsyncCommandRunner):
+        async def run(self, command, output_callback=None, completion_callback=None):
+            raise ExecutionError("cannot start")
+
+    command = Command(name="ping", command="ping {target}", targets=["a"])
+    runner = FanOutRunner(FailingRunner())
+
+    first = await runner.run(command)
+    second = await runner.run(command)
+
+    assert first.results[0].execution.status == ExecutionStatus.ERROR
+    assert first.results[0].execution.id != second.results[0].execution.id
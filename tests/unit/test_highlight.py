@@ -0,0 +1,99 @@
+"""Unit tests for output highlighting rules."""
+
+import pytest
+
+from src.exceptions import ConfigError
+from src.models import HighlightRule
+from src.services.config import ConfigLoader
+from src.services.highlight import DEFAULT_RULES, Highlighter, compile_rules
+
+
+def test_default_rules_style_matching_words():
+    """Test the built-in rules find errors, log levels and addresses in one pass."""
+    highlighter = Highlighter(DEFAULT_RULES)
+    content = "INFO connect 10.0.0.1:8080 failed: Error after 250ms"
+
+    spans = {content[start:end]: style for start, end, style in highlighter.spans(content)}
+
+    assert spans == {
+        "INFO": "cyan",
+        "10.0.0.1:8080": "magenta",
+        "failed": "bold red",
+        "Error": "bold red",
+        "250ms": "green",
+    }
+
+
+def test_earlier_rule_wins_at_same_position():
+    """Test rule order decides which style applies to an overlapping match."""
+    highlighter = Highlighter(
+        [
+            HighlightRule(name="first", pattern=r"abc", style="red"),
+            HighlightRule(name="second", pattern=r"abcdef", style="blue"),
+        ]
+    )
+
+    assert highlighter.spans("xabcdef") == ((1, 4, "red"),)
+
+
+def test_word_boundary_not_hoisted_over_alternation():
+    """Test a leading \\b is only factored out when it covers the whole pattern."""
+    regex = compile_rules(
+        [
+            HighlightRule(name="a", pattern=r"\bfoo|bar", style="red"),
+            HighlightRule(name="b", pattern=r"\bbaz\b", style="blue"),
+        ]
+    )
+
+    assert regex.search("xbar") is not None
+    assert regex.search("xbaz") is None
+
+
+def test_spans_are_cached_per_line():
+    """Test repeated lines reuse cached spans."""
+    highlighter = Highlighter(DEFAULT_RULES)
+
+    highlighter.spans("ERROR one")
+    highlighter.spans("ERROR one")
+
+    assert highlighter.spans.cache_info().hits == 1
+
+
+def test_no_rules_highlights_nothing():
+    """Test an empty rule list disables highlighting."""
+    assert Highlighter([]).spans("ERROR 10.0.0.1") == ()
+
+
+def test_invalid_rule_rejected_by_config():
+    """Test bad patterns and styles are reported when the config is validated."""
+    loader = ConfigLoader()
+    commands = [{"name": "t", "command": "true"}]
+
+    with pytest.raises(ConfigError, match="bad_regex"):
+        loader.validate(
+            {
+                "commands": commands,
+                "app": {"highlight_rules": [{"name": "bad_regex", "pattern": "(", "style": "red"}]},
+            }
+        )
+    with pytest.raises(ConfigError, match="already used"):
+        loader.validate(
+            {
+                "commands": commands,
+                "app": {
+                    "highlight_rules": [
+                        {"name": "a", "pattern": "(?P<n>a)", "style": "red"},
+                        {"name": "b", "pattern": "(?P<n>b)", "style": "red"},
+                    ]
+                },
+            }
+        )
+    with pytest.raises(ConfigError, match="bad_style"):
+        loader.validate(
+            {
+                "commands": commands,
+                "app": {
+                    "highlight_rules": [{"name": "bad_style", "pattern": "x", "style": "nocolour"}]
+                },
+            }
+        )
@@ -0,0 +1,149 @@
+"""Unit tests for delta-encoded output history."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.app import show_history
+from src.models import AppConfig, Command, Execution, ResourceUsage
+from src.services.history import HistoryStore, OutputHistory, apply_delta, encode_delta
+from src.widgets import OpsApp
+
+
+def test_delta_round_trip():
+    """Test deltas rebuild the new output from the old one, edits included."""
+    rng = random.Random(5)
+    words = ["", "ok", "load 0.51", "load 0.72", "héllo wörld", "x" * 30]
+    for _ in range(500):
+        old = [rng.choice(words) for _ in range(rng.randrange(12))]
+        new = list(old)
+        for _ in range(rng.randrange(4)):
+            position = rng.randrange(len(new) + 1)
+            if new and rng.random() < 0.5:
+                new[position - 1] += rng.choice(["", "1", "é"])
+            else:
+                new.insert(position, rng.choice(words))
+
+        assert apply_delta(old, encode_delta(old, new)) == new
+
+
+def test_changed_line_stores_only_the_difference():
+    """Test a line that changed in place costs a few bytes."""
+    old = [f"web-{n:02d}  Ready  uptime 3d 04:10:{n:02d}" for n in range(50)]
+    new = list(old)
+    new[20] = new[20].replace("Ready", "Drain")
+
+    assert len(encode_delta(old, new)) < 20
+
+
+def test_runs_share_identical_outputs_and_reopen(tmp_path):
+    """Test identical outputs are stored once and every run survives reopening."""
+    path = str(tmp_path / "status.opshist")
+    history = OutputHistory(path, "status", snapshot_every=4)
+    start = datetime(2026, 1, 1)
+    outputs = []
+    for run in range(30):
+        lines = ["NAME  STATUS", f"db    {'Ready' if run % 10 < 5 else 'NotReady'}"]
+        if run % 3 == 0:
+            lines.append(f"checked {run // 3}")
+        outputs.append(lines)
+        history.add(lines, exit_code=run % 2, time=start + timedelta(seconds=5 * run))
+    history.close()
+
+    reopened = OutputHistory(path)
+    runs = reopened.runs()
+    assert len(reopened) == 30
+    assert reopened.object_count < 20
+    assert runs[7].time == start + timedelta(seconds=35)
+    assert runs[7].exit_code == 1
+    assert [reopened.lines(index) for index in range(30)] == outputs
+    assert reopened.lines(-1) == outputs[-1]
+
+
+def test_runs_keep_their_resource_usage(tmp_path):
+    """Test a run's resource usage is stored with it and survives reopening."""
+    path = str(tmp_path / "build.opshist")
+    usage = ResourceUsage(
+        user_cpu_seconds=1.5,
+        system_cpu_seconds=0.25,
+        max_rss_kb=65536,
+        block_input_ops=8,
+        block_output_ops=16,
+        voluntary_context_switches=120,
+        involuntary_context_switches=3,
+    )
+    history = OutputHistory(path, "build")
+    history.add(["ok"], 0)
+    assert history.add(["ok"], 0, resource_usage=usage).resource_usage == usage
+    history.close()
+
+    runs = OutputHistory(path).runs()
+    assert runs[0].resource_usage is None
+    assert runs[1].resource_usage == usage
+
+
+def test_partly_written_record_is_dropped(tmp_path):
+    """Test a history cut short while writing reopens with its complete runs."""
+    path = tmp_path / "status.opshist"
+    history = OutputHistory(str(path))
+    history.add(["a", "b"])
+    history.add(["a", "c"])
+    history.close()
+    path.write_bytes(path.read_bytes()[:-2])
+
+    reopened = OutputHistory(str(path))
+    reopened.add(["a", "d"])
+
+    assert len(reopened) == 2
+    assert reopened.lines(1) == ["a", "d"]
+
+
+def test_day_of_five_second_runs_stays_small(tmp_path):
+    """Test a day of a slowly changing status output takes well under a megabyte."""
+    history = OutputHistory(str(tmp_path / "status.opshist"))
+    rng = random.Random(1)
+    state = {f"web-{n:02d}": "Ready" for n in range(20)}
+    for run in range(17_280):
+        if rng.random() < 0.05:
+            state[rng.choice(list(state))] = rng.choice(["Ready", "NotReady"])
+        lines = [f"{name}  {status:<8}  {run * 5 // 3600}h" for name, status in state.items()]
+        if run % 3 == 0:
+            lines.append(f"load average: {rng.random() * 4:.2f}")
+        history.add(lines, 0)
+
+    assert history.size < 512 * 1024
+    assert history.lines(12_345)[0].startswith("web-00")
+
+
+def test_store_records_executions_and_cli_prints_them(tmp_path, capsys):
+    """Test executions go to their command's history, readable from the command line."""
+    store = HistoryStore(str(tmp_path))
+    command = Command(name="df", command="df -h")
+    for number, free in enumerate(["10G", "9G"]):
+        execution = Execution(id=f"exec_{number}", command=command, exit_code=0)
+        store.record(execution, ["Filesystem  Avail", f"/dev/sda1   {free}"])
+    store.close()
+
+    assert show_history(store.path("df"), -1) == 0
+    assert capsys.readouterr().out.splitlines() == ["Filesystem  Avail", "/dev/sda1   9G"]
+    assert show_history(store.path("df")) == 0
+    listing = capsys.readouterr()
+    assert len(listing.out.splitlines()) == 2
+    assert "2 run(s), 2 distinct output(s)" in listing.err
+
+
+@pytest.mark.asyncio
+async def test_timed_out_run_is_recorded_once(tmp_path):
+    """Test a run that times out is stored once, with its timeout outcome."""
+    command = Command(name="slow", command="echo started; sleep 5", timeout=1)
+    app = OpsApp([command], AppConfig(history_dir=str(tmp_path)))
+    async with app.run_test() as pilot:
+        app.action_execute()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+
+    history = OutputHistory(HistoryStore(str(tmp_path)).path("slow"))
+    assert len(history) == 1
+    assert history.lines(0) == ["started"]
@@ -0,0 +1,91 @@
+"""Unit tests for per-command resource limits."""
+
+import os
+
+import pytest
+
+from src.exceptions import ExecutionError
+from src.models import Command, ExecutionStatus, ResourceLimits
+from src.services.command_runner import AsyncCommandRunner
+from src.services.limits import build_preexec, ioprio_value
+
+
+async def _run_and_collect(command: Command) -> tuple[str, ExecutionStatus]:
+    """Run a command and return its stdout text and status."""
+    lines = []
+    execution = await AsyncCommandRunner().run(
+        command, output_callback=lambda line: lines.append(line.content)
+    )
+    return "\n".join(lines), execution.status
+
+
+def test_no_limits_needs_no_preexec():
+    """Test commands without limits keep the fast spawn path."""
+    assert build_preexec(None) is None
+    assert build_preexec(ResourceLimits()) is None
+
+
+def test_ioprio_encoding():
+    """Test I/O class and level are packed like ionice does."""
+    assert ioprio_value("best-effort", 7) == (2 << 13) | 7
+    assert ioprio_value("idle", 3) == 3 << 13
+
+
+def test_unavailable_cpu_rejected():
+    """Test affinity to a CPU we cannot use fails before spawning."""
+    with pytest.raises(ExecutionError):
+        build_preexec(ResourceLimits(cpu_affinity=[4096]))
+
+
+@pytest.mark.asyncio
+async def test_limits_applied_before_exec():
+    """Test rlimits, nice and affinity are visible to the command."""
+    cpu = min(os.sched_getaffinity(0))
+    limits = ResourceLimits(memory_mb=512, cpu_seconds=30, nice=10, cpu_affinity=[cpu])
+    command = Command(
+        name="limits",
+        command="ulimit -v; ulimit -t; grep -E '^Cpus_allowed_list' /proc/self/status; "
+        "cut -d' ' -f19 /proc/self/stat",
+        limits=limits,
+    )
+
+    output, status = await _run_and_collect(command)
+
+    assert status == ExecutionStatus.SUCCESS
+    assert output.splitlines() == [
+        str(512 * 1024),
+        "30",
+        f"Cpus_allowed_list:\t{cpu}",
+        "10",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_memory_limit_stops_allocation():
+    """Test a command cannot allocate past its memory limit."""
+    command = Command(
+        name="hog",
+        command="python3 -c 'bytearray(512 * 1024 * 1024)'",
+        limits=ResourceLimits(memory_mb=128),
+    )
+
+    _, status = await _run_and_collect(command)
+
+    assert status == ExecutionStatus.ERROR
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.exists("/usr/bin/ionice"), reason="ionice not installed")
+async def test_idle_io_class():
+    """Test the I/O scheduling class is set in the child."""
+    command = Command(
+        name="ionice",
+        command="ionice -p $$",
+        limits=ResourceLimits(io_class="idle"),
+        shell=True,
+    )
+
+    output, status = await _run_and_collect(command)
+
+    assert status == ExecutionStatus.SUCCESS
+    assert "idle" in output
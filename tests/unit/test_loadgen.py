@@ -0,0 +1,83 @@
+"""Unit tests for the synthetic load generator."""
+
+import time
+
+import pytest
+
+from src.exceptions import TimeoutError as OpsTimeoutError
+from src.models import Command, ExecutionStatus, LoadProfile, StreamType
+from src.services.command_runner import AsyncCommandRunner
+from src.services.loadgen import LoadGenerator
+
+
+def test_same_seed_same_output():
+    """Test a profile always produces the same lines."""
+    profile = LoadProfile(ansi_ratio=0.5, invalid_utf8_ratio=0.5, stderr_ratio=0.5, seed=7)
+
+    generator_a, generator_b = LoadGenerator(profile), LoadGenerator(profile)
+    lines = [generator_a.make_line() for _ in range(200)]
+
+    assert lines == [generator_b.make_line() for _ in range(200)]
+    assert lines[0][1].startswith(b"00000000 ")
+
+
+def test_mix_follows_profile():
+    """Test stderr, ANSI and invalid UTF-8 lines appear at about the configured ratios."""
+    generator = LoadGenerator(
+        LoadProfile(stderr_ratio=0.25, ansi_ratio=0.5, invalid_utf8_ratio=0.1, line_length=40)
+    )
+    lines = [generator.make_line() for _ in range(4000)]
+
+    stderr = sum(stream == StreamType.STDERR for stream, _ in lines) / len(lines)
+    colored = sum(b"\x1b[" in data for _, data in lines) / len(lines)
+    invalid = 0
+    for _, data in lines:
+        try:
+            data.decode("utf-8")
+        except UnicodeDecodeError:
+            invalid += 1
+
+    assert 0.2 < stderr < 0.3
+    assert 0.45 < colored < 0.55
+    assert 0.07 < invalid / len(lines) < 0.13
+
+
+def test_fixed_line_length():
+    """Test fixed lengths give equally long lines."""
+    generator = LoadGenerator(LoadProfile(line_length=120, length_distribution="fixed"))
+
+    assert {len(generator.make_line()[1]) for _ in range(50)} == {len(b"00000000 ") + 120 + 1}
+
+
+@pytest.mark.asyncio
+async def test_runner_generates_at_rate_in_bursts():
+    """Test a load command outputs its lines at the configured average rate."""
+    command = Command(
+        name="soak",
+        load=LoadProfile(lines=300, lines_per_second=1000, burst_size=100, exit_code=4),
+    )
+    lines = []
+
+    start = time.perf_counter()
+    execution = await AsyncCommandRunner().run(command, output_callback=lines.append)
+    elapsed = time.perf_counter() - start
+
+    assert len(lines) == 300
+    # Three bursts, 0.1 s apart
+    assert 0.15 <= elapsed < 0.6
+    assert (execution.status, execution.exit_code) == (ExecutionStatus.ERROR, 4)
+
+
+@pytest.mark.asyncio
+async def test_unbounded_load_stops_at_timeout():
+    """Test a load without a line limit is stopped by the command timeout."""
+    command = Command(name="soak", timeout=1, load=LoadProfile(lines=None, lines_per_second=50))
+
+    with pytest.raises(OpsTimeoutError):
+        await AsyncCommandRunner().run(command)
+
+
+def test_command_line_required_without_load():
+    """Test a command needs a command line unless it generates load."""
+    with pytest.raises(ValueError, match="command is required"):
+        Command(name="empty")
@@ -0,0 +1,88 @@
+"""Unit tests for metric extraction and time series."""
+
+import pytest
+
+from src.exceptions import ConfigError
+from src.models import Command, MetricExtractor
+from src.services.command_runner import AsyncCommandRunner
+from src.services.config import ConfigLoader
+from src.services.metrics import MetricSeries, MetricStore, OutputMetrics, sparkline
+
+
+def test_series_keeps_last_values_in_order():
+    """Test the ring buffer overwrites the oldest values once full."""
+    series = MetricSeries(3)
+    for value in range(5):
+        series.append(value)
+
+    assert series.values() == [2.0, 3.0, 4.0]
+    assert series.last == 4.0
+    assert len(series) == 3
+
+
+def test_pattern_and_json_path_extractors():
+    """Test values come from the value group, group 1 or a JSON path."""
+    metrics = OutputMetrics(
+        [
+            MetricExtractor(name="free", pattern=r"free=(?P<value>[\d.]+)G"),
+            MetricExtractor(name="depth", pattern=r"depth (\d[\d,]*)"),
+            MetricExtractor(name="p99", json_path="latency.p[1]"),
+        ]
+    )
+
+    assert metrics.extract(b"disk free=12.5G depth 1,024") == [
+        ("free", 12.5),
+        ("depth", 1024.0),
+    ]
+    assert metrics.extract(b'{"latency": {"p": [10, 250]}}') == [("p99", 250.0)]
+    assert metrics.extract(b'{"latency": {"p": "n/a"}}') == []
+
+
+def test_sparkline_scales_to_range():
+    """Test sparklines span the block characters and show the latest values."""
+    assert sparkline([0, 5, 10], 8) == "▁▅█"
+    assert sparkline([1, 2, 3, 4], 2) == "▁█"
+    assert sparkline([7, 7], 8) == "▅▅"
+
+
+def test_store_uses_configured_size():
+    """Test a command's series is created with its extractor's number of points."""
+    command = Command(
+        name="df", command="df", metrics=[MetricExtractor(name="use", pattern=r"\d+", points=2)]
+    )
+    store = MetricStore()
+    for value in (1.0, 2.0, 3.0):
+        store.record(command, "use", value)
+
+    assert store.series("df") == {"use": [2.0, 3.0]}
+    assert store.version == 3
+
+
+def test_extractor_needs_one_source_and_valid_pattern():
+    """Test metrics without a source, or with a bad regex, are rejected."""
+    with pytest.raises(ValueError, match="pattern or json_path"):
+        MetricExtractor(name="x")
+
+    config = {
+        "commands": [{"name": "t", "command": "true", "metrics": [{"name": "x", "pattern": "("}]}]
+    }
+    with pytest.raises(ConfigError, match="metric 'x'"):
+        ConfigLoader().validate(config)
+
+
+@pytest.mark.asyncio
+async def test_runner_reports_values_as_output_streams():
+    """Test the runner passes each value found to the metric callback."""
+    command = Command(
+        name="queue",
+        command="echo 'depth 3'; echo noise; echo 'depth 7'",
+        metrics=[MetricExtractor(name="depth", pattern=r"depth (\d+)")],
+    )
+    values = []
+    runner = AsyncCommandRunner(
+        metric_callback=lambda execution, name, value: values.append((name, value))
+    )
+
+    await runner.run(command)
+
+    assert values == [("depth", 3.0), ("depth", 7.0)]
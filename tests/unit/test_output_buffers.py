@@ -0,0 +1,98 @@
+"""Unit tests for per-execution output buffers."""
+
+import os
+from datetime import datetime
+
+from src.models import OutputLine, StreamType
+from src.services.output_buffers import OutputBufferStore, line_size
+
+
+def make_line(execution_id: str, index: int, content: str = "x" * 40) -> OutputLine:
+    """Build an output line."""
+    return OutputLine(
+        id=f"{execution_id}_{index}",
+        execution_id=execution_id,
+        timestamp=datetime.now(),
+        stream=StreamType.STDOUT,
+        content=content,
+        spans=[(0, 1, "color(1)")] if index % 2 else None,
+    )
+
+
+def fill(store: OutputBufferStore, key: str, count: int) -> None:
+    """Add count lines to a buffer."""
+    store.open(key, f"cmd {key}")
+    for index in range(count):
+        store.append(key, make_line(key, index))
+
+
+def test_executions_get_separate_buffers():
+    """Test lines are routed by key and trimmed per buffer."""
+    store = OutputBufferStore(memory_budget=10**9, max_lines=5)
+
+    fill(store, "exec_a", 3)
+    fill(store, "exec_b", 8)
+
+    assert [line.id for line in store.get("exec_a").lines] == ["exec_a_0", "exec_a_1", "exec_a_2"]
+    assert store.get("exec_b").lines[0].id == "exec_b_3"
+    expected = sum(line_size(line) for key in ("exec_a", "exec_b") for line in store.get(key).lines)
+    assert store.resident_size == expected
+
+
+def test_budget_evicts_finished_buffers_lru_and_reloads(tmp_path):
+    """Test finished buffers are evicted least recently used first and read back."""
+    size = 10 * line_size(make_line("k", 0))
+    store = OutputBufferStore(memory_budget=int(size * 2.5), spill_dir=str(tmp_path))
+    for key in ("old", "new", "running"):
+        fill(store, key, 10)
+    store.complete("old")
+    store.complete("new")
+    store.get("old")  # now the most recently used
+
+    fill(store, "another", 0)
+    store.append("running", make_line("running", 99))
+
+    new = store._buffers["new"]
+    assert not new.resident and os.path.exists(new.spill_path)
+    assert store._buffers["old"].resident and store._buffers["running"].resident
+
+    reloaded = store.get("new")
+    assert [line.id for line in reloaded.lines] == [f"new_{i}" for i in range(10)]
+    assert reloaded.lines[1].spans == [(0, 1, "color(1)")]
+
+
+def test_running_and_visible_buffers_never_evicted(tmp_path):
+    """Test the budget may be exceeded rather than evict live or on-screen output."""
+    store = OutputBufferStore(memory_budget=1, spill_dir=str(tmp_path))
+    fill(store, "running", 3)
+    fill(store, "shown", 3)
+    store.visible = "shown"
+
+    store.complete("shown")
+
+    assert store.evictions == 0
+    assert store._buffers["running"].resident and store._buffers["shown"].resident
+
+
+def test_close_deletes_spill_files():
+    """Test closing the store removes its temporary directory."""
+    store = OutputBufferStore(memory_budget=1)
+    fill(store, "done", 2)
+    store.complete("done")
+    spill_dir = os.path.dirname(store._buffers["done"].spill_path)
+
+    store.close()
+
+    assert not os.path.exists(spill_dir)
+    assert len(store) == 0
+
+
+def test_trimmed_lines_kept_in_scrollback(tmp_path):
+    """Test lines past max_lines are spooled to disk and still readable in order."""
+    store = OutputBufferStore(memory_budget=10**9, max_lines=4, spill_dir=str(tmp_path))
+    fill(store, "long", 10)
+
+    snapshot = store.snapshot("long")
+
+    assert store._buffers["long"].first_line == 6
+    assert [line.id for line in snapshot.iter_lines(4)] == [f"long_{i}" for i in range(4, 10)]
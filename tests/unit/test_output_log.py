@@ -0,0 +1,67 @@
+"""Unit tests for the output log widget."""
+
+from datetime import datetime
+
+import pytest
+from textual.app import App, ComposeResult
+from textual.geometry import Offset
+from textual.selection import Selection
+
+from src.models import OutputLine, StreamType
+from src.widgets.output_log import OutputLog
+
+
+class LogApp(App):
+    """App hosting a single output log."""
+
+    def compose(self) -> ComposeResult:
+        yield OutputLog(id="log")
+
+
+def make_line(index: int, content: str, stream: StreamType = StreamType.STDOUT) -> OutputLine:
+    """Build an output line."""
+    return OutputLine(
+        id=f"line_{index}",
+        execution_id="exec",
+        timestamp=datetime.now(),
+        stream=stream,
+        content=content,
+    )
+
+
+@pytest.mark.asyncio
+async def test_markup_like_output_shown_verbatim():
+    """Test brackets in output are not parsed as console markup."""
+    app = LogApp()
+    async with app.run_test(size=(80, 10)) as pilot:
+        log = app.query_one(OutputLog)
+        log.add_line(make_line(0, "[bold]not bold[/bold] [1, 2]"))
+        log.add_line(make_line(1, "[ERROR] oops", StreamType.STDERR))
+        await pilot.pause()
+
+        stdout_row = log.render_line(0)
+        stderr_row = log.render_line(1)
+
+    assert stdout_row.text.rstrip() == "[OUT] [bold]not bold[/bold] [1, 2]"
+    assert stderr_row.text.rstrip() == "[ERR] [ERROR] oops"
+    assert log.frame_times
+    # stderr content carries the stream style, stdout content does not
+    stdout_colors = {seg.style.color for seg in stdout_row if seg.text.strip()}
+    stderr_colors = {seg.style.color for seg in stderr_row if seg.text.strip()}
+    assert stdout_colors != stderr_colors
+
+
+def test_selection_reads_only_selected_rows():
+    """Test copying a selection builds the text of the selected rows only."""
+    log = OutputLog()
+    log.lines = [make_line(index, f"line {index}") for index in range(1000)]
+    log.set_header(["header"])
+    rows_read = []
+    row_text = log._row_text
+    log._row_text = lambda row: rows_read.append(row) or row_text(row)
+
+    text, ending = log.get_selection(Selection(Offset(6, 2), Offset(9, 3)))
+
+    assert text == "line 1\n[OUT] lin"
+    assert ending == "\n"
+    assert rows_read == [2, 3]
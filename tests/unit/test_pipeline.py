@@ -0,0 +1,105 @@
+"""Unit tests for DAG pipeline execution."""
+
+import time
+
+import pytest
+
+from src.exceptions import ConfigError
+from src.models import Command, Pipeline
+from src.services.command_runner import AsyncCommandRunner
+from src.services.config import ConfigLoader
+from src.services.pipeline import PipelineExecutor, topological_order
+
+
+def _pipeline(steps):
+    return Pipeline(name="release", steps=steps)
+
+
+def test_topological_order_respects_dependencies():
+    """Test that every node is ordered after its dependencies."""
+    pipeline = _pipeline(
+        [
+            {"command": "package", "depends_on": ["test", "lint"]},
+            {"command": "test", "depends_on": ["build"]},
+            {"command": "build"},
+            {"command": "lint"},
+        ]
+    )
+
+    order = topological_order(pipeline)
+
+    assert order.index("build") < order.index("test") < order.index("package")
+    assert order.index("lint") < order.index("package")
+
+
+def test_topological_order_rejects_cycles():
+    """Test that dependency cycles are reported as configuration errors."""
+    pipeline = _pipeline(
+        [{"command": "a", "depends_on": ["b"]}, {"command": "b", "depends_on": ["a"]}]
+    )
+
+    with pytest.raises(ConfigError, match="cycle"):
+        topological_order(pipeline)
+
+
+def test_validate_pipelines_rejects_unknown_command():
+    """Test that pipeline steps must refer to configured commands."""
+    loader = ConfigLoader()
+    config = {"pipelines": [{"name": "p", "steps": [{"command": "missing"}]}]}
+
+    with pytest.raises(ConfigError, match="unknown command"):
+        loader.validate_pipelines(config, [Command(name="build", command="true")])
+
+
+@pytest.mark.asyncio
+async def test_independent_nodes_run_concurrently():
+    """Test that the pipeline takes critical-path time, not serial time."""
+    commands = {
+        name: Command(name=name, command="sleep 0.4", timeout=10)
+        for name in ("build", "lint", "docs", "package")
+    }
+    pipeline = _pipeline(
+        [
+            {"command": "build"},
+            {"command": "lint"},
+            {"command": "docs"},
+            {"command": "package", "depends_on": ["build", "lint"]},
+        ]
+    )
+
+    start = time.monotonic()
+    result = await PipelineExecutor(AsyncCommandRunner()).run(pipeline, commands)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.4
+    assert result.status() == "success"
+    critical = result.critical_path()
+    assert critical[-1] == "package"
+    assert len(critical) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_node_skips_dependents():
+    """Test that dependents of a failed node are skipped, others still run."""
+    commands = {
+        "build": Command(name="build", command="exit 1", timeout=10),
+        "test": Command(name="test", command="true", timeout=10),
+        "package": Command(name="package", command="true", timeout=10),
+        "lint": Command(name="lint", command="true", timeout=10),
+    }
+    pipeline = _pipeline(
+        [
+            {"command": "build"},
+            {"command": "test", "depends_on": ["build"]},
+            {"command": "package", "depends_on": ["test"]},
+            {"command": "lint"},
+        ]
+    )
+
+    result = await PipelineExecutor(AsyncCommandRunner()).run(pipeline, commands)
+
+    assert result.nodes["build"].status() == "error"
+    assert result.nodes["test"].skipped
+    assert result.nodes["package"].skipped
+    assert result.nodes["lint"].succeeded()
+    assert result.status() == "error"
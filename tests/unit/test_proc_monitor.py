@@ -0,0 +1,74 @@
+"""Unit tests for the /proc process-group monitor."""
+
+import os
+import signal
+import subprocess
+import time
+
+import pytest
+
+from src.services.proc_monitor import (
+    GroupSample,
+    ProcessMonitor,
+    parse_io,
+    parse_stat,
+    sort_samples,
+)
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="requires procfs")
+
+
+def test_parse_stat_handles_parentheses_in_name():
+    """Test the command name cannot shift the parsed fields."""
+    data = (
+        b"1234 (evil) (name) S 1 4321 4321 0 -1 4194304 100 0 0 0 "
+        b"7 3 0 0 20 0 5 0 100 1000000 250 18446744073709551615"
+    )
+
+    stat = parse_stat(data)
+
+    assert stat is not None
+    assert stat.pgid == 4321
+    assert stat.cpu_ticks == 10
+    assert stat.threads == 5
+    assert stat.rss_pages == 250
+
+
+def test_parse_io():
+    """Test storage byte counters are extracted."""
+    data = b"rchar: 10\nwchar: 20\nread_bytes: 4096\nwrite_bytes: 8192\n"
+
+    assert parse_io(data) == (4096, 8192)
+
+
+def test_sample_aggregates_process_group():
+    """Test a group's members are summed and CPU% measured between samples."""
+    process = subprocess.Popen(
+        ["sh", "-c", "sleep 30 & while :; do :; done"], start_new_session=True
+    )
+    try:
+        monitor = ProcessMonitor()
+        monitor.sample({process.pid: "busy"})
+        time.sleep(0.3)
+        [sample] = monitor.sample({process.pid: "busy"})
+    finally:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+    assert sample.name == "busy"
+    assert sample.processes == 2
+    assert sample.threads >= 2
+    assert sample.rss_bytes > 0
+    assert sample.cpu_percent > 20
+
+
+def test_sort_samples_largest_first():
+    """Test numeric columns sort descending and names ascending."""
+    samples = [
+        GroupSample(pgid=1, name="b", cpu_percent=5.0),
+        GroupSample(pgid=2, name="a", cpu_percent=50.0),
+    ]
+
+    assert [s.pgid for s in sort_samples(samples, "cpu")] == [2, 1]
+    assert [s.pgid for s in sort_samples(samples, "name")] == [2, 1]
+    assert [s.pgid for s in sort_samples(samples, "rss")] == [1, 2]
@@ -0,0 +1,150 @@
+"""Unit tests for the Python task runner."""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from src.exceptions import ConfigError
+from src.exceptions import TimeoutError as OpsTimeoutError
+from src.models import Command, ExecutionStatus, StreamType
+from src.services.config import ConfigLoader
+from src.services.python_runner import PythonTaskRunner
+
+TASKS = "tests.unit.python_tasks"
+
+
+@pytest.fixture
+def runner():
+    """A runner with a started pool, closed after the test."""
+    runner = PythonTaskRunner(workers=2)
+    runner.start()
+    yield runner
+    runner.close()
+
+
+@pytest.mark.asyncio
+async def test_prints_and_logging_stream_as_output(runner):
+    """Test stdout, logging and unterminated stderr output all become lines."""
+    command = Command(
+        name="greet", callable=f"{TASKS}:greet", arguments={"name": "deck", "count": 3}
+    )
+    lines = []
+
+    execution = await runner.run(command, output_callback=lines.append)
+
+    assert (execution.status, execution.exit_code) == (ExecutionStatus.SUCCESS, 0)
+    stdout = [line.content for line in lines if line.stream == StreamType.STDOUT]
+    stderr = [line.content for line in lines if line.stream == StreamType.STDERR]
+    assert stdout == ["hello deck 0", "hello deck 1", "hello deck 2"]
+    assert stderr == ["WARNING tasks: careful", "partial line without newline"]
+
+
+@pytest.mark.asyncio
+async def test_return_value_is_exit_code(runner):
+    """Test an int result is the exit code and dotted paths resolve too."""
+    execution = await runner.run(
+        Command(name="exit", callable=f"{TASKS}.exit_with", arguments={"code": 3})
+    )
+
+    assert (execution.status, execution.exit_code) == (ExecutionStatus.ERROR, 3)
+
+
+@pytest.mark.asyncio
+async def test_exception_shows_traceback(runner):
+    """Test an exception fails the execution with its traceback on stderr."""
+    lines = []
+
+    execution = await runner.run(
+        Command(name="fail", callable=f"{TASKS}:fail"), output_callback=lines.append
+    )
+
+    assert (execution.status, execution.exit_code) == (ExecutionStatus.ERROR, 1)
+    assert lines[0].content == "Traceback (most recent call last):"
+    assert lines[-1].content == "RuntimeError: task broke"
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_worker_and_pool_recovers(runner):
+    """Test a timed out callable is killed and later callables still run."""
+    command = Command(
+        name="sleep", timeout=1, callable=f"{TASKS}:sleep", arguments={"seconds": 30}
+    )
+
+    start = time.perf_counter()
+    with pytest.raises(OpsTimeoutError):
+        await runner.run(command)
+    assert time.perf_counter() - start < 5
+
+    execution = await runner.run(
+        Command(name="ok", callable=f"{TASKS}:exit_with", arguments={"code": 0})
+    )
+    assert execution.status == ExecutionStatus.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_timeout_leaves_other_callables_running(runner):
+    """Test killing a timed out worker does not affect a concurrent callable."""
+    stuck = Command(name="stuck", timeout=1, callable=f"{TASKS}:sleep", arguments={"seconds": 30})
+    healthy = Command(name="ok", timeout=10, callable=f"{TASKS}:sleep", arguments={"seconds": 2})
+
+    results = await asyncio.gather(runner.run(stuck), runner.run(healthy), return_exceptions=True)
+
+    assert isinstance(results[0], OpsTimeoutError)
+    assert results[1].status == ExecutionStatus.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_callable(runner):
+    """Test cancelling a running callable finishes it as cancelled."""
+    command = Command(name="sleep", callable=f"{TASKS}:sleep", arguments={"seconds": 30})
+    started = asyncio.Event()
+
+    def on_output(line):
+        started.set()
+
+    task = asyncio.create_task(runner.run(command, output_callback=on_output))
+    await asyncio.wait_for(started.wait(), 10)
+    runner.cancel_all()
+    execution = await asyncio.wait_for(task, 5)
+
+    assert execution.status == ExecutionStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_shell_commands_still_run(runner):
+    """Test commands without a callable run as processes."""
+    lines = []
+
+    execution = await runner.run(
+        Command(name="echo", command="echo hi"), output_callback=lines.append
+    )
+
+    assert execution.exit_code == 0
+    assert [line.content for line in lines] == ["hi"]
+
+
+def test_config_checks_callable_syntax_only():
+    """Test config validation rejects malformed callables without importing any."""
+    loader = ConfigLoader()
+    loader.validate({"commands": [{"name": "typo", "callable": f"{TASKS}:gret"}]})
+    loader.validate({"commands": [{"name": "dotted", "callable": "no_such_module.run"}]})
+    assert "no_such_module" not in sys.modules
+
+    for bad in ("not a path", "module:", "run", "pkg..module:run"):
+        with pytest.raises(ConfigError, match="callable"):
+            loader.validate({"commands": [{"name": "bad", "callable": bad}]})
+
+
+@pytest.mark.asyncio
+async def test_unknown_callable_fails_the_run(runner):
+    """Test a callable the worker cannot import finishes as a failed run."""
+    lines = []
+
+    execution = await runner.run(
+        Command(name="typo", callable=f"{TASKS}:gret"), output_callback=lines.append
+    )
+
+    assert execution.status == ExecutionStatus.ERROR
+    assert any("AttributeError" in line.content for line in lines)
@@ -0,0 +1,164 @@
+"""Unit tests for session recording and replay."""
+
+import asyncio
+import time
+from itertools import accumulate
+
+import pytest
+
+from src.exceptions import ExecutionError
+from src.exceptions import TimeoutError as OpsTimeoutError
+from src.models import Command, ExecutionStatus, LoadProfile, StreamType
+from src.services import recording
+from src.services.command_runner import AsyncCommandRunner
+from src.services.recording import Recording, ReplayRunner, SessionRecorder
+
+
+def write_recording(path, monkeypatch, chunks, exit_code=0) -> None:
+    """Write a recording with exact delays (seconds) between chunks."""
+    times = accumulate((delay for delay, _, _ in chunks), initial=0.0)
+    clock = (int(seconds * 1e9) for seconds in times)
+    monkeypatch.setattr(recording.time, "perf_counter_ns", lambda: next(clock))
+    recorder = SessionRecorder(str(path), Command(name="rec", command="make build"))
+    for _, stream, data in chunks:
+        recorder.record(stream, data)
+    recorder.close(exit_code)
+    monkeypatch.undo()
+
+
+@pytest.mark.asyncio
+async def test_recorded_run_replays_identically(tmp_path):
+    """Test a replay produces the same lines, colors, streams and status as the live run."""
+    script = r"printf '\033[31mred\033[0m\nplain\n'; echo oops >&2; exit 3"
+    command = Command(name="colors", command=script)
+    live = []
+    await AsyncCommandRunner(record_dir=str(tmp_path)).run(command, output_callback=live.append)
+    (path,) = tmp_path.glob("*.opsrec")
+
+    replayed = []
+    execution = await ReplayRunner(str(path), speed=0).run(command, output_callback=replayed.append)
+
+    assert [(line.stream, line.content, line.spans) for line in replayed] == [
+        (line.stream, line.content, line.spans) for line in live
+    ]
+    assert (execution.status, execution.exit_code) == (ExecutionStatus.ERROR, 3)
+    assert Recording(str(path)).command().command == command.command
+
+
+@pytest.mark.asyncio
+async def test_replay_speed_scales_recorded_timing(tmp_path, monkeypatch):
+    """Test playback keeps inter-chunk delays, divided by the speed."""
+    path = tmp_path / "slow.opsrec"
+    write_recording(
+        path, monkeypatch, [(0.0, StreamType.STDOUT, b"a\n"), (0.5, StreamType.STDERR, b"b\n")]
+    )
+    assert [chunk.delay for chunk in Recording(str(path)).chunks()] == [0.0, 0.5]
+
+    start = time.perf_counter()
+    lines = []
+    await ReplayRunner(str(path), speed=5).run(Command(name="rec", command="x"), lines.append)
+    elapsed = time.perf_counter() - start
+
+    assert 0.1 <= elapsed < 0.4
+    assert [(line.stream, line.content) for line in lines] == [
+        (StreamType.STDOUT, "a"),
+        (StreamType.STDERR, "b"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_can_be_cancelled(tmp_path, monkeypatch):
+    """Test a replay stops like a live execution when cancelled."""
+    path = tmp_path / "long.opsrec"
+    write_recording(
+        path, monkeypatch, [(0.0, StreamType.STDOUT, b"a\n"), (30.0, StreamType.STDOUT, b"b\n")]
+    )
+    runner = ReplayRunner(str(path))
+    started = asyncio.Event()
+
+    task = asyncio.ensure_future(
+        runner.run(Command(name="rec", command="x"), output_callback=lambda line: started.set())
+    )
+    await asyncio.wait_for(started.wait(), 5)
+    execution = runner.active_executions()[0]
+    runner.cancel(execution.id)
+
+    assert (await asyncio.wait_for(task, 5)).status == ExecutionStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_replay_stands_in_for_every_backend(tmp_path, monkeypatch):
+    """Test commands that would be exec'd directly or generated still play the recording."""
+    path = tmp_path / "rec.opsrec"
+    write_recording(path, monkeypatch, [(0.0, StreamType.STDOUT, b"recorded\n")], exit_code=5)
+    runner = ReplayRunner(str(path), speed=0)
+
+    for command in (
+        Command(name="direct", command="true", shell=False),
+        Command(name="soak", load=LoadProfile(lines=3)),
+    ):
+        lines = []
+        execution = await runner.run(command, output_callback=lines.append)
+        assert [line.content for line in lines] == ["recorded"]
+        assert execution.exit_code == 5
+
+
+@pytest.mark.asyncio
+async def test_replay_times_out(tmp_path, monkeypatch):
+    """Test playback longer than the command's timeout fails like a live run."""
+    path = tmp_path / "long.opsrec"
+    write_recording(
+        path, monkeypatch, [(0.0, StreamType.STDOUT, b"a\n"), (30.0, StreamType.STDOUT, b"b\n")]
+    )
+
+    with pytest.raises(OpsTimeoutError):
+        await ReplayRunner(str(path)).run(Command(name="rec", command="x", timeout=1))
+
+
+def test_rejects_other_files(tmp_path):
+    """Test opening a file that is not a recording fails clearly."""
+    path = tmp_path / "notes.txt"
+    path.write_text("hello")
+
+    with pytest.raises(ExecutionError, match="Not an Ops Deck recording"):
+        Recording(str(path))
+
+
+def test_replayed_command_keeps_its_settings(tmp_path):
+    """Test the recording rebuilds the whole command, not just its command line."""
+    command = Command(
+        name="build",
+        command="make",
+        timeout=30,
+        strip_ansi=True,
+        keep_tail=100,
+        fail_on=["ERROR"],
+    )
+    path = tmp_path / "rec.opsrec"
+    SessionRecorder(str(path), command).close(0)
+
+    assert Recording(str(path)).command() == command
+
+
+@pytest.mark.asyncio
+async def test_generated_output_recordings_replay(tmp_path):
+    """Test recordings of load commands, which have no command line, open for replay."""
+    execution = await AsyncCommandRunner(record_dir=str(tmp_path)).run(
+        Command(name="soak", load=LoadProfile(lines=3))
+    )
+    path = next(tmp_path.glob("*.opsrec"))
+    runner = ReplayRunner(str(path), speed=0)
+
+    lines = []
+    command = runner.recording.command()
+    replayed = await runner.run(command, output_callback=lines.append)
+
+    assert command.load == LoadProfile(lines=3)
+    assert len(lines) == 3
+    assert replayed.exit_code == execution.exit_code
+
+    # Recordings that only kept the (empty) command line
+    legacy = tmp_path / "legacy.opsrec"
+    header = b'{"name": "soak", "command": "", "started": "2026-01-01T00:00:00"}'
+    legacy.write_bytes(recording.MAGIC + bytes((len(header),)) + header)
+    assert Recording(str(legacy)).command().name == "soak"
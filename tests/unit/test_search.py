@@ -0,0 +1,76 @@
+"""Unit tests for output search."""
+
+from datetime import datetime
+
+from src.models import OutputLine, StreamType
+from src.services.output_buffers import OutputBufferStore
+from src.services.search import SearchState, compile_query, run_search, scan
+
+
+def make_line(index: int, content: str) -> OutputLine:
+    """Build an output line."""
+    return OutputLine(
+        id=f"exec_{index}",
+        execution_id="exec",
+        timestamp=datetime.now(),
+        stream=StreamType.STDOUT,
+        content=content,
+    )
+
+
+def fill(store: OutputBufferStore, start: int, count: int) -> None:
+    """Append numbered lines where every tenth one is an error."""
+    store.open("exec", "cmd")
+    for index in range(start, start + count):
+        store.append("exec", make_line(index, f"{index} {'Error' if index % 10 == 0 else 'ok'}"))
+
+
+def test_smart_case_and_literal_queries():
+    """Test lowercase queries ignore case and literal queries are escaped."""
+    assert compile_query("error").search("An ERROR")
+    assert not compile_query("Error").search("An ERROR")
+    assert compile_query("a.b").search("a.b") and not compile_query("a.b").search("axb")
+    assert compile_query("a.b", regex=True).search("axb")
+
+
+def test_scan_covers_scrollback_in_chunks(tmp_path):
+    """Test lines spooled out of memory are searched along with the window."""
+    store = OutputBufferStore(memory_budget=10**9, max_lines=25, spill_dir=str(tmp_path))
+    fill(store, 0, 100)
+    snapshot = store.snapshot("exec")
+
+    chunks = list(scan(compile_query("error"), snapshot, chunk_lines=30))
+
+    assert snapshot.scrollback_lines == 75 and len(snapshot) == 100
+    assert [(first, end) for first, end, _ in chunks] == [(0, 30), (30, 60), (60, 90), (90, 100)]
+    assert [number for _, _, found in chunks for number in found] == list(range(0, 100, 10))
+
+
+def test_repeated_search_scans_only_new_lines(tmp_path):
+    """Test a search continues from where its last scan stopped."""
+    store = OutputBufferStore(memory_budget=10**9, max_lines=25, spill_dir=str(tmp_path))
+    fill(store, 0, 50)
+    state = SearchState("error", False, compile_query("error"))
+    chunks = []
+
+    def record(first: int, end: int, found: list[int]) -> None:
+        chunks.append((first, end))
+        state.matches.extend(found)
+        state.scanned = end
+
+    run_search(state, store.snapshot("exec"), record)
+    fill(store, 50, 30)
+    run_search(state, store.snapshot("exec"), record)
+
+    assert chunks == [(0, 50), (50, 80)]
+    assert state.matches == list(range(0, 80, 10))
+
+
+def test_step_wraps_around():
+    """Test moving through matches wraps at both ends."""
+    state = SearchState("x", False, compile_query("x"), matches=[3, 8])
+
+    assert state.step() == 3
+    assert state.step() == 8
+    assert state.step() == 3
+    assert state.step(forward=False) == 8
@@ -0,0 +1,124 @@
+"""Unit tests for the pre-forked shell worker pool."""
+
+import pytest
+
+from src.exceptions import TimeoutError as OpsTimeoutError
+from src.models import Command, ExecutionStatus
+from src.services.command_runner import AsyncCommandRunner
+from src.services.shell_pool import ShellWorkerPool
+
+
+@pytest.fixture
+def pool():
+    """Fixture providing a started pool that is closed afterwards."""
+    shell_pool = ShellWorkerPool(size=1, max_runs=3)
+    shell_pool.start()
+    yield shell_pool
+    shell_pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pooled_run_streams_output_and_exit_code(pool):
+    """Test stdout/stderr separation and exit codes through a worker."""
+    runner = AsyncCommandRunner(shell_pool=pool)
+    command = Command(name="mixed", command="echo out; echo err >&2; printf tail; exit 3")
+    lines = []
+
+    execution = await runner.run(command, output_callback=lines.append)
+
+    assert execution.status == ExecutionStatus.ERROR
+    assert execution.exit_code == 3
+    assert [(line.stream.value, line.content) for line in lines if line.is_error()] == [
+        ("stderr", "err")
+    ]
+    assert [line.content for line in lines if not line.is_error()] == ["out", "tail"]
+
+
+@pytest.mark.asyncio
+async def test_pooled_runs_are_isolated(pool):
+    """Test that cd/export in one run do not leak into the next."""
+    runner = AsyncCommandRunner(shell_pool=pool)
+    await runner.run(Command(name="mutate", command="cd /; export LEAK=1"))
+    lines = []
+
+    await runner.run(
+        Command(name="check", command='echo "${LEAK:-clean} $PWD"'), output_callback=lines.append
+    )
+
+    assert lines[0].content.startswith("clean ")
+    assert lines[0].content != "clean /"
+
+
+@pytest.mark.asyncio
+async def test_pooled_env_replaces_environment(pool):
+    """Test that command env is applied like the spawn path."""
+    runner = AsyncCommandRunner(shell_pool=pool)
+    lines = []
+
+    await runner.run(
+        Command(name="env", command='echo "$FOO-${HOME:-unset}"', env={"FOO": "bar"}),
+        output_callback=lines.append,
+    )
+
+    assert lines[0].content == "bar-unset"
+
+
+@pytest.mark.asyncio
+async def test_pooled_env_runs_in_the_worker(pool):
+    """Test that a command with env runs in the worker's subshell, not a new shell."""
+    runner = AsyncCommandRunner(shell_pool=pool)
+    worker = pool._idle[0]
+    lines = []
+
+    await runner.run(
+        Command(name="pid", command="echo $$", env={"FOO": "bar"}), output_callback=lines.append
+    )
+
+    assert lines[0].content == str(worker.process.pid)
+
+
+@pytest.mark.asyncio
+async def test_worker_recycled_after_max_runs(pool):
+    """Test that a worker is replaced after max_runs executions."""
+    runner = AsyncCommandRunner(shell_pool=pool)
+    pids = set()
+    for _ in range(4):
+        pids.add(pool._idle[0].process.pid)
+        await runner.run(Command(name="noop", command="true"))
+
+    assert len(pids) == 2
+    assert pool.idle_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_pooled_timeout_kills_worker(pool):
+    """Test that a timeout kills the worker and the pool recovers."""
+    runner = AsyncCommandRunner(shell_pool=pool)
+    worker = pool._idle[0]
+
+    with pytest.raises(OpsTimeoutError):
+        await runner.run(Command(name="sleep", command="sleep 10", timeout=1))
+
+    assert not worker.alive
+    execution = await runner.run(Command(name="echo", command="echo ok"))
+    assert execution.status == ExecutionStatus.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_pooled_cancel_kills_worker(pool):
+    """Test that cancelling a pooled execution kills its worker."""
+    import asyncio
+
+    runner = AsyncCommandRunner(shell_pool=pool)
+    worker = pool._idle[0]
+
+    started = asyncio.Event()
+    command = Command(name="sleep", command="echo started; sleep 30")
+
+    task = asyncio.ensure_future(runner.run(command, output_callback=lambda line: started.set()))
+    await asyncio.wait_for(started.wait(), timeout=5)
+    runner.cancel_all()
+    execution = await asyncio.wait_for(task, timeout=5)
+
+    assert execution.status == ExecutionStatus.CANCELLED
+    assert not worker.alive
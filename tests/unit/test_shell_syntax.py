@@ -0,0 +1,39 @@
+"""Unit tests for shell syntax detection."""
+
+import pytest
+
+from src.services.shell_syntax import needs_shell, split_command
+
+
+@pytest.mark.parametrize(
+    "command, argv",
+    [
+        ("ls -la /tmp", ("ls", "-la", "/tmp")),
+        ("git log --oneline -10", ("git", "log", "--oneline", "-10")),
+        ("grep 'two words' file.txt", ("grep", "two words", "file.txt")),
+    ],
+)
+def test_plain_commands_are_split(command, argv):
+    """Test that commands without shell features are split into argv."""
+    assert split_command(command) == argv
+    assert not needs_shell(command)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "ps aux | head -20",
+        "ls *.py",
+        "echo $HOME",
+        "make > build.log",
+        "true && false",
+        "cd /tmp",
+        "exit 42",
+        "FOO=bar env",
+        "echo 'unbalanced",
+        "",
+    ],
+)
+def test_shell_features_are_detected(command):
+    """Test that pipes, globs, expansions, builtins etc. need a shell."""
+    assert needs_shell(command)
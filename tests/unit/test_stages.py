@@ -0,0 +1,101 @@
+"""Unit tests for output pipeline stages."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.exceptions import ConfigError
+from src.models import Command, OutputLine, OutputStage, StreamType
+from src.services.command_runner import AsyncCommandRunner
+from src.services.config import ConfigLoader
+from src.services.stages import OutputPipeline, StagePool, apply_stages, stage_specs
+
+
+def make_line(content: str, index: int = 0) -> OutputLine:
+    """Build an output line."""
+    return OutputLine(
+        id=f"out_{index}",
+        execution_id="exec_1",
+        timestamp=datetime.now(),
+        stream=StreamType.STDOUT,
+        content=content,
+        spans=[(0, 1, "red")],
+    )
+
+
+def test_filters_and_transforms_apply_in_order():
+    """Test include/exclude, replace and json stages chain."""
+    specs = stage_specs(
+        [
+            OutputStage(type="exclude", pattern="debug"),
+            OutputStage(type="replace", pattern=r"token=\w+", replacement="token=***"),
+            OutputStage(type="json"),
+        ]
+    )
+
+    results = apply_stages(specs, ["debug token=x", "call token=abc", '{"a": [1]}'])
+
+    assert results == [[], ["call token=***"], ["{", '  "a": [', "    1", "  ]", "}"]]
+
+
+def test_stage_patterns_are_checked_with_the_config():
+    """Test an invalid stage pattern or a missing pattern is a configuration error."""
+    loader = ConfigLoader()
+
+    with pytest.raises(ConfigError, match="invalid include stage pattern"):
+        loader.validate(
+            {
+                "commands": [
+                    {"name": "x", "command": "ls", "stages": [{"type": "include", "pattern": "("}]}
+                ]
+            }
+        )
+    with pytest.raises(ConfigError, match="requires a pattern"):
+        loader.validate(
+            {"commands": [{"name": "x", "command": "ls", "stages": [{"type": "replace"}]}]}
+        )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_keeps_order_and_colors_of_unchanged_lines():
+    """Test offloaded batches reach the sink in order, unchanged lines keeping spans."""
+    pool = StagePool(workers=2)
+    pool.start()
+    lines = []
+    try:
+        pipeline = OutputPipeline(
+            [
+                OutputStage(type="exclude", pattern="^skip"),
+                OutputStage(type="replace", pattern="7"),
+            ],
+            lines.append,
+            pool,
+        )
+        for index in range(2000):
+            pipeline.feed(make_line("skip" if index % 10 == 0 else f"line {index}", index))
+            if index % 300 == 0:
+                await asyncio.sleep(0)
+        await pipeline.close()
+    finally:
+        pool.close()
+
+    expected = [f"line {i}".replace("7", "***") for i in range(2000) if i % 10]
+    assert [line.content for line in lines] == expected
+    assert lines[0].spans == [(0, 1, "red")]
+    assert lines[[line.content for line in lines].index("line ***")].spans is None
+
+
+@pytest.mark.asyncio
+async def test_runner_applies_command_stages():
+    """Test a command's stages shape the lines its output callback receives."""
+    command = Command(
+        name="json",
+        command="""printf '{"ok": true}\\nnoise\\n'""",
+        stages=[OutputStage(type="exclude", pattern="noise"), OutputStage(type="json", indent=1)],
+    )
+    lines = []
+
+    await AsyncCommandRunner().run(command, output_callback=lines.append)
+
+    assert [line.content for line in lines] == ["{", ' "ok": true', "}"]
@@ -0,0 +1,71 @@
+"""Unit tests for the fast-start entry point paths."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.app import StartupProfile, check_config
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_check_config_does_not_import_textual(tmp_path):
+    """Test that --check-config validates without loading Textual."""
+    config_file = tmp_path / "commands.yaml"
+    config_file.write_text("commands:\n  - name: echo\n    command: echo hi\n")
+
+    script = (
+        "import sys\n"
+        "from src.app import main\n"
+        "try:\n"
+        f"    main(['--check-config', '--config', {str(config_file)!r}])\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 0, e.code\n"
+        "assert 'textual' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "1 command(s)" in result.stdout
+
+
+def test_check_config_reports_errors(tmp_path, capsys):
+    """Test that an invalid configuration yields a non-zero exit code."""
+    config_file = tmp_path / "commands.yaml"
+    config_file.write_text("commands:\n  - name: missing_command\n")
+
+    assert check_config(str(config_file)) == 1
+    assert "Configuration Error" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("module", ["src.services", "src.widgets", "src.models"])
+def test_package_imports_are_lazy(module):
+    """Test that importing a package does not import its heavy dependencies."""
+    script = (
+        "import sys\n"
+        f"import {module}\n"
+        "assert 'textual' not in sys.modules\n"
+        "assert 'pydantic' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_startup_profile_report():
+    """Test that recorded phases appear in the profile report."""
+    profile = StartupProfile()
+    profile.mark("config")
+    profile.mark("import")
+
+    report = profile.report()
+
+    assert "config" in report
+    assert "import" in report
+    assert "total" in report
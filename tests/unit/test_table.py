@@ -0,0 +1,126 @@
+"""Unit tests for structured output tables."""
+
+import re
+from datetime import datetime
+
+import pytest
+from textual.app import App, ComposeResult
+
+from src.models import Command, Execution, OutputLine, StreamType
+from src.services.table import SORT_CHUNK, ColumnTable, TableParser, TableView, compute_view
+from src.widgets.output_pane import OutputPane
+from src.widgets.output_table import OutputTable
+
+
+def test_jsonl_rows_flatten_and_add_columns():
+    """Test JSON objects become rows, with nested keys flattened and new keys added."""
+    parser = TableParser("jsonl")
+    for text in [
+        '{"host": "a", "cpu": 1.5, "meta": {"zone": "z1"}}',
+        "not json",
+        '{"host": "b", "up": true, "tags": ["x"], "cpu": null}',
+        "[1, 2]",
+    ]:
+        parser.feed(text)
+
+    table = parser.table
+    assert table.columns == ["host", "cpu", "meta.zone", "up", "tags"]
+    assert table.row(0) == ["a", "1.5", "z1", "", ""]
+    assert table.row(1) == ["b", "", "", "true", '["x"]']
+    assert parser.skipped == 2
+
+
+def test_csv_and_aligned_tables_use_header_line():
+    """Test csv and table formats take column names from the first line."""
+    csv_parser = TableParser("csv")
+    for text in ["name,size", '"a, b",10', "c"]:
+        csv_parser.feed(text)
+    assert csv_parser.table.columns == ["name", "size"]
+    assert csv_parser.table.row(0) == ["a, b", "10"]
+    assert csv_parser.table.row(1) == ["c", ""]
+
+    ps = TableParser("table")
+    for text in ["PID  TTY  CMD", "", "12   pts/0  python -m app --flag"]:
+        ps.feed(text)
+    assert ps.table.row(0) == ["12", "pts/0", "python -m app --flag"]
+
+
+def test_numeric_columns_sort_by_value_with_blanks_last():
+    """Test numeric sorting, text sorting and where non-numbers go."""
+    table = ColumnTable(["name", "size"])
+    for name, size in [("b", "10"), ("a", "9"), ("c", ""), ("d", "1,200")]:
+        table.append([name, size])
+
+    assert table.sort_rows(1) == [1, 0, 3, 2]
+    assert table.sort_rows(1, descending=True) == [3, 0, 1, 2]
+    assert table.sort_rows(0) == [1, 0, 2, 3]
+
+
+def test_large_sorts_are_chunked_and_stable():
+    """Test sorts merged from chunks keep equal keys in arrival order."""
+    table = ColumnTable(["key"])
+    count = SORT_CHUNK * 2 + 5
+    for index in range(count):
+        table.append([str(index % 3)])
+
+    rows = table.sort_rows(0)
+
+    assert rows == sorted(range(count), key=lambda index: index % 3)
+
+
+def test_view_filters_then_sorts():
+    """Test a view keeps rows with a matching cell, in sorted order."""
+    table = ColumnTable(["host", "cpu"])
+    for host, cpu in [("web-1", "50"), ("db-1", "90"), ("web-2", "70")]:
+        table.append([host, cpu])
+    view = TableView(sort_column=1, descending=True, pattern=re.compile("web"))
+
+    rows, count = compute_view(table, view)
+
+    assert rows == [2, 0]
+    assert count == 3
+    assert compute_view(table, TableView()) == (None, 3)
+
+
+class PaneApp(App):
+    """App hosting a single output pane."""
+
+    def compose(self) -> ComposeResult:
+        yield OutputPane(id="pane")
+
+
+@pytest.mark.asyncio
+async def test_pane_shows_table_for_structured_commands():
+    """Test stdout of a jsonl command fills a table, toggled with the raw output."""
+    app = PaneApp()
+    async with app.run_test(size=(80, 20)) as pilot:
+        pane = app.query_one(OutputPane)
+        command = Command(name="events", command="cat events", format="jsonl")
+        execution = Execution(id="exec_1", command=command)
+        pane.start_command(execution)
+        for index, cpu in enumerate(["5", "30", "12"]):
+            pane.add_output_line(
+                OutputLine(
+                    id=f"out_{index}",
+                    execution_id="exec_1",
+                    timestamp=datetime.now(),
+                    stream=StreamType.STDOUT,
+                    content=f'{{"host": "h{index}", "cpu": {cpu}}}',
+                )
+            )
+        table = pane.query_one(OutputTable)
+        await pilot.pause()
+
+        assert table.display
+        assert table.render_line(1).text.split() == ["host", "cpu"]
+        assert table.render_line(2).text.split() == ["h0", "5"]
+
+        table.view.column = 1
+        table.action_sort()
+        table.action_sort()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert [table.render_line(y).text.split()[0] for y in (2, 3, 4)] == ["h1", "h2", "h0"]
+
+        pane.toggle_table()
+        assert not table.display
@@ -0,0 +1,109 @@
+"""Unit tests for output-pattern triggers."""
+
+import time
+
+import pytest
+
+from src.exceptions import ConfigError
+from src.models import Command, ExecutionStatus
+from src.services.command_runner import AsyncCommandRunner
+from src.services.config import ConfigLoader
+from src.services.triggers import OutputTriggers
+
+
+def test_combined_regex_reports_matching_trigger():
+    """Test one scan identifies which pattern matched, flags included."""
+    triggers = OutputTriggers(
+        Command(name="t", command="true", until=["(?i)ready"], fail_on=["ERROR"], alert_on=["warn"])
+    )
+
+    assert triggers.match(b"Server READY\n").kind == "until"
+    assert triggers.match(b"ERROR: disk full\n").kind == "fail_on"
+    assert triggers.match(b"warn: slow\n").pattern == "warn"
+    assert triggers.match(b"all good\n") is None
+
+
+def test_invalid_pattern_rejected_by_config():
+    """Test a bad regex is reported when the config is validated."""
+    config = {"commands": [{"name": "t", "command": "true", "fail_on": ["("]}]}
+
+    with pytest.raises(ConfigError, match="fail_on"):
+        ConfigLoader().validate(config)
+
+
+def test_backreferences_follow_their_groups():
+    """Test numbered backreferences still match their own pattern's groups once joined."""
+    triggers = OutputTriggers(
+        Command(
+            name="t",
+            command="true",
+            fail_on=[r"(\w+) \1", r"[\1](x)(y)\2\1"],
+            alert_on=[r"(a)?(?(1)b|c)\x41"],
+        )
+    )
+
+    assert triggers.match(b"oops oops\n").pattern == r"(\w+) \1"
+    assert triggers.match(b"oops again\n") is None
+    assert triggers.match(b"\x01xyyx\n").kind == "fail_on"
+    assert triggers.match(b"abA\n").kind == "alert_on"
+    assert triggers.match(b"cA\n").kind == "alert_on"
+
+
+def test_repeated_group_name_rejected_by_config():
+    """Test a group name used by two patterns is reported with the pattern."""
+    config = {
+        "commands": [
+            {
+                "name": "t",
+                "command": "true",
+                "fail_on": ["(?P<code>E\\d+)"],
+                "alert_on": ["(?P<code>W\\d+)"],
+            }
+        ]
+    }
+
+    with pytest.raises(ConfigError, match=r"'code'.*W"):
+        ConfigLoader().validate(config)
+
+
+@pytest.mark.asyncio
+async def test_until_finishes_early_as_success():
+    """Test a matching line stops a long command with status SUCCESS."""
+    command = Command(
+        name="server", command="echo starting; echo Listening on 8080; sleep 30", until=["Listening"]
+    )
+    start = time.monotonic()
+
+    execution = await AsyncCommandRunner(termination_grace=0.5).run(command)
+
+    assert execution.status == ExecutionStatus.SUCCESS
+    assert "Listening" in (execution.stop_reason or "")
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.asyncio
+async def test_fail_on_stops_as_error():
+    """Test a fail_on match on stderr fails the execution."""
+    command = Command(
+        name="check", command="echo 'FATAL: boom' >&2; sleep 30", fail_on=["FATAL"], timeout=60
+    )
+
+    execution = await AsyncCommandRunner(termination_grace=0.5).run(command)
+
+    assert execution.status == ExecutionStatus.ERROR
+    assert "FATAL: boom" in (execution.error_message or "")
+
+
+@pytest.mark.asyncio
+async def test_alert_on_reports_once_and_keeps_running():
+    """Test alerts go to the callback once per pattern without stopping."""
+    alerts = []
+    runner = AsyncCommandRunner(alert_callback=lambda execution, alert: alerts.append(alert))
+    command = Command(name="log", command="echo warn 1; echo warn 2; exit 0", alert_on=["warn"])
+
+    execution = await runner.run(command)
+
+    assert execution.status == ExecutionStatus.SUCCESS
+    assert execution.exit_code == 0
+    assert len(alerts) == 1
+    assert execution.alerts == alerts